@@ -227,28 +227,21 @@ def getValueOf(tx, varname, rootContextNode):
 	outValues = [] #list of values (its a list due to potential assigments of different values in (dynamic-valued) if-conditions)
 	PROGRAM_NODE_INDEX = '1' # program node
 
-	# for PDG relations
-	query = """
-	MATCH (n_s { Id: '%s' })<-[:PDG_parentOf { Arguments: '%s' }]-(n_t) RETURN collect(distinct n_t) AS resultset
-	"""%(rootContextNode['Id'], varname)
-
-	results = tx.run(query)
-	for item in results: 
-		childNodes = item['resultset'] 
-		for childNode in childNodes:
-			tree = getChildsOf(tx, childNode)
-			contextNode = tree['node']
-			if contextNode['Id'] == PROGRAM_NODE_INDEX: 
-				continue
-			ex = getCodeExpression(tree)
-			[code_expr, literals, idents] = ex
-			outValues.append(ex)
+	childNodes = neo4jQueryUtilityModule.get_pdg_parents(tx, rootContextNode['Id'], varname)
+	for childNode in childNodes:
+		tree = getChildsOf(tx, childNode)
+		contextNode = tree['node']
+		if contextNode['Id'] == PROGRAM_NODE_INDEX: 
+			continue
+		ex = getCodeExpression(tree)
+		[code_expr, literals, idents] = ex
+		outValues.append(ex)
 			
-			new_varnames = _get_unique_list(list(idents)) 
-			for new_varname in new_varnames:
-				if new_varname == varname: continue
-				v = getValueOf(tx, new_varname, contextNode)
-				outValues.extend(v)	
+		new_varnames = _get_unique_list(list(idents)) 
+		for new_varname in new_varnames:
+			if new_varname == varname: continue
+			v = getValueOf(tx, new_varname, contextNode)
+			outValues.extend(v)	
 
 	return outValues
 
@@ -871,32 +864,32 @@ def getHttpRequestCallExpressionUrlArgument(tx, node, function_type):
 	query = ''
 	if function_type == 'fetch':
 		query="""
-		MATCH (t {Type: 'ExpressionStatement'})-[:AST_parentOf {RelationType: 'expression'}]->(n { Id: '%s', Type: 'CallExpression'})-[:AST_parentOf {RelationType: 'callee'}]-> (req {Type: 'Identifier', Code: 'fetch'}), 
+		MATCH (t {Type: 'ExpressionStatement'})-[:AST_parentOf {RelationType: 'expression'}]->(n { Id: $id, Type: 'CallExpression'})-[:AST_parentOf {RelationType: 'callee'}]-> (req {Type: 'Identifier', Code: 'fetch'}), 
 		(n)-[:AST_parentOf {RelationType: 'arguments', Arguments: '{\"arg\":0}'}]->(a)
 		RETURN t, n, a
-		"""%(nodeId)
+		"""
 	elif function_type == 'open':
 		query="""
-		MATCH (t {Type: 'ExpressionStatement'})-[:AST_parentOf {RelationType: 'expression'}]->(n { Id: '%s', Type: 'CallExpression'})-[:AST_parentOf {RelationType: 'callee'}]-> (n1 {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'property'}]->(req {Type: 'Identifier', Code: 'open'}), 
+		MATCH (t {Type: 'ExpressionStatement'})-[:AST_parentOf {RelationType: 'expression'}]->(n { Id: $id, Type: 'CallExpression'})-[:AST_parentOf {RelationType: 'callee'}]-> (n1 {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'property'}]->(req {Type: 'Identifier', Code: 'open'}), 
 		(n)-[:AST_parentOf {RelationType: 'arguments', Arguments: '{\"arg\":1}'}]->(a)
 		RETURN t, n, a
-		"""%(nodeId)
+		"""
 	elif function_type == 'ajax':
 		query="""
-		MATCH (t {Type: 'ExpressionStatement'})-[:AST_parentOf {RelationType: 'expression'}]->(n { Id: '%s', Type: 'CallExpression'})-[:AST_parentOf {RelationType: 'callee'}]-> (n1 {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'property'}]->(req {Type: 'Identifier', Code: 'ajax'}),
+		MATCH (t {Type: 'ExpressionStatement'})-[:AST_parentOf {RelationType: 'expression'}]->(n { Id: $id, Type: 'CallExpression'})-[:AST_parentOf {RelationType: 'callee'}]-> (n1 {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'property'}]->(req {Type: 'Identifier', Code: 'ajax'}),
 		(n1)-[:AST_parentOf {RelationType: 'object'}]->(n2 {Type: 'Identifier', Code: '$'}),
 		(n)-[:AST_parentOf {RelationType: 'arguments', Arguments: '{\"arg\":0}'}]->(n3 {Type: 'ObjectExpression'})-[:AST_parentOf {RelationType: 'properties'}]->(n4 {Type: 'Property'})-[:AST_parentOf {RelationType: 'key'}]->(n5 {Type: 'Identifier', Code: 'url'}),
 		(n4)-[:AST_parentOf {RelationType: 'value'}]->(a)
 		RETURN t, n, a
-		"""%(nodeId)
+		"""
 	elif function_type == 'asyncRequest':
 		query="""
-		MATCH (t {Type: 'ExpressionStatement'})-[:AST_parentOf {RelationType: 'expression'}]->(n { Id: '%s', Type: 'CallExpression'})-[:AST_parentOf {RelationType: 'callee'}]->(n1 {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'property'}]->(req {Type: 'Identifier', Code: 'asyncRequest'}),
+		MATCH (t {Type: 'ExpressionStatement'})-[:AST_parentOf {RelationType: 'expression'}]->(n { Id: $id, Type: 'CallExpression'})-[:AST_parentOf {RelationType: 'callee'}]->(n1 {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'property'}]->(req {Type: 'Identifier', Code: 'asyncRequest'}),
 		(n)-[:AST_parentOf {RelationType: 'arguments', Arguments: '{\"arg\":1}'}]->(a)
 		RETURN t, n, a
-		"""%(nodeId)
+		"""
 	if len(query):
-		out = tx.run(query)
+		out = tx.run(query, id=nodeId)
 	return out
 
 
@@ -1348,23 +1341,7 @@ def getChildsOf(tx, node, relation_type=''):
 	@return {dict}: wrapperNode= a dict containing the parse tree with its root set to input node, format: {'node': node, 'children': [child_node1, child_node2, ...]} 
 	"""
 
-	outNode =  {'node': node, 'children': []} # wrapper around neo4j node
-	nodeId = node['Id']
-	if relation_type != '':
-		query= """
-		MATCH (root { Id: '%s' })-[:AST_parentOf { RelationType: '%s'}]->(child) RETURN collect(distinct child) AS resultset
-		"""%(nodeId, relation_type)
-	else:
-		query= """
-			MATCH (root { Id: '%s' })-[:AST_parentOf]->(child) RETURN collect(distinct child) AS resultset
-			"""%(nodeId)
-
-	results = tx.run(query)
-	for item in results:
-		childNodes = item['resultset']
-		for childNode in childNodes:
-			outNode['children'].append(getChildsOf(tx, childNode))
-	return outNode
+	return neo4jQueryUtilityModule.get_ast_subtree(tx, node, relation_type=relation_type)
 
 
 
@@ -1379,11 +1356,11 @@ def getIdentifierLocalAndGlobalValues(tx, varname):
 
 	stack = []
 	query = """
-		MATCH (n { Type:'Identifier', Code: '%s'})<-[:AST_parentOf {RelationType: 'id'}]-(vdtor {Type: 'VariableDeclarator'})<-[:AST_parentOf {RelationType:'declarations'}]-(vdtion),
+		MATCH (n { Type:'Identifier', Code: $varname})<-[:AST_parentOf {RelationType: 'id'}]-(vdtor {Type: 'VariableDeclarator'})<-[:AST_parentOf {RelationType:'declarations'}]-(vdtion),
 		(vdtor)-[:AST_parentOf {RelationType: 'init'}]->(value)
 		RETURN vdtion, value
-	"""%(varname)
-	results = tx.run(query)
+	"""
+	results = tx.run(query, varname=varname)
 
 	for pair in results:
 		# must at most one pair exist, otherwise, there are 2 or more potential values defined for a single variable at different scopes!
@@ -1453,39 +1430,39 @@ def isVariableAFunctionArgumentInCurrentScope(tx, varname, varname_nid):
 
 	# Case 1: Function Expression as Variable Decleration, e.g., var f = function(varname) { ... }
 	query1 = """
-	MATCH (fname {Type: 'Identifier'})<-[:AST_parentOf {RelationType: 'id'}]-(vd {Type: 'VariableDeclarator'})-[:AST_parentOf {RelationType: 'init'}]->(n {Type:'FunctionExpression'})-[:AST_parentOf {RelationType: 'params'}]-(arg { Type:'Identifier', Code: '%s'}),
-	(n)-[:AST_parentOf {RelationType: 'body'}]->(block {Type: 'BlockStatement'})-[:AST_parentOf|:CFG_parentOf*]->(variable { Id:'%s', Type:'Identifier', Code: '%s'}) 
+	MATCH (fname {Type: 'Identifier'})<-[:AST_parentOf {RelationType: 'id'}]-(vd {Type: 'VariableDeclarator'})-[:AST_parentOf {RelationType: 'init'}]->(n {Type:'FunctionExpression'})-[:AST_parentOf {RelationType: 'params'}]-(arg { Type:'Identifier', Code: $varname}),
+	(n)-[:AST_parentOf {RelationType: 'body'}]->(block {Type: 'BlockStatement'})-[:AST_parentOf|:CFG_parentOf*]->(variable { Id:$id, Type:'Identifier', Code: $varname}) 
 	RETURN distinct(n) as top, fname
-	"""%(varname, varname_nid, varname)
+	"""
 
 	# Case 2: Function Expression as Dictionary Key, e.g., f: function(varname) { ... }
 	query2 = """
-	MATCH (fname {Type: 'Identifier'})<-[:AST_parentOf {RelationType: 'key'}]-(vd {Type: 'Property'})-[:AST_parentOf {RelationType: 'value'}]->(n {Type:'FunctionExpression'})-[:AST_parentOf {RelationType: 'params'}]-(arg { Type:'Identifier', Code: '%s'}),
-	(n)-[:AST_parentOf {RelationType: 'body'}]->(block {Type: 'BlockStatement'})-[:AST_parentOf|:CFG_parentOf*]->(variable { Id:'%s', Type:'Identifier', Code: '%s'}) 
+	MATCH (fname {Type: 'Identifier'})<-[:AST_parentOf {RelationType: 'key'}]-(vd {Type: 'Property'})-[:AST_parentOf {RelationType: 'value'}]->(n {Type:'FunctionExpression'})-[:AST_parentOf {RelationType: 'params'}]-(arg { Type:'Identifier', Code: $varname}),
+	(n)-[:AST_parentOf {RelationType: 'body'}]->(block {Type: 'BlockStatement'})-[:AST_parentOf|:CFG_parentOf*]->(variable { Id:$id, Type:'Identifier', Code: $varname}) 
 	RETURN distinct(n) as top, fname
-	"""%(varname, varname_nid, varname)
+	"""
 
 	# Case 3: Function Declaration, e.g., function f(varname) { ...}
 	query3 = """
-	MATCH (fname {Type: 'Identifier'})<-[:AST_parentOf {RelationType: 'id'}]-(n {Type:'FunctionDeclaration'})-[:AST_parentOf {RelationType: 'params'}]-(arg { Type:'Identifier', Code: '%s'}),
-	(n)-[:AST_parentOf {RelationType: 'body'}]->(block {Type: 'BlockStatement'})-[:AST_parentOf|:CFG_parentOf*]->(variable { Id:'%s', Type:'Identifier', Code: '%s'}) 
+	MATCH (fname {Type: 'Identifier'})<-[:AST_parentOf {RelationType: 'id'}]-(n {Type:'FunctionDeclaration'})-[:AST_parentOf {RelationType: 'params'}]-(arg { Type:'Identifier', Code: $varname}),
+	(n)-[:AST_parentOf {RelationType: 'body'}]->(block {Type: 'BlockStatement'})-[:AST_parentOf|:CFG_parentOf*]->(variable { Id:$id, Type:'Identifier', Code: $varname}) 
 	RETURN distinct(n) as top, fname
-	"""%(varname, varname_nid, varname)
+	"""
 
 
-	res = tx.run(query1)   # queries should only find one function!
+	res = tx.run(query1, varname=varname, id=varname_nid)   # queries should only find one function!
 	for item in res:
 		fn1 = item['top']
 		func_name_node = item['fname']
 		return [True, fn1, func_name_node]
 
-	res = tx.run(query2)
+	res = tx.run(query2, varname=varname, id=varname_nid)
 	for item in res:
 		fn2 = item['top']
 		func_name_node = item['fname']
 		return [True, fn2, func_name_node]
 
-	res = tx.run(query3)
+	res = tx.run(query3, varname=varname, id=varname_nid)
 	for item in res:
 		fn3 = item['top']
 		func_name_node = item['fname']
@@ -1503,11 +1480,11 @@ def getFunctionCallValuesOfFunctionDefinitions(tx, functionDefNode):
 	"""
 	out = {}
 	query = """
-	MATCH (param)<-[:AST_parentOf {RelationType: 'params'}]-(functionDef { Id: '%s' })<-[:CG_parentOf]-(caller {Type: 'CallExpression'})-[:AST_parentOf {RelationType: 'arguments'}]-> (arg) RETURN collect(distinct param) as params, caller, collect(distinct arg) AS args
-	"""%(functionDefNode['Id'])
+	MATCH (param)<-[:AST_parentOf {RelationType: 'params'}]-(functionDef { Id: $id })<-[:CG_parentOf]-(caller {Type: 'CallExpression'})-[:AST_parentOf {RelationType: 'arguments'}]-> (arg) RETURN collect(distinct param) as params, caller, collect(distinct arg) AS args
+	"""
 
 
-	results = tx.run(query)
+	results = tx.run(query, id=functionDefNode['Id'])
 	for each_binding in results:
 		call_expression = each_binding['caller']
 		args = each_binding['args']
@@ -1574,10 +1551,10 @@ def getThisPointerResolution(tx, this_node):
 
 	###  STEP 1: inspect if pointer-analysis is already done and is in DB
 	pointer_query="""
-	MATCH (this_node { Id: '%s'})-[:pointsTo {RelationType: 'top', Arguments: 'pointsTo=window'}]->(top_node)
+	MATCH (this_node { Id: $id})-[:pointsTo {RelationType: 'top', Arguments: 'pointsTo=window'}]->(top_node)
 	return top_node as top
-	"""%(this_expression_node_id)
-	results = tx.run(pointer_query)
+	"""
+	results = tx.run(pointer_query, id=this_expression_node_id)
 
 	shouldTerminate = False
 	for item in results:
@@ -1589,11 +1566,11 @@ def getThisPointerResolution(tx, this_node):
 		return out
 
 	pointer_query="""
-	MATCH (this_node { Id: '%s'})-[:pointsTo {RelationType: 'top'}]->(top_node),
-	(this_node { Id: '%s'})-[:pointsTo {RelationType: 'owner'}]->(owner_node)
+	MATCH (this_node { Id: $id})-[:pointsTo {RelationType: 'top'}]->(top_node),
+	(this_node { Id: $id})-[:pointsTo {RelationType: 'owner'}]->(owner_node)
 	return top_node as top, owner_node as owner
-	"""%(this_expression_node_id, this_expression_node_id)
-	results = tx.run(pointer_query)
+	"""
+	results = tx.run(pointer_query, id=this_expression_node_id)
 	for item in results:
 		top = item['top']
 		owner = item['owner']
@@ -1603,10 +1580,10 @@ def getThisPointerResolution(tx, this_node):
 		return out
 
 	pointer_query="""
-	MATCH (this_node { Id: '%s'})-[:pointsTo {RelationType: 'owner', Arguments: 'pointsTo=eventSelector'}]->(owner_node)
+	MATCH (this_node { Id: $id})-[:pointsTo {RelationType: 'owner', Arguments: 'pointsTo=eventSelector'}]->(owner_node)
 	return owner_node as owner
-	"""%(this_expression_node_id)
-	results = tx.run(pointer_query)
+	"""
+	results = tx.run(pointer_query, id=this_expression_node_id)
 	for item in results:
 		owner = item['owner']
 		out['events'].append({'owner': owner})
@@ -1620,10 +1597,10 @@ def getThisPointerResolution(tx, this_node):
 
 	# handle ThisStatement in events
 	query="""
-	MATCH (this_st {Id: '%s'})<-[:AST_parentOf*1..10]-(n {Type: 'FunctionExpression'})<-[r:ERDG]-(top_node)
+	MATCH (this_st {Id: $id})<-[:AST_parentOf*1..10]-(n {Type: 'FunctionExpression'})<-[r:ERDG]-(top_node)
 	RETURN r
-	"""%this_expression_node_id
-	results = tx.run(query)
+	"""
+	results = tx.run(query, id=this_expression_node_id)
 	for item in results:
 		relation = item['r']
 		out['events'].append({'relation': relation}) # r['args'].split('___')[1] = id of the node that `this` refers to it
@@ -1632,7 +1609,7 @@ def getThisPointerResolution(tx, this_node):
 	# handle ThisStatement in functions (may resolve to global object, i.e., window, or to the owner object, if they are lator assigned to a member expression)
 	# assignment expr, or var declaration:    										   (right/init)		assign_expr/declarator
 	query="""
-		MATCH (this_st { Id: '%s'})<-[:AST_parentOf*]-(n {Type: 'FunctionExpression'})<-[:AST_parentOf]-(expr)-[r:AST_parentOf]->(function_name), (expr)<-[:AST_parentOf]-(top)
+		MATCH (this_st { Id: $id})<-[:AST_parentOf*]-(n {Type: 'FunctionExpression'})<-[:AST_parentOf]-(expr)-[r:AST_parentOf]->(function_name), (expr)<-[:AST_parentOf]-(top)
 		WHERE r.Type= 'left' OR r.Type= 'id'
 		OPTIONAL MATCH (p1 {Type: 'AssignmentExpression'})-[:AST_parentOf {RelationType: 'right'}]->(c1 {Type: 'Identifier', Value: function_name.Code}), 
 		(p1)-[:AST_parentOf {RelationType: 'left'}]->(c2 {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'object'}]->(owner {Type: 'Identifier'})
@@ -1643,10 +1620,10 @@ def getThisPointerResolution(tx, this_node):
 		WHEN 'MemberExpression' THEN [top, true_owner]
 		ELSE 'xx'
 		END
-	"""%this_expression_node_id
+	"""
 	# if owner is null,  then `this` refers to global object: the window
 	# if owner is not null, `this` referes to the owner
-	results = tx.run(query)
+	results = tx.run(query, id=this_expression_node_id)
 	for item in results:
 		if 'true_owner' in item:
 			owner = item['true_owner']
@@ -1664,15 +1641,15 @@ def getThisPointerResolution(tx, this_node):
 
 	## handle the object expression case
 	query="""
-	MATCH (this_st {Id: '%s'})<-[:AST_parentOf*]-(n {Type: 'FunctionExpression'})<-[:AST_parentOf {RelationType: 'value'}]-(prop {Type: 'Property'})<-[:AST_parentOf {RelationType: 'properties'}]-(expr {Type: 'ObjectExpression'})<-[r:AST_parentOf]-(t)<-[:AST_parentOf]-(tt)
+	MATCH (this_st {Id: $id})<-[:AST_parentOf*]-(n {Type: 'FunctionExpression'})<-[:AST_parentOf {RelationType: 'value'}]-(prop {Type: 'Property'})<-[:AST_parentOf {RelationType: 'properties'}]-(expr {Type: 'ObjectExpression'})<-[r:AST_parentOf]-(t)<-[:AST_parentOf]-(tt)
 	WHERE (r.RelationType= 'right' OR r.RelationType= 'init' OR r.RelationType = 'arguments')
 	AND (t.Type = 'AssignmentExpression' OR t.Type='VariableDeclarator' OR t.Type= 'CallExpression')
 	AND (tt.Type = 'ExpressionStatement' OR tt.Type='VariableDeclaration')
 	OPTIONAL MATCH (t)-[r2:AST_parentOf]->(c1 {Type: 'Identifier'}) WHERE r2.RelationType = 'left' OR r2.RelationType = 'id'
 	OPTIONAL MATCH (t)-[:AST_parentOf]->(c3)-[AST_parentOf {RelationType: 'object'}]->(c2 {Type: 'Identifier'})
 	RETURN tt, c2, c1
-	"""%this_expression_node_id
-	results = tx.run(query)
+	"""
+	results = tx.run(query, id=this_expression_node_id)
 	for item in results:
 		owner = item['c2']
 		top = item['tt']
@@ -1683,11 +1660,11 @@ def getThisPointerResolution(tx, this_node):
 
 
 	query="""
-	MATCH (this_st { Id: '%s'})<-[:AST_parentOf*]-(n {Type: 'FunctionExpression'})<-[:AST_parentOf {RelationType: 'arguments'}]-(top_call_expression)-[:AST_parentOf {RelationType: 'callee'}]->(member_expr {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'object'}]->(the_event_target_top),
+	MATCH (this_st { Id: $id})<-[:AST_parentOf*]-(n {Type: 'FunctionExpression'})<-[:AST_parentOf {RelationType: 'arguments'}]-(top_call_expression)-[:AST_parentOf {RelationType: 'callee'}]->(member_expr {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'object'}]->(the_event_target_top),
 	(member_expr)-[:AST_parentOf {RelationType: 'property'}]->(prop {Type: 'Identifier', Code: 'on'}), (top_call_expression)<-[:AST_parentOf]-(top)
 	RETURN the_event_target_top, top
-	"""%this_expression_node_id
-	results = tx.run(query)
+	"""
+	results = tx.run(query, id=this_expression_node_id)
 	for item in results:
 		owner = item['the_event_target_top']
 		top = item['top']
@@ -1702,27 +1679,28 @@ def getThisPointerResolution(tx, this_node):
 			if owner_node == constantsModule.WINDOW_GLOBAL_OBJECT:
 				top_node_id= top_node['Id']
 				build_relationship_query="""
-				MATCH (this_node { Id: '%s'}), (top_node { Id: '%s'}))
+				MATCH (this_node { Id: $id}), (top_node { Id: $top_id})
 				CREATE (this_node)-[:pointsTo {RelationType: 'top', Arguments: 'pointsTo=window'}]->(top_node)
-				"""%(this_expression_node_id)
+				"""
+				tx.run(build_relationship_query, id=this_expression_node_id, top_id=top_node_id)
 			else:
 				top_node_id = top_node['Id']
 				owner_node_id = owner_node['Id']
 				build_relationship_query="""
-				MATCH (this_node { Id: '%s'}), (top_node { Id: '%s'}), (owner_node { Id: '%s'})
+				MATCH (this_node { Id: $id}), (top_node { Id: $top_id}), (owner_node { Id: $owner_id})
 				CREATE (this_node)-[:pointsTo {RelationType: 'top'}]->(top_node)
 				CREATE (this_node)-[:pointsTo {RelationType: 'owner'}]->(owner_node)
-				"""%(this_expression_node_id, top_node_id, owner_node_id)
-			tx.run(build_relationship_query)
+				"""
+				tx.run(build_relationship_query, id=this_expression_node_id, top_id=top_node_id, owner_id=owner_node_id)
 
 	if len(out['events']) > 0:
 		for element in out['events']:
 			owner_node_id = item['Arguments'].split('___')[1]
 			build_relationship_query="""
-			MATCH (this_node { Id: '%s'}), (owner_node { Id: '%s'})
+			MATCH (this_node { Id: $id}), (owner_node { Id: $owner_id})
 			CREATE (this_node)-[:pointsTo {RelationType: 'owner', Arguments: 'pointsTo=eventSelector'}]->(owner_node)
-			"""%(this_expression_node_id, owner_node_id)
-			tx.run(build_relationship_query)
+			"""
+			tx.run(build_relationship_query, id=this_expression_node_id, owner_id=owner_node_id)
 
 	### ---- END STEP 2 ---- ###
 
@@ -1758,9 +1736,9 @@ def getValueOfWithLocationChain(tx, varname, rootContextNode, recurse_counter=0,
 		@return VariableDeclaration or ExpressionStatemnet node
 		"""
 		query = """
-		MATCH (n)-[:AST_parentOf]->(callExpr { Id: '%s', Type: 'CallExpression'}) RETURN n
-		"""%(call_expr['Id'])
-		results = tx.run(query)
+		MATCH (n)-[:AST_parentOf]->(callExpr { Id: $id, Type: 'CallExpression'}) RETURN n
+		"""
+		results = tx.run(query, id=call_expr['Id'])
 		for item in results:
 			top_level = item['n']
 			return top_level
@@ -1771,9 +1749,9 @@ def getValueOfWithLocationChain(tx, varname, rootContextNode, recurse_counter=0,
 		gets the function definition of a block statement node
 		"""
 		query = """
-		MATCH (funcDef)-[:AST_parentOf]->(blockSt { Id: '%s', Type: 'BlockStatement'}) RETURN funcDef
-		"""%(block_stmt_node['Id'])
-		results = tx.run(query)
+		MATCH (funcDef)-[:AST_parentOf]->(blockSt { Id: $id, Type: 'BlockStatement'}) RETURN funcDef
+		"""
+		results = tx.run(query, id=block_stmt_node['Id'])
 		for record in results:
 			funcDef = record['funcDef']
 			return funcDef
@@ -1798,9 +1776,9 @@ def getValueOfWithLocationChain(tx, varname, rootContextNode, recurse_counter=0,
 	def _check_if_function_has_param(varname, func_def_node):
 
 		query="""
-		MATCH (n { Id: '%s'})-[:AST_parentOf {RelationType: 'params'}]-(arg) RETURN collect(distinct arg) as args
-		"""%(func_def_node['Id'])
-		results = tx.run(query)
+		MATCH (n { Id: $id})-[:AST_parentOf {RelationType: 'params'}]-(arg) RETURN collect(distinct arg) as args
+		"""
+		results = tx.run(query, id=func_def_node['Id'])
 		for item in results:
 			args = item['args']
 			arg_values = [_get_value_of_identifer_or_literal(node)[0] for node in args]
@@ -1812,211 +1790,185 @@ def getValueOfWithLocationChain(tx, varname, rootContextNode, recurse_counter=0,
 		return False
 
 
-	if PDG_on_variable_declarations_only:
-		# for VariableDeclaration PDG relations
-		query = """
-		MATCH (n_s { Id: '%s' })<-[:PDG_parentOf { Arguments: '%s' }]-(n_t {Type: 'VariableDeclaration'}) RETURN collect(distinct n_t) AS resultset
-		"""%(nodeId, varname)
-	else:
-		# for all PDG relations
-		query = """
-		MATCH (n_s { Id: '%s' })<-[:PDG_parentOf { Arguments: '%s' }]-(n_t) RETURN collect(distinct n_t) AS resultset
-		"""%(nodeId, varname)
-
-	results = tx.run(query)
-	for item in results: 
-		currentNodes = item['resultset'] 
-		for iteratorNode in currentNodes:
-			if iteratorNode['Type'] == 'BlockStatement': 
-				# the parameter 'varname' is a function argument
-
-				func_def_node = _get_function_def_of_block_stmt(iteratorNode) # check if func def has a varname parameter 
-				if func_def_node['Type'] == 'FunctionExpression' or func_def_node['Type'] == 'FunctionDeclaration':
-
-					match_signature = _check_if_function_has_param(varname, func_def_node)
-					if match_signature:
-						if context_scope == '':
-							out = ['%s = %s'%(varname, constantsModule.LOCAL_ARGUMENT_TAG_FOR_FUNC),
-								  [],
-								  [varname],
-								  iteratorNode['Location']]
-						else:
-							out = ['%s %s = %s'%(context_scope, varname, constantsModule.LOCAL_ARGUMENT_TAG_FOR_FUNC),
-								  [],
-								  [varname],
-								  iteratorNode['Location']]					
-						out_values.append(out)
-						
-						varname_values_within_call_expressions = _get_all_call_values_of(varname, func_def_node)
-						for nid in varname_values_within_call_expressions:
-							each_argument = varname_values_within_call_expressions[nid]
+	currentNodes = neo4jQueryUtilityModule.get_pdg_parents(tx, nodeId, varname, node_type='VariableDeclaration' if PDG_on_variable_declarations_only else None)
+	for iteratorNode in currentNodes:
+		if iteratorNode['Type'] == 'BlockStatement': 
+			# the parameter 'varname' is a function argument
 
-							location_line = _get_location_part(nid)
+			func_def_node = _get_function_def_of_block_stmt(iteratorNode) # check if func def has a varname parameter 
+			if func_def_node['Type'] == 'FunctionExpression' or func_def_node['Type'] == 'FunctionDeclaration':
 
-							if each_argument['Type'] == 'Literal':
-								if context_scope == '':
-									out = ['%s <--(invocation-value)-- \"%s\"'%(varname, each_argument['Value']),
-										  [each_argument['Value']],
-										  [varname],
-										  location_line]
-								else:
-									out = ['%s %s <--(invocation-value)-- \"%s\"'%(context_scope, varname, each_argument['Value']),
-										  [each_argument['Value']],
-										  [varname],
-										  location_line]
+				match_signature = _check_if_function_has_param(varname, func_def_node)
+				if match_signature:
+					if context_scope == '':
+						out = ['%s = %s'%(varname, constantsModule.LOCAL_ARGUMENT_TAG_FOR_FUNC),
+							  [],
+							  [varname],
+							  iteratorNode['Location']]
+					else:
+						out = ['%s %s = %s'%(context_scope, varname, constantsModule.LOCAL_ARGUMENT_TAG_FOR_FUNC),
+							  [],
+							  [varname],
+							  iteratorNode['Location']]					
+					out_values.append(out)
+						
+					varname_values_within_call_expressions = _get_all_call_values_of(varname, func_def_node)
+					for nid in varname_values_within_call_expressions:
+						each_argument = varname_values_within_call_expressions[nid]
+
+						location_line = _get_location_part(nid)
+
+						if each_argument['Type'] == 'Literal':
+							if context_scope == '':
+								out = ['%s <--(invocation-value)-- \"%s\"'%(varname, each_argument['Value']),
+									  [each_argument['Value']],
+									  [varname],
+									  location_line]
+							else:
+								out = ['%s %s <--(invocation-value)-- \"%s\"'%(context_scope, varname, each_argument['Value']),
+									  [each_argument['Value']],
+									  [varname],
+									  location_line]
 
-								out_values.append(out)
+							out_values.append(out)
 
-							elif each_argument['Type'] == 'Identifier':
+						elif each_argument['Type'] == 'Identifier':
 
-								call_expr_id = _get_node_id_part(nid)
-								# use this as an id to mark variables in this scope when doing def-use analsis
-								context_id_of_call_scope = '[scope-id=%s]'%call_expr_id  
+							call_expr_id = _get_node_id_part(nid)
+							# use this as an id to mark variables in this scope when doing def-use analsis
+							context_id_of_call_scope = '[scope-id=%s]'%call_expr_id  
 
-								if context_scope == '':
-									out = ['%s <--(invocation-value)-- [def-scope-id=%s] %s'%(varname, call_expr_id, each_argument['Value']),
+							if context_scope == '':
+								out = ['%s <--(invocation-value)-- [def-scope-id=%s] %s'%(varname, call_expr_id, each_argument['Value']),
+									  [],
+									  [varname, each_argument['Value']],
+									  location_line]
+							else:
+								out = ['%s %s <--(invocation-value)-- [def-scope-id=%s] %s'%(context_scope, varname, call_expr_id, each_argument['Value']),
 										  [],
 										  [varname, each_argument['Value']],
 										  location_line]
-								else:
-									out = ['%s %s <--(invocation-value)-- [def-scope-id=%s] %s'%(context_scope, varname, call_expr_id, each_argument['Value']),
-											  [],
-											  [varname, each_argument['Value']],
-											  location_line]
 
-								out_values.append(out)
+							out_values.append(out)
 
 								
-								top_level_of_call_expr = _get_non_anonymous_call_expr_top_node({'Id': call_expr_id})
-								recurse= getValueOfWithLocationChain(tx, each_argument['Value'], top_level_of_call_expr, context_scope=context_id_of_call_scope)
-								out_values.extend(recurse)
+							top_level_of_call_expr = _get_non_anonymous_call_expr_top_node({'Id': call_expr_id})
+							recurse= getValueOfWithLocationChain(tx, each_argument['Value'], top_level_of_call_expr, context_scope=context_id_of_call_scope)
+							out_values.extend(recurse)
 
-							elif each_argument['Type'] == 'MemberExpression':
+						elif each_argument['Type'] == 'MemberExpression':
 
-								call_expr_id = _get_node_id_part(nid)
-								context_id_of_call_scope = '[scope-id=%s]'%call_expr_id  
+							call_expr_id = _get_node_id_part(nid)
+							context_id_of_call_scope = '[scope-id=%s]'%call_expr_id  
 
-								if context_scope == '':
-									out = ['%s <--(invocation-value)-- [def-scope-id=%s] %s'%(varname, call_expr_id, each_argument['Value']),
+							if context_scope == '':
+								out = ['%s <--(invocation-value)-- [def-scope-id=%s] %s'%(varname, call_expr_id, each_argument['Value']),
+									  [],
+									  [varname, each_argument['Value']],
+									  location_line]
+							else:
+								out = ['%s %s <--(invocation-value)-- [def-scope-id=%s] %s'%(context_scope, varname, call_expr_id, each_argument['Value']),
 										  [],
 										  [varname, each_argument['Value']],
-										  location_line]
-								else:
-									out = ['%s %s <--(invocation-value)-- [def-scope-id=%s] %s'%(context_scope, varname, call_expr_id, each_argument['Value']),
-											  [],
-											  [varname, each_argument['Value']],
-											  location_line]						
-								out_values.append(out)	
-
-								# PDG on member expressions-> do PDG on the top most parent of it!
-								top_most = each_argument['Value'].split('.')[0]
-								call_expr_id = _get_node_id_part(nid)
-								top_level_of_call_expr = _get_non_anonymous_call_expr_top_node({'Id': call_expr_id})
-								recurse= getValueOfWithLocationChain(tx, top_most, top_level_of_call_expr, context_scope=context_id_of_call_scope)
-								out_values.extend(recurse)
-
-							elif each_argument['Type'] == 'ObjectExpression':
-								
-								call_expr_id = _get_node_id_part(nid)
-								context_id_of_call_scope = '[scope-id=%s]'%call_expr_id  
+										  location_line]						
+							out_values.append(out)	
 
-								if context_scope == '':
-									out = ['%s <--(invocation-value)-- [def-scope-id=%s] %s'%(varname, call_expr_id, each_argument['Value']),
+							# PDG on member expressions-> do PDG on the top most parent of it!
+							top_most = each_argument['Value'].split('.')[0]
+							call_expr_id = _get_node_id_part(nid)
+							top_level_of_call_expr = _get_non_anonymous_call_expr_top_node({'Id': call_expr_id})
+							recurse= getValueOfWithLocationChain(tx, top_most, top_level_of_call_expr, context_scope=context_id_of_call_scope)
+							out_values.extend(recurse)
+
+						elif each_argument['Type'] == 'ObjectExpression':
+								
+							call_expr_id = _get_node_id_part(nid)
+							context_id_of_call_scope = '[scope-id=%s]'%call_expr_id  
+
+							if context_scope == '':
+								out = ['%s <--(invocation-value)-- [def-scope-id=%s] %s'%(varname, call_expr_id, each_argument['Value']),
+									  [],
+									  [varname, each_argument['Value']],
+									  location_line]
+							else:
+								out = ['%s %s <--(invocation-value)-- [def-scope-id=%s] %s'%(context_scope, varname, call_expr_id, each_argument['Value']),
 										  [],
 										  [varname, each_argument['Value']],
 										  location_line]
-								else:
-									out = ['%s %s <--(invocation-value)-- [def-scope-id=%s] %s'%(context_scope, varname, call_expr_id, each_argument['Value']),
-											  [],
-											  [varname, each_argument['Value']],
-											  location_line]
 
-								out_values.append(out)	
+							out_values.append(out)	
 
-								additional_identifiers = each_argument['ResolveIdentifiers']
-								if additional_identifiers is not None:
-									for each_additional_identifier in additional_identifiers:
+							additional_identifiers = each_argument['ResolveIdentifiers']
+							if additional_identifiers is not None:
+								for each_additional_identifier in additional_identifiers:
 										
-										top_level_of_call_expr = _get_non_anonymous_call_expr_top_node({'Id': call_expr_id})
-										recurse= getValueOfWithLocationChain(tx, each_additional_identifier, top_level_of_call_expr, context_scope=context_id_of_call_scope)
-										out_values.extend(recurse)	
-
-
-							else: 
-								# expression statements, call expressions (window.location.replace(), etc)
-								if context_scope == '':
-									out = ['%s <--(invocation-value)-- %s'%(varname, each_argument['Value']),
-										  [],
-										  [varname, each_argument['Value']],
-										  location_line]
+									top_level_of_call_expr = _get_non_anonymous_call_expr_top_node({'Id': call_expr_id})
+									recurse= getValueOfWithLocationChain(tx, each_additional_identifier, top_level_of_call_expr, context_scope=context_id_of_call_scope)
+									out_values.extend(recurse)	
+
+
+						else: 
+							# expression statements, call expressions (window.location.replace(), etc)
+							if context_scope == '':
+								out = ['%s <--(invocation-value)-- %s'%(varname, each_argument['Value']),
+									  [],
+									  [varname, each_argument['Value']],
+									  location_line]
 									
-								else:
-									out = ['%s %s <--(invocation-value)-- %s'%(context_scope, varname, each_argument['Value']),
+							else:
+								out = ['%s %s <--(invocation-value)-- %s'%(context_scope, varname, each_argument['Value']),
+									  [],
+									  [varname, each_argument['Value']],
+									  location_line]
+
+							out_values.append(out)				
+
+
+							## check if further PDG analysis is required for these identifiers (e.g., arguments of call expressions)
+							# call_expr_id = _get_node_id_part(nid)
+							# context_id_of_call_scope = '[scope-id=%s]'%call_expr_id  
+							# additional_identifiers = each_argument['ResolveIdentifiers']
+							# for each_additional_identifier in additional_identifiers:
+							# 	top_level_of_call_expr = _get_non_anonymous_call_expr_top_node({'Id': call_expr_id})
+							# 	recurse= getValueOfWithLocationChain(tx, each_additional_identifier, top_level_of_call_expr, context_scope=context_id_of_call_scope)
+							# 	out_values.extend(recurse)	
+
+
+						# ThisExpression Pointer Analysis
+						# NOTE: this code block must be executed for ALL branches, so we have to place it outside of all conditional branches
+						additional_identifiers = each_argument['ResolveIdentifiers']
+						if additional_identifiers is not None:
+							if 'ThisExpression' in additional_identifiers:
+								this_expression_node_id = additional_identifiers['ThisExpression']
+								pointer_resolutions = getThisPointerResolution(tx, {'Id': this_expression_node_id })
+								for item in pointer_resolutions['methods']:
+									owner_item = item['owner']
+									owner_top = item['top']
+									tree_owner = getChildsOf(tx, owner_item)
+									tree_owner_exp = getAdvancedCodeExpression(tree_owner)[0]
+									location_line = owner_item['Location']
+									out_line = '%s this --(points-to)--> %s [this-nid: %s]'%(context_scope,tree_owner_exp, this_expression_node_id)
+									out = [out_line.lstrip(),
 										  [],
-										  [varname, each_argument['Value']],
+										  [tree_owner_exp[0]],
 										  location_line]
-
-								out_values.append(out)				
-
-
-								## check if further PDG analysis is required for these identifiers (e.g., arguments of call expressions)
-								# call_expr_id = _get_node_id_part(nid)
-								# context_id_of_call_scope = '[scope-id=%s]'%call_expr_id  
-								# additional_identifiers = each_argument['ResolveIdentifiers']
-								# for each_additional_identifier in additional_identifiers:
-								# 	top_level_of_call_expr = _get_non_anonymous_call_expr_top_node({'Id': call_expr_id})
-								# 	recurse= getValueOfWithLocationChain(tx, each_additional_identifier, top_level_of_call_expr, context_scope=context_id_of_call_scope)
-								# 	out_values.extend(recurse)	
-
-
-							# ThisExpression Pointer Analysis
-							# NOTE: this code block must be executed for ALL branches, so we have to place it outside of all conditional branches
-							additional_identifiers = each_argument['ResolveIdentifiers']
-							if additional_identifiers is not None:
-								if 'ThisExpression' in additional_identifiers:
-									this_expression_node_id = additional_identifiers['ThisExpression']
-									pointer_resolutions = getThisPointerResolution(tx, {'Id': this_expression_node_id })
-									for item in pointer_resolutions['methods']:
-										owner_item = item['owner']
-										owner_top = item['top']
-										tree_owner = getChildsOf(tx, owner_item)
-										tree_owner_exp = getAdvancedCodeExpression(tree_owner)[0]
-										location_line = owner_item['Location']
-										out_line = '%s this --(points-to)--> %s [this-nid: %s]'%(context_scope,tree_owner_exp, this_expression_node_id)
-										out = [out_line.lstrip(),
-											  [],
-											  [tree_owner_exp[0]],
-											  location_line]
-										out_values.append(out)
-
-										# def-use analysis over resolved `this` pointer
-										if owner_item != '' and owner_item is not None and owner_item!= constantsModule.WINDOW_GLOBAL_OBJECT and owner_item['Type'] == 'Identifier':
-											recurse_values = getValueOfWithLocationChain(tx, tree_owner_exp, owner_top, PDG_on_variable_declarations_only=True)
-											out_values.extend(recurse_values)
-
-
-									# handle `this` that resolves to DOM elements in events 
-									for element in pointer_resolutions['events']:
-										if 'relation' in element:
-											# fetched via analysis
-											item = element['relation']
-											target_node_id = item['Arguments'].split('___')[1]
-											if target_node_id == 'xx': 
-												continue
-											else:
-												tree_owner = getChildsOf({'Id': target_node_id})
-												tree_owner_exp = getAdvancedCodeExpression(tree_owner)
-												location_line = tree_owner['Location']
-												out_line = '%s this --(points-to)--> %s [this-nid: %s]'%(context_scope, tree_owner_exp, this_expression_node_id)
-												out = [out_line.lstrip(),
-													  [],
-													  [tree_owner_exp],
-													  location_line]
-												out_values.append(out) 
+									out_values.append(out)
+
+									# def-use analysis over resolved `this` pointer
+									if owner_item != '' and owner_item is not None and owner_item!= constantsModule.WINDOW_GLOBAL_OBJECT and owner_item['Type'] == 'Identifier':
+										recurse_values = getValueOfWithLocationChain(tx, tree_owner_exp, owner_top, PDG_on_variable_declarations_only=True)
+										out_values.extend(recurse_values)
+
+
+								# handle `this` that resolves to DOM elements in events 
+								for element in pointer_resolutions['events']:
+									if 'relation' in element:
+										# fetched via analysis
+										item = element['relation']
+										target_node_id = item['Arguments'].split('___')[1]
+										if target_node_id == 'xx': 
+											continue
 										else:
-											# fetched from DB
-											item = element['owner']
-											target_node_id = item['Id']		
 											tree_owner = getChildsOf({'Id': target_node_id})
 											tree_owner_exp = getAdvancedCodeExpression(tree_owner)
 											location_line = tree_owner['Location']
@@ -2025,69 +1977,69 @@ def getValueOfWithLocationChain(tx, varname, rootContextNode, recurse_counter=0,
 												  [],
 												  [tree_owner_exp],
 												  location_line]
-											out_values.append(out) 				
-
+											out_values.append(out) 
+									else:
+										# fetched from DB
+										item = element['owner']
+										target_node_id = item['Id']		
+										tree_owner = getChildsOf({'Id': target_node_id})
+										tree_owner_exp = getAdvancedCodeExpression(tree_owner)
+										location_line = tree_owner['Location']
+										out_line = '%s this --(points-to)--> %s [this-nid: %s]'%(context_scope, tree_owner_exp, this_expression_node_id)
+										out = [out_line.lstrip(),
+											  [],
+											  [tree_owner_exp],
+											  location_line]
+										out_values.append(out) 				
 
-				continue
 
+			continue
 
-			tree = getChildsOf(tx, iteratorNode)
-			contextNode = tree['node']
-			if contextNode['Id'] == constantsModule.PROGRAM_NODE_INDEX: 
-				continue
-			ex = getAdvancedCodeExpression(tree)
-			loc = iteratorNode['Location']
-			[code_expr, literals, idents] = ex
-			if context_scope != '':
-				code_expr = context_scope + '  ' + code_expr 
-			out_values.append([code_expr, literals, idents, loc])
-			new_varnames = _get_unique_list(list(idents))
-
-			# handle `this` expressions
-			if 'ThisExpression' in new_varnames:
-				this_expression_node_id = idents['ThisExpression']
-				pointer_resolutions = getThisPointerResolution(tx, {'Id': this_expression_node_id })
-				for item in pointer_resolutions['methods']:
-					owner_item = item['owner']
-					owner_top = item['top']
-					tree_owner = getChildsOf(tx, owner_item)
-					tree_owner_exp = getAdvancedCodeExpression(tree_owner)[0]
-					location_line = owner_item['Location']
-					out_line = '%s this --(points-to)--> %s [this-nid: %s]'%(context_scope, tree_owner_exp, this_expression_node_id)
-					out = [out_line.lstrip(),
-						  [],
-						  [tree_owner_exp[0]],
-						  location_line]
-					out_values.append(out)
 
-					# def-use analysis over resolved `this` pointer
-					if owner_item != '' and owner_item is not None and owner_item!= constantsModule.WINDOW_GLOBAL_OBJECT and owner_item['Type'] == 'Identifier':
-						recurse_values = getValueOfWithLocationChain(tx, tree_owner_exp, owner_top, PDG_on_variable_declarations_only=True)
-						out_values.extend(recurse_values)
-
-
-				# handle `this` that resolves to DOM elements in events 
-				for element in pointer_resolutions['events']:
-					if 'relation' in element:
-						# fetched via analysis
-						item = element['relation']
-						target_node_id = item['Arguments'].split('___')[1]
-						if target_node_id == 'xx': 
-							continue
-						else:
-							tree_owner = getChildsOf({'Id': target_node_id})
-							tree_owner_exp = getAdvancedCodeExpression(tree_owner)
-							location_line = tree_owner['Location']
-							out_line = '%s this --(points-to)--> %s [this-nid: %s]'%(context_scope, tree_owner_exp, this_expression_node_id)
-							out = [out_line.lstrip(),
-								  [],
-								  [tree_owner_exp],
-								  location_line]
-							out_values.append(out) 
+		tree = getChildsOf(tx, iteratorNode)
+		contextNode = tree['node']
+		if contextNode['Id'] == constantsModule.PROGRAM_NODE_INDEX: 
+			continue
+		ex = getAdvancedCodeExpression(tree)
+		loc = iteratorNode['Location']
+		[code_expr, literals, idents] = ex
+		if context_scope != '':
+			code_expr = context_scope + '  ' + code_expr 
+		out_values.append([code_expr, literals, idents, loc])
+		new_varnames = _get_unique_list(list(idents))
+
+		# handle `this` expressions
+		if 'ThisExpression' in new_varnames:
+			this_expression_node_id = idents['ThisExpression']
+			pointer_resolutions = getThisPointerResolution(tx, {'Id': this_expression_node_id })
+			for item in pointer_resolutions['methods']:
+				owner_item = item['owner']
+				owner_top = item['top']
+				tree_owner = getChildsOf(tx, owner_item)
+				tree_owner_exp = getAdvancedCodeExpression(tree_owner)[0]
+				location_line = owner_item['Location']
+				out_line = '%s this --(points-to)--> %s [this-nid: %s]'%(context_scope, tree_owner_exp, this_expression_node_id)
+				out = [out_line.lstrip(),
+					  [],
+					  [tree_owner_exp[0]],
+					  location_line]
+				out_values.append(out)
+
+				# def-use analysis over resolved `this` pointer
+				if owner_item != '' and owner_item is not None and owner_item!= constantsModule.WINDOW_GLOBAL_OBJECT and owner_item['Type'] == 'Identifier':
+					recurse_values = getValueOfWithLocationChain(tx, tree_owner_exp, owner_top, PDG_on_variable_declarations_only=True)
+					out_values.extend(recurse_values)
+
+
+			# handle `this` that resolves to DOM elements in events 
+			for element in pointer_resolutions['events']:
+				if 'relation' in element:
+					# fetched via analysis
+					item = element['relation']
+					target_node_id = item['Arguments'].split('___')[1]
+					if target_node_id == 'xx': 
+						continue
 					else:
-						# fetched from DB
-						item = element['owner']
-						target_node_id = item['Id']		
 						tree_owner = getChildsOf({'Id': target_node_id})
 						tree_owner_exp = getAdvancedCodeExpression(tree_owner)
 						location_line = tree_owner['Location']
@@ -2097,43 +2049,56 @@ def getValueOfWithLocationChain(tx, varname, rootContextNode, recurse_counter=0,
 							  [tree_owner_exp],
 							  location_line]
 						out_values.append(out) 
+				else:
+					# fetched from DB
+					item = element['owner']
+					target_node_id = item['Id']		
+					tree_owner = getChildsOf({'Id': target_node_id})
+					tree_owner_exp = getAdvancedCodeExpression(tree_owner)
+					location_line = tree_owner['Location']
+					out_line = '%s this --(points-to)--> %s [this-nid: %s]'%(context_scope, tree_owner_exp, this_expression_node_id)
+					out = [out_line.lstrip(),
+						  [],
+						  [tree_owner_exp],
+						  location_line]
+					out_values.append(out) 
+
+
+		# main recursion flow
+		for new_varname in new_varnames:
+			if new_varname == varname or new_varname in constantsModule.JS_DEFINED_VARS: continue
+
+			# check if new_varname is a function call
+			# i.e., it has a `callee` relation to a parent of type `CallExpression`
+			new_varname_id = idents[new_varname]
+			check_function_call_query="""
+			MATCH (n { Id: $id })<-[:AST_parentOf {RelationType: 'callee'}]-(fn_call {Type: 'CallExpression'})-[:CG_parentOf]->(call_definition)
+			RETURN call_definition
+			"""
+			call_definition_result = tx.run(check_function_call_query, id=new_varname_id)
+			is_func_call = False
+			for definition in call_definition_result:
+				item = definition['call_definition']
+				if item is not None:
+					is_func_call = True
+					wrapper_node_function_definition = getChildsOf(tx, item)
+					ce_function_definition = getAdvancedCodeExpression(wrapper_node_function_definition)
+					location_function_definition = item['Location']
+					body = ce_function_definition[0]
+					body = jsbeautifier.beautify(body)
+					out_line = """%s %s\n\t\t\t %s"""%(context_scope, constantsModule.FUNCTION_CALL_DEFINITION_BODY, body)
+					out = [out_line.strip(),
+						  [],
+						  [],
+						  location_function_definition]
+					if out not in out_values:
+						# avoid returning/printing twice
+						out_values.append(out)
 
-
-			# main recursion flow
-			for new_varname in new_varnames:
-				if new_varname == varname or new_varname in constantsModule.JS_DEFINED_VARS: continue
-
-				# check if new_varname is a function call
-				# i.e., it has a `callee` relation to a parent of type `CallExpression`
-				new_varname_id = idents[new_varname]
-				check_function_call_query="""
-				MATCH (n { Id: '%s' })<-[:AST_parentOf {RelationType: 'callee'}]-(fn_call {Type: 'CallExpression'})-[:CG_parentOf]->(call_definition)
-				RETURN call_definition
-				"""%(new_varname_id)
-				call_definition_result = tx.run(check_function_call_query)
-				is_func_call = False
-				for definition in call_definition_result:
-					item = definition['call_definition']
-					if item is not None:
-						is_func_call = True
-						wrapper_node_function_definition = getChildsOf(tx, item)
-						ce_function_definition = getAdvancedCodeExpression(wrapper_node_function_definition)
-						location_function_definition = item['Location']
-						body = ce_function_definition[0]
-						body = jsbeautifier.beautify(body)
-						out_line = """%s %s\n\t\t\t %s"""%(context_scope, constantsModule.FUNCTION_CALL_DEFINITION_BODY, body)
-						out = [out_line.strip(),
-							  [],
-							  [],
-							  location_function_definition]
-						if out not in out_values:
-							# avoid returning/printing twice
-							out_values.append(out)
-
-				if is_func_call:
-					continue
-				v = getValueOfWithLocationChain(tx, new_varname, contextNode, context_scope = context_scope)
-				out_values.extend(v)	
+			if is_func_call:
+				continue
+			v = getValueOfWithLocationChain(tx, new_varname, contextNode, context_scope = context_scope)
+			out_values.extend(v)	
 
 
 
@@ -2166,14 +2131,14 @@ def do_reachability_analysis(tx, node, input_is_top=False):
 		top_expression = neo4jQueryUtilityModule.get_ast_topmost(tx, {'Id': node_id})
 	
 	query = """
-	MATCH (n { Id: '%s'})<-[:CFG_parentOf*]-(block_node)
+	MATCH (n { Id: $id})<-[:CFG_parentOf*]-(block_node)
 	WHERE block_node.Type = 'Program' OR block_node.Type = 'BlockStatement'
 	OPTIONAL MATCH (block_node)<-[:AST_parentOf {RelationType: 'body'}]-(function_expr {Type: 'FunctionExpression'})
 	OPTIONAL MATCH (function_expr)-[:AST_parentOf {RelationType: 'id'}]->(function_def_id {Type: 'Identifier'})
 	RETURN block_node, function_expr, function_def_id
-	"""%(top_expression['Id'])
+	"""
 	
-	results = tx.run(query)
+	results = tx.run(query, id=top_expression['Id'])
 	for element in results:
 		block_node = element['block_node']
 		function_expr = element['function_expr']
@@ -2184,10 +2149,10 @@ def do_reachability_analysis(tx, node, input_is_top=False):
 			if function_def_id is not None:
 				# search for all locations where this `FunctionDefiniton` is called
 				query1="""
-				MATCH (call_expr {Type: 'CallExpression'})-[:AST_parentOf]->(callee { Type: 'Identifier', Code: '%s'})
+				MATCH (call_expr {Type: 'CallExpression'})-[:AST_parentOf]->(callee { Type: 'Identifier', Code: $name})
 				RETURN call_expr
-				"""%(function_def_id['Code'])
-				results1 = tx.run(query1)
+				"""
+				results1 = tx.run(query1, name=function_def_id['Code'])
 				for element1 in results1:
 					call_expr = element1['call_expr']
 					tag = do_reachability_analysis(tx, call_expr)
@@ -2196,10 +2161,10 @@ def do_reachability_analysis(tx, node, input_is_top=False):
 
 				 # case 2: func name is used later in an event handler, e.g, YAHOO.util.Event.onContentReady('ajaxUI-history-field', SUGAR.ajaxUI.firstLoad);
 				query2="""
-				MATCH (callee { Type: 'Identifier', Code: '%s'})<-[:AST_parentOf*1..6]-(call_expr {Type: 'CallExpression'})
+				MATCH (callee { Type: 'Identifier', Code: $name})<-[:AST_parentOf*1..6]-(call_expr {Type: 'CallExpression'})
 				RETURN call_expr
-				"""%(function_def_id['Code'])
-				results2 = tx.run(query2)
+				"""
+				results2 = tx.run(query2, name=function_def_id['Code'])
 				output_event_registrators = []
 				for element2 in results2:
 					call_expr = element2['call_expr']
@@ -2217,10 +2182,10 @@ def do_reachability_analysis(tx, node, input_is_top=False):
 
 				# 1) function expression is an argument of an event handler registrator
 				query3="""
-				MATCH (callee { Id: '%s'})<-[:AST_parentOf*1..6]-(call_expr {Type: 'CallExpression'})
+				MATCH (callee { Id: $id})<-[:AST_parentOf*1..6]-(call_expr {Type: 'CallExpression'})
 				RETURN call_expr
-				"""%(function_expr['Id'])
-				results3 = tx.run(query3)
+				"""
+				results3 = tx.run(query3, id=function_expr['Id'])
 				output_event_registrators = []
 				for element3 in results3:
 					call_expr = element3['call_expr']
@@ -2233,14 +2198,14 @@ def do_reachability_analysis(tx, node, input_is_top=False):
 				# 2) function expression is in an object expression
 				# @Note: for member expressions, we find all objects with the same pointer name in call expressions (consider all potential cases, but may end in false positive)
 				query4="""
-				MATCH (func_expr { Id: '%s'})<-[:AST_parentOf {RelationType: 'value'}]-(prop {Type: 'Property'})<-[:AST_parentOf {RelationType: 'properties'}]-(obj_expr {Type: 'ObjectExpression'})<-[:AST_parentOf]-(t)<-[:AST_parentOf]-(tt)
+				MATCH (func_expr { Id: $id})<-[:AST_parentOf {RelationType: 'value'}]-(prop {Type: 'Property'})<-[:AST_parentOf {RelationType: 'properties'}]-(obj_expr {Type: 'ObjectExpression'})<-[:AST_parentOf]-(t)<-[:AST_parentOf]-(tt)
 				OPTIONAL MATCH (t)-[r:AST_parentOf]->(c1_name {Type: 'Identifier'}) 
 				WHERE r.RelationType='left' or r.RelationType='id'
 				OPTIONAL MATCH (t)-[r:AST_parentOf]->(c2_member_expr {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'property'}]->(c2_name {Type: 'Identifier'}) 
 				WHERE r.RelationType='left' or r.RelationType='id'
 				RETURN tt, c1_name, c2_name
 				"""
-				results4 = tx.run(query4)
+				results4 = tx.run(query4, id=function_expr['Id'])
 				for element4 in results4:
 					top_expr = element4 ['tt']
 					function_name = element4['c1_name']
@@ -2250,10 +2215,10 @@ def do_reachability_analysis(tx, node, input_is_top=False):
 						continue
 
 					query5="""
-					MATCH (callee { Type: 'Identifier', Code: '%s'})<-[:AST_parentOf*1..8]-(call_expr {Type: 'CallExpression'})
+					MATCH (callee { Type: 'Identifier', Code: $name})<-[:AST_parentOf*1..8]-(call_expr {Type: 'CallExpression'})
 					RETURN call_expr
-					"""%(function_name['Code'])
-					results5= tx.run(query5)
+					"""
+					results5= tx.run(query5, name=function_name['Code'])
 					for element5 in results5:
 						call_expr = element5['call_expr']
 						tag = do_reachability_analysis(tx, call_expr)
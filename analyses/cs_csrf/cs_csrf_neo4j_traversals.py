@@ -31,6 +31,7 @@ import sys
 import time
 import constants as constantsModule
 import utils.io as IOModule
+import utils.compression as compressionModule
 import docker.neo4j.manage_container as dockerModule
 import hpg_neo4j.db_utility as neo4jDatabaseUtilityModule
 import hpg_neo4j.query_utility as neo4jQueryUtilityModule
@@ -93,14 +94,11 @@ def build_and_analyze_hpg(seed_url):
 		webpage = os.path.join(webapp_data_directory, each_webpage)
 		logger.warning('HPG for: %s'%(webpage))
 
-		# de-compress the hpg 
-		IOModule.decompress_graph(webpage)
-
 		# import the CSV files into an active neo4j database inside a docker container
 		if build:
-			nodes_file = os.path.join(webpage, constantsModule.NODE_INPUT_FILE_NAME)
-			rels_file =  os.path.join(webpage, constantsModule.RELS_INPUT_FILE_NAME)
-			if not (os.path.exists(nodes_file) and os.path.exists(rels_file)):
+			# plain, .gz or .zst files
+			[nodes_file, rels_file, rels_dynamic_file] = IOModule.get_graph_files(webpage)
+			if nodes_file is None or rels_file is None:
 				logger.error('The HPG nodes.csv / rels.csv files do not exist in the provided folder, skipping...')
 				continue
 			
@@ -118,7 +116,7 @@ def build_and_analyze_hpg(seed_url):
 				time.sleep(5)
 
 			logger.info('importing data inside container.')
-			dockerModule.import_data_inside_container(container_name, database_name, relative_import_path, 'CSV')
+			dockerModule.import_graph_inside_container(container_name, database_name, relative_import_path, webpage)
 			logger.info('waiting for the tcp port 7474 of the neo4j container to be ready...')
 			connection_success = neo4jDatabaseUtilityModule.wait_for_neo4j_bolt_connection(timeout=150)
 			if not connection_success:
@@ -130,11 +128,12 @@ def build_and_analyze_hpg(seed_url):
 			if not connection_success:
 				sys.exit(1)
 
-		# compress the hpg after the model import
-		IOModule.compress_graph(webpage)
+		# compress the hpg files that are still plain
+		compressionModule.compress_graph(webpage)
 
 		# step3: run the vulnerability detection queries
 		if query:
+			neo4jDatabaseUtilityModule.create_hpg_indexes()
 			navigation_url = get_url_for_webpage(webpage)
 			neo4jDatabaseUtilityModule.exec_fn_within_transaction(CSRFTraversalsModule.run_traversals, navigation_url, webpage, each_webpage)
 
@@ -71,11 +71,11 @@ def get_ast_parent(tx, node):
 	"""
 
 	query = """
-	MATCH (parent)-[:AST_parentOf]->(child {Id: '%s'})
+	MATCH (parent)-[:AST_parentOf]->(child {Id: $id})
 	RETURN parent
-	"""%(node['Id'])
+	"""
 
-	results = tx.run(query)
+	results = tx.run(query, id=node['Id'])
 	for record in results:
 		child = record['parent']
 		return child
@@ -92,11 +92,11 @@ def get_node_by_id(tx, node_id):
 	"""
 
 	query = """
-	MATCH (n {Id: '%s'})
+	MATCH (n {Id: $id})
 	RETURN n
-	"""%(node_id)
+	"""
 
-	results = tx.run(query)
+	results = tx.run(query, id=node_id)
 	for record in results:
 		n = record['n']
 		return n
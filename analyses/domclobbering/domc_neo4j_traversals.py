@@ -31,6 +31,7 @@ import sys
 import time
 import constants as constantsModule
 import utils.io as IOModule
+import utils.compression as compressionModule
 from utils.logging import logger
 
 import analyses.domclobbering.domc_cypher_queries as DOMCTraversalsModule
@@ -89,9 +90,6 @@ def build_and_analyze_hpg(seed_url):
 	database_name = 'neo4j'  
 	container_name = 'neo4j_container_'
 
-	# de-compress the hpg 
-	IOModule.decompress_graph(webpage)
-
 	for each_webpage in webapp_pages:
 
 		relative_import_path = os.path.join(webapp_folder_name, each_webpage)
@@ -102,9 +100,9 @@ def build_and_analyze_hpg(seed_url):
 
 		# import the CSV files into an active neo4j database inside a docker container
 		if build:
-			nodes_file = os.path.join(webpage, constantsModule.NODE_INPUT_FILE_NAME)
-			rels_file =  os.path.join(webpage, constantsModule.RELS_INPUT_FILE_NAME)
-			if not (os.path.exists(nodes_file) and os.path.exists(rels_file)):
+			# plain, .gz or .zst files
+			[nodes_file, rels_file, rels_dynamic_file] = IOModule.get_graph_files(webpage)
+			if nodes_file is None or rels_file is None:
 				logger.error('The HPG nodes.csv / rels.csv files do not exist in the provided folder, skipping...')
 				continue
 			
@@ -122,7 +120,7 @@ def build_and_analyze_hpg(seed_url):
 				time.sleep(5)
 
 			logger.info('importing data inside container.')
-			dockerModule.import_data_inside_container(container_name, database_name, relative_import_path, 'CSV')
+			dockerModule.import_graph_inside_container(container_name, database_name, relative_import_path, webpage)
 			logger.info('waiting for the tcp port 7474 of the neo4j container to be ready...')
 			connection_success = neo4jDatabaseUtilityModule.wait_for_neo4j_bolt_connection(timeout=150)
 			if not connection_success:
@@ -135,12 +133,13 @@ def build_and_analyze_hpg(seed_url):
 				sys.exit(1)
 
 
-		# compress the hpg after the model import
-		IOModule.compress_graph(webpage)
+		# compress the hpg files that are still plain
+		compressionModule.compress_graph(webpage)
 
 
 		# step3: run the vulnerability detection queries
 		if query:
+			neo4jDatabaseUtilityModule.create_hpg_indexes()
 			neo4jDatabaseUtilityModule.exec_fn_within_transaction(DOMCTraversalsModule.run_traversals, webpage)
 
 
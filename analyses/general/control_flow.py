@@ -44,14 +44,14 @@ def do_reachability_analysis(tx, node, input_is_top=False):
 		top_expression = QU.get_ast_topmost(tx, {'Id': node['Id']})
 	
 	query = """
-	MATCH (n { Id: '%s'})<-[:CFG_parentOf*]-(block_node)
+	MATCH (n { Id: $id})<-[:CFG_parentOf*]-(block_node)
 	WHERE block_node.Type = 'Program' OR block_node.Type = 'BlockStatement'
 	OPTIONAL MATCH (block_node)<-[:AST_parentOf {RelationType: 'body'}]-(function_expr {Type: 'FunctionExpression'})
 	OPTIONAL MATCH (function_expr)-[:AST_parentOf {RelationType: 'id'}]->(function_def_id {Type: 'Identifier'})
 	RETURN block_node, function_expr, function_def_id
-	"""%(top_expression['Id'])
+	"""
 	
-	results = tx.run(query)
+	results = tx.run(query, id=top_expression['Id'])
 	for element in results:
 		block_node = element['block_node']
 		function_expr = element['function_expr']
@@ -62,10 +62,10 @@ def do_reachability_analysis(tx, node, input_is_top=False):
 			if function_def_id is not None:
 				# search for all locations where this `FunctionDefiniton` is called
 				query1="""
-				MATCH (call_expr {Type: 'CallExpression'})-[:AST_parentOf]->(callee { Type: 'Identifier', Code: '%s'})
+				MATCH (call_expr {Type: 'CallExpression'})-[:AST_parentOf]->(callee { Type: 'Identifier', Code: $name})
 				RETURN call_expr
-				"""%(function_def_id['Code'])
-				results1 = tx.run(query1)
+				"""
+				results1 = tx.run(query1, name=function_def_id['Code'])
 				for element1 in results1:
 					call_expr = element1['call_expr']
 					tag = do_reachability_analysis(tx, call_expr)
@@ -74,10 +74,10 @@ def do_reachability_analysis(tx, node, input_is_top=False):
 
 				 # case 2: func name is used later in an event handler, e.g, YAHOO.util.Event.onContentReady('ajaxUI-history-field', SUGAR.ajaxUI.firstLoad);
 				query2="""
-				MATCH (callee { Type: 'Identifier', Code: '%s'})<-[:AST_parentOf*1..6]-(call_expr {Type: 'CallExpression'})
+				MATCH (callee { Type: 'Identifier', Code: $name})<-[:AST_parentOf*1..6]-(call_expr {Type: 'CallExpression'})
 				RETURN call_expr
-				"""%(function_def_id['Code'])
-				results2 = tx.run(query2)
+				"""
+				results2 = tx.run(query2, name=function_def_id['Code'])
 				output_event_registrators = []
 				for element2 in results2:
 					call_expr = element2['call_expr']
@@ -95,10 +95,10 @@ def do_reachability_analysis(tx, node, input_is_top=False):
 
 				# 1) function expression is an argument of an event handler registrator
 				query3="""
-				MATCH (callee { Id: '%s'})<-[:AST_parentOf*1..6]-(call_expr {Type: 'CallExpression'})
+				MATCH (callee { Id: $id})<-[:AST_parentOf*1..6]-(call_expr {Type: 'CallExpression'})
 				RETURN call_expr
-				"""%(function_expr['Id'])
-				results3 = tx.run(query3)
+				"""
+				results3 = tx.run(query3, id=function_expr['Id'])
 				output_event_registrators = []
 				for element3 in results3:
 					call_expr = element3['call_expr']
@@ -111,14 +111,14 @@ def do_reachability_analysis(tx, node, input_is_top=False):
 				# 2) function expression is in an object expression
 				# @Note: for member expressions, we find all objects with the same pointer name in call expressions (consider all potential cases, but may end in false positive)
 				query4="""
-				MATCH (func_expr { Id: '%s'})<-[:AST_parentOf {RelationType: 'value'}]-(prop {Type: 'Property'})<-[:AST_parentOf {RelationType: 'properties'}]-(obj_expr {Type: 'ObjectExpression'})<-[:AST_parentOf]-(t)<-[:AST_parentOf]-(tt)
+				MATCH (func_expr { Id: $id})<-[:AST_parentOf {RelationType: 'value'}]-(prop {Type: 'Property'})<-[:AST_parentOf {RelationType: 'properties'}]-(obj_expr {Type: 'ObjectExpression'})<-[:AST_parentOf]-(t)<-[:AST_parentOf]-(tt)
 				OPTIONAL MATCH (t)-[r:AST_parentOf]->(c1_name {Type: 'Identifier'}) 
 				WHERE r.RelationType='left' or r.RelationType='id'
 				OPTIONAL MATCH (t)-[r:AST_parentOf]->(c2_member_expr {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'property'}]->(c2_name {Type: 'Identifier'}) 
 				WHERE r.RelationType='left' or r.RelationType='id'
 				RETURN tt, c1_name, c2_name
 				"""
-				results4 = tx.run(query4)
+				results4 = tx.run(query4, id=function_expr['Id'])
 				for element4 in results4:
 					top_expr = element4 ['tt']
 					function_name = element4['c1_name']
@@ -128,10 +128,10 @@ def do_reachability_analysis(tx, node, input_is_top=False):
 						continue
 
 					query5="""
-					MATCH (callee { Type: 'Identifier', Code: '%s'})<-[:AST_parentOf*1..8]-(call_expr {Type: 'CallExpression'})
+					MATCH (callee { Type: 'Identifier', Code: $name})<-[:AST_parentOf*1..8]-(call_expr {Type: 'CallExpression'})
 					RETURN call_expr
-					"""%(function_name['Code'])
-					results5= tx.run(query5)
+					"""
+					results5= tx.run(query5, name=function_name['Code'])
 					for element5 in results5:
 						call_expr = element5['call_expr']
 						tag = do_reachability_analysis(tx, call_expr)
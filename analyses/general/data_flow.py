@@ -30,11 +30,13 @@
 
 import hpg_neo4j.query_utility as QU
 import hpg_neo4j.db_utility as DU
+import hpg_neo4j.graph_cache as graph_cache
+from hpg_neo4j.in_memory_graph import is_in_memory_graph
 import constants as constantsModule
 import neomodel
 import jsbeautifier
-import functools
 import json
+import copy
 
 ## ------------------------------------------------------------------------------- ## 
 ## Utility Functions
@@ -177,12 +179,15 @@ def get_this_pointer_resolution(tx, this_node):
 	this_expression_node_id = this_node['Id']
 	out = {'events':[], 'methods': []}
 
+	if is_in_memory_graph(tx):
+		return tx.get_this_pointer_resolution(this_expression_node_id)
+
 	###  STEP 1: inspect if pointer-analysis is already done and is in DB
 	pointer_query="""
-	MATCH (this_node { Id: '%s'})-[:pointsTo {RelationType: 'top', Arguments: 'pointsTo=window'}]->(top_node)
+	MATCH (this_node:ASTNode { Id: $id})-[:pointsTo {RelationType: 'top', Arguments: 'pointsTo=window'}]->(top_node)
 	return top_node as top
-	"""%(this_expression_node_id)
-	results = tx.run(pointer_query)
+	"""
+	results = tx.run(pointer_query, id=this_expression_node_id)
 
 	shouldTerminate = False
 	for item in results:
@@ -194,11 +199,11 @@ def get_this_pointer_resolution(tx, this_node):
 		return out
 
 	pointer_query="""
-	MATCH (this_node { Id: '%s'})-[:pointsTo {RelationType: 'top'}]->(top_node),
-	(this_node { Id: '%s'})-[:pointsTo {RelationType: 'owner'}]->(owner_node)
+	MATCH (this_node:ASTNode { Id: $id})-[:pointsTo {RelationType: 'top'}]->(top_node),
+	(this_node:ASTNode { Id: $id})-[:pointsTo {RelationType: 'owner'}]->(owner_node)
 	return top_node as top, owner_node as owner
-	"""%(this_expression_node_id, this_expression_node_id)
-	results = tx.run(pointer_query)
+	"""
+	results = tx.run(pointer_query, id=this_expression_node_id)
 	for item in results:
 		top = item['top']
 		owner = item['owner']
@@ -208,10 +213,10 @@ def get_this_pointer_resolution(tx, this_node):
 		return out
 
 	pointer_query="""
-	MATCH (this_node { Id: '%s'})-[:pointsTo {RelationType: 'owner', Arguments: 'pointsTo=eventSelector'}]->(owner_node)
+	MATCH (this_node:ASTNode { Id: $id})-[:pointsTo {RelationType: 'owner', Arguments: 'pointsTo=eventSelector'}]->(owner_node)
 	return owner_node as owner
-	"""%(this_expression_node_id)
-	results = tx.run(pointer_query)
+	"""
+	results = tx.run(pointer_query, id=this_expression_node_id)
 	for item in results:
 		owner = item['owner']
 		out['events'].append({'owner': owner})
@@ -225,10 +230,10 @@ def get_this_pointer_resolution(tx, this_node):
 
 	# handle ThisStatement in events
 	query="""
-	MATCH (this_st {Id: '%s'})<-[:AST_parentOf*1..10]-(n {Type: 'FunctionExpression'})<-[r:ERDG]-(top_node)
+	MATCH (this_st:ASTNode {Id: $id})<-[:AST_parentOf*1..10]-(n:ASTNode {Type: 'FunctionExpression'})<-[r:ERDG]-(top_node)
 	RETURN r
-	"""%this_expression_node_id
-	results = tx.run(query)
+	"""
+	results = tx.run(query, id=this_expression_node_id)
 	for item in results:
 		relation = item['r']
 		out['events'].append({'relation': relation}) # r['args'].split('___')[1] = id of the node that `this` refers to it
@@ -237,21 +242,21 @@ def get_this_pointer_resolution(tx, this_node):
 	# handle ThisStatement in functions (may resolve to global object, i.e., window, or to the owner object, if they are lator assigned to a member expression)
 	# assignment expr, or var declaration:    										   (right/init)		assign_expr/declarator
 	query="""
-		MATCH (this_st { Id: '%s'})<-[:AST_parentOf*]-(n {Type: 'FunctionExpression'})<-[:AST_parentOf]-(expr)-[r:AST_parentOf]->(function_name), (expr)<-[:AST_parentOf]-(top)
+		MATCH (this_st:ASTNode { Id: $id})<-[:AST_parentOf*]-(n:ASTNode {Type: 'FunctionExpression'})<-[:AST_parentOf]-(expr)-[r:AST_parentOf]->(function_name), (expr)<-[:AST_parentOf]-(top)
 		WHERE r.Type= 'left' OR r.Type= 'id'
-		OPTIONAL MATCH (p1 {Type: 'AssignmentExpression'})-[:AST_parentOf {RelationType: 'right'}]->(c1 {Type: 'Identifier', Value: function_name.Code}), 
-		(p1)-[:AST_parentOf {RelationType: 'left'}]->(c2 {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'object'}]->(owner {Type: 'Identifier'})
-		OPTIONAL MATCH (function_name)-[:AST_parentOf {RelationTYpe: 'object'}]->(true_owner {Type: 'Identifier'})
+		OPTIONAL MATCH (p1:ASTNode {Type: 'AssignmentExpression'})-[:AST_parentOf {RelationType: 'right'}]->(c1:ASTNode {Type: 'Identifier', Value: function_name.Code}), 
+		(p1)-[:AST_parentOf {RelationType: 'left'}]->(c2:ASTNode {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'object'}]->(owner:ASTNode {Type: 'Identifier'})
+		OPTIONAL MATCH (function_name)-[:AST_parentOf {RelationTYpe: 'object'}]->(true_owner:ASTNode {Type: 'Identifier'})
 		RETURN
 		CASE function_name.Type
 		WHEN 'Identifier' THEN [top, function_name, owner]
 		WHEN 'MemberExpression' THEN [top, true_owner]
 		ELSE 'xx'
 		END
-	"""%this_expression_node_id
+	"""
 	# if owner is null,  then `this` refers to global object: the window
 	# if owner is not null, `this` referes to the owner
-	results = tx.run(query)
+	results = tx.run(query, id=this_expression_node_id)
 	for item in results:
 		if 'true_owner' in item:
 			owner = item['true_owner']
@@ -269,15 +274,15 @@ def get_this_pointer_resolution(tx, this_node):
 
 	## handle the object expression case
 	query="""
-	MATCH (this_st {Id: '%s'})<-[:AST_parentOf*]-(n {Type: 'FunctionExpression'})<-[:AST_parentOf {RelationType: 'value'}]-(prop {Type: 'Property'})<-[:AST_parentOf {RelationType: 'properties'}]-(expr {Type: 'ObjectExpression'})<-[r:AST_parentOf]-(t)<-[:AST_parentOf]-(tt)
+	MATCH (this_st:ASTNode {Id: $id})<-[:AST_parentOf*]-(n:ASTNode {Type: 'FunctionExpression'})<-[:AST_parentOf {RelationType: 'value'}]-(prop:ASTNode {Type: 'Property'})<-[:AST_parentOf {RelationType: 'properties'}]-(expr:ASTNode {Type: 'ObjectExpression'})<-[r:AST_parentOf]-(t)<-[:AST_parentOf]-(tt)
 	WHERE (r.RelationType= 'right' OR r.RelationType= 'init' OR r.RelationType = 'arguments')
 	AND (t.Type = 'AssignmentExpression' OR t.Type='VariableDeclarator' OR t.Type= 'CallExpression')
 	AND (tt.Type = 'ExpressionStatement' OR tt.Type='VariableDeclaration')
-	OPTIONAL MATCH (t)-[r2:AST_parentOf]->(c1 {Type: 'Identifier'}) WHERE r2.RelationType = 'left' OR r2.RelationType = 'id'
-	OPTIONAL MATCH (t)-[:AST_parentOf]->(c3)-[AST_parentOf {RelationType: 'object'}]->(c2 {Type: 'Identifier'})
+	OPTIONAL MATCH (t)-[r2:AST_parentOf]->(c1:ASTNode {Type: 'Identifier'}) WHERE r2.RelationType = 'left' OR r2.RelationType = 'id'
+	OPTIONAL MATCH (t)-[:AST_parentOf]->(c3)-[AST_parentOf {RelationType: 'object'}]->(c2:ASTNode {Type: 'Identifier'})
 	RETURN tt, c2, c1
-	"""%this_expression_node_id
-	results = tx.run(query)
+	"""
+	results = tx.run(query, id=this_expression_node_id)
 	for item in results:
 		owner = item['c2']
 		top = item['tt']
@@ -288,11 +293,11 @@ def get_this_pointer_resolution(tx, this_node):
 
 
 	query="""
-	MATCH (this_st { Id: '%s'})<-[:AST_parentOf*]-(n {Type: 'FunctionExpression'})<-[:AST_parentOf {RelationType: 'arguments'}]-(top_call_expression)-[:AST_parentOf {RelationType: 'callee'}]->(member_expr {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'object'}]->(the_event_target_top),
-	(member_expr)-[:AST_parentOf {RelationType: 'property'}]->(prop {Type: 'Identifier', Code: 'on'}), (top_call_expression)<-[:AST_parentOf]-(top)
+	MATCH (this_st:ASTNode { Id: $id})<-[:AST_parentOf*]-(n:ASTNode {Type: 'FunctionExpression'})<-[:AST_parentOf {RelationType: 'arguments'}]-(top_call_expression)-[:AST_parentOf {RelationType: 'callee'}]->(member_expr:ASTNode {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'object'}]->(the_event_target_top),
+	(member_expr)-[:AST_parentOf {RelationType: 'property'}]->(prop:ASTNode {Type: 'Identifier', Code: 'on'}), (top_call_expression)<-[:AST_parentOf]-(top)
 	RETURN the_event_target_top, top
-	"""%this_expression_node_id
-	results = tx.run(query)
+	"""
+	results = tx.run(query, id=this_expression_node_id)
 	for item in results:
 		owner = item['the_event_target_top']
 		top = item['top']
@@ -307,27 +312,28 @@ def get_this_pointer_resolution(tx, this_node):
 			if owner_node == constantsModule.WINDOW_GLOBAL_OBJECT:
 				top_node_id= top_node['Id']
 				build_relationship_query="""
-				MATCH (this_node { Id: '%s'}), (top_node { Id: '%s'}))
+				MATCH (this_node:ASTNode { Id: $id}), (top_node:ASTNode { Id: $top_id})
 				CREATE (this_node)-[:pointsTo {RelationType: 'top', Arguments: 'pointsTo=window'}]->(top_node)
-				"""%(this_expression_node_id)
+				"""
+				tx.run(build_relationship_query, id=this_expression_node_id, top_id=top_node_id)
 			else:
 				top_node_id = top_node['Id']
 				owner_node_id = owner_node['Id']
 				build_relationship_query="""
-				MATCH (this_node { Id: '%s'}), (top_node { Id: '%s'}), (owner_node { Id: '%s'})
+				MATCH (this_node:ASTNode { Id: $id}), (top_node:ASTNode { Id: $top_id}), (owner_node:ASTNode { Id: $owner_id})
 				CREATE (this_node)-[:pointsTo {RelationType: 'top'}]->(top_node)
 				CREATE (this_node)-[:pointsTo {RelationType: 'owner'}]->(owner_node)
-				"""%(this_expression_node_id, top_node_id, owner_node_id)
-			tx.run(build_relationship_query)
+				"""
+				tx.run(build_relationship_query, id=this_expression_node_id, top_id=top_node_id, owner_id=owner_node_id)
 
 	if len(out['events']) > 0:
 		for element in out['events']:
 			owner_node_id = item['Arguments'].split('___')[1]
 			build_relationship_query="""
-			MATCH (this_node { Id: '%s'}), (owner_node { Id: '%s'})
+			MATCH (this_node:ASTNode { Id: $id}), (owner_node:ASTNode { Id: $owner_id})
 			CREATE (this_node)-[:pointsTo {RelationType: 'owner', Arguments: 'pointsTo=eventSelector'}]->(owner_node)
-			"""%(this_expression_node_id, owner_node_id)
-			tx.run(build_relationship_query)
+			"""
+			tx.run(build_relationship_query, id=this_expression_node_id, owner_id=owner_node_id)
 
 	### ---- END STEP 2 ---- ###
 
@@ -345,39 +351,39 @@ def is_variable_a_function_argument_in_current_scope(tx, varname, varname_nid):
 
 	# Case 1: Function Expression as Variable Decleration, e.g., var f = function(varname) { ... }
 	query1 = """
-	MATCH (fname {Type: 'Identifier'})<-[:AST_parentOf {RelationType: 'id'}]-(vd {Type: 'VariableDeclarator'})-[:AST_parentOf {RelationType: 'init'}]->(n {Type:'FunctionExpression'})-[:AST_parentOf {RelationType: 'params'}]-(arg { Type:'Identifier', Code: '%s'}),
-	(n)-[:AST_parentOf {RelationType: 'body'}]->(block {Type: 'BlockStatement'})-[:AST_parentOf|:CFG_parentOf*]->(variable { Id:'%s', Type:'Identifier', Code: '%s'}) 
+	MATCH (fname:ASTNode {Type: 'Identifier'})<-[:AST_parentOf {RelationType: 'id'}]-(vd:ASTNode {Type: 'VariableDeclarator'})-[:AST_parentOf {RelationType: 'init'}]->(n:ASTNode {Type:'FunctionExpression'})-[:AST_parentOf {RelationType: 'params'}]-(arg:ASTNode { Type:'Identifier', Code: $varname}),
+	(n)-[:AST_parentOf {RelationType: 'body'}]->(block:ASTNode {Type: 'BlockStatement'})-[:AST_parentOf|:CFG_parentOf*]->(variable:ASTNode { Id:$id, Type:'Identifier', Code: $varname}) 
 	RETURN distinct(n) as top, fname
-	"""%(varname, varname_nid, varname)
+	"""
 
 	# Case 2: Function Expression as Dictionary Key, e.g., f: function(varname) { ... }
 	query2 = """
-	MATCH (fname {Type: 'Identifier'})<-[:AST_parentOf {RelationType: 'key'}]-(vd {Type: 'Property'})-[:AST_parentOf {RelationType: 'value'}]->(n {Type:'FunctionExpression'})-[:AST_parentOf {RelationType: 'params'}]-(arg { Type:'Identifier', Code: '%s'}),
-	(n)-[:AST_parentOf {RelationType: 'body'}]->(block {Type: 'BlockStatement'})-[:AST_parentOf|:CFG_parentOf*]->(variable { Id:'%s', Type:'Identifier', Code: '%s'}) 
+	MATCH (fname:ASTNode {Type: 'Identifier'})<-[:AST_parentOf {RelationType: 'key'}]-(vd:ASTNode {Type: 'Property'})-[:AST_parentOf {RelationType: 'value'}]->(n:ASTNode {Type:'FunctionExpression'})-[:AST_parentOf {RelationType: 'params'}]-(arg:ASTNode { Type:'Identifier', Code: $varname}),
+	(n)-[:AST_parentOf {RelationType: 'body'}]->(block:ASTNode {Type: 'BlockStatement'})-[:AST_parentOf|:CFG_parentOf*]->(variable:ASTNode { Id:$id, Type:'Identifier', Code: $varname}) 
 	RETURN distinct(n) as top, fname
-	"""%(varname, varname_nid, varname)
+	"""
 
 	# Case 3: Function Declaration, e.g., function f(varname) { ...}
 	query3 = """
-	MATCH (fname {Type: 'Identifier'})<-[:AST_parentOf {RelationType: 'id'}]-(n {Type:'FunctionDeclaration'})-[:AST_parentOf {RelationType: 'params'}]-(arg { Type:'Identifier', Code: '%s'}),
-	(n)-[:AST_parentOf {RelationType: 'body'}]->(block {Type: 'BlockStatement'})-[:AST_parentOf|:CFG_parentOf*]->(variable { Id:'%s', Type:'Identifier', Code: '%s'}) 
+	MATCH (fname:ASTNode {Type: 'Identifier'})<-[:AST_parentOf {RelationType: 'id'}]-(n:ASTNode {Type:'FunctionDeclaration'})-[:AST_parentOf {RelationType: 'params'}]-(arg:ASTNode { Type:'Identifier', Code: $varname}),
+	(n)-[:AST_parentOf {RelationType: 'body'}]->(block:ASTNode {Type: 'BlockStatement'})-[:AST_parentOf|:CFG_parentOf*]->(variable:ASTNode { Id:$id, Type:'Identifier', Code: $varname}) 
 	RETURN distinct(n) as top, fname
-	"""%(varname, varname_nid, varname)
+	"""
 
 
-	res = tx.run(query1)   # queries should only find one function!
+	res = tx.run(query1, varname=varname, id=varname_nid)   # queries should only find one function!
 	for item in res:
 		fn1 = item['top']
 		func_name_node = item['fname']
 		return [True, fn1, func_name_node]
 
-	res = tx.run(query2)
+	res = tx.run(query2, varname=varname, id=varname_nid)
 	for item in res:
 		fn2 = item['top']
 		func_name_node = item['fname']
 		return [True, fn2, func_name_node]
 
-	res = tx.run(query3)
+	res = tx.run(query3, varname=varname, id=varname_nid)
 	for item in res:
 		fn3 = item['top']
 		func_name_node = item['fname']
@@ -426,11 +432,14 @@ def get_function_call_values_of_function_definitions(tx, function_def_node):
 
 	out = {}
 	query = """
-	MATCH (param)<-[:AST_parentOf {RelationType: 'params'}]-(functionDef { Id: '%s' })<-[r:CG_parentOf]-(caller {Type: 'CallExpression'})-[:AST_parentOf {RelationType: 'arguments'}]-> (arg) RETURN collect(distinct param) as params, caller, collect(distinct arg) AS args, collect(distinct r.Arguments) as arguments
-	"""%(function_def_node['Id'])
+	MATCH (param)<-[:AST_parentOf {RelationType: 'params'}]-(functionDef:ASTNode { Id: $id })<-[r:CG_parentOf]-(caller:ASTNode {Type: 'CallExpression'})-[:AST_parentOf {RelationType: 'arguments'}]-> (arg) RETURN collect(distinct param) as params, caller, collect(distinct arg) AS args, collect(distinct r.Arguments) as arguments
+	"""
 
 
-	results = tx.run(query)
+	if is_in_memory_graph(tx):
+		results = tx.get_call_bindings(function_def_node)
+	else:
+		results = tx.run(query, id=function_def_node['Id'])
 	for each_binding in results:
 		call_expression = each_binding['caller']
 		args = each_binding['args']
@@ -502,9 +511,12 @@ def get_function_call_values_of_function_definitions(tx, function_def_node):
 def check_if_function_has_param(tx, varname, func_def_node):
 
 	query="""
-	MATCH (n { Id: '%s'})-[:AST_parentOf {RelationType: 'params'}]-(arg) RETURN collect(distinct arg) as args
-	"""%(func_def_node['Id'])
-	results = tx.run(query)
+	MATCH (n:ASTNode { Id: $id})-[:AST_parentOf {RelationType: 'params'}]-(arg) RETURN collect(distinct arg) as args
+	"""
+	if is_in_memory_graph(tx):
+		results = [{'args': tx.get_function_params(func_def_node)}]
+	else:
+		results = tx.run(query, id=func_def_node['Id'])
 	for item in results:
 		args = item['args']
 		arg_values = [get_value_of_identifer_or_literal(node)[0] for node in args]
@@ -523,9 +535,9 @@ def get_non_anonymous_call_expr_top_node(tx, call_expr):
 	@return VariableDeclaration or ExpressionStatemnet node
 	"""
 	query = """
-	MATCH (n)-[:AST_parentOf]->(callExpr { Id: '%s', Type: 'CallExpression'}) RETURN n
-	"""%(call_expr['Id'])
-	results = tx.run(query)
+	MATCH (n)-[:AST_parentOf]->(callExpr:ASTNode { Id: $id, Type: 'CallExpression'}) RETURN n
+	"""
+	results = tx.run(query, id=call_expr['Id'])
 	for item in results:
 		top_level = item['n']
 		return top_level
@@ -535,10 +547,13 @@ def get_function_def_of_block_stmt(tx, block_stmt_node):
 	"""
 	gets the function definition of a block statement node
 	"""
+
+	if is_in_memory_graph(tx):
+		return tx.get_function_def_of_block_stmt(block_stmt_node)
 	query = """
-	MATCH (funcDef)-[:AST_parentOf {RelationType: 'body'}]->(blockSt { Id: '%s', Type: 'BlockStatement'}) RETURN funcDef
-	"""%(block_stmt_node['Id'])
-	results = tx.run(query)
+	MATCH (funcDef)-[:AST_parentOf {RelationType: 'body'}]->(blockSt:ASTNode { Id: $id, Type: 'BlockStatement'}) RETURN funcDef
+	"""
+	results = tx.run(query, id=block_stmt_node['Id'])
 	for record in results:
 		funcDef = record['funcDef']
 		return funcDef
@@ -551,7 +566,72 @@ def get_function_def_of_block_stmt(tx, block_stmt_node):
 ## Internal Functions
 ## ------------------------------------------------------------------------------- ## 
 
-@functools.lru_cache(maxsize=512)
+# max number of memoized backward slices per graph
+SLICE_CACHE_SIZE = 20000
+
+# max number of memoized function definitions with their call-site argument values per graph
+CALL_VALUES_CACHE_SIZE = 5000
+
+
+def prefetch_varname_values_from_contexts(tx, items, max_depth=None, batch_size=None):
+	"""
+	Description:
+	-------------
+	warms the query caches of `_get_varname_value_from_context` for a set of (varname, context node) pairs, 
+	e.g., the taintable identifiers of all sinks of a webpage, by walking their backward slices level by level:
+	the PDG parents and the AST subtrees of all pairs of a level are fetched with batched (UNWIND) queries, 
+	rather than with one query per pair. The slices are then computed as usual, but mostly from the caches.
+
+	Call values of function parameters, `this` pointers and call definitions are still resolved on demand.
+
+	@param tx {pointer} neo4j transaction pointer
+	@param {list} items: list of (varname, context node) tuples
+	@param {int} max_depth: max number of prefetched recursion levels
+	@param {int} batch_size: max number of pairs per query
+	@return {int} number of prefetched (node, varname) pairs
+	"""
+
+	if is_in_memory_graph(tx):
+		# no round trips to amortize
+		return 0
+
+	if max_depth is None:
+		max_depth = constantsModule.BATCH_SLICING_DEPTH
+	if batch_size is None:
+		batch_size = constantsModule.BATCH_SLICING_SIZE
+
+	frontier = set([(context_node['Id'], varname) for (varname, context_node) in items])
+	visited = set()
+	for level in range(max_depth):
+		pairs = [pair for pair in frontier if pair not in visited]
+		if not len(pairs):
+			break
+		visited.update(pairs)
+
+		pdg_parents = QU.get_pdg_parents_batch(tx, pairs, batch_size=batch_size)
+
+		# the statements that the main recursion flow of the slicing continues from
+		statements = {}
+		for nodes in pdg_parents.values():
+			for node in nodes:
+				if node['Type'] not in ['Program', 'BlockStatement'] and node['Id'] != constantsModule.PROGRAM_NODE_INDEX:
+					statements[node['Id']] = node
+		subtrees = QU.get_ast_subtree_batch(tx, list(statements.values()), batch_size=batch_size)
+
+		frontier = set()
+		for (node_id, varname), nodes in pdg_parents.items():
+			for node in nodes:
+				if node['Id'] not in subtrees:
+					continue
+				idents = QU.get_code_expression(subtrees[node['Id']])[2]
+				for new_varname in set(idents):
+					if new_varname != varname and new_varname not in constantsModule.JS_DEFINED_VARS:
+						frontier.add((node['Id'], new_varname))
+
+	return len(visited)
+
+
+
 def _get_varname_value_from_context(tx, varname, context_node, PDG_on_variable_declarations_only=False, context_scope=''):
 	"""
 	Description:
@@ -565,6 +645,27 @@ def _get_varname_value_from_context(tx, varname, context_node, PDG_on_variable_d
 	@param {string} context_scope: internal val to keep context scope in recursions
 	@return {list}: a 2d list where each entry is of the following format
 		[program_slice, literals, dict of identifer mapped to identifer node is, location dict]
+	@description slices are memoized per graph session, i.e., they are shared across all sinks of a webpage
+	"""
+
+	# context node identifer
+	node_id = context_node['Id']
+
+	slice_cache = graph_cache.get_cache(tx, 'data_flow_slices', maxsize=SLICE_CACHE_SIZE)
+	slice_key = (varname, node_id, context_scope, bool(PDG_on_variable_declarations_only))
+	if slice_key in slice_cache:
+		# callers extend and modify the returned slices and their nested lists and dicts, so hand out a deep copy
+		return copy.deepcopy(slice_cache.get(slice_key))
+
+	out_values = _compute_varname_value_from_context(tx, varname, context_node, PDG_on_variable_declarations_only, context_scope)
+	slice_cache.put(slice_key, copy.deepcopy(out_values))
+	return out_values
+
+
+
+def _compute_varname_value_from_context(tx, varname, context_node, PDG_on_variable_declarations_only=False, context_scope=''):
+	"""
+	computes the backward slice of `_get_varname_value_from_context` without memoization
 	"""
 
 
@@ -575,7 +676,8 @@ def _get_varname_value_from_context(tx, varname, context_node, PDG_on_variable_d
 	# output
 	out_values = [] 
 	# stores a map: funcDef id -->> get_function_call_values_of_function_definitions(funcDef)
-	knowledge_database = {} 
+	# shared across all slices of the graph
+	knowledge_database = graph_cache.get_cache(tx, 'data_flow_call_values', maxsize=CALL_VALUES_CACHE_SIZE)
 	# context node identifer
 	node_id = context_node['Id']
 
@@ -583,10 +685,10 @@ def _get_varname_value_from_context(tx, varname, context_node, PDG_on_variable_d
 		
 		key = func_def_node['Id']
 		if key in knowledge_database:
-			knowledge = knowledge_database[key]
+			knowledge = knowledge_database.get(key)
 		else:
 			knowledge = get_function_call_values_of_function_definitions(tx, func_def_node)	
-			knowledge_database[key] = knowledge
+			knowledge_database.put(key, knowledge)
 
 		ret = {}
 		for nid, values in knowledge.items():
@@ -601,205 +703,179 @@ def _get_varname_value_from_context(tx, varname, context_node, PDG_on_variable_d
 	## Main logic 
 	## ------------------------------------------------------------------------------- ## 
 
-	if PDG_on_variable_declarations_only:
-		# for VariableDeclaration PDG relations
-		query = """
-		MATCH (n_s { Id: '%s' })<-[:PDG_parentOf { Arguments: '%s' }]-(n_t {Type: 'VariableDeclaration'}) RETURN collect(distinct n_t) AS resultset
-		"""%(node_id, varname)
-	else:
-		# for all PDG relations
-		query = """
-		MATCH (n_s { Id: '%s' })<-[:PDG_parentOf { Arguments: '%s' }]-(n_t) RETURN collect(distinct n_t) AS resultset
-		"""%(node_id, varname)
-
-	results = tx.run(query)
-	for item in results: 
-		currentNodes = item['resultset'] 
+	currentNodes = QU.get_pdg_parents(tx, node_id, varname, node_type='VariableDeclaration' if PDG_on_variable_declarations_only else None)
 		
-		for iteratorNode in currentNodes:
-			if iteratorNode['Type'] == 'Program': continue
-
-			if iteratorNode['Type'] == 'BlockStatement': 
-				# the parameter 'varname' is a function argument
-
-				func_def_node = get_function_def_of_block_stmt(tx, iteratorNode) # check if func def has a varname parameter 
-				if func_def_node['Type'] in ['FunctionExpression', 'FunctionDeclaration', 'ArrowFunctionExpression']:
-
-					match_signature = check_if_function_has_param(tx, varname, func_def_node)
-					if match_signature:
-						if context_scope == '':
-							out = ['%s = %s'%(varname, constantsModule.LOCAL_ARGUMENT_TAG_FOR_FUNC),
-								  [],
-								  [varname],
-								  iteratorNode['Location']]
-						else:
-							out = ['%s %s = %s'%(context_scope, varname, constantsModule.LOCAL_ARGUMENT_TAG_FOR_FUNC),
-								  [],
-								  [varname],
-								  iteratorNode['Location']]					
-						out_values.append(out)
-						
-						varname_values_within_call_expressions = _get_all_call_values_of(varname, func_def_node)
-						for nid in varname_values_within_call_expressions:
-							each_argument = varname_values_within_call_expressions[nid]
+	for iteratorNode in currentNodes:
+		if iteratorNode['Type'] == 'Program': continue
 
-							location_line = _get_location_part(nid)
+		if iteratorNode['Type'] == 'BlockStatement': 
+			# the parameter 'varname' is a function argument
 
-							if each_argument['Type'] == 'Literal':
-								if context_scope == '':
-									out = ['%s <--(invocation-value)-- \"%s\"'%(varname, each_argument['Value']),
-										  [each_argument['Value']],
-										  [varname],
-										  location_line]
-								else:
-									out = ['%s %s <--(invocation-value)-- \"%s\"'%(context_scope, varname, each_argument['Value']),
-										  [each_argument['Value']],
-										  [varname],
-										  location_line]
+			func_def_node = get_function_def_of_block_stmt(tx, iteratorNode) # check if func def has a varname parameter 
+			if func_def_node['Type'] in ['FunctionExpression', 'FunctionDeclaration', 'ArrowFunctionExpression']:
+
+				match_signature = check_if_function_has_param(tx, varname, func_def_node)
+				if match_signature:
+					if context_scope == '':
+						out = ['%s = %s'%(varname, constantsModule.LOCAL_ARGUMENT_TAG_FOR_FUNC),
+							  [],
+							  [varname],
+							  iteratorNode['Location']]
+					else:
+						out = ['%s %s = %s'%(context_scope, varname, constantsModule.LOCAL_ARGUMENT_TAG_FOR_FUNC),
+							  [],
+							  [varname],
+							  iteratorNode['Location']]					
+					out_values.append(out)
+						
+					varname_values_within_call_expressions = _get_all_call_values_of(varname, func_def_node)
+					for nid in varname_values_within_call_expressions:
+						each_argument = varname_values_within_call_expressions[nid]
+
+						location_line = _get_location_part(nid)
+
+						if each_argument['Type'] == 'Literal':
+							if context_scope == '':
+								out = ['%s <--(invocation-value)-- \"%s\"'%(varname, each_argument['Value']),
+									  [each_argument['Value']],
+									  [varname],
+									  location_line]
+							else:
+								out = ['%s %s <--(invocation-value)-- \"%s\"'%(context_scope, varname, each_argument['Value']),
+									  [each_argument['Value']],
+									  [varname],
+									  location_line]
 
-								out_values.append(out)
+							out_values.append(out)
 
-							elif each_argument['Type'] == 'Identifier':
+						elif each_argument['Type'] == 'Identifier':
 
-								call_expr_id = _get_node_id_part(nid)
-								# use this as an id to mark variables in this scope when doing def-use analsis
-								context_id_of_call_scope = '[scope-id=%s]'%call_expr_id  
+							call_expr_id = _get_node_id_part(nid)
+							# use this as an id to mark variables in this scope when doing def-use analsis
+							context_id_of_call_scope = '[scope-id=%s]'%call_expr_id  
 
-								if context_scope == '':
-									out = ['%s <--(invocation-value)-- [def-scope-id=%s] %s'%(varname, call_expr_id, each_argument['Value']),
+							if context_scope == '':
+								out = ['%s <--(invocation-value)-- [def-scope-id=%s] %s'%(varname, call_expr_id, each_argument['Value']),
+									  [],
+									  [varname, each_argument['Value']],
+									  location_line]
+							else:
+								out = ['%s %s <--(invocation-value)-- [def-scope-id=%s] %s'%(context_scope, varname, call_expr_id, each_argument['Value']),
 										  [],
 										  [varname, each_argument['Value']],
 										  location_line]
-								else:
-									out = ['%s %s <--(invocation-value)-- [def-scope-id=%s] %s'%(context_scope, varname, call_expr_id, each_argument['Value']),
-											  [],
-											  [varname, each_argument['Value']],
-											  location_line]
 
-								out_values.append(out)
+							out_values.append(out)
 
 								
-								# top_level_of_call_expr = get_non_anonymous_call_expr_top_node(tx, {'Id': call_expr_id})
-								top_level_of_call_expr = QU.get_ast_topmost(tx, {'Id': call_expr_id})
-								recurse= _get_varname_value_from_context(tx, each_argument['Value'], top_level_of_call_expr, context_scope=context_id_of_call_scope)
-								out_values.extend(recurse)
-
-							elif each_argument['Type'] == 'MemberExpression':
-
-								call_expr_id = _get_node_id_part(nid)
-								context_id_of_call_scope = '[scope-id=%s]'%call_expr_id  
-
-								if context_scope == '':
-									out = ['%s <--(invocation-value)-- [def-scope-id=%s] %s'%(varname, call_expr_id, each_argument['Value']),
+							# top_level_of_call_expr = get_non_anonymous_call_expr_top_node(tx, {'Id': call_expr_id})
+							top_level_of_call_expr = QU.get_ast_topmost(tx, {'Id': call_expr_id})
+							recurse= _get_varname_value_from_context(tx, each_argument['Value'], top_level_of_call_expr, context_scope=context_id_of_call_scope)
+							out_values.extend(recurse)
+
+						elif each_argument['Type'] == 'MemberExpression':
+
+							call_expr_id = _get_node_id_part(nid)
+							context_id_of_call_scope = '[scope-id=%s]'%call_expr_id  
+
+							if context_scope == '':
+								out = ['%s <--(invocation-value)-- [def-scope-id=%s] %s'%(varname, call_expr_id, each_argument['Value']),
+									  [],
+									  [varname, each_argument['Value']],
+									  location_line]
+							else:
+								out = ['%s %s <--(invocation-value)-- [def-scope-id=%s] %s'%(context_scope, varname, call_expr_id, each_argument['Value']),
 										  [],
 										  [varname, each_argument['Value']],
-										  location_line]
-								else:
-									out = ['%s %s <--(invocation-value)-- [def-scope-id=%s] %s'%(context_scope, varname, call_expr_id, each_argument['Value']),
-											  [],
-											  [varname, each_argument['Value']],
-											  location_line]						
-								out_values.append(out)	
-
-								# PDG on member expressions-> do PDG on the top most parent of it!
-								top_most = each_argument['Value'].split('.')[0]
-								call_expr_id = _get_node_id_part(nid)
-								# top_level_of_call_expr = get_non_anonymous_call_expr_top_node(tx, {'Id': call_expr_id})
-								top_level_of_call_expr = QU.get_ast_topmost(tx, {'Id': call_expr_id})
-								recurse= _get_varname_value_from_context(tx, top_most, top_level_of_call_expr, context_scope=context_id_of_call_scope)
-								out_values.extend(recurse)
-
-							elif each_argument['Type'] == 'ObjectExpression':
+										  location_line]						
+							out_values.append(out)	
+
+							# PDG on member expressions-> do PDG on the top most parent of it!
+							top_most = each_argument['Value'].split('.')[0]
+							call_expr_id = _get_node_id_part(nid)
+							# top_level_of_call_expr = get_non_anonymous_call_expr_top_node(tx, {'Id': call_expr_id})
+							top_level_of_call_expr = QU.get_ast_topmost(tx, {'Id': call_expr_id})
+							recurse= _get_varname_value_from_context(tx, top_most, top_level_of_call_expr, context_scope=context_id_of_call_scope)
+							out_values.extend(recurse)
+
+						elif each_argument['Type'] == 'ObjectExpression':
 								
-								call_expr_id = _get_node_id_part(nid)
-								context_id_of_call_scope = '[scope-id=%s]'%call_expr_id  
-
-								if context_scope == '':
-									out = ['%s <--(invocation-value)-- [def-scope-id=%s] %s'%(varname, call_expr_id, each_argument['Value']),
+							call_expr_id = _get_node_id_part(nid)
+							context_id_of_call_scope = '[scope-id=%s]'%call_expr_id  
+
+							if context_scope == '':
+								out = ['%s <--(invocation-value)-- [def-scope-id=%s] %s'%(varname, call_expr_id, each_argument['Value']),
+									  [],
+									  [varname, each_argument['Value']],
+									  location_line]
+							else:
+								out = ['%s %s <--(invocation-value)-- [def-scope-id=%s] %s'%(context_scope, varname, call_expr_id, each_argument['Value']),
 										  [],
 										  [varname, each_argument['Value']],
 										  location_line]
-								else:
-									out = ['%s %s <--(invocation-value)-- [def-scope-id=%s] %s'%(context_scope, varname, call_expr_id, each_argument['Value']),
-											  [],
-											  [varname, each_argument['Value']],
-											  location_line]
-
-								out_values.append(out)	
-
-								additional_identifiers = each_argument['ResolveIdentifiers']
-								if additional_identifiers is not None:
-									for each_additional_identifier in additional_identifiers:
-										# top_level_of_call_expr = get_non_anonymous_call_expr_top_node(tx, {'Id': call_expr_id})
-										top_level_of_call_expr = QU.get_ast_topmost(tx, {'Id': call_expr_id})
-										recurse= _get_varname_value_from_context(tx, each_additional_identifier, top_level_of_call_expr, context_scope=context_id_of_call_scope)
-										out_values.extend(recurse)	
-							else: 
-								# expression statements, call expressions (window.location.replace(), etc)
-								if context_scope == '':
-									out = ['%s <--(invocation-value)-- %s'%(varname, each_argument['Value']),
-										  [],
-										  [varname, each_argument['Value']],
-										  location_line]
-									
-								else:
-									out = ['%s %s <--(invocation-value)-- %s'%(context_scope, varname, each_argument['Value']),
-										  [],
-										  [varname, each_argument['Value']],
-										  location_line]
-
-								out_values.append(out)				
-
 
+							out_values.append(out)	
 
-							## ThisExpression Pointer Analysis
-							## NOTE: this code block must be executed for ALL branches, so we have to place it outside of all conditional branches
 							additional_identifiers = each_argument['ResolveIdentifiers']
 							if additional_identifiers is not None:
-								if 'ThisExpression' in additional_identifiers:
-									this_expression_node_id = additional_identifiers['ThisExpression']
-									pointer_resolutions = get_this_pointer_resolution(tx, {'Id': this_expression_node_id })
-									for item in pointer_resolutions['methods']:
-										owner_item = item['owner']
-										owner_top = item['top']
-										tree_owner = QU.getChildsOf(tx, owner_item)
-										tree_owner_exp = QU.get_code_expression(tree_owner)[0]
-										location_line = owner_item['Location']
-										out_line = '%s this --(points-to)--> %s [this-nid: %s]'%(context_scope,tree_owner_exp, this_expression_node_id)
-										out = [out_line.lstrip(),
-											  [],
-											  [tree_owner_exp[0]],
-											  location_line]
-										out_values.append(out)
-
-										# def-use analysis over resolved `this` pointer
-										if owner_item != '' and owner_item is not None and owner_item!= constantsModule.WINDOW_GLOBAL_OBJECT and owner_item['Type'] == 'Identifier':
-											recurse_values = _get_varname_value_from_context(tx, tree_owner_exp, owner_top, PDG_on_variable_declarations_only=True)
-											out_values.extend(recurse_values)
-
-
-									# handle `this` that resolves to DOM elements in events 
-									for element in pointer_resolutions['events']:
-										if 'relation' in element:
-											# fetched via analysis
-											item = element['relation']
-											target_node_id = item['Arguments'].split('___')[1]
-											if target_node_id == 'xx': 
-												continue
-											else:
-												tree_owner = QU.getChildsOf({'Id': target_node_id})
-												tree_owner_exp = QU.get_code_expression(tree_owner)
-												location_line = tree_owner['Location']
-												out_line = '%s this --(points-to)--> %s [this-nid: %s]'%(context_scope, tree_owner_exp, this_expression_node_id)
-												out = [out_line.lstrip(),
-													  [],
-													  [tree_owner_exp],
-													  location_line]
-												out_values.append(out) 
+								for each_additional_identifier in additional_identifiers:
+									# top_level_of_call_expr = get_non_anonymous_call_expr_top_node(tx, {'Id': call_expr_id})
+									top_level_of_call_expr = QU.get_ast_topmost(tx, {'Id': call_expr_id})
+									recurse= _get_varname_value_from_context(tx, each_additional_identifier, top_level_of_call_expr, context_scope=context_id_of_call_scope)
+									out_values.extend(recurse)	
+						else: 
+							# expression statements, call expressions (window.location.replace(), etc)
+							if context_scope == '':
+								out = ['%s <--(invocation-value)-- %s'%(varname, each_argument['Value']),
+									  [],
+									  [varname, each_argument['Value']],
+									  location_line]
+									
+							else:
+								out = ['%s %s <--(invocation-value)-- %s'%(context_scope, varname, each_argument['Value']),
+									  [],
+									  [varname, each_argument['Value']],
+									  location_line]
+
+							out_values.append(out)				
+
+
+
+						## ThisExpression Pointer Analysis
+						## NOTE: this code block must be executed for ALL branches, so we have to place it outside of all conditional branches
+						additional_identifiers = each_argument['ResolveIdentifiers']
+						if additional_identifiers is not None:
+							if 'ThisExpression' in additional_identifiers:
+								this_expression_node_id = additional_identifiers['ThisExpression']
+								pointer_resolutions = get_this_pointer_resolution(tx, {'Id': this_expression_node_id })
+								for item in pointer_resolutions['methods']:
+									owner_item = item['owner']
+									owner_top = item['top']
+									tree_owner = QU.getChildsOf(tx, owner_item)
+									tree_owner_exp = QU.get_code_expression(tree_owner)[0]
+									location_line = owner_item['Location']
+									out_line = '%s this --(points-to)--> %s [this-nid: %s]'%(context_scope,tree_owner_exp, this_expression_node_id)
+									out = [out_line.lstrip(),
+										  [],
+										  [tree_owner_exp[0]],
+										  location_line]
+									out_values.append(out)
+
+									# def-use analysis over resolved `this` pointer
+									if owner_item != '' and owner_item is not None and owner_item!= constantsModule.WINDOW_GLOBAL_OBJECT and owner_item['Type'] == 'Identifier':
+										recurse_values = _get_varname_value_from_context(tx, tree_owner_exp, owner_top, PDG_on_variable_declarations_only=True)
+										out_values.extend(recurse_values)
+
+
+								# handle `this` that resolves to DOM elements in events 
+								for element in pointer_resolutions['events']:
+									if 'relation' in element:
+										# fetched via analysis
+										item = element['relation']
+										target_node_id = item['Arguments'].split('___')[1]
+										if target_node_id == 'xx': 
+											continue
 										else:
-											# fetched from DB
-											item = element['owner']
-											target_node_id = item['Id']		
 											tree_owner = QU.getChildsOf({'Id': target_node_id})
 											tree_owner_exp = QU.get_code_expression(tree_owner)
 											location_line = tree_owner['Location']
@@ -808,73 +884,73 @@ def _get_varname_value_from_context(tx, varname, context_node, PDG_on_variable_d
 												  [],
 												  [tree_owner_exp],
 												  location_line]
-											out_values.append(out) 				
-
-
-				continue
-
-
-			tree = QU.getChildsOf(tx, iteratorNode)
-			contextNode = tree['node']
-			if contextNode['Id'] == constantsModule.PROGRAM_NODE_INDEX: 
-				continue
-
-			if contextNode['Type'] == "Program":
-				continue
-
-			ex = QU.get_code_expression(tree)
-			loc = iteratorNode['Location']
-			[code_expr, literals, idents] = ex
-			if context_scope != '':
-				code_expr = context_scope + '  ' + code_expr 
-			out_values.append([code_expr, literals, idents, loc])
-			new_varnames = list(set((list(idents)))) # get unique vars
-
-			# handle `this` expressions
-			if 'ThisExpression' in new_varnames:
-				this_expression_node_id = idents['ThisExpression']
-				pointer_resolutions = get_this_pointer_resolution(tx, {'Id': this_expression_node_id })
-				for item in pointer_resolutions['methods']:
-					owner_item = item['owner']
-					owner_top = item['top']
-					tree_owner = QU.getChildsOf(tx, owner_item)
-					tree_owner_exp = QU.get_code_expression(tree_owner)[0]
-					location_line = owner_item['Location']
-					out_line = '%s this --(points-to)--> %s [this-nid: %s]'%(context_scope, tree_owner_exp, this_expression_node_id)
-					out = [out_line.lstrip(),
-						  [],
-						  [tree_owner_exp[0]],
-						  location_line]
-					out_values.append(out)
-
-					# def-use analysis over resolved `this` pointer
-					if owner_item != '' and owner_item is not None and owner_item!= constantsModule.WINDOW_GLOBAL_OBJECT and owner_item['Type'] == 'Identifier':
-						recurse_values = _get_varname_value_from_context(tx, tree_owner_exp, owner_top, PDG_on_variable_declarations_only=True)
-						out_values.extend(recurse_values)
-
-
-				# handle `this` that resolves to DOM elements in events 
-				for element in pointer_resolutions['events']:
-					if 'relation' in element:
-						# fetched via analysis
-						item = element['relation']
-						target_node_id = item['Arguments'].split('___')[1]
-						if target_node_id == 'xx': 
-							continue
-						else:
-							tree_owner = QU.getChildsOf({'Id': target_node_id})
-							tree_owner_exp = QU.get_code_expression(tree_owner)
-							location_line = tree_owner['Location']
-							out_line = '%s this --(points-to)--> %s [this-nid: %s]'%(context_scope, tree_owner_exp, this_expression_node_id)
-							out = [out_line.lstrip(),
-								  [],
-								  [tree_owner_exp],
-								  location_line]
-							out_values.append(out) 
+											out_values.append(out) 
+									else:
+										# fetched from DB
+										item = element['owner']
+										target_node_id = item['Id']		
+										tree_owner = QU.getChildsOf({'Id': target_node_id})
+										tree_owner_exp = QU.get_code_expression(tree_owner)
+										location_line = tree_owner['Location']
+										out_line = '%s this --(points-to)--> %s [this-nid: %s]'%(context_scope, tree_owner_exp, this_expression_node_id)
+										out = [out_line.lstrip(),
+											  [],
+											  [tree_owner_exp],
+											  location_line]
+										out_values.append(out) 				
+
+
+			continue
+
+
+		tree = QU.getChildsOf(tx, iteratorNode)
+		contextNode = tree['node']
+		if contextNode['Id'] == constantsModule.PROGRAM_NODE_INDEX: 
+			continue
+
+		if contextNode['Type'] == "Program":
+			continue
+
+		ex = QU.get_code_expression(tree)
+		loc = iteratorNode['Location']
+		[code_expr, literals, idents] = ex
+		if context_scope != '':
+			code_expr = context_scope + '  ' + code_expr 
+		out_values.append([code_expr, literals, idents, loc])
+		new_varnames = list(set((list(idents)))) # get unique vars
+
+		# handle `this` expressions
+		if 'ThisExpression' in new_varnames:
+			this_expression_node_id = idents['ThisExpression']
+			pointer_resolutions = get_this_pointer_resolution(tx, {'Id': this_expression_node_id })
+			for item in pointer_resolutions['methods']:
+				owner_item = item['owner']
+				owner_top = item['top']
+				tree_owner = QU.getChildsOf(tx, owner_item)
+				tree_owner_exp = QU.get_code_expression(tree_owner)[0]
+				location_line = owner_item['Location']
+				out_line = '%s this --(points-to)--> %s [this-nid: %s]'%(context_scope, tree_owner_exp, this_expression_node_id)
+				out = [out_line.lstrip(),
+					  [],
+					  [tree_owner_exp[0]],
+					  location_line]
+				out_values.append(out)
+
+				# def-use analysis over resolved `this` pointer
+				if owner_item != '' and owner_item is not None and owner_item!= constantsModule.WINDOW_GLOBAL_OBJECT and owner_item['Type'] == 'Identifier':
+					recurse_values = _get_varname_value_from_context(tx, tree_owner_exp, owner_top, PDG_on_variable_declarations_only=True)
+					out_values.extend(recurse_values)
+
+
+			# handle `this` that resolves to DOM elements in events 
+			for element in pointer_resolutions['events']:
+				if 'relation' in element:
+					# fetched via analysis
+					item = element['relation']
+					target_node_id = item['Arguments'].split('___')[1]
+					if target_node_id == 'xx': 
+						continue
 					else:
-						# fetched from DB
-						item = element['owner']
-						target_node_id = item['Id']		
 						tree_owner = QU.getChildsOf({'Id': target_node_id})
 						tree_owner_exp = QU.get_code_expression(tree_owner)
 						location_line = tree_owner['Location']
@@ -884,44 +960,60 @@ def _get_varname_value_from_context(tx, varname, context_node, PDG_on_variable_d
 							  [tree_owner_exp],
 							  location_line]
 						out_values.append(out) 
+				else:
+					# fetched from DB
+					item = element['owner']
+					target_node_id = item['Id']		
+					tree_owner = QU.getChildsOf({'Id': target_node_id})
+					tree_owner_exp = QU.get_code_expression(tree_owner)
+					location_line = tree_owner['Location']
+					out_line = '%s this --(points-to)--> %s [this-nid: %s]'%(context_scope, tree_owner_exp, this_expression_node_id)
+					out = [out_line.lstrip(),
+						  [],
+						  [tree_owner_exp],
+						  location_line]
+					out_values.append(out) 
+
+
+		# main recursion flow
+		for new_varname in new_varnames:
+			if new_varname == varname or new_varname in constantsModule.JS_DEFINED_VARS: continue
+
+			# check if new_varname is a function call
+			# i.e., it has a `callee` relation to a parent of type `CallExpression`
+			new_varname_id = idents[new_varname]
+			check_function_call_query="""
+			MATCH (n:ASTNode { Id: $id })<-[:AST_parentOf {RelationType: 'callee'}]-(fn_call:ASTNode {Type: 'CallExpression'})-[:CG_parentOf]->(call_definition)
+			RETURN call_definition
+			"""
+			if is_in_memory_graph(tx):
+				call_definition_result = [{'call_definition': item} for item in tx.get_call_definitions(new_varname_id)]
+			else:
+				call_definition_result = tx.run(check_function_call_query, id=new_varname_id)
+			is_func_call = False
+			for definition in call_definition_result:
+				item = definition['call_definition']
+				if item is not None:
+					is_func_call = True
+					wrapper_node_function_definition = QU.getChildsOf(tx, item)
+					ce_function_definition = QU.get_code_expression(wrapper_node_function_definition)
+					location_function_definition = item['Location']
+					body = ce_function_definition[0]
+					body = jsbeautifier.beautify(body)
+					out_line = """%s `%s` is %s\n\t\t\t %s"""%(context_scope, new_varname, constantsModule.FUNCTION_CALL_DEFINITION_BODY, body)
+					out = [out_line.strip(),
+						  [],
+						  [],
+						  location_function_definition]
+					if out not in out_values:
+						# avoid returning/printing twice
+						out_values.append(out)
 
+			if is_func_call:
+				continue
 
-			# main recursion flow
-			for new_varname in new_varnames:
-				if new_varname == varname or new_varname in constantsModule.JS_DEFINED_VARS: continue
-
-				# check if new_varname is a function call
-				# i.e., it has a `callee` relation to a parent of type `CallExpression`
-				new_varname_id = idents[new_varname]
-				check_function_call_query="""
-				MATCH (n { Id: '%s' })<-[:AST_parentOf {RelationType: 'callee'}]-(fn_call {Type: 'CallExpression'})-[:CG_parentOf]->(call_definition)
-				RETURN call_definition
-				"""%(new_varname_id)
-				call_definition_result = tx.run(check_function_call_query)
-				is_func_call = False
-				for definition in call_definition_result:
-					item = definition['call_definition']
-					if item is not None:
-						is_func_call = True
-						wrapper_node_function_definition = QU.getChildsOf(tx, item)
-						ce_function_definition = QU.get_code_expression(wrapper_node_function_definition)
-						location_function_definition = item['Location']
-						body = ce_function_definition[0]
-						body = jsbeautifier.beautify(body)
-						out_line = """%s `%s` is %s\n\t\t\t %s"""%(context_scope, new_varname, constantsModule.FUNCTION_CALL_DEFINITION_BODY, body)
-						out = [out_line.strip(),
-							  [],
-							  [],
-							  location_function_definition]
-						if out not in out_values:
-							# avoid returning/printing twice
-							out_values.append(out)
-
-				if is_func_call:
-					continue
-
-				v = _get_varname_value_from_context(tx, new_varname, contextNode, context_scope = context_scope)
-				out_values.extend(v)	
+			v = _get_varname_value_from_context(tx, new_varname, contextNode, context_scope = context_scope)
+			out_values.extend(v)	
 
 
 
@@ -32,6 +32,7 @@ import argparse
 import json
 import constants as constantsModule
 import utils.io as IOModule
+import utils.compression as compressionModule
 import utils.utility as utilityModule
 import docker.neo4j.manage_container as dockerModule
 import hpg_neo4j.db_utility as DU
@@ -102,22 +103,9 @@ def main():
 	neo4j_database_name = 'neo4j' 
 	database_name = '{0}_{1}'.format(webapp_folder_name, webpage) 
 
-	nodes_file = os.path.join(webpage_folder, constantsModule.NODE_INPUT_FILE_NAME)
-	rels_file =  os.path.join(webpage_folder, constantsModule.RELS_INPUT_FILE_NAME)
-	rels_dynamic_file = os.path.join(webpage_folder, constantsModule.RELS_DYNAMIC_INPUT_FILE_NAME)
-
-	nodes_file_gz = os.path.join(webpage_folder, constantsModule.NODE_INPUT_FILE_NAME +'.gz')
-	rels_file_gz =  os.path.join(webpage_folder, constantsModule.RELS_INPUT_FILE_NAME  +'.gz')
-	rels_dynamic_file_gz = os.path.join(webpage_folder, constantsModule.RELS_DYNAMIC_INPUT_FILE_NAME  +'.gz')
-
-	if os.path.exists(nodes_file) and os.path.exists(rels_file) and os.path.exists(rels_dynamic_file):
-		LOGGER.info('[TR] hpg files exist in decompressed format, skipping de-compression.')
-
-	elif os.path.exists(nodes_file_gz) and os.path.exists(rels_file_gz) and os.path.exists(rels_dynamic_file_gz):
-		LOGGER.info('[TR] de-compressing hpg.')
-		# de-compress the hpg 
-		IOModule.decompress_graph(webpage_folder)
-	else:
+	# plain, .gz or .zst files; the compressed files are imported without de-compressing them on disk
+	[nodes_file, rels_file, rels_dynamic_file] = IOModule.get_graph_files(webpage_folder)
+	if nodes_file is None or rels_file is None:
 		LOGGER.error('[TR] The nodes/rels.csv files do not exist in %s, skipping.'%webpage_folder)
 		return False
 
@@ -133,13 +121,14 @@ def main():
 		DU.ineo_set_bolt_port_for_db_instance(database_name, neo4j_bolt_port)
 
 	LOGGER.info('[TR] importing the database with neo4j-admin.')
-	DU.neoadmin_import_db_instance(database_name, neo4j_database_name, nodes_file, rels_file, rels_dynamic_file)
+	with compressionModule.import_files([nodes_file, rels_file, rels_dynamic_file]) as graph_files:
+		DU.neoadmin_import_db_instance(database_name, neo4j_database_name, *graph_files)
 
 	LOGGER.info('[TR] changing the default neo4j password to enable programmatic access.')
 	DU.ineo_set_initial_password_and_restart(database_name, password=constantsModule.NEO4J_PASS)
 
-	# compress the hpg after the model import
-	IOModule.compress_graph(webpage_folder)
+	# compress the hpg files that are still plain
+	compressionModule.compress_graph(webpage_folder)
 
 	LOGGER.info('[TR] waiting for the neo4j connection to be ready...')
 	time.sleep(10)
@@ -156,6 +145,9 @@ def main():
 			LOGGER.info('[TR] ran into exception while prematurely stopping neo4j for %s'%str(database_name))
 		return connection_success
 
+	LOGGER.info('[TR] creating the hpg indexes.')
+	DU.create_hpg_indexes(conn=constantsModule.NEO4J_CONN_STRING)
+
 	LOGGER.info('[TR] starting to run the queries.')
 	webpage_url = get_url_for_webpage(webpage_folder)
 	try:
@@ -173,6 +165,7 @@ def main():
 
 	## note: these steps are done in the top level module, as timeout may occur here
 	LOGGER.info('[TR] stopping neo4j for %s'%str(database_name))
+	DU.close_driver(constantsModule.NEO4J_CONN_STRING)
 	DU.ineo_stop_db_instance(database_name)
 
 	## remove db after analysis
@@ -442,7 +442,8 @@ var lib_src_heuristics = [
 module.exports = {
   js_builtin: js_builtin,
   lib_src_heuristics: lib_src_heuristics,
-  lib_content_heuristics: lib_content_heuristics
+  lib_content_heuristics: lib_content_heuristics,
+  lib_content_heuristics_names: lib_content_heuristics_names
 };
 
 
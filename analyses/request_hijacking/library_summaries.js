@@ -0,0 +1,124 @@
+/*
+	Copyright (C) 2022  Soheil Khodayari, CISPA
+	This program is free software: you can redistribute it and/or modify
+	it under the terms of the GNU Affero General Public License as published by
+	the Free Software Foundation, either version 3 of the License, or
+	(at your option) any later version.
+	This program is distributed in the hope that it will be useful,
+	but WITHOUT ANY WARRANTY; without even the implied warranty of
+	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+	GNU Affero General Public License for more details.
+	You should have received a copy of the GNU Affero General Public License
+	along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+	Description:
+	------------
+	Library summaries compiled by `python3 -m symbolic_modeling.summaries`.
+	A library script of a webpage is matched to a summary by the SHA256 hash of its content,
+	or else by the name of the content heuristic that identified it as a library, if the script
+	has one of the versions of the summarized library files.
+*/
+
+
+const fs = require('fs');
+const pathModule = require('path');
+const crypto = require('crypto');
+
+
+// prefix of the names of the summary scripts added to the webpages, i.e., `summary.<library>.js`
+const SUMMARY_SCRIPT_PREFIX = 'summary.';
+
+// e.g., `jQuery v3.5.0`, `Backbone.js 1.4.0` or `VERSION = "1.0.0"` in the first characters of a library script;
+// same as `get_library_version` of `symbolic_modeling.summaries`
+const VERSION_PATTERN = /(?:^|[^\w.])v?(\d+\.\d+\.\d+)(?![\w.])/;
+const VERSION_HEADER_LENGTH = 1024;
+
+
+/**
+ * @param {string} scriptContent: source of a library script
+ * @return {string} the version in the header of the script, e.g., `3.5.0`, or null
+ */
+function getLibraryVersion(scriptContent){
+	"use strict";
+	let match = VERSION_PATTERN.exec(scriptContent.substring(0, VERSION_HEADER_LENGTH));
+	return match? match[1]: null;
+}
+
+
+/**
+ * @param {string} webpageFolder: directory of the webpage
+ * @param {string} libraryName
+ * @return {string} path of the summary script of the library
+ */
+function getSummaryScriptName(webpageFolder, libraryName){
+	"use strict";
+	return pathModule.join(webpageFolder, SUMMARY_SCRIPT_PREFIX + libraryName + '.js');
+}
+
+
+/**
+ * @param {string} scriptName: path of a script of the webpage
+ * @return {boolean} whether the script is a library summary, whose request calls are not sinks of the webpage
+ */
+function isSummaryScript(scriptName){
+	"use strict";
+	return typeof scriptName === 'string' && pathModule.basename(scriptName).startsWith(SUMMARY_SCRIPT_PREFIX);
+}
+
+
+/**
+ * LibrarySummaries
+ * @constructor
+ * @param {string} summariesFile: path of the summaries file
+ */
+function LibrarySummaries(summariesFile){
+	"use strict";
+	this.libraries = {};
+	this.fingerprints = {}; // sha256 -> library name
+	this.names = {}; // library or heuristic name -> library name
+
+	let content = JSON.parse(fs.readFileSync(summariesFile, 'utf8'));
+	let libraries = content.libraries || {};
+	for(let name of Object.keys(libraries)){
+		let library = libraries[name];
+		this.libraries[name] = library;
+		for(let fingerprint of (library.fingerprints || [])){
+			this.fingerprints[fingerprint] = name;
+		}
+		for(let alias of (library.names || [name])){
+			this.names[alias] = name;
+		}
+	}
+}
+
+
+/**
+ * @param {string} scriptContent: source of a library script
+ * @param {string} heuristicName: name of the library according to the content heuristics, if any
+ * @return {Object} {name, stub} of the summary of the library, or null if the library is not summarized
+ */
+LibrarySummaries.prototype.match = function(scriptContent, heuristicName){
+	"use strict";
+	let fingerprint = crypto.createHash('sha256').update(scriptContent, 'utf8').digest('hex');
+	let name = this.fingerprints[fingerprint];
+	if(!name && heuristicName && this.names[heuristicName]){
+		// the summary of one version of a library does not hold for the others
+		let versions = this.libraries[this.names[heuristicName]].versions || [];
+		if(versions.includes(getLibraryVersion(scriptContent))){
+			name = this.names[heuristicName];
+		}
+	}
+	if(!name){
+		return null;
+	}
+	return {name: name, stub: this.libraries[name].stub};
+};
+
+
+module.exports = {
+	LibrarySummaries: LibrarySummaries,
+	getLibraryVersion: getLibraryVersion,
+	getSummaryScriptName: getSummaryScriptName,
+	isSummaryScript: isSummaryScript,
+};
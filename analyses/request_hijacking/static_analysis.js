@@ -41,6 +41,9 @@ const SourceSinkAnalyzer = SourceSinkAnalyzerModule.REQHijackSourceSinkAnalyzer;
 
 
 const GraphExporter = require('./../../engine/core/io/graphexporter');
+const ScriptCache = require('./../../engine/core/io/scriptcache').ScriptCache;
+const LibrarySummaries = require('./library_summaries.js').LibrarySummaries;
+const getSummaryScriptName = require('./library_summaries.js').getSummaryScriptName;
 
 /**
  * ------------------------------------------------
@@ -59,6 +62,10 @@ const DEBUG = true;
 const do_ast_preprocessing_passes = false;
 var do_compress_graphs = true;
 var overwrite_hpg = false;
+// content-addressed cache of per-script artifacts shared across webpages (null: disabled)
+var script_cache = null;
+// summaries that replace known library scripts in the HPG (null: libraries are left out)
+var library_summaries = null;
 /**
  * ------------------------------------------------
  *  			utility functions
@@ -164,6 +171,54 @@ function isLibraryScript(script, options){
 	return return_flag;
 }
 
+
+/** 
+ * @function getLibraryHeuristicName 
+ * @param {string} script_content: script content
+ * @return {string} name of the library whose content heuristic matches the script, or null
+**/
+function getLibraryHeuristicName(script_content){
+
+	let content = script_content.toLowerCase();
+	for(let i=0; i<globalsModule.lib_content_heuristics.length; i++){
+		if(content.includes(globalsModule.lib_content_heuristics[i].toLowerCase())){
+			return globalsModule.lib_content_heuristics_names[i] || null;
+		}
+	}
+	return null;
+}
+
+
+/** 
+ * @function addLibrarySummary 
+ * @param {array} scripts: scripts of the webpage to analyze
+ * @param {object} summarized_libraries: names of the libraries whose summaries were added -> script names
+ * @param {string} script_short_name: name of the library script, e.g., 1.js
+ * @param {string} script_content: content of the library script
+ * @param {string} webpageFolder: directory of the webpage
+ * @return {boolean} whether the library is summarized; the summary of each library is added once per webpage
+**/
+function addLibrarySummary(scripts, summarized_libraries, script_short_name, script_content, webpageFolder){
+
+	if(!library_summaries || script_content === -1){
+		return false;
+	}
+	let summary = library_summaries.match(script_content, getLibraryHeuristicName(script_content));
+	if(!summary){
+		return false;
+	}
+	if(!(summary.name in summarized_libraries)){
+		summarized_libraries[summary.name] = [];
+		scripts.push({
+			scriptId: 'summary.' + summary.name,
+			source: summary.stub,
+			name: getSummaryScriptName(webpageFolder, summary.name),
+		});
+	}
+	summarized_libraries[summary.name].push(script_short_name);
+	return true;
+}
+
 /**
  * ------------------------------------------------
  *  		Main Static Analysis Thread
@@ -198,6 +253,7 @@ async function staticallyAnalyzeWebpage(url, webpageFolder){
 	
 
 	var library_scripts = [];
+	var summarized_libraries = {};
 	let scriptFiles = dirContent.filter(function( elm ) {return elm.match(/.*\.(js$)/ig);});
 	for(let i=0; i<scriptFiles.length; i++){
 		
@@ -214,6 +270,9 @@ async function staticallyAnalyzeWebpage(url, webpageFolder){
 				
 				if(is_library){
 					library_scripts.push(script_short_name);
+					if(library_summaries){
+						addLibrarySummary(scripts, summarized_libraries, script_short_name, await readFile(script_full_name), webpageFolder);
+					}
 					continue;
 				}
 			}
@@ -228,6 +287,7 @@ async function staticallyAnalyzeWebpage(url, webpageFolder){
 			if(is_library){
 				
 				library_scripts.push(script_short_name);
+				addLibrarySummary(scripts, summarized_libraries, script_short_name, script_content, webpageFolder);
 				continue;
 			}
 			scripts.push({
@@ -245,6 +305,10 @@ async function staticallyAnalyzeWebpage(url, webpageFolder){
 
 	let library_scripts_path_name = pathModule.join(webpageFolder, 'library_scripts.json');
 	fs.writeFileSync(library_scripts_path_name, JSON.stringify(library_scripts));
+	if(library_summaries){
+		// library name -> library scripts that were replaced by the summary of the library
+		fs.writeFileSync(pathModule.join(webpageFolder, 'library_summaries.json'), JSON.stringify(summarized_libraries));
+	}
 	
 	/*
 	*  ----------------------------------------------
@@ -270,7 +334,7 @@ async function staticallyAnalyzeWebpage(url, webpageFolder){
 	let parsingErrors = [];
 	for(let [idx, script] of scripts.entries()){
 		let scriptName = script.name; // '' + idx + '.js';
-		let parsingError = await SourceSinkAnalyzerInstance.api.initializeModelsFromSource(scriptName, script.source, constantsModule.LANG.js, do_ast_preprocessing_passes)
+		let parsingError = await SourceSinkAnalyzerInstance.api.initializeModelsFromSource(scriptName, script.source, constantsModule.LANG.js, do_ast_preprocessing_passes, script_cache)
 		if(parsingError && parsingError === scriptName){
 			parsingErrors.push(parsingError);
 		}
@@ -331,7 +395,7 @@ async function staticallyAnalyzeWebpage(url, webpageFolder){
 
 		
 	DEBUG && console.log('[StaticAnalysis] started finding request hijacking sinks.')
-	const sinks = await SourceSinkAnalyzerInstance.get_sinks();
+	const sinks = await SourceSinkAnalyzerInstance.get_sinks(script_cache);
 
 	const sinksWithUrl = {
 		"url": url,
@@ -343,6 +407,9 @@ async function staticallyAnalyzeWebpage(url, webpageFolder){
 	await fs.writeFileSync(sinksOutputFileName, sinksWithUrlJson, 'utf8'); 
 
 	DEBUG && console.log('[StaticAnalysis] finished finding request hijacking sinks.')
+	if(script_cache){
+		DEBUG && console.log('[StaticAnalysis] script cache: ' + JSON.stringify(script_cache.stats));
+	}
 
 
 	const totalTime = totalTimer.get();
@@ -374,6 +441,17 @@ async function staticallyAnalyzeWebpage(url, webpageFolder){
     
     overwrite_hpg = (config.overwritehpg && config.overwritehpg.toLowerCase() === 'true')? true: false; 
     do_compress_graphs = (config.compresshpg && config.compresshpg.toLowerCase() === 'false')? false: true; 
+    if(config.scriptcache && config.scriptcache.toLowerCase() !== 'false'){
+    	script_cache = new ScriptCache(config.scriptcache.toLowerCase() === 'true'? pathModule.join(dataStorageDirectory, '.script_cache'): config.scriptcache);
+    }
+    if(config.librarysummaries && config.librarysummaries.toLowerCase() !== 'false'){
+    	let summaries_file = config.librarysummaries.toLowerCase() === 'true'? pathModule.join(dataStorageDirectory, 'libraries', 'summaries.json'): config.librarysummaries;
+    	try{
+    		library_summaries = new LibrarySummaries(summaries_file);
+    	}catch(err){
+    		console.log('[Warning] could not load the library summaries from ' + summaries_file + ': ' + err);
+    	}
+    }
   	
 
 	if(single_folder && single_folder.length > 10){
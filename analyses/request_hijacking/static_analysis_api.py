@@ -29,13 +29,69 @@
 
 import os, sys, json
 import utils.io as IOModule
+import utils.compression as compressionModule
 import constants as constantsModule
 import utils.utility as utilityModule
+import hpg_neo4j.columnar_graph as columnarGraphModule
+from hpg_neo4j.in_memory_graph import InMemoryGraph
 from utils.logging import logger as LOGGER
 
 
 
-def start_model_construction(website_url, memory=None, timeout=None, compress_hpg='true', overwrite_hpg='false', specific_webpage=None):
+def export_columnar_hpg(webpage_folder, overwrite=False):
+
+	"""
+	writes the columnar representation of the HPG of a webpage next to its csv files
+	@param {string} webpage_folder: absolute path of the webpage directory
+	@param {bool} overwrite: re-write an existing columnar HPG
+	@return {bool} whether or not a columnar HPG exists for the webpage afterwards
+	"""
+
+	if columnarGraphModule.has_columnar_graph(webpage_folder) and str(overwrite).lower() != 'true':
+		return True
+
+	[nodes_file, rels_file, rels_dynamic_file] = IOModule.get_graph_files(webpage_folder)
+	if nodes_file is None or rels_file is None:
+		return False
+
+	try:
+		graph = InMemoryGraph.load(nodes_file, rels_file, rels_dynamic_file)
+		graph.to_columnar(columnarGraphModule.get_columnar_folder(webpage_folder))
+		return True
+	except Exception as e:
+		LOGGER.error('failed to write the columnar hpg of %s: %s'%(webpage_folder, str(e)))
+		return False
+
+
+
+def finalize_hpg(webpage_folder, compress_hpg='true', overwrite_hpg='false', columnar_hpg=False, compression=None):
+
+	"""
+	post-processes the csv files of a webpage after the HPG construction
+	@param {string} webpage_folder: absolute path of the webpage directory
+	@param {string} compression: 'gzip' or 'zstd'; gzip compression is done by the node process itself
+	"""
+
+	if columnar_hpg:
+		export_columnar_hpg(webpage_folder, overwrite=overwrite_hpg)
+
+	if str(compress_hpg).lower() == 'true' and compression == compressionModule.COMPRESSION_ZSTD:
+		try:
+			compressionModule.compress_graph(webpage_folder, method=compression)
+		except Exception as e:
+			LOGGER.error('failed to compress the hpg of %s: %s'%(webpage_folder, str(e)))
+
+
+
+def start_model_construction(website_url, memory=None, timeout=None, compress_hpg='true', overwrite_hpg='false', specific_webpage=None, columnar_hpg=False, compression=None, script_cache=False, skip_webpages=None, library_summaries=False):
+
+	"""
+	@param {bool} columnar_hpg: also write a columnar, memory-mappable copy of each HPG (see `hpg_neo4j.columnar_graph`)
+	@param {string} compression: compression of the csv files, 'gzip' or 'zstd' (default: constants.HPG_COMPRESSION)
+	@param {set} skip_webpages: webpages not to analyze, e.g., the redundant members of page clusters (see `utils.page_clusters`)
+	@param {bool} script_cache: re-use the parsed ASTs and sinks of scripts analyzed before, keyed by their content hash (stored in constants.SCRIPT_CACHE_DIR)
+	@param {bool} library_summaries: replace known library scripts with their summaries (constants.LIBRARY_SUMMARIES_FILE, see `symbolic_modeling.summaries`)
+	"""
 
 	# setup defaults
 	if memory is None:
@@ -52,8 +108,21 @@ def start_model_construction(website_url, memory=None, timeout=None, compress_hp
 	request_hijacking_analyses_command_cwd = os.path.join(constantsModule.BASE_DIR, "analyses/request_hijacking")
 	request_hijacking_static_analysis_driver_program = os.path.join(request_hijacking_analyses_command_cwd, "static_analysis.js")
 
-	request_hijacking_static_analysis_command = "node --max-old-space-size=%s DRIVER_ENTRY --singlefolder=SINGLE_FOLDER --compresshpg=%s --overwritehpg=%s"%(static_analysis_memory, compress_hpg, overwrite_hpg)
+	if compression is None:
+		compression = constantsModule.HPG_COMPRESSION
+
+	# the node process only supports gzip, zstd compression is done by `finalize_hpg`
+	node_compress_hpg = compress_hpg if compression == compressionModule.COMPRESSION_GZIP else 'false'
+
+	request_hijacking_static_analysis_command = "node --max-old-space-size=%s DRIVER_ENTRY --singlefolder=SINGLE_FOLDER --compresshpg=%s --overwritehpg=%s"%(static_analysis_memory, node_compress_hpg, overwrite_hpg)
 	request_hijacking_static_analysis_command = request_hijacking_static_analysis_command.replace("DRIVER_ENTRY", request_hijacking_static_analysis_driver_program)
+	if script_cache:
+		request_hijacking_static_analysis_command = request_hijacking_static_analysis_command + " --scriptcache=%s"%constantsModule.SCRIPT_CACHE_DIR
+	if library_summaries:
+		if os.path.exists(constantsModule.LIBRARY_SUMMARIES_FILE):
+			request_hijacking_static_analysis_command = request_hijacking_static_analysis_command + " --librarysummaries=%s"%constantsModule.LIBRARY_SUMMARIES_FILE
+		else:
+			LOGGER.warning('library summaries do not exist at %s; run `python3 -m symbolic_modeling.summaries` first'%constantsModule.LIBRARY_SUMMARIES_FILE)
 
 
 	website_folder_name = utilityModule.getDirectoryNameFromURL(website_url)
@@ -68,6 +137,7 @@ def start_model_construction(website_url, memory=None, timeout=None, compress_hp
 		if os.path.exists(webpage_folder):
 			node_command= request_hijacking_static_analysis_command.replace('SINGLE_FOLDER', webpage_folder)
 			IOModule.run_os_command(node_command, cwd=request_hijacking_analyses_command_cwd, timeout=static_analysis_per_webpage_timeout, print_stdout=True, log_command=True)
+			finalize_hpg(webpage_folder, compress_hpg=compress_hpg, overwrite_hpg=overwrite_hpg, columnar_hpg=columnar_hpg, compression=compression)
 
 	elif os.path.exists(webpages_json_file):
 
@@ -76,11 +146,14 @@ def start_model_construction(website_url, memory=None, timeout=None, compress_hp
 		fd.close()
 
 		for webpage in webpages:
+			if skip_webpages and webpage in skip_webpages:
+				continue
 			webpage_folder = os.path.join(website_folder, webpage)
 			if os.path.exists(webpage_folder):
 				
 				node_command= request_hijacking_static_analysis_command.replace('SINGLE_FOLDER', webpage_folder)
 				IOModule.run_os_command(node_command, cwd=request_hijacking_analyses_command_cwd, timeout=static_analysis_per_webpage_timeout, print_stdout=True, log_command=True)
+				finalize_hpg(webpage_folder, compress_hpg=compress_hpg, overwrite_hpg=overwrite_hpg, columnar_hpg=columnar_hpg, compression=compression)
 
 
 
@@ -101,10 +174,13 @@ def start_model_construction(website_url, memory=None, timeout=None, compress_hp
 		for url in urls:
 			url = url.strip().rstrip('\n').strip()
 			webpage_folder_name = utilityModule.sha256(url)
+			if skip_webpages and webpage_folder_name in skip_webpages:
+				continue
 			webpage_folder = os.path.join(website_folder, webpage_folder_name)
 			if os.path.exists(webpage_folder):
 				node_command= request_hijacking_static_analysis_command.replace('SINGLE_FOLDER', webpage_folder)
 				IOModule.run_os_command(node_command, cwd=request_hijacking_analyses_command_cwd, timeout=static_analysis_per_webpage_timeout, print_stdout=True, log_command=True)
+				finalize_hpg(webpage_folder, compress_hpg=compress_hpg, overwrite_hpg=overwrite_hpg, columnar_hpg=columnar_hpg, compression=compression)
 
 	else:
 		message = 'no webpages.json or urls.out file exists in the webapp directory; skipping analysis...'
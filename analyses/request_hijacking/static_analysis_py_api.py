@@ -32,13 +32,22 @@ import time
 import json
 import constants as constantsModule
 import utils.io as IOModule
+import utils.compression as compressionModule
 import docker.neo4j.manage_container as dockerModule
 import hpg_neo4j.db_utility as DU
 import hpg_neo4j.query_utility as QU
+import hpg_neo4j.graph_cache as graph_cache
+from hpg_neo4j.in_memory_graph import InMemoryGraph
+import hpg_neo4j.columnar_graph as columnarGraphModule
 import analyses.request_hijacking.traversals_cypher as request_hijacking_py_traversals
+import analyses.request_hijacking.triage as triageModule
 from utils.logging import logger as LOGGER
  
 
+# backends that the traversals can run over
+GRAPH_BACKEND_NEO4J = 'neo4j'
+GRAPH_BACKEND_MEMORY = 'memory'
+
 
 def get_url_for_webpage(webpage_directory):
 	content = None
@@ -62,18 +71,26 @@ def get_name_from_url(url):
 # ------------------------------------------------------------------------------------ #
 #	Interface
 # ------------------------------------------------------------------------------------ #
-def build_and_analyze_hpg(seed_url, timeout=1800, overwrite=False, compress_hpg=True):
+def build_and_analyze_hpg(seed_url, timeout=1800, overwrite=False, compress_hpg=True, http_port=None, bolt_port=None, instance=None, backend=GRAPH_BACKEND_NEO4J, skip_webpages=None, triage=False):
 
 	"""	
 	@param {string} seed_url
 	@param {integer} timeout: per page static analysis timeout
+	@param {string} http_port: http port of the neo4j instance (default: the configured port)
+	@param {string} bolt_port: bolt port of the neo4j instance (default: the configured port)
+	@param {Neo4jInstance} instance: a warm instance of a `Neo4jInstancePool` to load the HPGs into (optional)
+	@param {string} backend: `neo4j`, or `memory` to run the traversals in-process without a database
+	@param {set} skip_webpages: webpages not to analyze, e.g., the redundant members of page clusters (see `utils.page_clusters`)
+	@param {bool} triage: whether to skip the neo4j import of webpages that can not yield flows (see `triage.py`)
 	@description: imports an HPG inside a neo4j graph database and runs traversals over it.
 	"""
 
-	if str(constantsModule.NEO4J_USE_DOCKER).lower() == 'true':
-		build_and_analyze_hpg_docker(seed_url, conn_timeout=timeout)
+	if backend == GRAPH_BACKEND_MEMORY:
+		build_and_analyze_hpg_in_memory(seed_url, overwrite=overwrite, skip_webpages=skip_webpages)
+	elif str(constantsModule.NEO4J_USE_DOCKER).lower() == 'true':
+		build_and_analyze_hpg_docker(seed_url, conn_timeout=timeout, skip_webpages=skip_webpages, triage=triage)
 	else:
-		build_and_analyze_hpg_local(seed_url, overwrite=overwrite, conn_timeout=timeout, compress_hpg=compress_hpg)
+		build_and_analyze_hpg_local(seed_url, overwrite=overwrite, conn_timeout=timeout, compress_hpg=compress_hpg, http_port=http_port, bolt_port=bolt_port, instance=instance, skip_webpages=skip_webpages, triage=triage)
 
 	# if timeout is not None:
 	# 	build_and_analyze_hpg_local_with_timeout(seed_url, timeout=timeout, overwrite=overwrite)
@@ -145,7 +162,25 @@ def build_and_analyze_hpg_local_with_timeout(seed_url, timeout=None, overwrite=F
 			LOGGER.info('[TR] finished HPG analyis for: %s'%(webpage_folder))
 
 
-def build_and_analyze_hpg_local(seed_url, overwrite=False, conn_timeout=None, compress_hpg=True):
+def build_and_analyze_hpg_local(seed_url, overwrite=False, conn_timeout=None, compress_hpg=True, http_port=None, bolt_port=None, instance=None, skip_webpages=None, triage=False):
+
+	"""	
+	@param {string} seed_url
+	@param {string} http_port: http port of the neo4j instance; needed to run several instances side by side
+	@param {string} bolt_port: bolt port of the neo4j instance
+	@param {Neo4jInstance} instance: a warm instance of a `Neo4jInstancePool`; if set, the HPG of each webpage 
+			is swapped into this instance rather than into a new ineo instance created for the webpage
+	@param {bool} triage: whether to skip the neo4j import of webpages that can not yield flows
+	@description: imports the HPG of each webpage inside a local ineo instance and runs traversals over it.
+	"""
+
+	if http_port is None:
+		http_port = constantsModule.NEO4J_HTTP_PORT
+	if bolt_port is None:
+		bolt_port = constantsModule.NEO4J_BOLT_PORT
+
+	neo4j_conn_http_string = "http://127.0.0.1:%s"%str(http_port)
+	neo4j_conn_string = "bolt://127.0.0.1:%s"%str(bolt_port)
 
 	webapp_folder_name = get_name_from_url(seed_url)
 	webapp_data_directory = os.path.join(constantsModule.DATA_DIR, webapp_folder_name)
@@ -169,6 +204,9 @@ def build_and_analyze_hpg_local(seed_url, overwrite=False, conn_timeout=None, co
 		webapp_pages = [item for item in webapp_pages if len(item) == 64]
 
 
+	if skip_webpages:
+		webapp_pages = [webpage for webpage in webapp_pages if webpage not in skip_webpages]
+
 	for webpage in webapp_pages:
 		webpage_folder = os.path.join(webapp_data_directory, webpage)
 		if os.path.exists(webpage_folder):
@@ -188,27 +226,21 @@ def build_and_analyze_hpg_local(seed_url, overwrite=False, conn_timeout=None, co
 
 			database_name = '{0}_{1}'.format(webapp_folder_name, webpage) 
 
-			nodes_file = os.path.join(webpage_folder, constantsModule.NODE_INPUT_FILE_NAME)
-			rels_file =  os.path.join(webpage_folder, constantsModule.RELS_INPUT_FILE_NAME)
-			rels_dynamic_file = os.path.join(webpage_folder, constantsModule.RELS_DYNAMIC_INPUT_FILE_NAME)
-
-			nodes_file_gz = os.path.join(webpage_folder, constantsModule.NODE_INPUT_FILE_NAME +'.gz')
-			rels_file_gz =  os.path.join(webpage_folder, constantsModule.RELS_INPUT_FILE_NAME  +'.gz')
-			rels_dynamic_file_gz = os.path.join(webpage_folder, constantsModule.RELS_DYNAMIC_INPUT_FILE_NAME  +'.gz')
+			# plain, .gz or .zst files; the compressed files are imported without de-compressing them on disk
+			[nodes_file, rels_file, rels_dynamic_file] = IOModule.get_graph_files(webpage_folder)
+			if nodes_file is None or rels_file is None:
+				LOGGER.error('[TR] The nodes/rels.csv files do not exist in %s, skipping.'%webpage_folder)
+				continue
 
-			if os.path.exists(nodes_file) and os.path.exists(rels_file) and os.path.exists(rels_dynamic_file):
-				LOGGER.info('[TR] hpg files exist in decompressed format, skipping de-compression.')
+			if str(triage).lower() == 'true' and not triage_webpage_before_import(webpage_folder, webpage, nodes_file, rels_file, rels_dynamic_file):
+				continue
 
-			elif os.path.exists(nodes_file_gz) and os.path.exists(rels_file_gz) and os.path.exists(rels_dynamic_file_gz):
-				LOGGER.info('[TR] de-compressing hpg.')
-				# de-compress the hpg 
-				IOModule.decompress_graph(webpage_folder)
-			else:
-				LOGGER.error('[TR] The nodes/rels.csv files do not exist in %s, skipping.'%webpage_folder)
+			if instance is not None:
+				analyze_hpg_with_instance(instance, webpage_folder, webpage, nodes_file, rels_file, rels_dynamic_file, conn_timeout=conn_timeout, compress_hpg=compress_hpg)
 				continue
 
-			neo4j_http_port = constantsModule.NEO4J_HTTP_PORT
-			neo4j_bolt_port = constantsModule.NEO4J_BOLT_PORT
+			neo4j_http_port = http_port
+			neo4j_bolt_port = bolt_port
 
 			LOGGER.warning('[TR] removing any previous neo4j instance for %s'%str(database_name))
 			DU.ineo_remove_db_instance(database_name)
@@ -222,19 +254,20 @@ def build_and_analyze_hpg_local(seed_url, overwrite=False, conn_timeout=None, co
 				DU.ineo_set_bolt_port_for_db_instance(database_name, neo4j_bolt_port)
 
 			LOGGER.info('[TR] importing the database with neo4j-admin.')
-			DU.neoadmin_import_db_instance(database_name, neo4j_database_name, nodes_file, rels_file, rels_dynamic_file)
+			with compressionModule.import_files([nodes_file, rels_file, rels_dynamic_file]) as graph_files:
+				DU.neoadmin_import_db_instance(database_name, neo4j_database_name, *graph_files)
 
 			LOGGER.info('[TR] changing the default neo4j password to enable programmatic access.')
 			DU.ineo_set_initial_password_and_restart(database_name, password=constantsModule.NEO4J_PASS)
 
 			if str(compress_hpg).lower() == 'true':
-				# compress the hpg after the model import
-				IOModule.compress_graph(webpage_folder)
+				# compress the hpg files that are still plain
+				compressionModule.compress_graph(webpage_folder)
 
 			LOGGER.info('[TR] waiting for the neo4j connection to be ready...')
 			time.sleep(10)
-			LOGGER.info('[TR] connection: %s'%constantsModule.NEO4J_CONN_HTTP_STRING)
-			connection_success = DU.wait_for_neo4j_bolt_connection(timeout=150, conn=constantsModule.NEO4J_CONN_HTTP_STRING)
+			LOGGER.info('[TR] connection: %s'%neo4j_conn_http_string)
+			connection_success = DU.wait_for_neo4j_bolt_connection(timeout=150, conn=neo4j_conn_http_string)
 			if not connection_success:
 				try:
 					LOGGER.info('[TR] stopping neo4j for %s'%str(database_name))
@@ -246,20 +279,14 @@ def build_and_analyze_hpg_local(seed_url, overwrite=False, conn_timeout=None, co
 					LOGGER.info('[TR] ran into exception while prematurely stopping neo4j for %s'%str(database_name))
 				continue
 
+			LOGGER.info('[TR] creating the hpg indexes.')
+			DU.create_hpg_indexes(conn=neo4j_conn_string)
+
 			LOGGER.info('[TR] starting to run the queries.')
-			webpage_url = get_url_for_webpage(webpage_folder)
-			try:
-				DU.exec_fn_within_transaction(request_hijacking_py_traversals.run_traversals, webpage_url, webpage_folder, webpage, conn=constantsModule.NEO4J_CONN_STRING, conn_timeout=conn_timeout)
-			except Exception as e:
-				LOGGER.error(e)
-				LOGGER.error('[TR] neo4j connection error.')
-				outfile =  os.path.join(webpage_folder, "sinks.flows.out")
-				if not os.path.exists(outfile):
-					with open(outfile, 'w+') as fd:
-						error_json = {"error": str(e)}
-						json.dump(error_json, fd, ensure_ascii=False, indent=4)
+			run_traversals_for_webpage(webpage_folder, webpage, conn=neo4j_conn_string, conn_timeout=conn_timeout)
 
 			LOGGER.info('[TR] stopping neo4j for %s'%str(database_name))
+			DU.close_driver(neo4j_conn_string)
 			DU.ineo_stop_db_instance(database_name)
 
 			## remove db after analysis
@@ -267,10 +294,183 @@ def build_and_analyze_hpg_local(seed_url, overwrite=False, conn_timeout=None, co
 			DU.ineo_remove_db_instance(database_name)
 
 
-def build_and_analyze_hpg_docker(seed_url, conn_timeout=None):
+def triage_webpage_before_import(webpage_folder, webpage, nodes_file, rels_file, rels_dynamic_file=None):
+
+	"""
+	handles the webpages that need no neo4j import according to their triage:
+		- webpages without sinks get an empty output
+		- webpages without taintable sinks are analyzed in-memory
+	@param {string} webpage_folder: absolute path of the webpage directory
+	@param {string} webpage: name (hash) of the webpage directory
+	@return {bool} whether or not the HPG of the webpage must still be imported into neo4j
+	"""
+
+	(decision, reason) = triageModule.triage_webpage(webpage_folder, nodes_file)
+	triageModule.store_triage_result(webpage_folder, decision, reason)
+
+	if decision == triageModule.TRIAGE_ANALYZE:
+		return True
+
+	if decision == triageModule.TRIAGE_IN_MEMORY:
+		analyze_hpg_in_memory(webpage_folder, webpage, nodes_file, rels_file, rels_dynamic_file)
+	elif triageModule.load_sinks(webpage_folder) is not None:
+		# no sinks, or no graph to query them on
+		webpage_url = get_url_for_webpage(webpage_folder)
+		request_hijacking_py_traversals.store_empty_traversals_output(webpage_url, webpage_folder)
+	return False
+
+
+
+def run_traversals_for_webpage(webpage_folder, webpage, conn, conn_timeout=None, database=None):
+
+	"""
+	runs the request hijacking traversals over the HPG of a webpage that is loaded in neo4j
+	@param {string} webpage_folder: absolute path of the webpage directory
+	@param {string} webpage: name (hash) of the webpage directory
+	@param {string} conn: bolt connection string
+	@param {string} database: neo4j database holding the HPG (default: the default database)
+	"""
+
+	webpage_url = get_url_for_webpage(webpage_folder)
+	try:
+		DU.exec_fn_within_transaction(request_hijacking_py_traversals.run_traversals, webpage_url, webpage_folder, webpage, conn=conn, conn_timeout=conn_timeout, database=database)
+	except Exception as e:
+		LOGGER.error(e)
+		LOGGER.error('[TR] neo4j connection error.')
+		write_traversals_error(webpage_folder, e)
+
+
+def write_traversals_error(webpage_folder, error):
+
+	"""
+	stores the error of a failed traversal run as the output of the webpage, unless an output already exists
+	@param {string} webpage_folder: absolute path of the webpage directory
+	@param {Exception} error
+	"""
+
+	outfile =  os.path.join(webpage_folder, "sinks.flows.out")
+	if not os.path.exists(outfile):
+		with open(outfile, 'w+') as fd:
+			error_json = {"error": str(error)}
+			json.dump(error_json, fd, ensure_ascii=False, indent=4)
+
+
+
+def build_and_analyze_hpg_in_memory(seed_url, overwrite=False, skip_webpages=None):
+
+	"""	
+	@param {string} seed_url
+	@description: loads the HPG of each webpage into an in-process graph and runs the traversals over it, 
+			i.e., no neo4j instance is created and the (compressed) csv files are read as they are.
+			the columnar HPG of a webpage is memory-mapped instead, if it exists.
+	"""
+
+	webapp_folder_name = get_name_from_url(seed_url)
+	webapp_data_directory = os.path.join(constantsModule.DATA_DIR, webapp_folder_name)
+	if not os.path.exists(webapp_data_directory):
+		LOGGER.error("[TR] did not found the directory for HPG analysis: "+str(webapp_data_directory))
+		return -1
+
+	webpages_json_file = os.path.join(webapp_data_directory, "webpages.json")
+	if os.path.exists(webpages_json_file):
+		fd = open(webpages_json_file, 'r')
+		webapp_pages = json.load(fd)
+		fd.close()
+	else:
+		# the name of each webpage folder is a hex digest of a SHA256 hash (as stored by the crawler)
+		webapp_pages = [item for item in os.listdir(webapp_data_directory) if len(item) == 64]
+
+	if skip_webpages:
+		webapp_pages = [webpage for webpage in webapp_pages if webpage not in skip_webpages]
+
+	for webpage in webapp_pages:
+		webpage_folder = os.path.join(webapp_data_directory, webpage)
+		if not os.path.exists(webpage_folder):
+			continue
+
+		if str(overwrite).lower() == 'false' and os.path.exists(os.path.join(webpage_folder, "sinks.flows.out")):
+			LOGGER.info('[TR] analyis results already exists for webpage: %s'%webpage_folder)
+			continue
+
+		[nodes_file, rels_file, rels_dynamic_file] = IOModule.get_graph_files(webpage_folder)
+		if (nodes_file is None or rels_file is None) and not columnarGraphModule.has_columnar_graph(webpage_folder):
+			LOGGER.error('[TR] The nodes/rels.csv files do not exist in %s, skipping.'%webpage_folder)
+			continue
+
+		LOGGER.warning('[TR] in-memory HPG analyis for: %s'%(webpage_folder))
+		analyze_hpg_in_memory(webpage_folder, webpage, nodes_file, rels_file, rels_dynamic_file)
+
+
+
+def analyze_hpg_in_memory(webpage_folder, webpage, nodes_file, rels_file, rels_dynamic_file=None):
+
+	"""
+	runs the request hijacking traversals over the HPG of a webpage without a database
+	@param {string} webpage_folder: absolute path of the webpage directory
+	@param {string} webpage: name (hash) of the webpage directory
+	@return {bool} whether or not the traversals were run
+	"""
+
+	try:
+		if columnarGraphModule.has_columnar_graph(webpage_folder):
+			graph = InMemoryGraph.load_columnar(columnarGraphModule.get_columnar_folder(webpage_folder))
+		else:
+			graph = InMemoryGraph.load(nodes_file, rels_file, rels_dynamic_file)
+	except Exception as e:
+		LOGGER.error('[TR] failed to load the hpg of %s: %s'%(webpage_folder, str(e)))
+		write_traversals_error(webpage_folder, e)
+		return False
+
+	webpage_url = get_url_for_webpage(webpage_folder)
+	try:
+		request_hijacking_py_traversals.run_traversals(graph, webpage_url, webpage_folder, webpage)
+	except Exception as e:
+		LOGGER.error(e)
+		LOGGER.error('[TR] in-memory traversal error.')
+		write_traversals_error(webpage_folder, e)
+		return False
+	finally:
+		graph_cache.release(graph)
+
+	return True
+
+
+
+def analyze_hpg_with_instance(instance, webpage_folder, webpage, nodes_file, rels_file, rels_dynamic_file, conn_timeout=None, compress_hpg=True):
+
+	"""
+	swaps the HPG of a webpage into a warm neo4j instance of the pool, and runs the traversals over it
+	@param {Neo4jInstance} instance
+	@param {string} webpage_folder: absolute path of the webpage directory
+	@param {string} webpage: name (hash) of the webpage directory
+	@return {bool} whether or not the traversals were run
+	"""
+
+	LOGGER.info('[TR] importing the hpg into the pooled neo4j instance %s.'%instance.name)
+	with compressionModule.import_files([nodes_file, rels_file, rels_dynamic_file]) as graph_files:
+		ready = instance.load_graph(*graph_files)
+
+	if str(compress_hpg).lower() == 'true':
+		# compress the hpg files that are still plain
+		compressionModule.compress_graph(webpage_folder)
+
+	if not ready:
+		LOGGER.error('[TR] pooled neo4j instance %s is not ready, skipping %s.'%(instance.name, webpage_folder))
+		instance.recover()
+		return False
+
+	LOGGER.info('[TR] starting to run the queries.')
+	run_traversals_for_webpage(webpage_folder, webpage, conn=instance.conn_string, conn_timeout=conn_timeout, database=instance.database)
+	instance.unload_graph()
+	return True
+
+
+
+def build_and_analyze_hpg_docker(seed_url, conn_timeout=None, skip_webpages=None, triage=False):
 
 	"""	
 	@param {string} seed_url
+	@param {bool} triage: whether to skip the neo4j import of webpages that can not yield flows
 	@description: imports an HPG inside a neo4j docker instance and runs traversals over it.
 	
 	"""
@@ -295,6 +495,9 @@ def build_and_analyze_hpg_docker(seed_url, conn_timeout=None):
 	database_name = 'neo4j'  
 	container_name = 'neo4j_container_'
 
+	if skip_webpages:
+		webapp_pages = [webpage for webpage in webapp_pages if webpage not in skip_webpages]
+
 	for each_webpage in webapp_pages:
 
 		relative_import_path = os.path.join(webapp_folder_name, each_webpage)
@@ -302,16 +505,15 @@ def build_and_analyze_hpg_docker(seed_url, conn_timeout=None):
 		webpage = os.path.join(webapp_data_directory, each_webpage)
 		LOGGER.warning('HPG for: %s'%(webpage))
 
-		# de-compress the hpg 
-		IOModule.decompress_graph(webpage)
-
 		# import the CSV files into an active neo4j database inside a docker container
 		if build:
-			nodes_file = os.path.join(webpage, constantsModule.NODE_INPUT_FILE_NAME)
-			rels_file =  os.path.join(webpage, constantsModule.RELS_INPUT_FILE_NAME)
-			if not (os.path.exists(nodes_file) and os.path.exists(rels_file)):
+			[nodes_file, rels_file, rels_dynamic_file] = IOModule.get_graph_files(webpage)
+			if nodes_file is None or rels_file is None:
 				LOGGER.error('The HPG nodes.csv / rels.csv files do not exist in the provided folder, skipping...')
 				continue
+
+			if str(triage).lower() == 'true' and not triage_webpage_before_import(webpage, each_webpage, nodes_file, rels_file, rels_dynamic_file):
+				continue
 			
 			# must build a container only once
 			if build_container: 
@@ -327,7 +529,7 @@ def build_and_analyze_hpg_docker(seed_url, conn_timeout=None):
 				time.sleep(5)
 
 			LOGGER.info('importing data inside container.')
-			dockerModule.import_data_inside_container(container_name, database_name, relative_import_path, 'CSV')
+			dockerModule.import_graph_inside_container(container_name, database_name, relative_import_path, webpage)
 			LOGGER.info('waiting for the tcp port 7474 of the neo4j container to be ready...')
 			connection_success = DU.wait_for_neo4j_bolt_connection(timeout=150)
 			if not connection_success:
@@ -339,11 +541,12 @@ def build_and_analyze_hpg_docker(seed_url, conn_timeout=None):
 			if not connection_success:
 				sys.exit(1)
 
-		# compress the hpg after the model import
-		IOModule.compress_graph(webpage)
+		# compress the hpg files that are still plain
+		compressionModule.compress_graph(webpage)
 
 		# step3: run the vulnerability detection queries
 		if query:
+			DU.create_hpg_indexes()
 			webpage_url = get_url_for_webpage(webpage)
 			DU.exec_fn_within_transaction(request_hijacking_py_traversals.run_traversals, webpage_url, webpage, each_webpage, conn_timeout=conn_timeout)
 
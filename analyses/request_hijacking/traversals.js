@@ -20,6 +20,7 @@
 const constantsModule = require('./../../engine/lib/jaw/constants');
 const esprimaParser = require('./../../engine/lib/jaw/parser/jsparser');
 const globalsModule = require('./globals.js');
+const isSummaryScript = require('./library_summaries.js').isSummaryScript;
 const walkes = require('walkes');
 const escodgen = require('escodegen');
 var Set = require('./../../engine/lib/analyses/set');
@@ -176,7 +177,7 @@ REQHijackSourceSinkAnalyzer.prototype.get_sources = async function(){
 }
 
 
-REQHijackSourceSinkAnalyzer.prototype.get_sinks = async function(){
+REQHijackSourceSinkAnalyzer.prototype.get_sinks = async function(scriptCache){
 
 	/*
 	====================
@@ -290,6 +291,21 @@ REQHijackSourceSinkAnalyzer.prototype.get_sinks = async function(){
 		const ast = scopeTree.scopes[0].ast;
 		const script_id = ast.value;
 
+		// the request calls of the library summaries only model the library functions called by the webpage
+		if(isSummaryScript(script_id)){
+			continue;
+		}
+
+		// re-use the sinks of scripts that were analyzed before on another page
+		if(scriptCache){
+			let cached_sinks = scriptCache.getSinks(ast);
+			if(cached_sinks){
+				outputs.push(...cached_sinks);
+				continue;
+			}
+		}
+		const script_outputs_start = outputs.length;
+
 		walkes(ast, {
 
 
@@ -680,6 +696,9 @@ REQHijackSourceSinkAnalyzer.prototype.get_sinks = async function(){
 
 		});
 
+		if(scriptCache){
+			scriptCache.putSinks(ast, outputs.slice(script_outputs_start));
+		}
 	}
 
 	return outputs;
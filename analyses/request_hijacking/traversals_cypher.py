@@ -402,7 +402,7 @@ def getWindowOpenCallExpressions(tx):
 	"""
 
 	query="""
-	MATCH (t {Type: 'ExpressionStatement'})-[:AST_parentOf {RelationType: 'expression'}]->(n {Type: 'CallExpression'})-[:AST_parentOf {RelationType: 'callee'}]-> (n1 {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'property'}]->(req {Type: 'Identifier', Code: 'open'}),
+	MATCH (t:ASTNode {Type: 'ExpressionStatement'})-[:AST_parentOf {RelationType: 'expression'}]->(n:ASTNode {Type: 'CallExpression'})-[:AST_parentOf {RelationType: 'callee'}]-> (n1:ASTNode {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'property'}]->(req:ASTNode {Type: 'Identifier', Code: 'open'}),
 	(n1)-[:AST_parentOf {RelationType: 'object'}]->(callee),
 	(n)-[:AST_parentOf {RelationType: 'arguments', Arguments: '{\"arg\":0}'}]->(a)
 	WHERE callee.Code= 'window'
@@ -420,7 +420,7 @@ def getXhrOpenCallExpressions(tx):
 	"""
 
 	query="""
-	MATCH (t {Type: 'ExpressionStatement'})-[:AST_parentOf {RelationType: 'expression'}]->(n {Type: 'CallExpression'})-[:AST_parentOf {RelationType: 'callee'}]-> (n1 {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'property'}]->(req {Type: 'Identifier', Code: 'open'}),
+	MATCH (t:ASTNode {Type: 'ExpressionStatement'})-[:AST_parentOf {RelationType: 'expression'}]->(n:ASTNode {Type: 'CallExpression'})-[:AST_parentOf {RelationType: 'callee'}]-> (n1:ASTNode {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'property'}]->(req:ASTNode {Type: 'Identifier', Code: 'open'}),
 	(n1)-[:AST_parentOf {RelationType: 'object'}]->(callee),
 	(n)-[:AST_parentOf {RelationType: 'arguments', Arguments: '{\"arg\":1}'}]->(a)
 	WHERE callee.Code <> 'window'
@@ -439,7 +439,7 @@ def getFetchCallExpressions(tx):
 	"""
 
 	query="""
-	MATCH (t {Type: 'ExpressionStatement'})-[:AST_parentOf {RelationType: 'expression'}]->(n {Type: 'CallExpression'})-[:AST_parentOf {RelationType: 'callee'}]-> (req {Type: 'Identifier', Code: 'fetch'}), 
+	MATCH (t:ASTNode {Type: 'ExpressionStatement'})-[:AST_parentOf {RelationType: 'expression'}]->(n:ASTNode {Type: 'CallExpression'})-[:AST_parentOf {RelationType: 'callee'}]-> (req:ASTNode {Type: 'Identifier', Code: 'fetch'}), 
 	(n)-[:AST_parentOf {RelationType: 'arguments', Arguments: '{\"arg\":0}'}]->(a)
 	RETURN t, n, a
 	"""
@@ -458,10 +458,10 @@ def getAjaxCallExpressions(tx):
 	# argument a can be ObjectExpression, Identifier, or MemberExpression
 	# variable relation length will capture function chains, e.g., $.ajax({}).done().success().failure() etc.
 	query="""
-	MATCH (t {Type: 'ExpressionStatement'})-[:AST_parentOf*1..10]->(n {Type: 'CallExpression'})-[:AST_parentOf {RelationType: 'callee'}]-> (n1 {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'property'}]->(req {Type: 'Identifier', Code: 'ajax'}),
-	(n1)-[:AST_parentOf {RelationType: 'object'}]->(n2 {Type: 'Identifier' }),
+	MATCH (t:ASTNode {Type: 'ExpressionStatement'})-[:AST_parentOf*1..10]->(n:ASTNode {Type: 'CallExpression'})-[:AST_parentOf {RelationType: 'callee'}]-> (n1:ASTNode {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'property'}]->(req:ASTNode {Type: 'Identifier', Code: 'ajax'}),
+	(n1)-[:AST_parentOf {RelationType: 'object'}]->(n2:ASTNode {Type: 'Identifier' }),
 	(n)-[:AST_parentOf {RelationType: 'arguments', Arguments: '{\"arg\":0}'}]->(a)
-	OPTIONAL MATCH (a)-[:AST_parentOf {RelationType: 'properties'}]->(n4 {Type: 'Property'})-[:AST_parentOf {RelationType: 'key'}]->(n5 {Type: 'Identifier', Code: 'url'}),
+	OPTIONAL MATCH (a)-[:AST_parentOf {RelationType: 'properties'}]->(n4:ASTNode {Type: 'Property'})-[:AST_parentOf {RelationType: 'key'}]->(n5:ASTNode {Type: 'Identifier', Code: 'url'}),
 	(n4)-[:AST_parentOf {RelationType: 'value'}]->(aa)
 	RETURN t, n, a, aa
 	"""
@@ -478,7 +478,7 @@ def xhrPostCallExpressions(tx):
 	@Note: xhrPost is used e.g., in tinytinyrss
 	"""
 	query="""
-	MATCH (t {Type: 'ExpressionStatement'})-[:AST_parentOf {RelationType: 'expression'}]->(n {Type: 'CallExpression'})-[:AST_parentOf {RelationType: 'callee'}]-> (req {Type: 'Identifier', Code: 'xhrPost'}), 
+	MATCH (t:ASTNode {Type: 'ExpressionStatement'})-[:AST_parentOf {RelationType: 'expression'}]->(n:ASTNode {Type: 'CallExpression'})-[:AST_parentOf {RelationType: 'callee'}]-> (req:ASTNode {Type: 'Identifier', Code: 'xhrPost'}), 
 	(n)-[:AST_parentOf {RelationType: 'arguments', Arguments: '{\"arg\":1}'}]->(a)
 	RETURN t, n, a
 	"""
@@ -496,7 +496,7 @@ def getAsyncRequestCallExpressions(tx):
 	"""
 
 	query="""
-	MATCH (t)-[:AST_parentOf]->(n {Type: 'CallExpression'})-[:AST_parentOf {RelationType: 'callee'}]->(n1 {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'property'}]->(req {Type: 'Identifier', Code: 'asyncRequest'}),
+	MATCH (t)-[:AST_parentOf]->(n:ASTNode {Type: 'CallExpression'})-[:AST_parentOf {RelationType: 'callee'}]->(n1:ASTNode {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'property'}]->(req:ASTNode {Type: 'Identifier', Code: 'asyncRequest'}),
 	(n)-[:AST_parentOf {RelationType: 'arguments', Arguments: '{\"arg\":1}'}]->(a)
 	OPTIONAL MATCH (tt)-[:AST_parentOf]->(t) WHERE tt.Type='VariableDeclaration' OR tt.Type='ExpressionStatement'
 	RETURN  tt, t, n, a
@@ -514,7 +514,7 @@ def getSetFormCallExpressions(tx):
 	"""
 
 	query = """
-	MATCH (call_expression {Type: 'CallExpression'})-[:AST_parentOf {RelationType: 'callee'}]-(member_expression {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'property'}]->(set_form {Code:'setForm', Type: 'Identifier'}),
+	MATCH (call_expression:ASTNode {Type: 'CallExpression'})-[:AST_parentOf {RelationType: 'callee'}]-(member_expression:ASTNode {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'property'}]->(set_form:ASTNode {Code:'setForm', Type: 'Identifier'}),
 	(call_expression)-[:AST_parentOf {RelationType: 'arguments', Arguments: '{\"arg\":0}'}]->(arg), (t)-[:AST_parentOf]->(call_expression)
 	OPTIONAL MATCH (tt)-[:AST_parentOf]->(t) WHERE tt.Type='VariableDeclaration' OR tt.Type='ExpressionStatement'
 	RETURN tt, t, call_expression as n, arg as a
@@ -530,8 +530,8 @@ def getPageSpeedExpressions(tx):
 	"""
 
 	query = """
-	MATCH (t {Type: 'ExpressionStatement'})-[:AST_parentOf {RelationType: 'expression'}]->(call_expr {Type: 'CallExpression'})-[:AST_parentOf {RelationType: 'callee'}]->(member_expr {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'property'}]->(run {Type: 'Identifier', Code: 'Run'}),
-	(member_expr)-[:AST_parentOf {RelationType: 'object'}]->(inner_member_expression {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'property'}]->(ci {Type: 'Identifier', Code: 'CriticalImages'}), (inner_member_expression)-[:AST_parentOf {RelationType: 'object'}]->(ps {Type: 'Identifier', Code: 'pagespeed'}),
+	MATCH (t:ASTNode {Type: 'ExpressionStatement'})-[:AST_parentOf {RelationType: 'expression'}]->(call_expr:ASTNode {Type: 'CallExpression'})-[:AST_parentOf {RelationType: 'callee'}]->(member_expr:ASTNode {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'property'}]->(run:ASTNode {Type: 'Identifier', Code: 'Run'}),
+	(member_expr)-[:AST_parentOf {RelationType: 'object'}]->(inner_member_expression:ASTNode {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'property'}]->(ci:ASTNode {Type: 'Identifier', Code: 'CriticalImages'}), (inner_member_expression)-[:AST_parentOf {RelationType: 'object'}]->(ps:ASTNode {Type: 'Identifier', Code: 'pagespeed'}),
 	(call_expr)-[:AST_parentOf {RelationType: 'arguments', Arguments: '{\"arg\":1}'}]->(a)
 	RETURN t, call_expr AS n, a
 	"""
@@ -546,8 +546,8 @@ def getAjaxSettingObjectExpressions(tx):
 	"""
 
 	query = """
-	MATCH (t {Type: 'ExpressionStatement'})-[:AST_parentOf*1..5]->(call_expr {Type: 'CallExpression'})-[:AST_parentOf {RelationType: 'arguments'}]->(obj_expr {Type: 'ObjectExpression'})-[:AST_parentOf {RelationType: 'properties'}]->(ajaxSettingsProperty {Type: 'Property'})-[:AST_parentOf {RelationType: 'key'}]->(ajaxSettingsIdentifier {Type: 'Identifier', Code: 'ajaxSettings'}),
-	(ajaxSettingsProperty)-[:AST_parentOf {RelationType: 'value'}]->(ajaxSettingsObjExpr {Type: 'ObjectExpression'})-[:AST_parentOf {RelationType: 'properties'}]->(urlProperty {Type: 'Property'})-[:AST_parentOf {RelationType: 'key'}]->(url {Type: 'Identifier', Code: 'url'}),
+	MATCH (t:ASTNode {Type: 'ExpressionStatement'})-[:AST_parentOf*1..5]->(call_expr:ASTNode {Type: 'CallExpression'})-[:AST_parentOf {RelationType: 'arguments'}]->(obj_expr:ASTNode {Type: 'ObjectExpression'})-[:AST_parentOf {RelationType: 'properties'}]->(ajaxSettingsProperty:ASTNode {Type: 'Property'})-[:AST_parentOf {RelationType: 'key'}]->(ajaxSettingsIdentifier:ASTNode {Type: 'Identifier', Code: 'ajaxSettings'}),
+	(ajaxSettingsProperty)-[:AST_parentOf {RelationType: 'value'}]->(ajaxSettingsObjExpr:ASTNode {Type: 'ObjectExpression'})-[:AST_parentOf {RelationType: 'properties'}]->(urlProperty:ASTNode {Type: 'Property'})-[:AST_parentOf {RelationType: 'key'}]->(url:ASTNode {Type: 'Identifier', Code: 'url'}),
 	(urlProperty)-[:AST_parentOf {RelationType: 'value'}]->(a)
 	RETURN t, ajaxSettingsProperty AS n, a
 	"""
@@ -570,32 +570,32 @@ def getHttpRequestCallExpressionUrlArgument(tx, node, function_type):
 	query = ''
 	if function_type == 'fetch':
 		query="""
-		MATCH (t {Type: 'ExpressionStatement'})-[:AST_parentOf {RelationType: 'expression'}]->(n { Id: '%s', Type: 'CallExpression'})-[:AST_parentOf {RelationType: 'callee'}]-> (req {Type: 'Identifier', Code: 'fetch'}), 
+		MATCH (t:ASTNode {Type: 'ExpressionStatement'})-[:AST_parentOf {RelationType: 'expression'}]->(n:ASTNode { Id: $id, Type: 'CallExpression'})-[:AST_parentOf {RelationType: 'callee'}]-> (req:ASTNode {Type: 'Identifier', Code: 'fetch'}), 
 		(n)-[:AST_parentOf {RelationType: 'arguments', Arguments: '{\"arg\":0}'}]->(a)
 		RETURN t, n, a
-		"""%(nodeId)
+		"""
 	elif function_type == 'open':
 		query="""
-		MATCH (t {Type: 'ExpressionStatement'})-[:AST_parentOf {RelationType: 'expression'}]->(n { Id: '%s', Type: 'CallExpression'})-[:AST_parentOf {RelationType: 'callee'}]-> (n1 {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'property'}]->(req {Type: 'Identifier', Code: 'open'}), 
+		MATCH (t:ASTNode {Type: 'ExpressionStatement'})-[:AST_parentOf {RelationType: 'expression'}]->(n:ASTNode { Id: $id, Type: 'CallExpression'})-[:AST_parentOf {RelationType: 'callee'}]-> (n1:ASTNode {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'property'}]->(req:ASTNode {Type: 'Identifier', Code: 'open'}), 
 		(n)-[:AST_parentOf {RelationType: 'arguments', Arguments: '{\"arg\":1}'}]->(a)
 		RETURN t, n, a
-		"""%(nodeId)
+		"""
 	elif function_type == 'ajax':
 		query="""
-		MATCH (t {Type: 'ExpressionStatement'})-[:AST_parentOf {RelationType: 'expression'}]->(n { Id: '%s', Type: 'CallExpression'})-[:AST_parentOf {RelationType: 'callee'}]-> (n1 {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'property'}]->(req {Type: 'Identifier', Code: 'ajax'}),
-		(n1)-[:AST_parentOf {RelationType: 'object'}]->(n2 {Type: 'Identifier', Code: '$'}),
-		(n)-[:AST_parentOf {RelationType: 'arguments', Arguments: '{\"arg\":0}'}]->(n3 {Type: 'ObjectExpression'})-[:AST_parentOf {RelationType: 'properties'}]->(n4 {Type: 'Property'})-[:AST_parentOf {RelationType: 'key'}]->(n5 {Type: 'Identifier', Code: 'url'}),
+		MATCH (t:ASTNode {Type: 'ExpressionStatement'})-[:AST_parentOf {RelationType: 'expression'}]->(n:ASTNode { Id: $id, Type: 'CallExpression'})-[:AST_parentOf {RelationType: 'callee'}]-> (n1:ASTNode {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'property'}]->(req:ASTNode {Type: 'Identifier', Code: 'ajax'}),
+		(n1)-[:AST_parentOf {RelationType: 'object'}]->(n2:ASTNode {Type: 'Identifier', Code: '$'}),
+		(n)-[:AST_parentOf {RelationType: 'arguments', Arguments: '{\"arg\":0}'}]->(n3:ASTNode {Type: 'ObjectExpression'})-[:AST_parentOf {RelationType: 'properties'}]->(n4:ASTNode {Type: 'Property'})-[:AST_parentOf {RelationType: 'key'}]->(n5:ASTNode {Type: 'Identifier', Code: 'url'}),
 		(n4)-[:AST_parentOf {RelationType: 'value'}]->(a)
 		RETURN t, n, a
-		"""%(nodeId)
+		"""
 	elif function_type == 'asyncRequest':
 		query="""
-		MATCH (t {Type: 'ExpressionStatement'})-[:AST_parentOf {RelationType: 'expression'}]->(n { Id: '%s', Type: 'CallExpression'})-[:AST_parentOf {RelationType: 'callee'}]->(n1 {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'property'}]->(req {Type: 'Identifier', Code: 'asyncRequest'}),
+		MATCH (t:ASTNode {Type: 'ExpressionStatement'})-[:AST_parentOf {RelationType: 'expression'}]->(n:ASTNode { Id: $id, Type: 'CallExpression'})-[:AST_parentOf {RelationType: 'callee'}]->(n1:ASTNode {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'property'}]->(req:ASTNode {Type: 'Identifier', Code: 'asyncRequest'}),
 		(n)-[:AST_parentOf {RelationType: 'arguments', Arguments: '{\"arg\":1}'}]->(a)
 		RETURN t, n, a
-		"""%(nodeId)
+		"""
 	if len(query):
-		out = tx.run(query)
+		out = tx.run(query, id=nodeId)
 	return out
 
 
@@ -610,11 +610,11 @@ def getIdentifierLocalAndGlobalValues(tx, varname):
 
 	stack = []
 	query = """
-		MATCH (n { Type:'Identifier', Code: '%s'})<-[:AST_parentOf {RelationType: 'id'}]-(vdtor {Type: 'VariableDeclarator'})<-[:AST_parentOf {RelationType:'declarations'}]-(vdtion),
+		MATCH (n:ASTNode { Type:'Identifier', Code: $varname})<-[:AST_parentOf {RelationType: 'id'}]-(vdtor:ASTNode {Type: 'VariableDeclarator'})<-[:AST_parentOf {RelationType:'declarations'}]-(vdtion),
 		(vdtor)-[:AST_parentOf {RelationType: 'init'}]->(value)
 		RETURN vdtion, value
-	"""%(varname)
-	results = tx.run(query)
+	"""
+	results = tx.run(query, varname=varname)
 
 	for pair in results:
 		# must at most one pair exist, otherwise, there are 2 or more potential values defined for a single variable at different scopes!
@@ -653,6 +653,53 @@ def getIdentifierLocalAndGlobalValues(tx, varname):
 # ----------------------------------------------------------------------- #
 
 
+def _prefetch_sink_slices(tx, sinks_list):
+	"""
+	batched slicing: resolves the CFG-level statements of all sinks, and warms the caches of the backward slices 
+	of all their taintable identifiers with batched queries, one per recursion level
+	@param {pointer} tx
+	@param {list} sinks_list: sinks of `sinks.out.json`
+	"""
+
+	sink_cfg_nodes = QU.get_ast_topmost_batch(tx, [{"Id": str(sink_node["id"])} for sink_node in sinks_list], batch_size=constantsModule.BATCH_SLICING_SIZE)
+
+	items = []
+	for sink_node in sinks_list:
+		sink_cfg_node = sink_cfg_nodes[str(sink_node["id"])]
+		sink_taint_possiblity_vector = sink_node["taint_possibility"]
+		for semantic_type in sink_taint_possiblity_vector:
+			if sink_taint_possiblity_vector[semantic_type] == True:
+				items.extend([(varname, sink_cfg_node) for varname in sink_node["sink_identifiers"][semantic_type]])
+
+	count = DF.prefetch_varname_values_from_contexts(tx, items)
+	LOGGER.info('[TR] prefetched the slices of %s (node, variable) pairs for %s sinks.'%(count, len(sinks_list)))
+
+
+
+def store_empty_traversals_output(webpage_url, webpage_directory):
+	"""
+	stores the outputs of a webpage without any flows, i.e., without querying its graph
+	@param {string} webpage_url
+	@param {string} webpage_directory
+	"""
+
+	sep = utilityModule.get_output_header_sep()
+	sep_sub = utilityModule.get_output_subheader_sep()
+
+	output_file = os.path.join(webpage_directory, "sinks.flows.out")
+	with open(output_file, "w+") as fd:
+		fd.write(sep)
+		fd.write('[timestamp] generated on %s\n'%_get_current_timestamp())
+		fd.write(sep+'\n')
+		fd.write('[*] webpage URL: %s\n\n'%webpage_url)
+		fd.write(sep_sub+'\n')
+
+	output_file_json = os.path.join(webpage_directory, "sinks.flows.out.json")
+	with open(output_file_json, "w+") as fd:
+		json.dump({"url": webpage_url, "flows": []}, fd, ensure_ascii=False, indent=4)
+
+
+
 def run_traversals(tx, webpage_url, webpage_directory, webpage_directory_hash='xxx', named_properties=[]):
 	"""
 	@param {string} webpage_url
@@ -675,6 +722,9 @@ def run_traversals(tx, webpage_url, webpage_directory, webpage_directory_hash='x
 
 	storage = {}
 
+	if constantsModule.BATCH_SLICING and len(sinks_list):
+		_prefetch_sink_slices(tx, sinks_list)
+
 
 	for sink_node in sinks_list:
 
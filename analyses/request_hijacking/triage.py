@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+
+"""
+	Copyright (C) 2022  Soheil Khodayari, CISPA
+	This program is free software: you can redistribute it and/or modify
+	it under the terms of the GNU Affero General Public License as published by
+	the Free Software Foundation, either version 3 of the License, or
+	(at your option) any later version.
+	This program is distributed in the hope that it will be useful,
+	but WITHOUT ANY WARRANTY; without even the implied warranty of
+	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+	GNU Affero General Public License for more details.
+	You should have received a copy of the GNU Affero General Public License
+	along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+	Description:
+	------------
+	Triage of webpages before their HPG is imported into neo4j, based on `sinks.out.json` of the static pass
+	and on the graph files, such that database time is only spent on webpages that can yield flows:
+		- skip: the webpage has no sinks (or no usable graph), so the traversals can not find any flow
+		- in-memory: none of the sinks of the webpage is taintable, so the traversals only locate the sinks,
+			which the in-process graph backend does without a database
+		- analyze: the webpage has taintable sinks, and is imported into neo4j
+
+	The decision and its reason are logged and stored in `triage.out` of the webpage directory.
+
+	Usage:
+	------------
+	> import analyses.request_hijacking.triage as triageModule
+	> (decision, reason) = triageModule.triage_webpage(webpage_folder, nodes_file)
+
+"""
+
+import os
+import json
+import utils.compression as compressionModule
+from utils.logging import logger as LOGGER
+
+
+TRIAGE_ANALYZE = 'analyze'
+TRIAGE_IN_MEMORY = 'in-memory'
+TRIAGE_SKIP = 'skip'
+
+TRIAGE_FILE_NAME = 'triage.out'
+SINKS_FILE_NAME = 'sinks.out.json'
+
+
+
+def load_sinks(webpage_folder):
+
+	"""
+	@param {string} webpage_folder: absolute path of the webpage directory
+	@return {list} the sinks found by the static pass, or None if `sinks.out.json` is missing or invalid
+	"""
+
+	sinks_file = os.path.join(webpage_folder, SINKS_FILE_NAME)
+	if not os.path.exists(sinks_file):
+		return None
+	try:
+		with open(sinks_file, 'r') as fd:
+			sinks = json.load(fd)['sinks']
+	except (ValueError, KeyError, TypeError):
+		return None
+	return sinks if isinstance(sinks, list) else None
+
+
+def is_taintable_sink(sink):
+
+	taint_possibility = sink.get('taint_possibility') if isinstance(sink, dict) else None
+	if not isinstance(taint_possibility, dict):
+		return False
+	return any(value == True for value in taint_possibility.values())
+
+
+def has_graph_rows(graph_file):
+
+	"""
+	@param {string} graph_file: plain, .gz or .zst csv file
+	@return {bool} whether the file has at least one row after the header; only the first two lines are read
+	"""
+
+	try:
+		with compressionModule.open_text(graph_file) as fd:
+			fd.readline()
+			return len(fd.readline().strip()) > 0
+	except Exception:
+		# unreadable files are left to the import, which reports the error
+		return True
+
+
+def triage_webpage(webpage_folder, nodes_file=None):
+
+	"""
+	@param {string} webpage_folder: absolute path of the webpage directory
+	@param {string} nodes_file: nodes csv file of the HPG, if known
+	@return {tuple} (decision, reason)
+	"""
+
+	sinks = load_sinks(webpage_folder)
+	if sinks is None:
+		return (TRIAGE_SKIP, '%s is missing or invalid'%SINKS_FILE_NAME)
+
+	if len(sinks) == 0:
+		return (TRIAGE_SKIP, 'no sinks')
+
+	if nodes_file is not None and not has_graph_rows(nodes_file):
+		return (TRIAGE_SKIP, 'the hpg has no nodes')
+
+	taintable = [sink for sink in sinks if is_taintable_sink(sink)]
+	if len(taintable) == 0:
+		return (TRIAGE_IN_MEMORY, 'none of the %s sinks is taintable'%len(sinks))
+
+	return (TRIAGE_ANALYZE, '%s of %s sinks are taintable'%(len(taintable), len(sinks)))
+
+
+def store_triage_result(webpage_folder, decision, reason):
+
+	LOGGER.info('[TR] triage of %s: %s (%s)'%(webpage_folder, decision, reason))
+	with open(os.path.join(webpage_folder, TRIAGE_FILE_NAME), 'w+') as fd:
+		json.dump({'decision': decision, 'reason': reason}, fd, ensure_ascii=False, indent=4)
@@ -63,6 +63,21 @@ NEO4J_CONN_STRING = "bolt://127.0.0.1:%s"%str(NEO4J_BOLT_PORT)
 # NeoModel connection string
 NEOMODEL_NEO4J_CONN_STRING = "bolt://%s:%s@127.0.0.1:%s"%(NEO4J_USER, NEO4J_PASS, NEO4J_BOLT_PORT)
 
+# max number of pooled bolt connections (i.e., concurrent sessions) per neo4j server
+if os.getenv('NEO4J_MAX_CONNECTION_POOL_SIZE') is not None:
+	NEO4J_MAX_CONNECTION_POOL_SIZE = int(os.getenv('NEO4J_MAX_CONNECTION_POOL_SIZE'))
+else:
+	NEO4J_MAX_CONNECTION_POOL_SIZE = 16
+
+# batched slicing: prefetch the backward slices of all sinks of a webpage with UNWIND queries, one per recursion level
+if os.getenv('BATCH_SLICING') is not None:
+	BATCH_SLICING = os.getenv('BATCH_SLICING').lower() == 'true'
+else:
+	BATCH_SLICING = False
+# max number of (node, variable) pairs per batched query, and max number of prefetched recursion levels
+BATCH_SLICING_SIZE = 1000
+BATCH_SLICING_DEPTH = 8
+
 # use docker for neo4j 
 NEO4J_USE_DOCKER = True
 
@@ -71,6 +86,43 @@ NODE_INPUT_FILE_NAME = 'nodes.csv'
 RELS_INPUT_FILE_NAME = 'rels.csv'
 RELS_DYNAMIC_INPUT_FILE_NAME = 'rels_dynamic.csv'
 
+# compression of the graph csv files (options: 'gzip' or 'zstd')
+if os.getenv('HPG_COMPRESSION') is not None:
+	HPG_COMPRESSION = os.getenv('HPG_COMPRESSION')
+else:
+	HPG_COMPRESSION = 'gzip'
+
+# zstd dictionary trained on sample graphs, and the zstd compression level
+if os.getenv('HPG_ZSTD_DICTIONARY') is not None:
+	HPG_ZSTD_DICTIONARY = os.getenv('HPG_ZSTD_DICTIONARY')
+else:
+	HPG_ZSTD_DICTIONARY = os.path.join(DATA_DIR, 'hpg.zstd.dict')
+HPG_ZSTD_LEVEL = 10
+
+# content-addressed cache of per-script static analysis artifacts, shared across webpages and sites
+if os.getenv('SCRIPT_CACHE_DIR') is not None:
+	SCRIPT_CACHE_DIR = os.getenv('SCRIPT_CACHE_DIR')
+else:
+	SCRIPT_CACHE_DIR = os.path.join(DATA_DIR, '.script_cache')
+
+# library summaries compiled from the symbolic models of `data/libraries` (see `symbolic_modeling.summaries`)
+if os.getenv('LIBRARY_SUMMARIES_FILE') is not None:
+	LIBRARY_SUMMARIES_FILE = os.getenv('LIBRARY_SUMMARIES_FILE')
+else:
+	LIBRARY_SUMMARIES_FILE = os.path.join(os.path.join(DATA_DIR, 'libraries'), 'summaries.json')
+
+# fingerprint index of the library scripts of `data/libraries` (see `utils.library_index`)
+if os.getenv('LIBRARY_INDEX_FILE') is not None:
+	LIBRARY_INDEX_FILE = os.getenv('LIBRARY_INDEX_FILE')
+else:
+	LIBRARY_INDEX_FILE = os.path.join(os.path.join(DATA_DIR, 'libraries'), 'fingerprints.json')
+
+# SQLite index of the dynamic taint flows of the crawled webpages (see `utils.taintflow_index`)
+if os.getenv('TAINTFLOW_INDEX_FILE') is not None:
+	TAINTFLOW_INDEX_FILE = os.getenv('TAINTFLOW_INDEX_FILE')
+else:
+	TAINTFLOW_INDEX_FILE = os.path.join(OUTPUTS_DIR, 'taintflows.index.db')
+
 # ineo neo4j manager bin
 INEO_BIN = os.path.join(os.path.join(os.path.join(BASE_DIR, "ineo"), "bin"), "ineo")
 
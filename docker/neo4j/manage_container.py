@@ -29,6 +29,8 @@
 import os
 import constants
 import utils.utility as utilityModule
+import utils.io as IOModule
+import utils.compression as compressionModule
 import hpg_neo4j.db_utility as DU
 from utils.logging import logger
 import time
@@ -92,6 +94,8 @@ def start_neo4j_container(container_name):
 
 def stop_neo4j_container(container_name):
 
+	# the pooled connections to the container do not survive a stop
+	DU.close_driver(constants.NEO4J_CONN_STRING)
 	command = "docker stop %s"%str(container_name)
 	utilityModule.run_os_command(command, print_stdout=False)
 	logger.warning('Docker container %s is being stopped.'%str(container_name))
@@ -170,6 +174,24 @@ def import_data_inside_container(container_name, database_name, relative_import_
 		return DU.exec_fn_within_transaction(import_data_inside_container_with_cypher, database_name, relative_import_path)
 
 
+def import_graph_inside_container(container_name, database_name, relative_import_path, webpage_folder):
+
+	"""
+	imports the (plain, .gz or .zst) csv files of an HPG without de-compressing them on disk
+	@param {string} relative_import_path: path of the webpage folder relative to the mounted import folder
+	@param {string} webpage_folder: absolute path of the webpage folder on the host
+	@return {int} 1 if the import was run, -1 if the csv files do not exist
+	"""
+
+	graph_files = IOModule.get_graph_files(webpage_folder)
+	if graph_files[0] is None or graph_files[1] is None:
+		return -1
+
+	with compressionModule.import_files(graph_files) as import_files:
+		[nodes_file, edges_file, edges_dynamic_file] = [os.path.basename(f) if f is not None else None for f in import_files]
+		return import_data_inside_container(container_name, database_name, relative_import_path, 'CSV', nodes_file=nodes_file, edges_file=edges_file, edges_dynamic_file=edges_dynamic_file)
+
+
 
 #### Tests
 
@@ -0,0 +1,251 @@
+/*
+    Copyright (C) 2022  Soheil Khodayari, CISPA
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Affero General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Affero General Public License for more details.
+    You should have received a copy of the GNU Affero General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+    Description:
+    ------------
+    Content-addressed cache of per-script analysis artifacts, shared across webpages and sites.
+    Entries are keyed by the SHA256 hash of the analyzed script source, and hold:
+        - the parsed AST (before node ids are assigned)
+        - parse errors
+        - the sinks found in the script, with node ids stored relative to the script
+          (i.e., as the pre-order index of the node), such that they can be re-mapped
+          to the node ids of any webpage that includes the same script
+
+    Layout: <cache directory>/<version>/<first two hex digits of the key>/<key>.<artifact>
+    Entries are written to a temporary file first and then renamed, so concurrent
+    static analysis processes can share one cache directory.
+*/
+
+
+var fs = require('fs');
+var zlib = require('zlib');
+var crypto = require('crypto');
+var pathModule = require('path');
+
+
+// bump when the format of the cached artifacts, the parser or the sink detection changes
+const CACHE_VERSION = 'v1';
+
+const AST_ARTIFACT = 'ast.json.gz';
+const PARSE_ERROR_ARTIFACT = 'error';
+const SINKS_ARTIFACT = 'sinks.json';
+
+
+/**
+ * ScriptCache
+ * @constructor
+ * @param {string} directory: root directory of the cache
+ */
+function ScriptCache(directory) {
+    "use strict";
+    this.directory = pathModule.join(directory, CACHE_VERSION);
+    this.stats = {
+        'ast_hits': 0,
+        'ast_misses': 0,
+        'sinks_hits': 0,
+        'sinks_misses': 0,
+    };
+}
+
+
+/**
+ * @param {string} code: script source
+ * @returns {string} cache key of the script
+ */
+ScriptCache.prototype.getKey = function (code) {
+    "use strict";
+    return crypto.createHash('sha256').update(code, 'utf8').digest('hex');
+};
+
+
+ScriptCache.prototype._getPath = function (key, artifact) {
+    "use strict";
+    return pathModule.join(this.directory, key.substring(0, 2), key + '.' + artifact);
+};
+
+
+ScriptCache.prototype._read = function (key, artifact) {
+    "use strict";
+    try {
+        return fs.readFileSync(this._getPath(key, artifact));
+    } catch (err) {
+        return null;
+    }
+};
+
+
+ScriptCache.prototype._write = function (key, artifact, content) {
+    "use strict";
+    let path = this._getPath(key, artifact);
+    let tmpPath = path + '.' + process.pid + '.tmp';
+    try {
+        fs.mkdirSync(pathModule.dirname(path), { recursive: true });
+        fs.writeFileSync(tmpPath, content);
+        fs.renameSync(tmpPath, path);
+    } catch (err) {
+        // the cache is best-effort
+        console.log('[ScriptCache] could not write ' + path + ': ' + err);
+        try { fs.rmSync(tmpPath, { force: true }); } catch (e) { /* PASS */ }
+    }
+};
+
+
+/**
+ * restores the properties that do not survive the JSON serialization of an esprima AST
+ */
+function reviveLiteral(key, value) {
+    if (value && value.type === 'Literal') {
+        if (value.regex) {
+            try {
+                value.value = new RegExp(value.regex.pattern, value.regex.flags);
+            } catch (err) {
+                value.value = null;
+            }
+        } else if (value.value === null && value.raw !== 'null' && typeof value.raw === 'string') {
+            // e.g., numeric literals that overflow to Infinity
+            value.value = Number(value.raw);
+        }
+    }
+    return value;
+}
+
+
+/**
+ * @param {string} key
+ * @returns {Object} the cached AST of the script (a fresh copy), or null
+ */
+ScriptCache.prototype.getAST = function (key) {
+    "use strict";
+    let content = this._read(key, AST_ARTIFACT);
+    if (content === null) {
+        this.stats.ast_misses += 1;
+        return null;
+    }
+    try {
+        let ast = JSON.parse(zlib.gunzipSync(content).toString('utf8'), reviveLiteral);
+        this.stats.ast_hits += 1;
+        return ast;
+    } catch (err) {
+        this.stats.ast_misses += 1;
+        return null;
+    }
+};
+
+
+/**
+ * stores the AST of a script; must be called before the AST is annotated by the analysis
+ * @param {string} key
+ * @param {Object} ast
+ */
+ScriptCache.prototype.putAST = function (key, ast) {
+    "use strict";
+    this._write(key, AST_ARTIFACT, zlib.gzipSync(JSON.stringify(ast)));
+};
+
+
+ScriptCache.prototype.isParseError = function (key) {
+    "use strict";
+    return fs.existsSync(this._getPath(key, PARSE_ERROR_ARTIFACT));
+};
+
+
+ScriptCache.prototype.putParseError = function (key) {
+    "use strict";
+    this._write(key, PARSE_ERROR_ARTIFACT, '');
+};
+
+
+/**
+ * attaches the cache key and the ids of the AST nodes (in pre-order) to the AST of a script.
+ * the properties are not enumerable, so they are neither exported nor traversed.
+ * @param {Object} ast
+ * @param {string} key
+ * @param {Array} nodeIds: node ids in the order they were assigned
+ */
+ScriptCache.prototype.bindAST = function (ast, key, nodeIds) {
+    "use strict";
+    Object.defineProperty(ast, '_scriptCacheKey', { value: key, enumerable: false, writable: true });
+    Object.defineProperty(ast, '_scriptNodeIds', { value: nodeIds, enumerable: false, writable: true });
+};
+
+
+/**
+ * @param {Object} ast: AST bound with `bindAST`
+ * @returns {Array} the cached sinks of the script with the node ids and script name of this AST, or null
+ */
+ScriptCache.prototype.getSinks = function (ast) {
+    "use strict";
+    if (!ast || !ast._scriptCacheKey) {
+        return null;
+    }
+
+    let content = this._read(ast._scriptCacheKey, SINKS_ARTIFACT);
+    if (content === null) {
+        this.stats.sinks_misses += 1;
+        return null;
+    }
+
+    let sinks;
+    try {
+        sinks = JSON.parse(content.toString('utf8'));
+    } catch (err) {
+        this.stats.sinks_misses += 1;
+        return null;
+    }
+
+    let nodeIds = ast._scriptNodeIds;
+    for (let sink of sinks) {
+        if (sink.id < 0 || sink.id >= nodeIds.length) {
+            // the AST does not match the cached entry
+            this.stats.sinks_misses += 1;
+            return null;
+        }
+        sink.id = nodeIds[sink.id];
+        sink.script = ast.value;
+    }
+    this.stats.sinks_hits += 1;
+    return sinks;
+};
+
+
+/**
+ * stores the sinks of a script, with node ids made relative to the script
+ * @param {Object} ast: AST bound with `bindAST`
+ * @param {Array} sinks: sink outputs of the script
+ */
+ScriptCache.prototype.putSinks = function (ast, sinks) {
+    "use strict";
+    if (!ast || !ast._scriptCacheKey) {
+        return;
+    }
+
+    let index = new Map();
+    ast._scriptNodeIds.forEach(function (id, i) { index.set(id, i); });
+
+    let relativeSinks = [];
+    for (let sink of sinks) {
+        if (!index.has(sink.id)) {
+            return;
+        }
+        let relativeSink = Object.assign({}, sink);
+        relativeSink.id = index.get(sink.id);
+        relativeSink.script = null;
+        relativeSinks.push(relativeSink);
+    }
+    this._write(ast._scriptCacheKey, SINKS_ARTIFACT, JSON.stringify(relativeSinks));
+};
+
+
+module.exports = {
+    ScriptCache: ScriptCache,
+};
@@ -100,15 +100,40 @@ async function createASTFromSource(code, language, options){
  * @param {String} code (string of the code)
  * @param {String} language (options: js | nodejs)
  * @param {Bool} preprocessing: whether to do code preprocessing and transformation before analysis
+ * @param {ScriptCache} [scriptCache] content-addressed cache of parsed scripts (see `core/io/scriptcache.js`)
  * @returns {void}
  */
-async function initializeModelsFromSource(scriptName, code, language, preprocessing){
+async function initializeModelsFromSource(scriptName, code, language, preprocessing, scriptCache){
 	"use strict";
 	var lang = language || constantsModule.LANG.js;
 	var parser = await getParser(lang);
 	var options = null; // fall back to default parser options
-	console.log('[-] parsing script: '+ scriptName);
-	var ast = await createASTFromSource(code, lang, options);
+
+	var ast = null;
+	var cacheKey = null;
+	if(scriptCache){
+		cacheKey = scriptCache.getKey(code);
+		if(scriptCache.isParseError(cacheKey)){
+			console.log("[-] exiting CPG generation, as parser error occured (cached).");
+			return scriptName;
+		}
+		ast = scriptCache.getAST(cacheKey);
+	}
+
+	if(ast){
+		console.log('[-] loaded cached AST of script: '+ scriptName);
+	}else{
+		console.log('[-] parsing script: '+ scriptName);
+		ast = await createASTFromSource(code, lang, options);
+		if(scriptCache){
+			if(ast){
+				scriptCache.putAST(cacheKey, ast);
+			}else{
+				scriptCache.putParseError(cacheKey);
+			}
+		}
+	}
+
 	if( !ast )
 	{
 		console.log("[-] exiting CPG generation, as parser error occured.");
@@ -145,6 +170,7 @@ async function initializeModelsFromSource(scriptName, code, language, preprocess
 		ast.value = scriptName;
 		ast.kind = lang; // store the lang
  	}
+    var nodeIds = [];
     await parser.traverseAST(ast, function(node){
         if(node && node.type){
             let _id = flownodeFactory.count;
@@ -153,9 +179,14 @@ async function initializeModelsFromSource(scriptName, code, language, preprocess
                  _id = flownodeFactory.count    
             }
             node._id = _id;
+            nodeIds.push(_id);
             flownodeFactory.count= flownodeFactory.count + 1;           
         }
     });
+    if(scriptCache){
+        // needed to re-map cached per-script artifacts to the node ids of this page
+        scriptCache.bindAST(ast, cacheKey, nodeIds);
+    }
     // add ast to scope
 	await scopeCtrl.addPageScopeTree(ast);
 
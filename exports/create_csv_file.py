@@ -31,58 +31,13 @@ import pandas as pd
 import csv
 
 import utils.io as IOModule
+import utils.taintflow_dedup as dedupModule
 import constants as constantsModule
 
 from utils.logging import logger as LOGGER
 import utils.utility as utilityModule
 
 
-def _get_unique_objects(list_of_jsons):
-
-	output = []
-	tmp = []
-	for item in list_of_jsons:
-		hashed = str(item)
-		if hashed not in tmp:
-			tmp.append(hashed)
-			output.append(item)
-
-	return output
-
-def _get_unique_taint_flows(json_content):
-
-	taintflows = _get_unique_objects(json_content)
-
-	unique_taintflows = []
-	for taintflow_object in taintflows:
-		taints = _get_unique_objects(taintflow_object["taint"])	
-
-		# merge multiple begin, end flows together
-		merged_begin_end_taints = []
-		tmp = []
-		for t in taints:
-			obj = {"flow": t["flow"]}
-			hashed = str(obj)
-			if hashed not in tmp:
-				tmp.append(hashed)
-				obj["begin"] = [t["begin"]]
-				obj["end"] = [t["end"]]
-				merged_begin_end_taints.append(obj)
-			else:
-				idx = tmp.index(hashed)
-				obj = merged_begin_end_taints[idx]
-				obj["begin"].append(t["begin"])
-				obj["end"].append(t["end"])		
-				merged_begin_end_taints[idx] = obj
-
-		copy = taintflow_object
-		copy["taint"] = merged_begin_end_taints
-		unique_taintflows.append(copy)
-
-	return unique_taintflows
-
-
-
 global_id = 1
 def insert_taint_flows_into_csv(csv_writer, table_name, json_content, webpage_url):
 
@@ -92,7 +47,7 @@ def insert_taint_flows_into_csv(csv_writer, table_name, json_content, webpage_ur
 	domain, url, source, sink, str, dataflows 
 
 	"""
-	unique_taintflows = _get_unique_taint_flows(json_content)
+	unique_taintflows = dedupModule.get_unique_taint_flows(json_content)
 	global global_id
 
 	for taintflow_object in unique_taintflows:
@@ -16,129 +16,274 @@
 
 	Description:
 	------------
-	creates a sql database for the dynamic taint flows
+	creates a sql database for the dynamic taint flows, with the normalized schema:
+		- sites, pages (with the url of the webpage), sources, sinks
+		- flows: one row per unique flow of a page, with its sink, string and taint dataflows
+		- flow_sources: the sources of each flow
+	the `taintflows` view has one row per (flow, source), i.e., the columns of the former `taintflows` table,
+	which is renamed to `taintflows_legacy` in the databases created by previous exports.
+
+	the taint flow files are read, deduplicated and serialized by a pool of worker processes, while the main
+	process is the only writer, and inserts the rows in batches. pages whose taint flow file did not change since
+	the last export (same size and modification time) are skipped, changed pages are replaced, and pages whose
+	taint flow file was removed (or is no longer valid) are deleted, such that the database matches a fresh export.
 
 	Running:
 	------------
-	$ python3 -m exports.create_sql_table --table=taintflows --sitelist=/path/to/sitelist_crawled.csv --cut=1000
+	$ python3 -m exports.create_sql_table --table=taintflows --sitelist=/path/to/sitelist_crawled.csv --cut=1000 --processes=8
 
 """
 
 import os, sys
 import json
 import argparse
-import pandas as pd
 import sqlite3
 
 import utils.io as IOModule
+import utils.taintflow_dedup as dedupModule
+import utils.data_walker as walkerModule
 import constants as constantsModule
 
 from utils.logging import logger as LOGGER
-import utils.utility as utilityModule
 
 
-def _get_unique_objects(list_of_jsons):
-
-	output = []
-	tmp = []
-	for item in list_of_jsons:
-		hashed = str(item)
-		if hashed not in tmp:
-			tmp.append(hashed)
-			output.append(item)
+# number of flow rows inserted per transaction
+BATCH_SIZE = 10000
+
+# name of the `taintflows` table of the previous, denormalized schema, once replaced by the view
+LEGACY_TABLE_NAME = 'taintflows_legacy'
+
+_PRAGMAS = [
+	'PRAGMA journal_mode=WAL',
+	'PRAGMA synchronous=NORMAL',
+	'PRAGMA temp_store=MEMORY',
+	'PRAGMA cache_size=-65536',
+	'PRAGMA foreign_keys=ON',
+]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sites (
+	id INTEGER PRIMARY KEY,
+	name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS pages (
+	id INTEGER PRIMARY KEY,
+	site_id INTEGER NOT NULL REFERENCES sites(id),
+	name TEXT NOT NULL,
+	url TEXT NOT NULL,
+	mtime INTEGER NOT NULL,
+	size INTEGER NOT NULL,
+	UNIQUE (site_id, name)
+);
+CREATE TABLE IF NOT EXISTS sources (
+	id INTEGER PRIMARY KEY,
+	name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS sinks (
+	id INTEGER PRIMARY KEY,
+	name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS flows (
+	id INTEGER PRIMARY KEY,
+	page_id INTEGER NOT NULL REFERENCES pages(id) ON DELETE CASCADE,
+	domain TEXT NOT NULL,
+	loc TEXT NOT NULL,
+	sink_id INTEGER NOT NULL REFERENCES sinks(id),
+	string TEXT NOT NULL,
+	dataflows TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS flow_sources (
+	flow_id INTEGER NOT NULL REFERENCES flows(id) ON DELETE CASCADE,
+	source_id INTEGER NOT NULL REFERENCES sources(id),
+	PRIMARY KEY (flow_id, source_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS pages_site ON pages(site_id);
+CREATE INDEX IF NOT EXISTS flows_page ON flows(page_id);
+CREATE INDEX IF NOT EXISTS flows_sink ON flows(sink_id, page_id);
+CREATE INDEX IF NOT EXISTS flows_domain ON flows(domain);
+CREATE INDEX IF NOT EXISTS flow_sources_source ON flow_sources(source_id, flow_id);
+CREATE VIEW IF NOT EXISTS taintflows AS
+	SELECT f.id AS flow_id, f.domain AS domain, p.url AS url, f.loc AS loc, so.name AS source, si.name AS sink, f.string AS string, f.dataflows AS dataflows
+	FROM flows f
+	JOIN pages p ON p.id = f.page_id
+	JOIN sinks si ON si.id = f.sink_id
+	JOIN flow_sources fs ON fs.flow_id = f.id
+	JOIN sources so ON so.id = fs.source_id;
+"""
 
-	return output
 
-def _get_unique_taint_flows(json_content):
 
-	taintflows = _get_unique_objects(json_content)
+def get_webpage_taint_flows(webpage_path_name, taint_flow_file_name):
 
-	unique_taintflows = []
-	for taintflow_object in taintflows:
-		taints = _get_unique_objects(taintflow_object["taint"])	
+	"""
+	reads the url and the taint flows of a webpage (run by the worker processes)
+	@return {tuple} (webpage url, rows), with one (domain, loc, sink, string, dataflows, sources) row per unique flow;
+		None if the webpage has no `url.out` or no valid taint flow file
+	"""
 
-		# merge multiple begin, end flows together
-		merged_begin_end_taints = []
-		tmp = []
-		for t in taints:
-			obj = {"flow": t["flow"]}
-			hashed = str(obj)
-			if hashed not in tmp:
-				tmp.append(hashed)
-				obj["begin"] = [t["begin"]]
-				obj["end"] = [t["end"]]
-				merged_begin_end_taints.append(obj)
-			else:
-				idx = tmp.index(hashed)
-				obj = merged_begin_end_taints[idx]
-				obj["begin"].append(t["begin"])
-				obj["end"].append(t["end"])		
-				merged_begin_end_taints[idx] = obj
+	url_file = os.path.join(webpage_path_name, 'url.out')
+	taintflows_json_file = os.path.join(webpage_path_name, taint_flow_file_name)
+	if not os.path.exists(url_file) or not os.path.exists(taintflows_json_file):
+		return None
 
-		copy = taintflow_object
-		copy["taint"] = merged_begin_end_taints
-		unique_taintflows.append(copy)
+	with open(url_file, 'r') as fd:
+		webpage_url = fd.read().strip().strip('\n').strip()
 
-	return unique_taintflows
+	try:
+		with open(taintflows_json_file, 'r') as fd:
+			json_content = json.load(fd)
+	except:
+		LOGGER.warning('JSON parsing error for %s'%taintflows_json_file)
+		return None
 
+	rows = []
+	for taintflow_object in dedupModule.get_unique_taint_flows(json_content):
+		try:
+			rows.append((
+				str(taintflow_object["domain"]),
+				str(taintflow_object["loc"]),
+				str(taintflow_object["sink"]),
+				str(taintflow_object["str"]),
+				json.dumps(taintflow_object["taint"]),
+				[str(source) for source in dict.fromkeys(taintflow_object["sources"])]
+			))
+		except Exception as e:
+			LOGGER.error(e)
 
+	return (webpage_url, rows)
 
 
-def insert_taint_flows_into_table(db_conn, table_name, json_content, webpage_url):
+def get_file_stamp(file_path_name):
 
 	"""
-	Table
-	------------------
-	domain, url, source, sink, str, dataflows 
+	@return {tuple} (mtime in ns, size) of the file, or None if it does not exist
+	"""
+
+	try:
+		stat = os.stat(file_path_name)
+	except OSError:
+		return None
+	return (stat.st_mtime_ns, stat.st_size)
+
 
+
+class TaintFlowDatabase:
+
+	"""
+	single writer of the taint flow database; rows are inserted with `executemany`, and committed in batches
 	"""
-	unique_taintflows = _get_unique_taint_flows(json_content)
 
+	def __init__(self, database_name, batch_size=BATCH_SIZE):
 
-	c = db_conn.cursor()
+		self.conn = sqlite3.connect(database_name)
+		for pragma in _PRAGMAS:
+			self.conn.execute(pragma)
+		self._rename_legacy_table()
+		self.conn.executescript(_SCHEMA)
+		self.conn.commit()
+
+		self.batch_size = batch_size
+		self.pending_rows = 0
+		self.next_flow_id = self.conn.execute('SELECT COALESCE(MAX(id), 0) + 1 FROM flows').fetchone()[0]
+		self._ids = {'sites': {}, 'sources': {}, 'sinks': {}}
+
+
+	def _rename_legacy_table(self):
+
+		"""
+		moves the `taintflows` table of a previous export out of the way of the `taintflows` view
+		"""
+
+		row = self.conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'taintflows'").fetchone()
+		if row is not None:
+			LOGGER.warning('renaming the taintflows table of a previous export to %s.'%LEGACY_TABLE_NAME)
+			self.conn.execute('ALTER TABLE taintflows RENAME TO %s'%LEGACY_TABLE_NAME)
+			self.conn.commit()
+
+
+	def close(self):
+
+		self.commit()
+		self.conn.execute('PRAGMA optimize')
+		self.conn.close()
+
+
+	def commit(self):
+
+		self.conn.commit()
+		self.pending_rows = 0
+
+
+	def _get_id(self, table, name):
+
+		ids = self._ids[table]
+		if name not in ids:
+			self.conn.execute('INSERT OR IGNORE INTO %s (name) VALUES (?)'%table, (name,))
+			ids[name] = self.conn.execute('SELECT id FROM %s WHERE name = ?'%table, (name,)).fetchone()[0]
+		return ids[name]
+
+
+	def get_exported_pages(self):
+
+		"""
+		@return {dict} (site, page) -> (mtime, size) of the taint flow file of the exported pages
+		"""
+
+		query = 'SELECT s.name, p.name, p.mtime, p.size FROM pages p JOIN sites s ON s.id = p.site_id'
+		return {(site, page): (mtime, size) for (site, page, mtime, size) in self.conn.execute(query)}
+
+
+	def delete_webpage(self, site, webpage):
+
+		"""
+		removes an exported webpage and its flows
+		"""
+
+		self.conn.execute('DELETE FROM pages WHERE site_id = (SELECT id FROM sites WHERE name = ?) AND name = ?', (site, webpage))
+		self.pending_rows = self.pending_rows + 1
+
+
+	def delete_unused_names(self):
+
+		"""
+		removes the sites, sources and sinks that are no longer referenced by any page or flow
+		"""
+
+		self.conn.execute('DELETE FROM sites WHERE id NOT IN (SELECT site_id FROM pages)')
+		self.conn.execute('DELETE FROM sources WHERE id NOT IN (SELECT source_id FROM flow_sources)')
+		self.conn.execute('DELETE FROM sinks WHERE id NOT IN (SELECT sink_id FROM flows)')
+		self._ids = {'sites': {}, 'sources': {}, 'sinks': {}}
+
+
+	def insert_webpage(self, site, webpage, stamp, webpage_url, rows):
+
+		"""
+		replaces the flows of a webpage
+		@param {tuple} stamp: (mtime, size) of the taint flow file
+		@param {list} rows: see `get_webpage_taint_flows`
+		"""
+
+		site_id = self._get_id('sites', site)
+		self.conn.execute('DELETE FROM pages WHERE site_id = ? AND name = ?', (site_id, webpage))
+		cursor = self.conn.execute('INSERT INTO pages (site_id, name, url, mtime, size) VALUES (?, ?, ?, ?, ?)',
+			(site_id, webpage, webpage_url, stamp[0], stamp[1]))
+		page_id = cursor.lastrowid
+
+		flows = []
+		flow_sources = []
+		for (domain, loc, sink, string, dataflows, sources) in rows:
+			flow_id = self.next_flow_id
+			self.next_flow_id = self.next_flow_id + 1
+			flows.append((flow_id, page_id, domain, loc, self._get_id('sinks', sink), string, dataflows))
+			flow_sources.extend([(flow_id, self._get_id('sources', source)) for source in sources])
+
+		self.conn.executemany('INSERT INTO flows (id, page_id, domain, loc, sink_id, string, dataflows) VALUES (?, ?, ?, ?, ?, ?, ?)', flows)
+		self.conn.executemany('INSERT OR IGNORE INTO flow_sources (flow_id, source_id) VALUES (?, ?)', flow_sources)
+
+		self.pending_rows = self.pending_rows + len(flows) + 1
+		if self.pending_rows >= self.batch_size:
+			self.commit()
 
-	for taintflow_object in unique_taintflows:
-		
-		domain = taintflow_object["domain"]
-		webpage_loc = taintflow_object["loc"]
-		sources = taintflow_object["sources"]
-		sink = taintflow_object["sink"]
-		string = taintflow_object["str"] 
-		dataflows = taintflow_object["taint"]
-		dataflows = json.dumps(dataflows) 
-		for source in sources:
-			# NEW ENTRY: [domain, webpage_loc, source, sink, string, dataflows]
-			query = '''
-					INSERT INTO taintflows (domain, url, loc, source, sink, string, dataflows)
-					VALUES (?, ?, ?, ?, ?, ?, ?)
-			'''
-
-			try:
-				args = (str(domain), str(webpage_url), str(webpage_loc), str(source), str(sink), str(string), dataflows)
-				c.execute(query, args)
-			except Exception as e:
-				LOGGER.error(e)
-	db_conn.commit()
-
-
-
-def initialize_table(db_conn, table_name):
-	
-	c = db_conn.cursor() 
-	if table_name == 'taintflows':
-		c.execute('''
-		  CREATE TABLE IF NOT EXISTS taintflows
-		  ([id] INTEGER PRIMARY KEY,
-		   [domain] VARCHAR NOT NULL,
-		   [url] VARCHAR NOT NULL,
-		   [loc] VARCHAR NOT NULL,
-		   [source] VARCHAR NOT NULL,
-		   [sink] VARCHAR NOT NULL,
-		   [string] VARCHAR NOT NULL,
-		   [dataflows] VARCHAR NOT NULL)
-		  ''')
-
-	db_conn.commit()
 
 
 def main():
@@ -147,6 +292,7 @@ def main():
 	
 	TAINT_FLOW_FILE_NAME = 'taintflows_relevant.json'
 	TABLE_TAINT_FLOWS = 'taintflows'
+	DATABASE_NAME_DEFAULT = r'./exports/JAWv3.db'
 
 
 	p = argparse.ArgumentParser(description='This script filters the relevant foxhound taint flows based on the sources.')
@@ -157,22 +303,31 @@ def main():
 		  type=str)
 
 	p.add_argument('--table', "-T",
-		  metavar="FILE",
+		  metavar="NAME",
 		  default=TABLE_TAINT_FLOWS,
-		  help='taint files name (default: %(default)s)',
+		  help='name of the exported view with one row per taint flow and source (default: %(default)s)',
 		  type=str)
 
 	p.add_argument('--cut', "-C", type=int, default=1000, help='the threshold for maximum number of entries to consider in the sitelist (default: %(default)s)')
 
+	p.add_argument('--database', "-D",
+		  metavar="FILE",
+		  default=DATABASE_NAME_DEFAULT,
+		  help='sqlite database file (default: %(default)s)',
+		  type=str)
+
+	p.add_argument('--processes', "-P",
+		  default=walkerModule.DEFAULT_PROCESSES,
+		  help='number of worker processes reading the taint flow files (default: %(default)s)',
+		  type=int)
+
 
 	args= vars(p.parse_args())
 	sitelist_filename = args["sitelist"]
 	table_name = args["table"]
 	max_threshold =  int(args["cut"])
-
-	database_name = r'./exports/JAWv3.db'
-	db_conn = sqlite3.connect(database_name)
-
+	database_name = args["database"]
+	processes = args["processes"]
 
 
 	if sitelist_filename == SITELIST_FILE_NAME_DEFAULT:
@@ -182,49 +337,49 @@ def main():
 		
 	if table_name == TABLE_TAINT_FLOWS:
 
-		initialize_table(db_conn, table_name)
-
-		chunksize = 10**5
-		breakLoop = False
-
-		for chunk_df in pd.read_csv(sitelist_filename, chunksize=chunksize, usecols=[0, 1], header=None, skip_blank_lines=True):
-			
-			if breakLoop:
-				break
-
-			for (index, row) in chunk_df.iterrows():
-				etld_url = row[1]
-				url = 'http://' + etld_url
-				app_name = utilityModule.getDirectoryNameFromURL(url)
-				app_path_name = os.path.join(constantsModule.DATA_DIR, app_name)
-				if os.path.exists(app_path_name) and os.path.isdir(app_path_name):
-					files = os.listdir(app_path_name)
-					if len(files) > 1:
-						for webpage_name in files:
-							webpage_path_name = os.path.join(app_path_name, webpage_name)
-							if os.path.exists(webpage_path_name) and os.path.isdir(webpage_path_name):
-
-								url_file = os.path.join(webpage_path_name, 'url.out')
-								if os.path.exists(url_file):
-									fd = open(url_file, 'r')
-									webpage_url = fd.read().strip().strip('\n').strip()
-									fd.close()
-
-									taintflows_json_file = os.path.join(webpage_path_name, TAINT_FLOW_FILE_NAME)
-									if os.path.exists(taintflows_json_file):
-										json_content = {}
-										try:
-											fd = open(taintflows_json_file, 'r')
-											json_content = json.load(fd)
-											fd.close()
-										except:
-											LOGGER.warning('JSON parsing error for %s'%taintflows_json_file)
-											continue
-
-										insert_taint_flows_into_table(db_conn, table_name, json_content, webpage_url)
-				if index >= max_threshold:
-					breakLoop = True
-					break
+		database = TaintFlowDatabase(database_name)
+		exported_pages = database.get_exported_pages()
+
+		# only the pages whose taint flow file changed since the last export are read
+		stamps = {}
+		sites = {}
+		count_skipped = 0
+		for (site, webpages) in walkerModule.get_crawled_sites(sitelist_filename, to_row=max_threshold).items():
+			sites[site] = []
+			for webpage in webpages:
+				stamp = get_file_stamp(os.path.join(os.path.join(os.path.join(constantsModule.DATA_DIR, site), webpage), TAINT_FLOW_FILE_NAME))
+				if stamp is None:
+					continue
+				if exported_pages.get((site, webpage)) == stamp:
+					count_skipped = count_skipped + 1
+					continue
+				stamps[(site, webpage)] = stamp
+				sites[site].append(webpage)
+
+		count_exported = 0
+		count_deleted = 0
+		try:
+			# the pages whose taint flow file was removed since the last export
+			for (site, webpage) in exported_pages:
+				if get_file_stamp(os.path.join(os.path.join(os.path.join(constantsModule.DATA_DIR, site), webpage), TAINT_FLOW_FILE_NAME)) is None:
+					database.delete_webpage(site, webpage)
+					count_deleted = count_deleted + 1
+
+			for (site, webpage, result) in walkerModule.walk_webpages(get_webpage_taint_flows, sites, args=(TAINT_FLOW_FILE_NAME,), processes=processes):
+				if result is not None:
+					(webpage_url, rows) = result
+					database.insert_webpage(site, webpage, stamps[(site, webpage)], webpage_url, rows)
+					count_exported = count_exported + 1
+				elif (site, webpage) in exported_pages:
+					# e.g., the taint flow file is no longer valid
+					database.delete_webpage(site, webpage)
+					count_deleted = count_deleted + 1
+
+			database.delete_unused_names()
+		finally:
+			database.close()
+
+		LOGGER.info('exported %s pages, skipped %s unchanged pages, deleted %s pages.'%(count_exported, count_skipped, count_deleted))
 
 	else:
 		LOGGER.warning('exporting %s is not yet supported.'%table_name)
@@ -232,4 +387,5 @@ def main():
 	LOGGER.info('finished.')
 
 
-main()
\ No newline at end of file
+if __name__ == "__main__":
+	main()
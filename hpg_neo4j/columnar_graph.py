@@ -0,0 +1,493 @@
+# -*- coding: utf-8 -*-
+
+"""
+	Copyright (C) 2022  Soheil Khodayari, CISPA
+	This program is free software: you can redistribute it and/or modify
+	it under the terms of the GNU Affero General Public License as published by
+	the Free Software Foundation, either version 3 of the License, or
+	(at your option) any later version.
+	This program is distributed in the hope that it will be useful,
+	but WITHOUT ANY WARRANTY; without even the implied warranty of
+	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+	GNU Affero General Public License for more details.
+	You should have received a copy of the GNU Affero General Public License
+	along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+	Description:
+	------------
+	Binary columnar storage of an HPG, written next to the nodes.csv / rels.csv files of a webpage.
+	Every column is a flat file of native-endian integers that is memory-mapped on load,
+	so opening a graph does not parse any text.
+
+	Layout of the `hpg.columnar` folder:
+		- manifest.json: counts, column encodings, dictionaries and the files of each column
+		- integer columns (i.e., Id): int64 values, and the int32 row indices in order of value, for binary search
+		- dictionary columns (e.g., Type, Kind, RelationType): int32 codes into the dictionary of the manifest (-1: absent)
+		- string columns (e.g., Code, Location): int64 offsets (n+1 entries) into a utf-8 data file (empty: absent)
+		- relationships: int32 source and target node indices, int32 relationship type codes
+		- adjacency: int32 CSR offsets and edge indices per relationship type and direction
+
+	Usage:
+	------------
+	> import hpg_neo4j.columnar_graph as columnarGraphModule
+	> columnar = columnarGraphModule.ColumnarGraph.open(columnarGraphModule.get_columnar_folder(webpage_folder))
+	> columnar.value_counts('Type')
+
+"""
+
+import os
+import sys
+import mmap
+import json
+import array
+import shutil
+import collections
+
+
+COLUMNAR_FOLDER_NAME = 'hpg.columnar'
+MANIFEST_FILE_NAME = 'manifest.json'
+
+FORMAT_NAME = 'jaw-hpg-columnar'
+FORMAT_VERSION = 2
+
+# version 1 stores the Id column as a string column
+SUPPORTED_FORMAT_VERSIONS = [1, 2]
+
+ENCODING_DICTIONARY = 'dictionary'
+ENCODING_STRING = 'string'
+ENCODING_INTEGER = 'integer'
+
+# column that holds the labels of the nodes
+LABEL_COLUMN = 'Label'
+
+# properties with integer values; a column with any other value is stored as strings
+INTEGER_NODE_COLUMNS = ['Id']
+
+# low-cardinality properties that are dictionary-encoded; all other properties are stored as strings
+DICTIONARY_NODE_COLUMNS = ['Type', 'Kind', 'Async', 'Label', 'SemanticType']
+DICTIONARY_EDGE_COLUMNS = ['RelationType']
+
+# marks an absent value in dictionary columns
+MISSING_CODE = -1
+
+
+
+def get_columnar_folder(webpage_folder):
+
+	"""
+	@param {string} webpage_folder: absolute path of the webpage directory
+	@return {string} path of the columnar HPG of the webpage
+	"""
+	return os.path.join(webpage_folder, COLUMNAR_FOLDER_NAME)
+
+
+def has_columnar_graph(webpage_folder):
+
+	return os.path.exists(os.path.join(get_columnar_folder(webpage_folder), MANIFEST_FILE_NAME))
+
+
+
+# ----------------------------------------------------------------------- #
+#		Columns
+# ----------------------------------------------------------------------- #
+
+class DictionaryColumn:
+
+	"""
+	column of integer codes into a dictionary of values
+	"""
+
+	encoding = ENCODING_DICTIONARY
+
+	def __init__(self, codes, dictionary):
+
+		self.codes = codes
+		self.dictionary = dictionary
+
+
+	def get(self, index):
+
+		code = self.codes[index]
+		if code == MISSING_CODE:
+			return None
+		return self.dictionary[code]
+
+
+	def __len__(self):
+
+		return len(self.codes)
+
+
+
+class StringColumn:
+
+	"""
+	column of utf-8 strings, stored back to back in a data buffer
+	"""
+
+	encoding = ENCODING_STRING
+
+	def __init__(self, offsets, data):
+
+		self.offsets = offsets
+		self.data = data
+
+
+	def get(self, index):
+
+		start = self.offsets[index]
+		end = self.offsets[index + 1]
+		if start == end:
+			return None
+		return bytes(self.data[start:end]).decode('utf-8', errors='replace')
+
+
+	def __len__(self):
+
+		return len(self.offsets) - 1
+
+
+
+class IntegerColumn:
+
+	"""
+	column of int64 values, which are returned as strings like the values of the other columns
+	"""
+
+	encoding = ENCODING_INTEGER
+
+	def __init__(self, values, order):
+
+		self.values = values
+		self.order = order
+
+
+	def get(self, index):
+
+		return str(self.values[index])
+
+
+	def __len__(self):
+
+		return len(self.values)
+
+
+	def index(self):
+
+		return IntegerIndex(self.values, self.order)
+
+
+
+class IntegerIndex:
+
+	"""
+	value -> row index lookups over an integer column, by binary search over its rows in order of value
+	"""
+
+	def __init__(self, values, order):
+
+		self.values = values
+		self.order = order
+
+
+	def get(self, key, default=None):
+
+		try:
+			value = int(key)
+		except (TypeError, ValueError):
+			return default
+
+		low = 0
+		high = len(self.order)
+		while low < high:
+			middle = (low + high) // 2
+			if self.values[self.order[middle]] < value:
+				low = middle + 1
+			else:
+				high = middle
+		if low < len(self.order) and self.values[self.order[low]] == value:
+			return self.order[low]
+		return default
+
+
+	def __contains__(self, key):
+
+		return self.get(key) is not None
+
+
+	def __len__(self):
+
+		return len(self.order)
+
+
+
+# ----------------------------------------------------------------------- #
+#		Writing
+# ----------------------------------------------------------------------- #
+
+def _write_array(path, typecode, values):
+
+	with open(path, 'wb') as fd:
+		if isinstance(values, array.array) and values.typecode == typecode:
+			values.tofile(fd)
+		else:
+			array.array(typecode, values).tofile(fd)
+
+
+def _get_integer_values(column, num_rows):
+
+	"""
+	@return {array} the int64 values of the column, or None if a value is absent or not a (canonical) integer
+	"""
+
+	values = array.array('q')
+	for i in range(num_rows):
+		value = column.get(i)
+		try:
+			number = int(value)
+		except (TypeError, ValueError, OverflowError):
+			return None
+		if str(number) != value:
+			return None
+		try:
+			values.append(number)
+		except OverflowError:
+			return None
+	return values
+
+
+def _write_column(folder, prefix, name, column, num_rows, dictionary_encoded, integer_encoded=False):
+
+	"""
+	@return {dict} manifest entry of the column
+	"""
+
+	values = _get_integer_values(column, num_rows) if integer_encoded else None
+	if values is not None:
+		order = array.array('i', sorted(range(num_rows), key=values.__getitem__))
+		values_file = '{0}.{1}.values'.format(prefix, name)
+		order_file = '{0}.{1}.order'.format(prefix, name)
+		_write_array(os.path.join(folder, values_file), 'q', values)
+		_write_array(os.path.join(folder, order_file), 'i', order)
+		return {'encoding': ENCODING_INTEGER, 'values': values_file, 'order': order_file}
+
+	if dictionary_encoded:
+		dictionary = []
+		dictionary_index = {}
+		codes = array.array('i')
+		for i in range(num_rows):
+			value = column.get(i)
+			if value is None:
+				codes.append(MISSING_CODE)
+				continue
+			code = dictionary_index.get(value)
+			if code is None:
+				code = len(dictionary)
+				dictionary.append(value)
+				dictionary_index[value] = code
+			codes.append(code)
+
+		codes_file = '{0}.{1}.codes'.format(prefix, name)
+		_write_array(os.path.join(folder, codes_file), 'i', codes)
+		return {'encoding': ENCODING_DICTIONARY, 'codes': codes_file, 'dictionary': dictionary}
+
+	offsets = array.array('q', [0])
+	data_file = '{0}.{1}.data'.format(prefix, name)
+	with open(os.path.join(folder, data_file), 'wb') as fd:
+		position = 0
+		for i in range(num_rows):
+			value = column.get(i)
+			if value is not None:
+				encoded = value.encode('utf-8', errors='replace')
+				fd.write(encoded)
+				position += len(encoded)
+			offsets.append(position)
+
+	offsets_file = '{0}.{1}.offsets'.format(prefix, name)
+	_write_array(os.path.join(folder, offsets_file), 'q', offsets)
+	return {'encoding': ENCODING_STRING, 'offsets': offsets_file, 'data': data_file}
+
+
+def write_columnar_graph(folder, node_columns, edge_columns, edge_sources, edge_targets, edge_types, adjacency):
+
+	"""
+	writes an HPG in the columnar format; the folder is replaced atomically
+	@param {string} folder: output folder, e.g., `get_columnar_folder(webpage_folder)`
+	@param {dict} node_columns: property name -> column with a `get(index)` method
+	@param {dict} edge_columns: property name -> column with a `get(index)` method
+	@param {sequence} edge_sources: source node index of each relationship
+	@param {sequence} edge_targets: target node index of each relationship
+	@param {column} edge_types: relationship type of each relationship
+	@param {dict} adjacency: relationship type -> {'outgoing': (offsets, edges), 'incoming': (offsets, edges)}
+	@return {dict} the manifest
+	"""
+
+	num_edges = len(edge_sources)
+	num_nodes = 0
+	for column in node_columns.values():
+		num_nodes = len(column)
+		break
+
+	tmp_folder = folder + '.tmp'
+	if os.path.exists(tmp_folder):
+		shutil.rmtree(tmp_folder)
+	os.makedirs(tmp_folder)
+
+	manifest = {
+		'format': FORMAT_NAME,
+		'version': FORMAT_VERSION,
+		'byteorder': sys.byteorder,
+		'num_nodes': num_nodes,
+		'num_edges': num_edges,
+		'node_columns': collections.OrderedDict(),
+		'edge_columns': collections.OrderedDict(),
+		'adjacency': collections.OrderedDict(),
+	}
+
+	for name, column in node_columns.items():
+		manifest['node_columns'][name] = _write_column(tmp_folder, 'nodes', name, column, num_nodes, name in DICTIONARY_NODE_COLUMNS, name in INTEGER_NODE_COLUMNS)
+
+	for name, column in edge_columns.items():
+		manifest['edge_columns'][name] = _write_column(tmp_folder, 'edges', name, column, num_edges, name in DICTIONARY_EDGE_COLUMNS)
+
+	_write_array(os.path.join(tmp_folder, 'edges.source'), 'i', edge_sources)
+	_write_array(os.path.join(tmp_folder, 'edges.target'), 'i', edge_targets)
+	manifest['edge_types'] = _write_column(tmp_folder, 'edges', 'type', edge_types, num_edges, True)
+
+	for i, (relation_type, directions) in enumerate(adjacency.items()):
+		entry = {}
+		for direction in ['outgoing', 'incoming']:
+			(offsets, edges) = directions[direction]
+			offsets_file = 'adjacency.{0}.{1}.offsets'.format(i, direction)
+			edges_file = 'adjacency.{0}.{1}.edges'.format(i, direction)
+			_write_array(os.path.join(tmp_folder, offsets_file), 'i', offsets)
+			_write_array(os.path.join(tmp_folder, edges_file), 'i', edges)
+			entry[direction] = {'offsets': offsets_file, 'edges': edges_file}
+		manifest['adjacency'][relation_type] = entry
+
+	# the manifest is written last, such that an interrupted export is never picked up
+	with open(os.path.join(tmp_folder, MANIFEST_FILE_NAME), 'w') as fd:
+		json.dump(manifest, fd, ensure_ascii=False)
+
+	if os.path.exists(folder):
+		shutil.rmtree(folder)
+	os.rename(tmp_folder, folder)
+	return manifest
+
+
+
+# ----------------------------------------------------------------------- #
+#		Reading
+# ----------------------------------------------------------------------- #
+
+class ColumnarGraph:
+
+	"""
+	memory-mapped view of a columnar HPG
+	"""
+
+	def __init__(self, folder, manifest):
+
+		self.folder = folder
+		self.manifest = manifest
+		self.num_nodes = manifest['num_nodes']
+		self.num_edges = manifest['num_edges']
+		self._maps = []
+
+		self.node_columns = collections.OrderedDict()
+		for name, entry in manifest['node_columns'].items():
+			self.node_columns[name] = self._open_column(entry)
+
+		self.edge_columns = collections.OrderedDict()
+		for name, entry in manifest['edge_columns'].items():
+			self.edge_columns[name] = self._open_column(entry)
+
+		self.edge_sources = self._map('edges.source', 'i')
+		self.edge_targets = self._map('edges.target', 'i')
+		self.edge_types = self._open_column(manifest['edge_types'])
+
+		self.adjacency = collections.OrderedDict()
+		for relation_type, entry in manifest['adjacency'].items():
+			self.adjacency[relation_type] = {}
+			for direction in ['outgoing', 'incoming']:
+				offsets = self._map(entry[direction]['offsets'], 'i')
+				edges = self._map(entry[direction]['edges'], 'i')
+				self.adjacency[relation_type][direction] = (offsets, edges)
+
+
+	@classmethod
+	def open(cls, folder):
+
+		"""
+		@param {string} folder: path of the columnar HPG
+		@return {ColumnarGraph}
+		"""
+
+		with open(os.path.join(folder, MANIFEST_FILE_NAME), 'r') as fd:
+			manifest = json.load(fd)
+
+		if manifest.get('format') != FORMAT_NAME or manifest.get('version') not in SUPPORTED_FORMAT_VERSIONS:
+			raise ValueError('unsupported columnar hpg format in %s'%folder)
+		if manifest.get('byteorder') != sys.byteorder:
+			raise ValueError('columnar hpg in %s was written with a different byte order'%folder)
+
+		return cls(folder, manifest)
+
+
+	def _map(self, file_name, typecode=None):
+
+		path = os.path.join(self.folder, file_name)
+		if os.path.getsize(path) == 0:
+			# empty files can not be memory-mapped
+			return array.array(typecode) if typecode is not None else b''
+
+		with open(path, 'rb') as fd:
+			mapped = mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+		self._maps.append(mapped)
+		view = memoryview(mapped)
+		if typecode is not None:
+			view = view.cast(typecode)
+		return view
+
+
+	def _open_column(self, entry):
+
+		if entry['encoding'] == ENCODING_DICTIONARY:
+			return DictionaryColumn(self._map(entry['codes'], 'i'), entry['dictionary'])
+		if entry['encoding'] == ENCODING_INTEGER:
+			return IntegerColumn(self._map(entry['values'], 'q'), self._map(entry['order'], 'i'))
+		return StringColumn(self._map(entry['offsets'], 'q'), self._map(entry['data']))
+
+
+	def value_counts(self, name):
+
+		"""
+		@param {string} name: name of a dictionary-encoded node or edge column
+		@return {dict} value -> number of occurrences
+		"""
+
+		column = self.node_columns.get(name) or self.edge_columns.get(name)
+		if column is None or column.encoding != ENCODING_DICTIONARY:
+			raise ValueError('%s is not a dictionary-encoded column'%name)
+
+		counts = [0] * len(column.dictionary)
+		for code in column.codes:
+			if code != MISSING_CODE:
+				counts[code] += 1
+		return dict(zip(column.dictionary, counts))
+
+
+	def close(self):
+
+		"""
+		releases the memory maps; the columns of this object must not be used afterwards
+		"""
+
+		for mapped in self._maps:
+			try:
+				mapped.close()
+			except BufferError:
+				# a view of the map is still referenced; it is released by the garbage collector
+				pass
+		self._maps = []
@@ -33,6 +33,8 @@ import sys
 import time
 import requests
 import uuid
+import atexit
+import threading
 
 
 import constants as constantsModule
@@ -40,10 +42,25 @@ import constants as constantsModule
 from utils.utility import _hash
 from utils.io import run_os_command
 from neo4j import GraphDatabase
+from neo4j.exceptions import ServiceUnavailable, SessionExpired
 from utils.logging import logger
+import hpg_neo4j.graph_cache as graph_cache
 
 
 
+# label that the HPG exporter assigns to every node (column `Label:LABEL` of nodes.csv)
+HPG_NODE_LABEL = 'ASTNode'
+
+# node properties used by the traversals to look up nodes;
+# `Code` is not indexed, since the code of program and function nodes exceeds the max size of an index key
+HPG_INDEXED_PROPERTIES = ['Id', 'Type']
+
+
+# process-wide registry of neo4j drivers: (connection string, driver options) -> driver
+_drivers = {}
+_drivers_lock = threading.Lock()
+
+
 # ------------------------------------------------------------------------------------ #
 # 	Utils
 # ------------------------------------------------------------------------------------ #
@@ -195,32 +212,156 @@ def does_neo4j_db_exists(database_name):
 # 	Current APIs
 # ------------------------------------------------------------------------------------ #
 
-def exec_fn_within_transaction(fn, *args, conn=constantsModule.NEO4J_CONN_STRING, conn_timeout=None, keep_alive=True):
+def get_driver(conn=constantsModule.NEO4J_CONN_STRING, conn_timeout=None, keep_alive=True):
+
+	"""
+	returns the shared driver of the given connection string, and creates it on first use.
+	every driver holds a bounded pool of bolt connections (see `constantsModule.NEO4J_MAX_CONNECTION_POOL_SIZE`)
+	that is reused by all sessions opened against the same server.
+	@param {string} conn: bolt connection string
+	@param {int} conn_timeout: max expected duration (in seconds) of a transaction; bounds the connection lifetime
+	@param {bool} keep_alive: whether or not to enable TCP keep-alive
+	@return {pointer} neo4j driver
+	"""
+
+	max_connection_lifetime = None
+	if conn_timeout is not None:
+		max_connection_lifetime = int(conn_timeout) + 60 # in seconds
+
+	key = (conn, max_connection_lifetime, keep_alive)
+	with _drivers_lock:
+		if key not in _drivers:
+			options = {
+				'auth': (constantsModule.NEO4J_USER, constantsModule.NEO4J_PASS),
+				'max_connection_pool_size': constantsModule.NEO4J_MAX_CONNECTION_POOL_SIZE,
+				'keep_alive': keep_alive,
+			}
+			if max_connection_lifetime is not None:
+				options['max_connection_lifetime'] = max_connection_lifetime
+			_drivers[key] = GraphDatabase.driver(conn, **options)
+		return _drivers[key]
+
+
+def close_driver(conn=constantsModule.NEO4J_CONN_STRING):
+
+	"""
+	closes the shared drivers of the given connection string, e.g., before the neo4j server behind it is stopped
+	@param {string} conn: bolt connection string
+	@return {void} None
+	"""
+
+	with _drivers_lock:
+		keys = [key for key in _drivers if key[0] == conn]
+		drivers = [_drivers.pop(key) for key in keys]
+
+	for neo_driver in drivers:
+		try:
+			neo_driver.close()
+		except Exception as e:
+			logger.warning('failed to close the neo4j driver of %s: %s'%(conn, str(e)))
+
+
+def close_all_drivers():
+
+	"""
+	closes all shared drivers of the process
+	@return {void} None
+	"""
+
+	with _drivers_lock:
+		conns = set([key[0] for key in _drivers])
+
+	for conn in conns:
+		close_driver(conn)
+
+atexit.register(close_all_drivers)
+
+
+def verify_connectivity(conn=constantsModule.NEO4J_CONN_STRING, database=None):
+
+	"""
+	health check of the shared driver of the given connection string.
+	a driver whose server is not reachable is closed and removed from the registry,
+	such that the next `get_driver` call opens fresh connections.
+	@param {string} conn: bolt connection string
+	@param {string} database: name of the neo4j database to check
+	@return {bool} whether or not the database answers queries
+	"""
+
+	try:
+		with get_driver(conn).session(database=database) as session:
+			session.run("RETURN 1").consume()
+		return True
+	except Exception as e:
+		logger.warning('neo4j health check failed for %s: %s'%(conn, str(e)))
+		close_driver(conn)
+		return False
+
+
+def exec_fn_within_transaction(fn, *args, conn=constantsModule.NEO4J_CONN_STRING, conn_timeout=None, keep_alive=True, database=None):
 	
 	"""
 	wraps a function within a neo4j transaction
 	@param {pointer} fn: function 
 	@param {param-list} *args: positional arguments
+	@param {string} database: name of the neo4j database to query (default: the default database of the server)
 	@return fn output: execute fn with transaction and the list of passed args 
 	"""
 	logger.info('quering on connection: %s'%str(conn))
 	out = None
 
-	if conn_timeout is None:
-		neo_driver = GraphDatabase.driver(conn, auth=(constantsModule.NEO4J_USER, constantsModule.NEO4J_PASS))
-		with neo_driver.session() as session:
+	neo_driver = get_driver(conn, conn_timeout=conn_timeout, keep_alive=keep_alive)
+	try:
+		with neo_driver.session(database=database) as session:
 			with session.begin_transaction() as tx:
-				out = fn(tx, *args)
+				try:
+					out = fn(tx, *args)
+				finally:
+					# memoized query results are only valid for the graph session of this transaction
+					for stats in graph_cache.release(tx):
+						logger.info('graph cache %s: %s entries, %s hits, %s misses'%(stats['name'], stats['size'], stats['hits'], stats['misses']))
+	except (ServiceUnavailable, SessionExpired):
+		# do not hand out the pooled connections of an unreachable server again
+		close_driver(conn)
+		raise
+
+	return out
+
+
+def create_hpg_indexes(conn=constantsModule.NEO4J_CONN_STRING, database=None, timeout=600):
+
+	"""
+	creates the schema indexes on the HPG node properties (if they do not exist yet), 
+	and waits until they are online, such that node lookups by `Id` or `Type` are index seeks
+	@param {string} conn: bolt connection string
+	@param {string} database: name of the neo4j database holding the HPG
+	@param {int} timeout: max number of seconds to wait for the indexes to be populated
+	@return {bool} whether or not the indexes are online
+	"""
+
+	try:
+		# schema changes can not be mixed with data reads in the same transaction
+		with get_driver(conn).session(database=database) as session:
+			for property_name in HPG_INDEXED_PROPERTIES:
+				query = "CREATE INDEX {0}_{1} IF NOT EXISTS FOR (n:{0}) ON (n.{1})".format(HPG_NODE_LABEL, property_name)
+				session.run(query).consume()
+			session.run("CALL db.awaitIndexes($timeout)", timeout=int(timeout)).consume()
+		return True
+	except Exception as e:
+		logger.error('failed to create the hpg indexes: %s'%str(e))
+		return False
 
-		return out
-	else:
-		max_connection_lifetime = int(conn_timeout) + 60 # in seconds
-		neo_driver = GraphDatabase.driver(conn, auth=(constantsModule.NEO4J_USER, constantsModule.NEO4J_PASS), max_connection_lifetime=max_connection_lifetime, keep_alive=keep_alive)
-		with neo_driver.session() as session:
-			with session.begin_transaction() as tx:
-				out = fn(tx, *args)
 
-		return out
+def run_system_command(query, conn=constantsModule.NEO4J_CONN_STRING):
+
+	"""
+	runs an administration command (e.g., CREATE DATABASE) against the system database
+	@param {string} query: cypher administration command
+	@param {string} conn: bolt connection string
+	@return {void} None
+	"""
+	with get_driver(conn).session(database='system') as session:
+		session.run(query).consume()
 
 
 
@@ -253,6 +394,36 @@ def wait_for_neo4j_bolt_connection(timeout=60, conn=constantsModule.NEO4J_CONN_H
 	return RET
 
 
+def wait_for_neo4j_query_ready(timeout=60, conn=constantsModule.NEO4J_CONN_STRING, database=None):
+	"""
+	readiness probe: wait until the given database answers a trivial bolt query.
+	unlike `wait_for_neo4j_bolt_connection`, this does not return before the database is actually online.
+	@param {int} timeout: max number of seconds to wait
+	@param {string} conn: bolt connection string
+	@param {string} database: name of the neo4j database to probe
+	@return {bool} whether or not the database is ready
+	"""
+	increment = 1
+	start = time.time()
+
+	while True:
+		neo_driver = None
+		try:
+			neo_driver = GraphDatabase.driver(conn, auth=(constantsModule.NEO4J_USER, constantsModule.NEO4J_PASS), connection_timeout=3)
+			with neo_driver.session(database=database) as session:
+				session.run("RETURN 1").consume()
+			logger.info('neo4j database is ready to accept queries.')
+			return True
+		except:
+			if time.time() - start >= timeout:
+				logger.error('neo4j database is not accepting queries.')
+				return False
+			time.sleep(increment)
+		finally:
+			if neo_driver is not None:
+				neo_driver.close()
+
+
 def ineo_create_db_instance(db_name, port, neo4j_version='4.2.3'):
 
 	INEO_BIN = constantsModule.INEO_BIN
@@ -284,7 +455,7 @@ def ineo_stop_db_instance(db_name):
 	command = command.replace("INEO_BIN", INEO_BIN)
 	run_os_command(command)
 
-def neoadmin_import_db_instance(ineo_db_name, neo4j_db_name, nodes_file, rels_file, rels_dynamic_file=None):
+def neoadmin_import_db_instance(ineo_db_name, neo4j_db_name, nodes_file, rels_file, rels_dynamic_file=None, force=False):
 
 	# script: BASE_DIR/ineo/instances/DB_NAME/bin/neo4j-admin
 	NEO4j_ADMIN = os.path.join(os.path.join(os.path.join(os.path.join(os.path.join(constantsModule.BASE_DIR, "ineo"), "instances"), str(ineo_db_name)), "bin"), "neo4j-admin")
@@ -293,6 +464,10 @@ def neoadmin_import_db_instance(ineo_db_name, neo4j_db_name, nodes_file, rels_fi
 	else:
 		command = "NEO4j_ADMIN import --database={0} --nodes={1} --relationships={2} --delimiter='¿' --skip-bad-relationships=true --skip-duplicate-nodes=true --bad-tolerance=100000 --ignore-extra-columns=true --skip-bad-entries-logging=true".format(neo4j_db_name, nodes_file, rels_file)
 	
+	# overwrite the database of a stopped instance, e.g., when it is re-used for another graph
+	if force:
+		command = command + " --force=true"
+
 	command = command.replace("NEO4j_ADMIN", NEO4j_ADMIN)
 	run_os_command(command, print_stdout=True, log_command=True, prettify=True)
 
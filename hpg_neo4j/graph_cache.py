@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+"""
+	Copyright (C) 2022  Soheil Khodayari, CISPA
+	This program is free software: you can redistribute it and/or modify
+	it under the terms of the GNU Affero General Public License as published by
+	the Free Software Foundation, either version 3 of the License, or
+	(at your option) any later version.
+	This program is distributed in the hope that it will be useful,
+	but WITHOUT ANY WARRANTY; without even the implied warranty of
+	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+	GNU Affero General Public License for more details.
+	You should have received a copy of the GNU Affero General Public License
+	along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+	Description:
+	------------
+	Per-graph memoization of query results.
+	A cache lives as long as the graph session (i.e., the neo4j transaction) that it is bound to,
+	and is released by `db_utility.exec_fn_within_transaction` when the transaction ends,
+	such that results of one graph are never served for another graph.
+
+	Usage:
+	------------
+	> import hpg_neo4j.graph_cache as GC
+	> cache = GC.get_cache(tx, 'ast_topmost')
+	> if node_id in cache:
+	>	return cache.get(node_id)
+	> cache.put(node_id, value)
+
+"""
+
+import threading
+import collections
+
+
+# default max number of entries per cache
+DEFAULT_CACHE_SIZE = 100000
+
+_lock = threading.Lock()
+
+# (graph session key, cache name) -> GraphCache
+_caches = {}
+
+
+
+class GraphCache:
+
+	"""
+	bounded LRU cache with hit/miss counters
+	"""
+
+	def __init__(self, name, maxsize=DEFAULT_CACHE_SIZE):
+
+		self.name = name
+		self.maxsize = maxsize
+		self.hits = 0
+		self.misses = 0
+		self._entries = collections.OrderedDict()
+		self._lock = threading.Lock()
+
+
+	def __contains__(self, key):
+
+		with self._lock:
+			found = key in self._entries
+			if found:
+				self.hits += 1
+			else:
+				self.misses += 1
+			return found
+
+
+	def get(self, key, default=None):
+
+		with self._lock:
+			if key not in self._entries:
+				return default
+			self._entries.move_to_end(key)
+			return self._entries[key]
+
+
+	def put(self, key, value):
+
+		with self._lock:
+			self._entries[key] = value
+			self._entries.move_to_end(key)
+			if self.maxsize is not None and len(self._entries) > self.maxsize:
+				self._entries.popitem(last=False)
+
+
+	def __len__(self):
+
+		return len(self._entries)
+
+
+	def stats(self):
+
+		"""
+		@return {dict} number of entries, hits and misses of the cache
+		"""
+		return {'name': self.name, 'size': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+
+def _get_session_key(tx):
+
+	return id(tx)
+
+
+def get_cache(tx, name, maxsize=DEFAULT_CACHE_SIZE):
+
+	"""
+	@param {pointer} tx: neo4j transaction of the graph session
+	@param {string} name: name of the cache (e.g., the memoized function)
+	@param {int} maxsize: max number of entries of the cache
+	@return {GraphCache} the cache with the given name bound to the graph session of tx
+	"""
+
+	key = (_get_session_key(tx), name)
+	with _lock:
+		if key not in _caches:
+			_caches[key] = GraphCache(name, maxsize=maxsize)
+		return _caches[key]
+
+
+def release(tx):
+
+	"""
+	drops all caches bound to the graph session of tx
+	@param {pointer} tx: neo4j transaction of the graph session
+	@return {list} the stats of the released caches
+	"""
+
+	session_key = _get_session_key(tx)
+	released = []
+	with _lock:
+		for key in list(_caches.keys()):
+			if key[0] == session_key:
+				released.append(_caches.pop(key).stats())
+	return released
@@ -0,0 +1,830 @@
+# -*- coding: utf-8 -*-
+
+"""
+	Copyright (C) 2022  Soheil Khodayari, CISPA
+	This program is free software: you can redistribute it and/or modify
+	it under the terms of the GNU Affero General Public License as published by
+	the Free Software Foundation, either version 3 of the License, or
+	(at your option) any later version.
+	This program is distributed in the hope that it will be useful,
+	but WITHOUT ANY WARRANTY; without even the implied warranty of
+	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+	GNU Affero General Public License for more details.
+	You should have received a copy of the GNU Affero General Public License
+	along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+	Description:
+	------------
+	In-process HPG backend that answers the traversal patterns of `query_utility` and `data_flow`
+	directly over the nodes.csv / rels.csv files, i.e., without importing them into neo4j.
+
+	The graph is held in compact arrays:
+		- node and relationship properties are columns of indices into a table of interned strings
+		- the relationships of each type are stored as CSR adjacency lists in both directions
+	The same arrays can be persisted in, and memory-mapped from, the columnar format of `columnar_graph`.
+
+	An `InMemoryGraph` object is passed to the traversals in place of the neo4j transaction (`tx`);
+	the helpers of `query_utility` and `data_flow` dispatch to it with `is_in_memory_graph(tx)`.
+	Nodes and relationships are returned as `Entity` dicts of their properties, which support the same
+	`node['Type']`, `node.get('Type')` and `'Type' in node` accesses as neo4j nodes, i.e., an absent
+	property is None rather than a KeyError.
+
+	Like neo4j, the relationships of a node are expanded in reverse order of import,
+	which is the child order that `query_utility.get_code_expression` relies on.
+
+	Usage:
+	------------
+	> from hpg_neo4j.in_memory_graph import InMemoryGraph
+	> graph = InMemoryGraph.load(nodes_file, rels_file, rels_dynamic_file)
+	> graph = InMemoryGraph.load_columnar(columnar_folder)
+	> request_hijacking_py_traversals.run_traversals(graph, webpage_url, webpage_folder, webpage)
+
+"""
+
+import array
+import collections
+
+import constants as constantsModule
+import utils.compression as compressionModule
+from utils.logging import logger as LOGGER
+from hpg_neo4j.columnar_graph import ColumnarGraph, DictionaryColumn, write_columnar_graph, LABEL_COLUMN, ENCODING_INTEGER
+
+
+# label that the HPG exporter assigns to every AST node
+AST_NODE_LABEL = 'ASTNode'
+
+# relationship types of the HPG
+AST_RELATION = 'AST_parentOf'
+CFG_RELATION = 'CFG_parentOf'
+PDG_RELATION = 'PDG_parentOf'
+CG_RELATION = 'CG_parentOf'
+ERDG_RELATION = 'ERDG'
+POINTS_TO_RELATION = 'pointsTo'
+
+# property that holds the node id
+ID_PROPERTY = 'Id'
+
+# marks an absent property in the property columns
+_MISSING = -1
+
+# array delimiter of the `:LABEL` column (neo4j-admin default)
+_LABEL_DELIMITER = ';'
+
+
+
+def is_in_memory_graph(tx):
+
+	"""
+	@param {pointer} tx: neo4j transaction or InMemoryGraph
+	@return {bool} whether the traversals run over the in-process backend
+	"""
+	return isinstance(tx, InMemoryGraph)
+
+
+def _open_csv(path):
+
+	# plain, .gz or .zst
+	return compressionModule.open_text(path)
+
+
+def _parse_field(value):
+
+	"""
+	applies the quoting rules of neo4j-admin import to a csv field
+	@return {string} the field value, or None for an empty field (i.e., an absent property)
+	"""
+
+	if len(value) >= 2 and value[0] == '"' and value[-1] == '"':
+		value = value[1:-1].replace('""', '"')
+	if value == '':
+		return None
+	return value
+
+
+def _parse_header(line, delimiter):
+
+	"""
+	@return {list} (property name, column type) for each column, e.g., `Id:ID` -> ('Id', 'ID')
+	"""
+
+	columns = []
+	for column in line.rstrip('\r\n').split(delimiter):
+		if ':' in column:
+			name, column_type = column.split(':', 1)
+		else:
+			name, column_type = column, ''
+		columns.append((name.strip(), column_type.strip().upper()))
+	return columns
+
+
+
+class Entity(dict):
+
+	"""
+	properties of a node or relationship; like a neo4j `Node`, `entity[name]` is None for an absent property
+	"""
+
+	def __missing__(self, name):
+		return None
+
+
+
+class InMemoryGraph:
+
+	"""
+	read-only property graph of one webpage, held in compact arrays
+	"""
+
+	def __init__(self):
+
+		# interned strings, i.e., the dictionary of all columns loaded from csv
+		self._strings = []
+		self._string_index = {}
+
+		# nodes: property name -> column with a `get(node index)` method
+		self._num_nodes = 0
+		self._node_index = {}
+		self._node_labels = None
+		self._node_properties = collections.OrderedDict()
+
+		# relationships (global edge index -> source, target, type, properties)
+		self._edge_sources = array.array('i')
+		self._edge_targets = array.array('i')
+		self._edge_types = None
+		self._edge_properties = collections.OrderedDict()
+
+		# relationship type -> (offsets, edge indices) per direction
+		self._outgoing = {}
+		self._incoming = {}
+
+		# relationships created by the traversals (e.g., resolved `this` pointers)
+		self._created_edges = collections.defaultdict(list)
+
+		# node index -> node dict, such that a node is always represented by the same object
+		self._nodes = {}
+
+		# the memory-mapped columns, if loaded from the columnar format
+		self._columnar = None
+
+
+	# ----------------------------------------------------------------------- #
+	#		Loading
+	# ----------------------------------------------------------------------- #
+
+	@classmethod
+	def load(cls, nodes_file, rels_file, rels_dynamic_file=None, delimiter=None):
+
+		"""
+		@param {string} nodes_file: path of the nodes csv file (optionally .gz or .zst)
+		@param {string} rels_file: path of the relationships csv file (optionally .gz or .zst)
+		@param {string} rels_dynamic_file: path of the dynamic relationships csv file (optional)
+		@param {string} delimiter: csv delimiter (default: the delimiter of the HPG exporter)
+		@return {InMemoryGraph}
+		"""
+
+		if delimiter is None:
+			delimiter = constantsModule.outputCSVDelimiter
+
+		graph = cls()
+		node_codes = collections.OrderedDict()
+		edge_codes = collections.OrderedDict()
+		label_codes = array.array('i')
+		type_codes = array.array('i')
+
+		graph._load_nodes(nodes_file, delimiter, node_codes, label_codes)
+		graph._load_relationships(rels_file, delimiter, edge_codes, type_codes)
+		if rels_dynamic_file:
+			graph._load_relationships(rels_dynamic_file, delimiter, edge_codes, type_codes)
+
+		# all columns share the table of interned strings as their dictionary
+		for name, codes in node_codes.items():
+			graph._node_properties[name] = DictionaryColumn(codes, graph._strings)
+		for name, codes in edge_codes.items():
+			graph._edge_properties[name] = DictionaryColumn(codes, graph._strings)
+		graph._node_labels = DictionaryColumn(label_codes, graph._strings)
+		graph._edge_types = DictionaryColumn(type_codes, graph._strings)
+
+		graph._build_adjacency()
+
+		LOGGER.info('loaded in-memory hpg with %d nodes and %d relationships.'%(graph._num_nodes, len(graph._edge_sources)))
+		return graph
+
+
+	@classmethod
+	def load_columnar(cls, folder):
+
+		"""
+		@param {string} folder: path of a columnar HPG (see `columnar_graph`)
+		@return {InMemoryGraph} graph over the memory-mapped columns, i.e., without parsing any text
+		"""
+
+		columnar = ColumnarGraph.open(folder)
+
+		graph = cls()
+		graph._columnar = columnar
+		graph._num_nodes = columnar.num_nodes
+		for name, column in columnar.node_columns.items():
+			if name == LABEL_COLUMN:
+				graph._node_labels = column
+			else:
+				graph._node_properties[name] = column
+		graph._edge_properties = columnar.edge_columns
+		graph._edge_sources = columnar.edge_sources
+		graph._edge_targets = columnar.edge_targets
+		graph._edge_types = columnar.edge_types
+		for relation_type, directions in columnar.adjacency.items():
+			graph._outgoing[relation_type] = directions['outgoing']
+			graph._incoming[relation_type] = directions['incoming']
+
+		ids = graph._node_properties[ID_PROPERTY]
+		if ids.encoding == ENCODING_INTEGER:
+			# binary search over the memory-mapped ids
+			graph._node_index = ids.index()
+		else:
+			# version 1 of the format
+			for index in range(graph._num_nodes):
+				graph._node_index[ids.get(index)] = index
+
+		LOGGER.info('loaded columnar hpg with %d nodes and %d relationships.'%(graph._num_nodes, len(graph._edge_sources)))
+		return graph
+
+
+	def to_columnar(self, folder):
+
+		"""
+		persists the graph in the columnar format
+		@param {string} folder: output folder, e.g., `columnar_graph.get_columnar_folder(webpage_folder)`
+		@return {dict} the manifest of the columnar HPG
+		"""
+
+		node_columns = collections.OrderedDict(self._node_properties)
+		node_columns[LABEL_COLUMN] = self._node_labels
+		adjacency = collections.OrderedDict()
+		for relation_type in self._outgoing:
+			adjacency[relation_type] = {'outgoing': self._outgoing[relation_type], 'incoming': self._incoming[relation_type]}
+
+		return write_columnar_graph(folder, node_columns, self._edge_properties, self._edge_sources, self._edge_targets, self._edge_types, adjacency)
+
+
+	def _intern(self, value):
+
+		if value is None:
+			return _MISSING
+		index = self._string_index.get(value)
+		if index is None:
+			index = len(self._strings)
+			self._strings.append(value)
+			self._string_index[value] = index
+		return index
+
+
+	def _load_nodes(self, nodes_file, delimiter, node_codes, label_codes):
+
+		with _open_csv(nodes_file) as fd:
+			header = _parse_header(fd.readline(), delimiter)
+			num_columns = len(header)
+
+			id_column = None
+			label_column = None
+			property_columns = []
+			for i, (name, column_type) in enumerate(header):
+				if column_type == 'ID':
+					id_column = i
+					# neo4j-admin also stores the id as a property
+					property_columns.append((i, name))
+				elif column_type == 'LABEL':
+					label_column = i
+				elif column_type != 'IGNORE':
+					property_columns.append((i, name))
+
+			for (_, name) in property_columns:
+				node_codes[name] = array.array('i')
+
+			for line in fd:
+				fields = line.rstrip('\r\n').split(delimiter)
+				if len(fields) < num_columns:
+					continue # bad entry
+
+				node_id = _parse_field(fields[id_column])
+				if node_id is None or node_id in self._node_index:
+					continue # skip duplicate nodes, like the import
+
+				self._node_index[node_id] = self._num_nodes
+				self._num_nodes += 1
+				labels = _parse_field(fields[label_column]) if label_column is not None else None
+				label_codes.append(self._intern(labels))
+				for (i, name) in property_columns:
+					node_codes[name].append(self._intern(_parse_field(fields[i])))
+
+
+	def _load_relationships(self, rels_file, delimiter, edge_codes, type_codes):
+
+		with _open_csv(rels_file) as fd:
+			header = _parse_header(fd.readline(), delimiter)
+			num_columns = len(header)
+
+			start_column = end_column = type_column = None
+			property_columns = []
+			for i, (name, column_type) in enumerate(header):
+				if column_type == 'START_ID':
+					start_column = i
+				elif column_type == 'END_ID':
+					end_column = i
+				elif column_type == 'TYPE':
+					type_column = i
+				elif column_type != 'IGNORE':
+					property_columns.append((i, name))
+
+			num_edges = len(self._edge_sources)
+			for (_, name) in property_columns:
+				if name not in edge_codes:
+					edge_codes[name] = array.array('i', [_MISSING]) * num_edges
+
+			# property columns of previously loaded files that this file does not have
+			file_properties = set([name for (_, name) in property_columns])
+			absent_properties = [codes for (name, codes) in edge_codes.items() if name not in file_properties]
+
+			for line in fd:
+				fields = line.rstrip('\r\n').split(delimiter)
+				if len(fields) < num_columns:
+					continue # bad entry
+
+				source = self._node_index.get(_parse_field(fields[start_column]))
+				target = self._node_index.get(_parse_field(fields[end_column]))
+				relation_type = _parse_field(fields[type_column])
+				if source is None or target is None or relation_type is None:
+					continue # skip bad relationships, like the import
+
+				self._edge_sources.append(source)
+				self._edge_targets.append(target)
+				type_codes.append(self._intern(relation_type))
+				for (i, name) in property_columns:
+					edge_codes[name].append(self._intern(_parse_field(fields[i])))
+				for codes in absent_properties:
+					codes.append(_MISSING)
+
+
+	def _build_adjacency(self):
+
+		"""
+		builds the CSR adjacency lists of every relationship type in both directions.
+		edges are placed in reverse order of import, i.e., the expansion order of neo4j.
+		"""
+
+		edges_by_type = collections.OrderedDict()
+		for edge in range(len(self._edge_sources) - 1, -1, -1):
+			relation_type = self._edge_types.get(edge)
+			if relation_type not in edges_by_type:
+				edges_by_type[relation_type] = []
+			edges_by_type[relation_type].append(edge)
+
+		for relation_type, edges in edges_by_type.items():
+			self._outgoing[relation_type] = self._build_csr(edges, self._edge_sources, self._num_nodes)
+			self._incoming[relation_type] = self._build_csr(edges, self._edge_targets, self._num_nodes)
+
+
+	@staticmethod
+	def _build_csr(edges, endpoints, num_nodes):
+
+		offsets = array.array('i', [0]) * (num_nodes + 1)
+		for edge in edges:
+			offsets[endpoints[edge] + 1] += 1
+		for i in range(num_nodes):
+			offsets[i + 1] += offsets[i]
+
+		positions = array.array('i', offsets)
+		ordered = array.array('i', [0]) * len(edges)
+		for edge in edges:
+			node = endpoints[edge]
+			ordered[positions[node]] = edge
+			positions[node] += 1
+
+		return (offsets, ordered)
+
+
+	# ----------------------------------------------------------------------- #
+	#		Nodes and Relationships
+	# ----------------------------------------------------------------------- #
+
+	def _node(self, index):
+
+		node = self._nodes.get(index)
+		if node is None:
+			node = Entity()
+			for name, column in self._node_properties.items():
+				value = column.get(index)
+				if value is not None:
+					node[name] = value
+			self._nodes[index] = node
+		return node
+
+
+	def _index_of(self, node):
+
+		if node is None:
+			return None
+		return self._node_index.get(node['Id'])
+
+
+	def _relationship(self, edge):
+
+		relationship = Entity()
+		for name, column in self._edge_properties.items():
+			value = column.get(edge)
+			if value is not None:
+				relationship[name] = value
+		return relationship
+
+
+	def _has_label(self, index, label):
+
+		labels = self._node_labels.get(index) if self._node_labels is not None else None
+		return labels is not None and label in labels.split(_LABEL_DELIMITER)
+
+
+	def _property(self, index, name):
+
+		column = self._node_properties.get(name)
+		if column is None:
+			return None
+		return column.get(index)
+
+
+	def _type_of(self, index):
+
+		return self._property(index, 'Type')
+
+
+	def _edge_property(self, edge, name):
+
+		column = self._edge_properties.get(name)
+		if column is None:
+			return None
+		return column.get(edge)
+
+
+	def _expand(self, index, relation_type, outgoing=True, relation_property=None):
+
+		"""
+		@param {int} index: node index
+		@param {string} relation_type: relationship type
+		@param {bool} outgoing: direction of the relationships
+		@param {string} relation_property: if set, only relationships whose `RelationType` equals it
+		@return {generator} (neighbour node index, edge index) pairs in expansion order
+		"""
+
+		adjacency = self._outgoing if outgoing else self._incoming
+		if relation_type not in adjacency:
+			return
+		(offsets, ordered) = adjacency[relation_type]
+		endpoints = self._edge_targets if outgoing else self._edge_sources
+		for position in range(offsets[index], offsets[index + 1]):
+			edge = ordered[position]
+			if relation_property is not None and self._edge_property(edge, 'RelationType') != relation_property:
+				continue
+			yield (endpoints[edge], edge)
+
+
+	def _ast_children(self, index, relation_property=None):
+
+		return [child for (child, _) in self._expand(index, AST_RELATION, True, relation_property)]
+
+
+	def _ast_parents(self, index, relation_property=None):
+
+		return [parent for (parent, _) in self._expand(index, AST_RELATION, False, relation_property)]
+
+
+	def _ast_ancestors(self, index, max_depth=None):
+
+		"""
+		@return {list} (ancestor index, depth) pairs, nearest first
+		"""
+
+		out = []
+		visited = set([index])
+		frontier = [index]
+		depth = 0
+		while frontier and (max_depth is None or depth < max_depth):
+			depth += 1
+			next_frontier = []
+			for node in frontier:
+				for parent in self._ast_parents(node):
+					if parent not in visited:
+						visited.add(parent)
+						next_frontier.append(parent)
+						out.append((parent, depth))
+			frontier = next_frontier
+		return out
+
+
+	def __len__(self):
+
+		return self._num_nodes
+
+
+	# ----------------------------------------------------------------------- #
+	#		query_utility API
+	# ----------------------------------------------------------------------- #
+
+	def get_node_by_id(self, node_id):
+
+		index = self._node_index.get(node_id)
+		if index is None or not self._has_label(index, AST_NODE_LABEL):
+			return None
+		return self._node(index)
+
+
+	def get_ast_parent(self, node):
+
+		index = self._index_of(node)
+		if index is None:
+			return None
+		for parent in self._ast_parents(index):
+			return self._node(parent)
+		return None
+
+
+	def get_ast_topmost(self, node, cfg_level_statements):
+
+		"""
+		@return the closest CFG-level statement enclosing the node (or the node itself), or the AST root
+		"""
+
+		index = self._index_of(node)
+		if index is None:
+			return node
+
+		cfg_level_statements = set(cfg_level_statements)
+		frontier = [index]
+		visited = set(frontier)
+		while frontier:
+			next_frontier = []
+			for current in frontier:
+				parents = self._ast_parents(current)
+				if self._type_of(current) in cfg_level_statements or len(parents) == 0:
+					return self._node(current)
+				for parent in parents:
+					if parent not in visited:
+						visited.add(parent)
+						next_frontier.append(parent)
+			frontier = next_frontier
+		return self._node(index)
+
+
+	def get_ast_subtree(self, node, relation_type='', max_depth=None, max_nodes=None):
+
+		index = self._index_of(node)
+		if index is None or (max_depth is not None and int(max_depth) <= 0):
+			return {'node': node, 'children': []}
+
+		def _get_relation_property(depth):
+			if depth == 0 and relation_type != '':
+				return relation_type
+			return None
+
+		# same as the neo4j backend: the first `max_nodes` nodes in breadth-first order are expanded
+		expanded = None
+		if max_nodes is not None:
+			expanded = set()
+			queue = collections.deque([(index, 0)])
+			queued = set([index])
+			while len(queue) and len(expanded) < int(max_nodes):
+				(current, depth) = queue.popleft()
+				if max_depth is not None and depth >= int(max_depth):
+					continue
+				expanded.add(current)
+				for child in self._ast_children(current, _get_relation_property(depth)):
+					if child not in queued:
+						queued.add(child)
+						queue.append((child, depth + 1))
+
+		def _build(current, depth, visited):
+			wrapper = {'node': self._node(current), 'children': []}
+			if max_depth is not None and depth >= int(max_depth):
+				return wrapper
+			if expanded is not None and current not in expanded:
+				return wrapper
+
+			relation_property = _get_relation_property(depth)
+
+			seen = set()
+			for child in self._ast_children(current, relation_property):
+				# distinct children, and guard against malformed (cyclic) AST edges
+				if child in seen or child in visited:
+					continue
+				seen.add(child)
+				visited.add(child)
+				wrapper['children'].append(_build(child, depth + 1, visited))
+				visited.discard(child)
+			return wrapper
+
+		tree = _build(index, 0, set([index]))
+		tree['node'] = node
+		return tree
+
+
+	def get_pdg_parents(self, node_id, varname, node_type=None):
+
+		index = self._node_index.get(node_id)
+		if index is None:
+			return []
+
+		out = []
+		seen = set()
+		for (parent, edge) in self._expand(index, PDG_RELATION, outgoing=False):
+			if self._edge_property(edge, 'Arguments') != varname:
+				continue
+			if node_type is not None and self._type_of(parent) != node_type:
+				continue
+			if parent not in seen:
+				seen.add(parent)
+				out.append(self._node(parent))
+		return out
+
+
+	# ----------------------------------------------------------------------- #
+	#		data_flow API
+	# ----------------------------------------------------------------------- #
+
+	def get_function_def_of_block_stmt(self, block_stmt_node):
+
+		index = self._index_of(block_stmt_node)
+		if index is None or self._type_of(index) != 'BlockStatement':
+			return None
+		for parent in self._ast_parents(index, 'body'):
+			return self._node(parent)
+		return None
+
+
+	def get_function_params(self, func_def_node):
+
+		index = self._index_of(func_def_node)
+		if index is None:
+			return []
+
+		# the pattern of the cypher query is undirected
+		out = []
+		for neighbour in self._ast_children(index, 'params') + self._ast_parents(index, 'params'):
+			node = self._node(neighbour)
+			if node not in out:
+				out.append(node)
+		return out
+
+
+	def get_call_bindings(self, function_def_node):
+
+		"""
+		@return {list} records of (params, caller, args, arguments) for each call site of the function definition
+		"""
+
+		index = self._index_of(function_def_node)
+		if index is None:
+			return []
+
+		params = self._ast_children(index, 'params')
+		if len(params) == 0:
+			return []
+
+		records = collections.OrderedDict()
+		for (caller, edge) in self._expand(index, CG_RELATION, outgoing=False):
+			if self._type_of(caller) != 'CallExpression':
+				continue
+			args = self._ast_children(caller, 'arguments')
+			if len(args) == 0:
+				continue
+			if caller not in records:
+				records[caller] = {'params': [], 'caller': self._node(caller), 'args': [], 'arguments': []}
+			record = records[caller]
+			for param in params:
+				if self._node(param) not in record['params']:
+					record['params'].append(self._node(param))
+			for arg in args:
+				if self._node(arg) not in record['args']:
+					record['args'].append(self._node(arg))
+			arguments = self._edge_property(edge, 'Arguments')
+			if arguments is not None and arguments not in record['arguments']:
+				record['arguments'].append(arguments)
+
+		return list(records.values())
+
+
+	def get_call_definitions(self, callee_node_id):
+
+		"""
+		@return {list} the function definitions that the call expression with the given callee invokes
+		"""
+
+		index = self._node_index.get(callee_node_id)
+		if index is None:
+			return []
+
+		out = []
+		for call_expression in self._ast_parents(index, 'callee'):
+			if self._type_of(call_expression) != 'CallExpression':
+				continue
+			for (definition, _) in self._expand(call_expression, CG_RELATION):
+				out.append(self._node(definition))
+		return out
+
+
+	def get_this_pointer_resolution(self, this_node_id):
+
+		"""
+		`ThisExpression` pointer analysis, see `data_flow.get_this_pointer_resolution`
+		"""
+
+		out = {'events':[], 'methods': []}
+		index = self._node_index.get(this_node_id)
+		if index is None:
+			return out
+
+		### STEP 1: re-use the resolutions stored by a previous call
+		created = self._created_edges[index]
+		window_tops = [target for (relation_type, arguments, target) in created if relation_type == 'top' and arguments == 'pointsTo=window']
+		if len(window_tops):
+			out['methods'] = [{'top': self._node(top), 'owner': constantsModule.WINDOW_GLOBAL_OBJECT} for top in window_tops]
+			return out
+
+		tops = [target for (relation_type, _, target) in created if relation_type == 'top']
+		owners = [target for (relation_type, arguments, target) in created if relation_type == 'owner' and arguments is None]
+		if len(tops) and len(owners):
+			out['methods'] = [{'top': self._node(top), 'owner': self._node(owner)} for top in tops for owner in owners]
+			return out
+
+		event_owners = [target for (relation_type, arguments, target) in created if relation_type == 'owner' and arguments == 'pointsTo=eventSelector']
+		if len(event_owners):
+			out['events'] = [{'owner': self._node(owner)} for owner in event_owners]
+			return out
+
+		### STEP 2: do the pointer-analysis
+		ancestors = self._ast_ancestors(index)
+		function_expressions = [(node, depth) for (node, depth) in ancestors if self._type_of(node) == 'FunctionExpression']
+
+		# handle ThisStatement in events
+		for (function_expression, depth) in function_expressions:
+			if depth > 10:
+				continue
+			for (_, edge) in self._expand(function_expression, ERDG_RELATION, outgoing=False):
+				out['events'].append({'relation': self._relationship(edge)})
+
+		# note: the results of the function assignment query of the neo4j backend are never read, so it has no counterpart here
+
+		# handle the object expression case
+		for (function_expression, _) in function_expressions:
+			for prop in self._ast_parents(function_expression, 'value'):
+				if self._type_of(prop) != 'Property': continue
+				for expr in self._ast_parents(prop, 'properties'):
+					if self._type_of(expr) != 'ObjectExpression': continue
+					for (t, edge) in self._expand(expr, AST_RELATION, outgoing=False):
+						if self._edge_property(edge, 'RelationType') not in ['right', 'init', 'arguments']: continue
+						if self._type_of(t) not in ['AssignmentExpression', 'VariableDeclarator', 'CallExpression']: continue
+						for tt in self._ast_parents(t):
+							if self._type_of(tt) not in ['ExpressionStatement', 'VariableDeclaration']: continue
+
+							c1_nodes = [c1 for c1 in self._ast_children(t, 'left') + self._ast_children(t, 'id') if self._type_of(c1) == 'Identifier']
+							c2_nodes = []
+							for c3 in self._ast_children(t):
+								for relation_type in self._outgoing:
+									for (c2, _) in self._expand(c3, relation_type, True, 'object'):
+										if self._type_of(c2) == 'Identifier':
+											c2_nodes.append(c2)
+
+							for c1 in (c1_nodes or [None]):
+								for c2 in (c2_nodes or [None]):
+									owner = c2 if c2 is not None else c1
+									if owner is not None:
+										out['methods'].append({'top': self._node(tt), 'owner': self._node(owner)})
+
+		# handle event handlers registered with `.on()`
+		for (function_expression, _) in function_expressions:
+			for top_call_expression in self._ast_parents(function_expression, 'arguments'):
+				for member_expr in self._ast_children(top_call_expression, 'callee'):
+					if self._type_of(member_expr) != 'MemberExpression': continue
+					has_on_property = False
+					for prop in self._ast_children(member_expr, 'property'):
+						if self._type_of(prop) == 'Identifier' and self._property(prop, 'Code') == 'on':
+							has_on_property = True
+					if not has_on_property: continue
+					for the_event_target_top in self._ast_children(member_expr, 'object'):
+						for top in self._ast_parents(top_call_expression):
+							out['methods'].append({'top': self._node(top), 'owner': self._node(the_event_target_top)})
+
+		# store the results for future use
+		for element in out['methods']:
+			top_index = self._index_of(element['top'])
+			if element['owner'] == constantsModule.WINDOW_GLOBAL_OBJECT:
+				created.append(('top', 'pointsTo=window', top_index))
+			else:
+				created.append(('top', None, top_index))
+				created.append(('owner', None, self._index_of(element['owner'])))
+
+		for element in out['events']:
+			arguments = element['relation'].get('Arguments', '')
+			if '___' in arguments:
+				owner_index = self._node_index.get(arguments.split('___')[1])
+				if owner_index is not None:
+					created.append(('owner', 'pointsTo=eventSelector', owner_index))
+
+		return out
@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+
+"""
+	Copyright (C) 2022  Soheil Khodayari, CISPA
+	This program is free software: you can redistribute it and/or modify
+	it under the terms of the GNU Affero General Public License as published by
+	the Free Software Foundation, either version 3 of the License, or
+	(at your option) any later version.
+	This program is distributed in the hope that it will be useful,
+	but WITHOUT ANY WARRANTY; without even the implied warranty of
+	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+	GNU Affero General Public License for more details.
+	You should have received a copy of the GNU Affero General Public License
+	along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+	Description:
+	------------
+	Pool of long-lived, pre-configured ineo neo4j instances.
+	Instead of creating and destroying an instance for every webpage, the HPG of a webpage
+	is swapped into a free instance of the pool, and the instance is returned to the pool afterwards.
+
+	Two swap modes are supported:
+		- restart: offline import into the stopped default database, then start the instance (neo4j community)
+		- database: import into a new database of the running instance and switch to it (neo4j enterprise)
+
+	Readiness is checked by a bolt query probe rather than by fixed sleeps.
+
+
+	Usage:
+	------------
+	> from hpg_neo4j.instance_pool import Neo4jInstancePool
+	> pool = Neo4jInstancePool(size=2, http_port=7474, port_step=3)
+	> pool.start()
+	> with pool.instance() as instance:
+	>	if instance.load_graph(nodes_file, rels_file, rels_dynamic_file):
+	>		DU.exec_fn_within_transaction(fn, conn=instance.conn_string, database=instance.database)
+	> pool.shutdown()
+
+"""
+
+import queue
+import threading
+import contextlib
+
+import constants as constantsModule
+import hpg_neo4j.db_utility as DU
+from utils.logging import logger as LOGGER
+
+
+SWAP_MODE_RESTART = 'restart'
+SWAP_MODE_DATABASE = 'database'
+
+# the default database of a neo4j server, i.e., the only one of the community edition
+DEFAULT_DATABASE_NAME = 'neo4j'
+
+
+
+class Neo4jInstance:
+
+	"""
+	a long-lived ineo instance with a fixed pair of ports, which holds the HPG of one webpage at a time
+	"""
+
+	def __init__(self, name, http_port, bolt_port, swap_mode=SWAP_MODE_RESTART, ready_timeout=150):
+
+		"""
+		@param {string} name: ineo instance name
+		@param {int} http_port
+		@param {int} bolt_port
+		@param {string} swap_mode: `restart` or `database`
+		@param {int} ready_timeout: max number of seconds to wait for the instance to accept queries
+		"""
+
+		self.name = name
+		self.http_port = int(http_port)
+		self.bolt_port = int(bolt_port)
+		self.swap_mode = swap_mode
+		self.ready_timeout = ready_timeout
+
+		self.conn_http_string = "http://127.0.0.1:%s"%str(self.http_port)
+		self.conn_string = "bolt://127.0.0.1:%s"%str(self.bolt_port)
+
+		# name of the database that holds the currently loaded graph
+		# None selects the default database of the server
+		self.database = None
+		self._graph_counter = 0
+
+
+	def setup(self):
+
+		"""
+		creates and configures the ineo instance; called once per pool lifetime
+		"""
+
+		LOGGER.info('[pool] creating neo4j instance %s with http port %s'%(self.name, self.http_port))
+		DU.ineo_remove_db_instance(self.name)
+		DU.ineo_create_db_instance(self.name, self.http_port)
+
+		if not ( self.http_port + 2 == self.bolt_port ):
+			DU.ineo_set_bolt_port_for_db_instance(self.name, self.bolt_port)
+
+		# the initial password can only be set before the first start
+		DU.ineo_set_initial_password_and_restart(self.name, password=constantsModule.NEO4J_PASS)
+
+
+	def teardown(self):
+
+		LOGGER.info('[pool] removing neo4j instance %s'%self.name)
+		DU.close_driver(self.conn_string)
+		try:
+			DU.ineo_stop_db_instance(self.name)
+		finally:
+			DU.ineo_remove_db_instance(self.name)
+
+
+	def load_graph(self, nodes_file, rels_file, rels_dynamic_file=None):
+
+		"""
+		swaps the given HPG into this instance
+		@param {string} nodes_file: path of the nodes csv file
+		@param {string} rels_file: path of the relationships csv file
+		@param {string} rels_dynamic_file: path of the dynamic relationships csv file
+		@return {bool} whether or not the graph is loaded and the database accepts queries
+		"""
+
+		if self.swap_mode == SWAP_MODE_DATABASE:
+			self._graph_counter += 1
+			# database names may only contain ascii letters, numbers, dots and dashes
+			database_name = 'hpg-{0}-{1}'.format(self.bolt_port, self._graph_counter)
+			DU.neoadmin_import_db_instance(self.name, database_name, nodes_file, rels_file, rels_dynamic_file)
+			try:
+				DU.run_system_command('CREATE DATABASE `%s`'%database_name, conn=self.conn_string)
+			except Exception as e:
+				LOGGER.error('[pool] could not create database %s on %s: %s'%(database_name, self.name, str(e)))
+				return False
+			self.database = database_name
+
+		else:
+			DU.close_driver(self.conn_string)
+			DU.ineo_stop_db_instance(self.name)
+			DU.neoadmin_import_db_instance(self.name, DEFAULT_DATABASE_NAME, nodes_file, rels_file, rels_dynamic_file, force=True)
+			DU.ineo_start_db_instance(self.name)
+			self.database = None
+
+		if not DU.wait_for_neo4j_query_ready(timeout=self.ready_timeout, conn=self.conn_string, database=self.database):
+			return False
+
+		DU.create_hpg_indexes(conn=self.conn_string, database=self.database)
+		return True
+
+
+	def unload_graph(self):
+
+		"""
+		releases the currently loaded graph.
+		in `restart` mode the graph is overwritten by the next import, so nothing needs to be done.
+		"""
+
+		if self.swap_mode == SWAP_MODE_DATABASE and self.database is not None:
+			try:
+				DU.run_system_command('DROP DATABASE `%s` IF EXISTS'%self.database, conn=self.conn_string)
+			except Exception as e:
+				LOGGER.error('[pool] could not drop database %s on %s: %s'%(self.database, self.name, str(e)))
+			self.database = None
+
+
+	def recover(self):
+
+		"""
+		brings the instance back to a clean state after a failed analysis, e.g., an unresponsive server
+		"""
+
+		LOGGER.warning('[pool] restarting neo4j instance %s'%self.name)
+		self.unload_graph()
+		DU.close_driver(self.conn_string)
+		DU.ineo_restart_neo4j(self.name)
+
+
+
+class Neo4jInstancePool:
+
+	"""
+	fixed-size pool of Neo4jInstance objects.
+	Instance i uses the port block (http_port + i * port_step), i.e., http, https, bolt.
+	"""
+
+	def __init__(self, size, http_port=None, port_step=3, swap_mode=SWAP_MODE_RESTART, name_prefix='jaw-pool', ready_timeout=150):
+
+		"""
+		@param {int} size: number of neo4j instances
+		@param {int} http_port: http port of the first instance (default: the configured port)
+		@param {int} port_step: port distance between two instances
+		@param {string} swap_mode: `restart` (neo4j community) or `database` (neo4j enterprise)
+		@param {string} name_prefix: prefix of the ineo instance names
+		@param {int} ready_timeout: max number of seconds to wait for an instance to accept queries
+		"""
+
+		if swap_mode not in [SWAP_MODE_RESTART, SWAP_MODE_DATABASE]:
+			raise ValueError('invalid neo4j pool swap mode: %s'%str(swap_mode))
+
+		if http_port is None:
+			http_port = constantsModule.NEO4J_HTTP_PORT
+
+		self.size = max(1, int(size))
+		self.instances = []
+		for i in range(self.size):
+			instance_http_port = int(http_port) + i * int(port_step)
+			name = '{0}-{1}'.format(name_prefix, i)
+			self.instances.append(Neo4jInstance(name, instance_http_port, instance_http_port + 2, swap_mode=swap_mode, ready_timeout=ready_timeout))
+
+		self._free = queue.Queue()
+		self._lock = threading.Lock()
+		self._started = False
+
+
+	def start(self):
+
+		"""
+		creates all instances of the pool and marks them as free
+		"""
+
+		with self._lock:
+			if self._started:
+				return
+			for instance in self.instances:
+				instance.setup()
+				self._free.put(instance)
+			self._started = True
+
+
+	def shutdown(self):
+
+		"""
+		stops and removes all instances of the pool
+		"""
+
+		with self._lock:
+			if not self._started:
+				return
+			for instance in self.instances:
+				try:
+					instance.teardown()
+				except Exception as e:
+					LOGGER.error('[pool] failed to remove neo4j instance %s: %s'%(instance.name, str(e)))
+			self._started = False
+
+
+	def acquire(self):
+
+		"""
+		blocks until an instance is free
+		@return {Neo4jInstance}
+		"""
+
+		if not self._started:
+			self.start()
+		return self._free.get()
+
+
+	def release(self, instance):
+
+		"""
+		unloads the graph of the instance, and returns it to the pool
+		@param {Neo4jInstance} instance
+		"""
+
+		try:
+			instance.unload_graph()
+		finally:
+			self._free.put(instance)
+
+
+	@contextlib.contextmanager
+	def instance(self):
+
+		"""
+		holds a free instance for the duration of the context
+		"""
+
+		instance = self.acquire()
+		try:
+			yield instance
+		finally:
+			self.release(instance)
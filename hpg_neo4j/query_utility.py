@@ -18,6 +18,9 @@
 	Description:
 	---------------
 	Neo4j utility functions
+	
+	Note: the queries must pass ids and names as query parameters (e.g., `$id`) rather than 
+	formatting them into the query string, such that neo4j can re-use the cached query plans
 
 	Usage:
 	---------------
@@ -26,6 +29,13 @@
 
 """
 
+import hpg_neo4j.graph_cache as graph_cache
+from hpg_neo4j.in_memory_graph import is_in_memory_graph
+
+
+# max number of whole AST subtrees memoized per graph session
+AST_SUBTREE_CACHE_SIZE = 20000
+
 
 # -------------------------------------------------------------------------- #
 #		Neo4j Utility Queries
@@ -38,12 +48,15 @@ def get_node_by_id(tx, node_id):
 	@return node
 	"""
 
+	if is_in_memory_graph(tx):
+		return tx.get_node_by_id(node_id)
+
 	query = """
-	MATCH (n {Id: '%s'})
+	MATCH (n:ASTNode {Id: $id})
 	RETURN n
-	"""%(node_id)
+	"""
 
-	results = tx.run(query)
+	results = tx.run(query, id=node_id)
 	for record in results:
 		n = record['n']
 		return n
@@ -85,12 +98,15 @@ def get_ast_parent(tx, node):
 	@return immediate parent of an AST node
 	"""
 
+	if is_in_memory_graph(tx):
+		return tx.get_ast_parent(node)
+
 	query = """
-	MATCH (parent)-[:AST_parentOf]->(child {Id: '%s'})
+	MATCH (parent)-[:AST_parentOf]->(child:ASTNode {Id: $id})
 	RETURN parent
-	"""%(node['Id'])
+	"""
 
-	results = tx.run(query)
+	results = tx.run(query, id=node['Id'])
 	for record in results:
 		child = record['parent']
 		return child
@@ -98,41 +114,179 @@ def get_ast_parent(tx, node):
 	return None
 
 
+def get_pdg_parents(tx, node_id, varname, node_type=None):
+
+	"""
+	@param {neo4j-pointer} tx
+	@param {string} node_id: id of the node where `varname` is used
+	@param {string} varname: name of the variable
+	@param {string} node_type: if set, only returns the nodes of the given type (e.g., VariableDeclaration)
+	@return {list} nodes that have a PDG data dependency edge for `varname` to the given node
+	"""
+
+	if is_in_memory_graph(tx):
+		return tx.get_pdg_parents(node_id, varname, node_type=node_type)
+
+	# filled by `get_pdg_parents_batch`, too
+	cache = graph_cache.get_cache(tx, 'pdg_parents')
+	key = (node_id, varname, node_type)
+	if key in cache:
+		return list(cache.get(key))
+
+	query = """
+	MATCH (n_s:ASTNode { Id: $id })<-[:PDG_parentOf { Arguments: $varname }]-(n_t)
+	WHERE $node_type IS NULL OR n_t.Type = $node_type
+	RETURN collect(distinct n_t) AS resultset
+	"""
+
+	resultset = []
+	results = tx.run(query, id=node_id, varname=varname, node_type=node_type)
+	for record in results:
+		resultset = record['resultset']
+		break
+
+	cache.put(key, list(resultset))
+	return resultset
+
+
+def _get_batches(items, batch_size):
+
+	items = list(items)
+	for i in range(0, len(items), batch_size):
+		yield items[i:i + batch_size]
+
+
+def get_pdg_parents_batch(tx, pairs, node_type=None, batch_size=1000):
+
+	"""
+	batched version of `get_pdg_parents`: one UNWIND query per batch of (node id, varname) pairs
+	@param {neo4j-pointer} tx
+	@param {list} pairs: list of (node id, varname) tuples
+	@param {string} node_type: if set, only returns the nodes of the given type
+	@param {int} batch_size: max number of pairs per query
+	@return {dict} (node id, varname) -> list of PDG parent nodes; the results are memoized for `get_pdg_parents`
+	"""
+
+	out = {}
+	if is_in_memory_graph(tx):
+		for (node_id, varname) in pairs:
+			out[(node_id, varname)] = tx.get_pdg_parents(node_id, varname, node_type=node_type)
+		return out
+
+	cache = graph_cache.get_cache(tx, 'pdg_parents')
+	missing = []
+	for (node_id, varname) in pairs:
+		key = (node_id, varname, node_type)
+		if key in cache:
+			out[(node_id, varname)] = list(cache.get(key))
+		elif (node_id, varname) not in out:
+			out[(node_id, varname)] = []
+			missing.append((node_id, varname))
+
+	query = """
+	UNWIND $pairs AS pair
+	MATCH (n_s:ASTNode { Id: pair.id })<-[:PDG_parentOf { Arguments: pair.varname }]-(n_t)
+	WHERE $node_type IS NULL OR n_t.Type = $node_type
+	RETURN pair.id AS id, pair.varname AS varname, collect(distinct n_t) AS resultset
+	"""
+	for batch in _get_batches(missing, batch_size):
+		results = tx.run(query, pairs=[{'id': node_id, 'varname': varname} for (node_id, varname) in batch], node_type=node_type)
+		for record in results:
+			out[(record['id'], record['varname'])] = record['resultset']
+
+	# pairs without any PDG parent are memoized, too
+	for (node_id, varname) in missing:
+		cache.put((node_id, varname, node_type), list(out[(node_id, varname)]))
+
+	return out
+
+
 def get_ast_topmost(tx, node):
 
 	"""
 	@param {neo4j-pointer} tx
 	@param {neo4j-node} node
-	@return topmost parent of an AST node
+	@return topmost parent of an AST node, i.e., the closest CFG-level statement enclosing the node,
+	or the AST root if there is no such statement
+	@description resolves the enclosing statement with a single variable-length path query;
+	the result is memoized per node id for the lifetime of the graph session of tx
 	"""
 
-	CFG_LEVEL_STATEMENTS = get_cfg_level_nodes_for_statements()
+	node_id = node["Id"]
+	cache = graph_cache.get_cache(tx, 'ast_topmost')
+	if node_id in cache:
+		return cache.get(node_id)
 
-	if "Type" in node:
-		node_type = node["Type"]
-	else:
-		node = get_node_by_id(tx, node["Id"]) # re-assign the input parameter here
-		node_type = node["Type"]
+	if is_in_memory_graph(tx):
+		top = tx.get_ast_topmost(node, get_cfg_level_nodes_for_statements())
+		cache.put(node_id, top)
+		return top
 
-	if node_type in CFG_LEVEL_STATEMENTS:
-		return node
+	# the shortest path from the node upwards that ends in a CFG-level statement or in the AST root
+	query = """
+	MATCH p=(top:ASTNode)-[:AST_parentOf*0..]->(n:ASTNode {Id: $id})
+	WHERE top.Type IN $cfg_level_statements OR NOT (:ASTNode)-[:AST_parentOf]->(top)
+	RETURN top
+	ORDER BY length(p)
+	LIMIT 1
+	"""
+	results = tx.run(query, id=node_id, cfg_level_statements=get_cfg_level_nodes_for_statements())
+	top = None
+	for item in results:
+		top = item['top']
 
-	
-	done = False
-	iterator = node
-	while not done:
-		parent = get_ast_parent(tx, iterator)
-		if parent is None:
-			done = True
-			return iterator
-
-		if parent['Type'] in CFG_LEVEL_STATEMENTS:
-			done = True
-			break
-		else:
-			iterator = parent # loop
+	if top is None:
+		# node does not exist in the graph
+		top = node
+
+	cache.put(node_id, top)
+	return top
+
+
+def get_ast_topmost_batch(tx, nodes, batch_size=1000):
+
+	"""
+	batched version of `get_ast_topmost`: one UNWIND query per batch of nodes
+	@param {neo4j-pointer} tx
+	@param {list} nodes: list of nodes (or dicts with an `Id` key)
+	@param {int} batch_size: max number of nodes per query
+	@return {dict} node id -> topmost parent of the node; the results are memoized for `get_ast_topmost`
+	"""
+
+	out = {}
+	if is_in_memory_graph(tx):
+		for node in nodes:
+			out[node['Id']] = get_ast_topmost(tx, node)
+		return out
+
+	cache = graph_cache.get_cache(tx, 'ast_topmost')
+	missing = []
+	for node in nodes:
+		node_id = node['Id']
+		if node_id in cache:
+			out[node_id] = cache.get(node_id)
+		elif node_id not in out:
+			# nodes that do not exist in the graph are their own topmost parent
+			out[node_id] = node
+			missing.append(node_id)
+
+	query = """
+	UNWIND $ids AS node_id
+	MATCH p=(top:ASTNode)-[:AST_parentOf*0..]->(n:ASTNode {Id: node_id})
+	WHERE top.Type IN $cfg_level_statements OR NOT (:ASTNode)-[:AST_parentOf]->(top)
+	WITH node_id, top, length(p) AS depth
+	ORDER BY depth
+	RETURN node_id, collect(top)[0] AS top
+	"""
+	for batch in _get_batches(missing, batch_size):
+		results = tx.run(query, ids=batch, cfg_level_statements=get_cfg_level_nodes_for_statements())
+		for record in results:
+			out[record['node_id']] = record['top']
+
+	for node_id in missing:
+		cache.put(node_id, out[node_id])
 
-	return parent
+	return out
 
 
 
@@ -518,31 +672,150 @@ def get_code_expression(wrapper_node, is_argument = False, relation_type='', sho
 
 
 
-def getChildsOf(tx, node, relation_type=''):
+def get_ast_subtree(tx, node, relation_type='', max_depth=None, max_nodes=None):
 	"""
+	fetches the whole AST subtree rooted at the given node with a single query, 
+	and rebuilds the wrapper tree that `get_code_expression` consumes.
 	@param {pointer} tx
-	@param {node object} node
-	@param {string} relation_type
+	@param {node object} node: root of the subtree
+	@param {string} relation_type: if set, only the children of the root with this AST relation type are included
+	@param {int} max_depth: max number of AST levels below the root (default: unbounded)
+	@param {int} max_nodes: max number of nodes whose children are expanded, in breadth-first order (default: unbounded)
 	@return {dict}: wrapperNode= a dict containing the parse tree with its root set to input node, format: {'node': node, 'children': [child_node1, child_node2, ...]} 
 	"""
 
-	outNode =  {'node': node, 'children': []} # wrapper around neo4j node
-	nodeId = node['Id']
-	if relation_type != '':
-		query= """
-		MATCH (root { Id: '%s' })-[:AST_parentOf { RelationType: '%s'}]->(child) RETURN collect(distinct child) AS resultset
-		"""%(nodeId, relation_type)
+	if is_in_memory_graph(tx):
+		return tx.get_ast_subtree(node, relation_type=relation_type, max_depth=max_depth, max_nodes=max_nodes)
+
+	if max_depth is not None and int(max_depth) <= 0:
+		return {'node': node, 'children': []}
+
+	if relation_type == '' and max_depth is None and max_nodes is None:
+		# whole subtrees prefetched by `get_ast_subtree_batch`
+		cache = graph_cache.get_cache(tx, 'ast_subtree', maxsize=AST_SUBTREE_CACHE_SIZE)
+		if node['Id'] in cache:
+			return cache.get(node['Id'])
+
+	# the upper bound of a variable-length pattern can not be a query parameter;
+	# the nodes at the last level are fetched as children of the level above
+	if max_depth is None:
+		path_range = '*0..'
 	else:
-		query= """
-			MATCH (root { Id: '%s' })-[:AST_parentOf]->(child) RETURN collect(distinct child) AS resultset
-			"""%(nodeId)
+		path_range = '*0..%d'%(int(max_depth) - 1)
+
+	# the children of each parent are collected in relationship expansion order, 
+	# which is the same order as the one of the per-node query that `get_code_expression` relies on
+	if max_nodes is None:
+		query = """
+		MATCH (root:ASTNode { Id: $id })-[:AST_parentOf%s]->(parent)
+		WITH DISTINCT parent
+		OPTIONAL MATCH (parent)-[r:AST_parentOf]->(child)
+		RETURN parent, collect(child) AS children, collect(r.RelationType) AS relation_types
+		"""%(path_range)
+	else:
+		# the nodes are expanded breadth-first, such that the parents of every expanded node are expanded too
+		query = """
+		MATCH p = (root:ASTNode { Id: $id })-[:AST_parentOf%s]->(parent)
+		WITH parent, min(length(p)) AS depth
+		ORDER BY depth
+		LIMIT $max_nodes
+		OPTIONAL MATCH (parent)-[r:AST_parentOf]->(child)
+		RETURN parent, collect(child) AS children, collect(r.RelationType) AS relation_types
+		"""%(path_range)
+
+	results = tx.run(query, id=node['Id'], max_nodes=max_nodes)
+
+	# parent id -> list of (child node, relation type) 
+	adjacency = {}
+	for record in results:
+		parent = record['parent']
+		adjacency[parent['Id']] = list(zip(record['children'], record['relation_types']))
 
-	results = tx.run(query)
-	for item in results:
-		childNodes = item['resultset']
-		for childNode in childNodes:
-			outNode['children'].append(getChildsOf(tx, childNode))
-	return outNode
+	return _build_ast_wrapper(node, adjacency, relation_type=relation_type)
 
 
+def _build_ast_wrapper(node, adjacency, relation_type=''):
+
+	"""
+	@param {dict} adjacency: parent id -> list of (child node, relation type)
+	@return {dict} the wrapper tree of `get_ast_subtree` rooted at the given node
+	"""
+
+	root_children = adjacency.get(node['Id'], [])
+	if relation_type != '':
+		root_children = [(child, rel) for (child, rel) in root_children if rel == relation_type]
+
+	def _build(child_node, child_edges, visited):
+		wrapper = {'node': child_node, 'children': []}
+		seen = set()
+		for (child, _) in child_edges:
+			child_id = child['Id']
+			# distinct children, and guard against malformed (cyclic) AST edges
+			if child_id in seen or child_id in visited:
+				continue
+			seen.add(child_id)
+			visited.add(child_id)
+			wrapper['children'].append(_build(child, adjacency.get(child_id, []), visited))
+			visited.discard(child_id)
+		return wrapper
+
+	return _build(node, root_children, set([node['Id']]))
+
+
+def get_ast_subtree_batch(tx, nodes, batch_size=1000):
+
+	"""
+	batched version of `get_ast_subtree` for whole subtrees: one UNWIND query per batch of root nodes
+	@param {pointer} tx
+	@param {list} nodes: root nodes of the subtrees
+	@param {int} batch_size: max number of root nodes per query
+	@return {dict} root node id -> wrapper tree; the results are memoized for `get_ast_subtree` (and `getChildsOf`)
+	"""
+
+	out = {}
+	if is_in_memory_graph(tx):
+		for node in nodes:
+			out[node['Id']] = tx.get_ast_subtree(node)
+		return out
+
+	cache = graph_cache.get_cache(tx, 'ast_subtree', maxsize=AST_SUBTREE_CACHE_SIZE)
+	missing = {}
+	for node in nodes:
+		node_id = node['Id']
+		if node_id in cache:
+			out[node_id] = cache.get(node_id)
+		else:
+			missing[node_id] = node
+
+	query = """
+	UNWIND $ids AS root_id
+	MATCH (root:ASTNode { Id: root_id })-[:AST_parentOf*0..]->(parent)
+	WITH DISTINCT root_id, parent
+	OPTIONAL MATCH (parent)-[r:AST_parentOf]->(child)
+	RETURN root_id, parent, collect(child) AS children, collect(r.RelationType) AS relation_types
+	"""
+	for batch in _get_batches(list(missing.keys()), batch_size):
+		# root id -> adjacency of its subtree
+		adjacencies = dict((root_id, {}) for root_id in batch)
+		results = tx.run(query, ids=batch)
+		for record in results:
+			parent = record['parent']
+			adjacencies[record['root_id']][parent['Id']] = list(zip(record['children'], record['relation_types']))
+
+		for root_id in batch:
+			wrapper = _build_ast_wrapper(missing[root_id], adjacencies[root_id])
+			cache.put(root_id, wrapper)
+			out[root_id] = wrapper
+
+	return out
+
+
+def getChildsOf(tx, node, relation_type=''):
+	"""
+	@param {pointer} tx
+	@param {node object} node
+	@param {string} relation_type
+	@return {dict}: wrapperNode= a dict containing the parse tree with its root set to input node, format: {'node': node, 'children': [child_node1, child_node2, ...]} 
+	"""
 
+	return get_ast_subtree(tx, node, relation_type=relation_type)
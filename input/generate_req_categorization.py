@@ -16,7 +16,8 @@
 
 	Description:
 	------------
-	Generates a bash script that categorizes requests / taint flows based on the tainted position of the sink string
+	Generates a bash script that categorizes requests / taint flows based on the tainted position of the sink string,
+	for all source x sink buckets at once
 
 
 	Usage:
@@ -48,50 +49,11 @@ def main():
 	stop_script_content_lines = ["#!/usr/bin/env bash"]
 
 
-	sources = [
-		"loc_href",
-		"loc_hash",
-		"win_name",
-		"loc_search",
-		"doc_referrer",
-		"doc_baseuri",
-		"doc_uri",
-		"pushsub_endpoint",
-		"message_evt"
-	]
-
-	sinks = [
-		"websocket_url",
-		"websocket_data",
-		"eventsource_url",
-		"fetch_url",
-		"fetch_data",
-		"xmlhttprequest_url",
-		"xmlhttprequest_data",
-		"xmlhttprequest_sethdr",
-		"window.open",
-		"loc_assign",
-		"script_src"
-	]
-
-	RUN_COMMAND_TEMPLATE = "screen -dmS cc{0} bash -c 'python3 -m scripts.categorize_reqs_based_on_tainted_params  --source={1} --sink={2}; exec sh'"
-	STOP_COMMAND_TEMPLATE = "screen -X -S cc{0} kill"
-
-	screen_counter = 0
-	for source in sources:
-		for sink in sinks:
-			screen_counter = screen_counter + 1
-			run_command = RUN_COMMAND_TEMPLATE.format(screen_counter, source, sink)
-			run_script_content_lines.append(run_command)
-
-			stop_command = STOP_COMMAND_TEMPLATE.format(screen_counter)
-			stop_script_content_lines.append(stop_command)
-		run_script_content_lines.append("#")
-
-	run_all_command = "screen -dmS cc{0} bash -c 'python3 -m scripts.categorize_reqs_based_on_tainted_params; exec sh'".format(screen_counter+1)
+	# all source x sink buckets are categorized in a single pass over the taint flows, see `categorize_reqs_based_on_tainted_params`
+	run_all_command = "screen -dmS cc1 bash -c 'python3 -m scripts.categorize_reqs_based_on_tainted_params; exec sh'"
 	run_script_content_lines.append(run_all_command)
 	
-	stop_all_command = "screen -X -S cc{0} kill".format(screen_counter+1)
+	stop_all_command = "screen -X -S cc1 kill"
 	stop_script_content_lines.append(stop_all_command)
 
 
@@ -26,11 +26,14 @@
 """
 
 import argparse
+import contextlib
 import pandas as pd
 import os, sys
 import requests
 
 import utils.io as IOModule
+import utils.page_clusters as pageClustersModule
+import utils.incremental_analysis as incrementalModule
 from utils.logging import logger as LOGGER
 import utils.utility as utilityModule
 import constants as constantsModule
@@ -39,6 +42,23 @@ import analyses.cs_csrf.cs_csrf_neo4j_traversals as CSRFTraversalsModule
 import analyses.request_hijacking.static_analysis_api as sast_model_construction_api
 import analyses.request_hijacking.static_analysis_py_api as request_hijacking_neo4j_analysis_api
 import analyses.request_hijacking.verification_api as request_hijacking_verification_api
+from utils.scheduler import StageScheduler, StagePipeline, get_stage_limit, split_memory_budget
+from hpg_neo4j.instance_pool import Neo4jInstancePool, SWAP_MODE_RESTART
+import hpg_neo4j.db_utility as DU
+
+
+# scheduler stages
+STAGE_CRAWLING = 'crawling'
+STAGE_STATIC = 'static'
+STAGE_STATIC_NEO4J = 'static_neo4j'
+STAGE_STATIC_NEO4J_DOCKER = 'static_neo4j_docker'
+STAGE_DYNAMIC = 'dynamic'
+STAGE_VERIFICATION = 'verification'
+
+# scheduler modes
+SCHEDULER_MODE_POOL = 'pool'
+SCHEDULER_MODE_PIPELINE = 'pipeline'
+
 
 def is_website_up(uri):
 	try:
@@ -58,6 +78,377 @@ def save_website_is_down(domain):
 		fd.write(domain)
 
 
+def is_crawling_enabled(config):
+	return (config['domclobbering']['enabled'] and config['domclobbering']["passes"]["crawling"]) or \
+		(config['cs_csrf']['enabled'] and config['cs_csrf']["passes"]["crawling"]) or \
+		(config['request_hijacking']['enabled'] and config['request_hijacking']["passes"]["crawling"])
+
+
+def get_sites_from_sitelist(testbed_filename, from_row, to_row):
+
+	"""
+	@param {string} testbed_filename: csv file with rank, site entries
+	@param {int} from_row
+	@param {int} to_row
+	@return {generator} of (row index, site rank, site url) tuples for the rows in the [from_row, to_row] range
+	"""
+
+	chunksize = 10**5
+	iteration = 0
+	done = False
+	for chunk_df in pd.read_csv(testbed_filename, chunksize=chunksize, usecols=[0, 1], header=None, skip_blank_lines=True):
+		if done:
+			break
+
+		iteration = iteration + 1
+		LOGGER.info("starting to crawl chunk: %s -- %s"%((iteration-1)*chunksize, iteration*chunksize))
+		
+		reverse_chunk_df = chunk_df[::-1]
+
+		for (index, row) in reverse_chunk_df.iterrows():
+			g_index = iteration*index+1
+			if g_index >= from_row and g_index <= to_row:
+
+				website_rank = row[0]
+				website_url = 'http://' + row[1]
+				yield (g_index, website_rank, website_url)
+
+			# if g_index > to_row :
+			if g_index < from_row:
+				done = True
+				break
+
+
+def get_stage_context(scheduler, stage_name):
+
+	"""
+	@param {StageScheduler} scheduler: may be None for sequential runs
+	@param {string} stage_name
+	@return a context manager that holds a slot of the given stage
+	"""
+	if scheduler is None:
+		return contextlib.nullcontext(None)
+	return scheduler.stage(stage_name)
+
+
+def site_has_hpg(website_url):
+
+	"""
+	@param {string} website_url
+	@return {bool} whether the static pass produced a property graph for at least one webpage of the site
+	"""
+	website_folder = os.path.join(constantsModule.DATA_DIR, utilityModule.getDirectoryNameFromURL(website_url))
+	if not os.path.isdir(website_folder):
+		return False
+
+	for webpage in os.listdir(website_folder):
+		webpage_folder = os.path.join(website_folder, webpage)
+		if IOModule.get_graph_files(webpage_folder)[0] is not None:
+			return True
+	return False
+
+
+def get_site_clusters(website_url, pipeline, recompute=False):
+
+	"""
+	@param {string} website_url
+	@param {bool} recompute: re-cluster the webpages of the site even if the clusters are stored already
+	@return {dict} clusters of the webpages of the site (see `utils.page_clusters`), or None if page clustering is disabled
+	"""
+	if not pipeline.get("cluster_pages"):
+		return None
+
+	website_folder = os.path.join(constantsModule.DATA_DIR, utilityModule.getDirectoryNameFromURL(website_url))
+	if not os.path.isdir(website_folder):
+		return None
+
+	clusters = None
+	if not recompute:
+		clusters = pageClustersModule.load_site_clusters(website_folder)
+	if clusters is None:
+		clusters = pageClustersModule.cluster_site_webpages(website_folder, mode=pipeline["cluster_mode"], threshold=pipeline["cluster_threshold"], weighted=pipeline["cluster_weighted"])
+	return clusters
+
+
+def attach_site_cluster_results(website_url, clusters, file_names):
+
+	if clusters:
+		website_folder = os.path.join(constantsModule.DATA_DIR, utilityModule.getDirectoryNameFromURL(website_url))
+		count = pageClustersModule.attach_cluster_results(website_folder, clusters, file_names)
+		LOGGER.info("attached %s result files to the members of the webpage clusters of %s"%(count, website_url))
+
+
+def prepare_incremental_stage(website_url, pipeline, stage):
+
+	"""
+	@param {string} stage: `incrementalModule.STAGE_STATIC` or `incrementalModule.STAGE_TRAVERSALS`
+	@return {set} webpages whose outputs of the stage are up to date since the last crawl (empty if the incremental mode is disabled)
+	"""
+	if not pipeline.get("incremental"):
+		return set()
+
+	website_folder = os.path.join(constantsModule.DATA_DIR, utilityModule.getDirectoryNameFromURL(website_url))
+	if not os.path.isdir(website_folder):
+		return set()
+	return incrementalModule.prepare_stage(website_folder, pageClustersModule.get_site_webpages(website_folder), stage)
+
+
+def record_incremental_stage(website_url, pipeline, stage):
+
+	if not pipeline.get("incremental"):
+		return
+
+	website_folder = os.path.join(constantsModule.DATA_DIR, utilityModule.getDirectoryNameFromURL(website_url))
+	if os.path.isdir(website_folder):
+		incrementalModule.record_stage(website_folder, pageClustersModule.get_site_webpages(website_folder), stage)
+
+
+def run_crawling_pass(website_url, site_label, config, pipeline, scheduler=None, print_stdout=True):
+
+	"""
+	@return {bool} whether the site should be handed to the next pass
+	"""
+
+	if is_crawling_enabled(config):
+		with get_stage_context(scheduler, STAGE_CRAWLING):
+			LOGGER.info("crawling site %s"%(site_label)) 
+			cmd = pipeline["crawling_command"].replace('SEED_URL', website_url)
+			IOModule.run_os_command(cmd, cwd=pipeline["crawler_command_cwd"], timeout= pipeline["crawling_timeout"])
+			LOGGER.info("successfully crawled %s"%(site_label)) 
+
+		website_folder = os.path.join(constantsModule.DATA_DIR, utilityModule.getDirectoryNameFromURL(website_url))
+		if not os.path.isdir(website_folder):
+			LOGGER.warning("no crawled data for site %s"%(site_label))
+			return False
+
+		# group the new webpages by their scripts
+		get_site_clusters(website_url, pipeline, recompute=True)
+
+	return True
+
+
+def run_static_pass(website_url, site_label, config, pipeline, scheduler=None, print_stdout=True):
+
+	"""
+	@return {bool} whether the site should be handed to the next pass
+	"""
+
+	# dom clobbering
+	if config['domclobbering']['enabled'] and config['domclobbering']["passes"]["static"]:
+		with get_stage_context(scheduler, STAGE_STATIC):
+			LOGGER.info("static analysis for site %s"%(site_label)) 
+			cmd = pipeline["domc_static_analysis_command"].replace('SEED_URL', website_url)
+			IOModule.run_os_command(cmd, print_stdout=print_stdout, cwd=pipeline["domc_analyses_command_cwd"], timeout= pipeline["static_analysis_timeout"])
+			LOGGER.info("successfully finished static analysis for site %s"%(site_label)) 
+
+	# client-side csrf
+	if config['cs_csrf']['enabled'] and config['cs_csrf']["passes"]["static"]:
+		with get_stage_context(scheduler, STAGE_STATIC):
+			LOGGER.info("static analysis for site %s"%(site_label)) 
+			cmd = pipeline["cs_csrf_static_analysis_command"].replace('SEED_URL', website_url)
+			IOModule.run_os_command(cmd, print_stdout=print_stdout, cwd=pipeline["cs_csrf_analyses_command_cwd"], timeout= pipeline["static_analysis_timeout"])
+			LOGGER.info("successfully finished static analysis for site %s"%(site_label)) 
+
+	# request hijacking
+	if config['request_hijacking']['enabled'] and config['request_hijacking']["passes"]["static"]:
+		# analyze one webpage per cluster of webpages with the same scripts
+		clusters = get_site_clusters(website_url, pipeline)
+		# and only the webpages that changed since the last crawl
+		skip_webpages = pageClustersModule.get_redundant_webpages(clusters) | prepare_incremental_stage(website_url, pipeline, incrementalModule.STAGE_STATIC)
+		with get_stage_context(scheduler, STAGE_STATIC):
+			LOGGER.info("static analysis for site %s"%(site_label)) 
+			sast_model_construction_api.start_model_construction(website_url, memory=pipeline["static_analysis_memory"], timeout=pipeline["static_analysis_per_webpage_timeout"], compress_hpg=pipeline["static_analysis_compress_hpg"], overwrite_hpg=pipeline["static_analysis_overwrite_hpg"], columnar_hpg=pipeline["static_analysis_columnar_hpg"], script_cache=pipeline["static_analysis_script_cache"], skip_webpages=skip_webpages, library_summaries=pipeline["static_analysis_library_summaries"])
+			LOGGER.info("successfully finished static analysis for site %s"%(site_label)) 
+		attach_site_cluster_results(website_url, clusters, pageClustersModule.STATIC_RESULT_FILES)
+		record_incremental_stage(website_url, pipeline, incrementalModule.STAGE_STATIC)
+
+		# only sites with at least one property graph need the neo4j pass
+		if config['request_hijacking']["passes"]["static_neo4j"] and not site_has_hpg(website_url):
+			LOGGER.warning("no property graph was constructed for site %s"%(site_label))
+			return False
+
+	return True
+
+
+def run_static_neo4j_pass(website_url, site_label, config, pipeline, scheduler=None, print_stdout=True):
+
+	"""
+	@return {bool} whether the site should be handed to the next pass
+	"""
+
+	# dom clobbering (docker-based, single instance)
+	if config['domclobbering']['enabled'] and config['domclobbering']["passes"]["static_neo4j"]:
+		with get_stage_context(scheduler, STAGE_STATIC_NEO4J_DOCKER):
+			LOGGER.info("HPG construction and analysis over neo4j for site %s"%(site_label)) 
+			DOMCTraversalsModule.build_and_analyze_hpg(website_url)
+			LOGGER.info("finished HPG construction and analysis over neo4j for site %s"%(site_label)) 
+
+	# client-side csrf (docker-based, single instance)
+	if config['cs_csrf']['enabled'] and config['cs_csrf']["passes"]["static_neo4j"]:
+		with get_stage_context(scheduler, STAGE_STATIC_NEO4J_DOCKER):
+			LOGGER.info("HPG construction and analysis over neo4j for site %s"%(site_label)) 
+			CSRFTraversalsModule.build_and_analyze_hpg(website_url)
+			LOGGER.info("finished HPG construction and analysis over neo4j for site %s"%(site_label)) 
+
+	# request hijacking
+	if config['request_hijacking']['enabled'] and config['request_hijacking']["passes"]["static_neo4j"]:
+		clusters = get_site_clusters(website_url, pipeline)
+		skip_webpages = pageClustersModule.get_redundant_webpages(clusters) | prepare_incremental_stage(website_url, pipeline, incrementalModule.STAGE_TRAVERSALS)
+		try:
+			run_request_hijacking_neo4j_pass(website_url, site_label, pipeline, scheduler=scheduler, skip_webpages=skip_webpages)
+		finally:
+			attach_site_cluster_results(website_url, clusters, pageClustersModule.TRAVERSAL_RESULT_FILES)
+			record_incremental_stage(website_url, pipeline, incrementalModule.STAGE_TRAVERSALS)
+
+	return True
+
+
+def run_request_hijacking_neo4j_pass(website_url, site_label, pipeline, scheduler=None, skip_webpages=None):
+
+	"""
+	runs the request hijacking traversals over the HPGs of a site, in the configured graph backend
+	@param {set} skip_webpages: webpages not to analyze
+	"""
+
+	neo4j_stage = STAGE_STATIC_NEO4J
+	if str(constantsModule.NEO4J_USE_DOCKER).lower() == 'true':
+		neo4j_stage = STAGE_STATIC_NEO4J_DOCKER
+
+	if pipeline.get("graph_backend") == request_hijacking_neo4j_analysis_api.GRAPH_BACKEND_MEMORY:
+		with get_stage_context(scheduler, STAGE_STATIC_NEO4J):
+			LOGGER.info("in-memory HPG analysis for site %s"%(site_label)) 
+			request_hijacking_neo4j_analysis_api.build_and_analyze_hpg(website_url, overwrite=pipeline["static_analysis_overwrite_hpg"], backend=request_hijacking_neo4j_analysis_api.GRAPH_BACKEND_MEMORY, skip_webpages=skip_webpages)
+			LOGGER.info("finished in-memory HPG analysis for site %s"%(site_label)) 
+		return True
+
+	neo4j_pool = pipeline.get("neo4j_pool", None)
+	if neo4j_pool is not None and neo4j_stage == STAGE_STATIC_NEO4J:
+		# swap the graphs into a warm instance; the size of the pool bounds the concurrency
+		with neo4j_pool.instance() as instance:
+			LOGGER.info("HPG construction and analysis over neo4j instance %s for site %s"%(instance.name, site_label)) 
+			request_hijacking_neo4j_analysis_api.build_and_analyze_hpg(website_url, timeout=pipeline["static_analysis_per_webpage_timeout"], overwrite=pipeline["static_analysis_overwrite_hpg"], compress_hpg=pipeline["static_analysis_compress_hpg"], instance=instance, skip_webpages=skip_webpages, triage=pipeline["triage"])
+			LOGGER.info("finished HPG construction and analysis over neo4j for site %s"%(site_label)) 
+		return True
+
+	with get_stage_context(scheduler, neo4j_stage) as slot:
+		# each concurrent neo4j instance runs on its own block of ports
+		port_offset = 0
+		if slot is not None and neo4j_stage == STAGE_STATIC_NEO4J:
+			port_offset = slot * pipeline["neo4j_port_step"]
+		neo4j_http_port = str(int(constantsModule.NEO4J_HTTP_PORT) + port_offset)
+		neo4j_bolt_port = str(int(constantsModule.NEO4J_BOLT_PORT) + port_offset)
+
+		LOGGER.info("HPG construction and analysis over neo4j for site %s"%(site_label)) 
+		request_hijacking_neo4j_analysis_api.build_and_analyze_hpg(website_url, timeout=pipeline["static_analysis_per_webpage_timeout"], overwrite=pipeline["static_analysis_overwrite_hpg"], compress_hpg=pipeline["static_analysis_compress_hpg"], http_port=neo4j_http_port, bolt_port=neo4j_bolt_port, skip_webpages=skip_webpages, triage=pipeline["triage"])
+		LOGGER.info("finished HPG construction and analysis over neo4j for site %s"%(site_label)) 
+
+	return True
+
+
+def run_dynamic_pass(website_url, site_label, config, pipeline, scheduler=None, print_stdout=True):
+
+	"""
+	@return {bool} whether the site should be handed to the next pass
+	"""
+
+	# dom clobbering
+	if config['domclobbering']['enabled'] and config['domclobbering']["passes"]["dynamic"]:
+		with get_stage_context(scheduler, STAGE_DYNAMIC):
+			LOGGER.info("Running dynamic verifier for site %s"%(site_label)) 
+			cmd = pipeline["node_force_execution"].replace('SEED_URL', website_url)
+			IOModule.run_os_command(cmd, cwd=pipeline["force_execution_command_cwd"], timeout= pipeline["force_execution_timeout"])
+			LOGGER.info("Dynamic verification completed for site %s"%(site_label)) 
+
+	# request hijacking
+	if config['request_hijacking']['enabled'] and config['request_hijacking']['passes']['verification']:
+		with get_stage_context(scheduler, STAGE_VERIFICATION):
+			LOGGER.info("dynamic data flow verification for site %s"%(site_label))
+			cmd = pipeline["node_dynamic_verifier"].replace("SITE_URL", website_url)
+			request_hijacking_verification_api.start_verification_for_site(cmd, website_url, cwd=pipeline["dynamic_verifier_command_cwd"], timeout=pipeline["verification_pass_timeout"], overwrite=False)
+			LOGGER.info("sucessfully finished dynamic data flow verification for site %s"%(site_label))
+
+	return True
+
+
+# passes of the pipeline, in the order of execution
+PIPELINE_PASSES = [
+	run_crawling_pass,
+	run_static_pass,
+	run_static_neo4j_pass,
+	run_dynamic_pass,
+]
+
+
+def run_site_passes(website_url, site_label, config, pipeline, scheduler=None, print_stdout=True):
+
+	"""
+	@param {string} website_url
+	@param {string} site_label: site description used in the logs (e.g., rank and url)
+	@param {dict} config: pipeline configuration
+	@param {dict} pipeline: commands, working directories and timeouts of the passes
+	@param {StageScheduler} scheduler: bounds the number of concurrent executions per stage (optional)
+	@param {bool} print_stdout: whether to log the output of the static analysis processes
+	@description runs the enabled passes of the pipeline for a single site
+	"""
+
+	for run_pass in PIPELINE_PASSES:
+		run_pass(website_url, site_label, config, pipeline, scheduler=scheduler, print_stdout=print_stdout)
+
+
+def create_scheduler(config, pipeline):
+
+	"""
+	@param {dict} config: pipeline configuration
+	@param {dict} pipeline: commands, working directories and timeouts of the passes
+	@return {StageScheduler} scheduler with per-stage limits taken from the `scheduler` section of the config
+	"""
+
+	scheduler_config = config["scheduler"]
+	concurrency = scheduler_config.get("concurrency", {}) or {}
+	workers = int(scheduler_config.get("workers", 1))
+
+	# memory budget (in MB) shared by the node processes of the crawler and the static analyzer
+	memory_budget = scheduler_config.get("memory", None)
+	(crawling_limit, static_limit) = split_memory_budget(memory_budget, [
+		(concurrency.get(STAGE_CRAWLING, workers), pipeline["crawler_node_memory"]),
+		(concurrency.get(STAGE_STATIC, workers), pipeline["static_analysis_memory"]),
+	])
+
+	stage_limits = {
+		STAGE_CRAWLING: crawling_limit,
+		STAGE_STATIC: static_limit,
+		STAGE_STATIC_NEO4J: get_stage_limit(concurrency.get(STAGE_STATIC_NEO4J, 1)),
+		# the docker-based neo4j setup uses fixed container ports
+		STAGE_STATIC_NEO4J_DOCKER: 1,
+		STAGE_DYNAMIC: get_stage_limit(concurrency.get(STAGE_DYNAMIC, workers)),
+		STAGE_VERIFICATION: get_stage_limit(concurrency.get(STAGE_VERIFICATION, workers)),
+	}
+
+	LOGGER.info("scheduler: %s workers, stage limits: %s"%(workers, str(stage_limits)))
+	return StageScheduler(workers, stage_limits)
+
+
+def create_neo4j_instance_pool(config, pipeline):
+
+	"""
+	@param {dict} config: pipeline configuration
+	@param {dict} pipeline: commands, working directories and timeouts of the passes
+	@return {Neo4jInstancePool} pool of warm neo4j instances, or None if `neo4j_pool_size` is not set
+	"""
+
+	pool_size = int(config["staticpass"].get("neo4j_pool_size", 0) or 0)
+	if pool_size <= 0 or str(constantsModule.NEO4J_USE_DOCKER).lower() == 'true':
+		return None
+	if pipeline["graph_backend"] == request_hijacking_neo4j_analysis_api.GRAPH_BACKEND_MEMORY:
+		return None
+
+	swap_mode = config["staticpass"].get("neo4j_pool_swap_mode", SWAP_MODE_RESTART)
+	LOGGER.info("starting a pool of %s neo4j instances (swap mode: %s)"%(pool_size, swap_mode))
+	neo4j_pool = Neo4jInstancePool(pool_size, http_port=constantsModule.NEO4J_HTTP_PORT, port_step=pipeline["neo4j_port_step"], swap_mode=swap_mode)
+	neo4j_pool.start()
+	return neo4j_pool
+
+
 def main():
 
 	BASE_DIR= os.path.dirname(os.path.realpath(__file__))
@@ -167,6 +558,40 @@ def main():
 	if "overwrite_hpg" in config["staticpass"]:
 		static_analysis_overwrite_hpg = config["staticpass"]["overwrite_hpg"]
 
+	# also write a columnar, memory-mappable copy of each HPG
+	static_analysis_columnar_hpg = str(config["staticpass"].get("columnar_hpg", False)).lower() == 'true'
+
+	# re-use per-script analysis artifacts across webpages and sites
+	static_analysis_script_cache = str(config["staticpass"].get("script_cache", False)).lower() == 'true'
+
+	# replace known library scripts with their summaries rather than leaving them out
+	static_analysis_library_summaries = str(config["staticpass"].get("library_summaries", False)).lower() == 'true'
+	if "library_summaries_file" in config["staticpass"]:
+		constantsModule.LIBRARY_SUMMARIES_FILE = config["staticpass"]["library_summaries_file"]
+
+	# analyze one webpage per cluster of webpages with the same scripts, and attach its results to the other members
+	cluster_pages = str(config["staticpass"].get("cluster_pages", False)).lower() == 'true'
+	# exact: identical scripts; minhash: near-identical sets of scripts (i.e., Jaccard similarity above the threshold)
+	cluster_mode = config["staticpass"].get("cluster_mode", pageClustersModule.CLUSTER_MODE_EXACT)
+	cluster_threshold = float(config["staticpass"].get("cluster_threshold", pageClustersModule.MINHASH_THRESHOLD))
+	cluster_weighted = str(config["staticpass"].get("cluster_weighted", False)).lower() == 'true'
+
+	# after a recrawl, only re-analyze the webpages whose scripts or DOM snapshot changed
+	incremental = str(config["staticpass"].get("incremental", False)).lower() == 'true'
+
+	# skip the neo4j import of webpages without (taintable) sinks, according to their `sinks.out.json`
+	triage = str(config["staticpass"].get("triage", False)).lower() == 'true'
+
+	# prefetch the backward slices of all sinks of a webpage with batched queries
+	if "batch_slicing" in config["staticpass"]:
+		constantsModule.BATCH_SLICING = str(config["staticpass"]["batch_slicing"]).lower() == 'true'
+
+	# compression of the graph csv files: gzip or zstd (with an optional trained dictionary)
+	if "compression" in config["staticpass"]:
+		constantsModule.HPG_COMPRESSION = config["staticpass"]["compression"]
+	if "zstd_dictionary" in config["staticpass"]:
+		constantsModule.HPG_ZSTD_DICTIONARY = config["staticpass"]["zstd_dictionary"]
+
 	# set neo4j config
 	if "neo4j_user" in config["staticpass"]:
 		constantsModule.NEO4J_USER = config["staticpass"]["neo4j_user"]
@@ -231,14 +656,94 @@ def main():
 
 
 
+	pipeline = {
+		"crawler_command_cwd": crawler_command_cwd,
+		"crawler_node_memory": crawler_node_memory,
+		"crawling_command": crawling_command,
+		"crawling_timeout": crawling_timeout,
+		"static_analysis_timeout": static_analysis_timeout,
+		"static_analysis_memory": static_analysis_memory,
+		"static_analysis_per_webpage_timeout": static_analysis_per_webpage_timeout,
+		"static_analysis_compress_hpg": static_analysis_compress_hpg,
+		"static_analysis_overwrite_hpg": static_analysis_overwrite_hpg,
+		"static_analysis_columnar_hpg": static_analysis_columnar_hpg,
+		"static_analysis_script_cache": static_analysis_script_cache,
+		"static_analysis_library_summaries": static_analysis_library_summaries,
+		"cluster_pages": cluster_pages,
+		"cluster_mode": cluster_mode,
+		"cluster_threshold": cluster_threshold,
+		"cluster_weighted": cluster_weighted,
+		"incremental": incremental,
+		"triage": triage,
+		"domc_analyses_command_cwd": domc_analyses_command_cwd,
+		"domc_static_analysis_command": domc_static_analysis_command,
+		"cs_csrf_analyses_command_cwd": cs_csrf_analyses_command_cwd,
+		"cs_csrf_static_analysis_command": cs_csrf_static_analysis_command,
+		"force_execution_command_cwd": force_execution_command_cwd,
+		"force_execution_timeout": force_execution_timeout,
+		"node_force_execution": node_force_execution,
+		"dynamic_verifier_command_cwd": dynamic_verifier_command_cwd,
+		"verification_pass_timeout": verification_pass_timeout,
+		"node_dynamic_verifier": node_dynamic_verifier,
+		# block of ports reserved for each concurrent neo4j instance (i.e., http, https, bolt)
+		"neo4j_port_step": 3,
+	}
+
+	if "scheduler" in config and "neo4j_port_step" in config["scheduler"]:
+		pipeline["neo4j_port_step"] = int(config["scheduler"]["neo4j_port_step"])
+
+	# backend of the request hijacking traversals: `neo4j` or `memory` (in-process, no database)
+	pipeline["graph_backend"] = config["staticpass"].get("graph_backend", request_hijacking_neo4j_analysis_api.GRAPH_BACKEND_NEO4J)
+
+	pipeline["neo4j_pool"] = create_neo4j_instance_pool(config, pipeline)
+	try:
+		run_testbed(config, pipeline, BASE_DIR, domain_health_check)
+	finally:
+		if pipeline["neo4j_pool"] is not None:
+			pipeline["neo4j_pool"].shutdown()
+		DU.close_all_drivers()
+
+
+
+def run_testbed(config, pipeline, base_dir, domain_health_check):
+
+	"""
+	runs the enabled passes for the site or the sitelist of the testbed
+	@param {dict} config: pipeline configuration
+	@param {dict} pipeline: commands, working directories and timeouts of the passes
+	@param {string} base_dir: absolute path of the repository
+	@param {bool} domain_health_check: whether to skip the sites that are down
+	"""
+
 	if "site" in config["testbed"]:
 		website_url = config["testbed"]["site"]
 
-		# crawling
-		if (config['domclobbering']['enabled'] and config['domclobbering']["passes"]["crawling"]) or \
-			(config['cs_csrf']['enabled'] and config['cs_csrf']["passes"]["crawling"]) or \
-			(config['request_hijacking']['enabled'] and config['request_hijacking']["passes"]["crawling"]):
+		if domain_health_check and is_crawling_enabled(config):
+			LOGGER.info('checking if domain is up with python requests ...')
+			website_up = False
+
+			try:
+				website_up = is_website_up(website_url)
+			except:
+				save_website_is_down(website_url)
 
+			if not website_up:
+				LOGGER.warning('domain %s is not up, skipping!'%website_url)
+				save_website_is_down(website_url)
+
+		run_site_passes(website_url, website_url, config, pipeline)
+
+	else: 
+		
+		testbed_filename = base_dir.rstrip('/') + config["testbed"]["sitelist"].strip().strip('\n').strip()
+		from_row = int(config["testbed"]["from_row"])
+		to_row = int(config["testbed"]["to_row"])
+
+		scheduler = None
+		if "scheduler" in config and config["scheduler"]["enabled"]:
+			scheduler = create_scheduler(config, pipeline)
+
+		def check_site_is_up(website_url):
 
 			if domain_health_check:
 				LOGGER.info('checking if domain is up with python requests ...')
@@ -248,193 +753,61 @@ def main():
 					website_up = is_website_up(website_url)
 				except:
 					save_website_is_down(website_url)
+					return False
 
 				if not website_up:
 					LOGGER.warning('domain %s is not up, skipping!'%website_url)
 					save_website_is_down(website_url)
+					return False
+
+			return True
+
+		def get_site_label(site_entry):
+			(g_index, website_rank, website_url) = site_entry
+			return "at row %s - rank %s - %s"%(g_index, website_rank, website_url)
+
+		def process_site(site_entry):
+			website_url = site_entry[2]
+			if not check_site_is_up(website_url):
+				return
+			run_site_passes(website_url, get_site_label(site_entry), config, pipeline, scheduler=scheduler, print_stdout=False)
+
+		def get_pipeline_stage_fn(run_pass, health_check=False):
+			def run_stage(site_entry):
+				website_url = site_entry[2]
+				if health_check and not check_site_is_up(website_url):
+					return False
+				return run_pass(website_url, get_site_label(site_entry), config, pipeline, scheduler=scheduler, print_stdout=False)
+			return run_stage
+
+
+		sites = get_sites_from_sitelist(testbed_filename, from_row, to_row)
+		if scheduler is None:
+			for site_entry in sites:
+				process_site(site_entry)
+
+		elif config["scheduler"].get("mode", SCHEDULER_MODE_POOL) == SCHEDULER_MODE_PIPELINE:
+			# producer/consumer mode: crawled sites are queued for the static pass, and
+			# sites with property graphs are queued for the neo4j pass, so that the
+			# browser-, cpu- and database-bound passes of different sites overlap
+			limits = scheduler.stage_limits
+			stage_pipeline = StagePipeline([
+				(STAGE_CRAWLING, get_pipeline_stage_fn(run_crawling_pass, health_check=True), limits[STAGE_CRAWLING]),
+				(STAGE_STATIC, get_pipeline_stage_fn(run_static_pass), limits[STAGE_STATIC]),
+				(STAGE_STATIC_NEO4J, get_pipeline_stage_fn(run_static_neo4j_pass), limits[STAGE_STATIC_NEO4J]),
+				(STAGE_VERIFICATION, get_pipeline_stage_fn(run_dynamic_pass), max(limits[STAGE_DYNAMIC], limits[STAGE_VERIFICATION])),
+			])
+			failures = stage_pipeline.run(sites)
+			if failures > 0:
+				LOGGER.warning("%s pipeline stages ran into errors."%failures)
+
+		else:
+			failures = scheduler.run(process_site, sites)
+			if failures > 0:
+				LOGGER.warning("%s sites ran into errors during the pipeline execution."%failures)
+
+		LOGGER.info("successfully tested sites, terminating!") 
 
-			LOGGER.info("crawling site %s."%(website_url))
-			cmd = crawling_command.replace('SEED_URL', website_url)
-			LOGGER.debug(cmd)
-			IOModule.run_os_command(cmd, cwd=crawler_command_cwd, timeout= crawling_timeout)
-			LOGGER.info("successfully crawled %s."%(website_url)) 
-
-		# dom clobbering
-		if config['domclobbering']['enabled']:
-			# static analysis
-			if config['domclobbering']["passes"]["static"]:
-				LOGGER.info("static analysis for site %s."%(website_url))
-				cmd = domc_static_analysis_command.replace('SEED_URL', website_url)
-				IOModule.run_os_command(cmd, cwd=domc_analyses_command_cwd, timeout= static_analysis_timeout)
-				LOGGER.info("successfully finished static analysis for site %s."%(website_url)) 
-
-			# static analysis over neo4j
-			if config['domclobbering']["passes"]["static_neo4j"]:
-				LOGGER.info("HPG construction and analysis over neo4j for site %s."%(website_url))
-				DOMCTraversalsModule.build_and_analyze_hpg(website_url)
-				LOGGER.info("finished HPG construction and analysis over neo4j for site %s."%(website_url))
-
-			# dynamic verification
-			if config['domclobbering']["passes"]["dynamic"]:
-				LOGGER.info("Running dynamic verifier for site %s."%(website_url))
-				cmd = node_force_execution.replace('SEED_URL', website_url)
-				IOModule.run_os_command(cmd, cwd=force_execution_command_cwd, timeout= force_execution_timeout)
-				LOGGER.info("Dynamic verification completed for site %s."%(website_url))
-
-
-		# client-side csrf
-		if config['cs_csrf']['enabled']:
-			# static analysis
-			if config['cs_csrf']["passes"]["static"]:
-				LOGGER.info("static analysis for site %s."%(website_url))
-				cmd = cs_csrf_static_analysis_command.replace('SEED_URL', website_url)
-				IOModule.run_os_command(cmd, cwd=cs_csrf_analyses_command_cwd, timeout= static_analysis_timeout)
-				LOGGER.info("successfully finished static analysis for site %s."%(website_url)) 
-
-			# static analysis over neo4j
-			if config['cs_csrf']["passes"]["static_neo4j"]:
-				LOGGER.info("HPG construction and analysis over neo4j for site %s."%(website_url))
-				CSRFTraversalsModule.build_and_analyze_hpg(website_url)
-				LOGGER.info("finished HPG construction and analysis over neo4j for site %s."%(website_url))
-	
-
-		# request hijacking
-		if config['request_hijacking']['enabled']:
-			# static analysis
-			if config['request_hijacking']["passes"]["static"]:
-				LOGGER.info("static analysis for site %s."%(website_url))
-				sast_model_construction_api.start_model_construction(website_url, memory=static_analysis_memory, timeout=static_analysis_per_webpage_timeout, compress_hpg=static_analysis_compress_hpg, overwrite_hpg=static_analysis_overwrite_hpg)
-				LOGGER.info("successfully finished static analysis for site %s."%(website_url)) 
-
-			# static analysis over neo4j
-			if config['request_hijacking']["passes"]["static_neo4j"]:
-				LOGGER.info("HPG construction and analysis over neo4j for site %s."%(website_url))
-				request_hijacking_neo4j_analysis_api.build_and_analyze_hpg(website_url, timeout=static_analysis_per_webpage_timeout, compress_hpg=static_analysis_compress_hpg, overwrite=static_analysis_overwrite_hpg)
-				LOGGER.info("finished HPG construction and analysis over neo4j for site %s."%(website_url))
-
-			# dynamic verification
-			if config['request_hijacking']['passes']['verification']:
-				LOGGER.info("dynamic data flow verification for site %s."%(website_url))
-				cmd = node_dynamic_verifier.replace("SITE_URL", website_url)
-				request_hijacking_verification_api.start_verification_for_site(cmd, website_url, cwd=dynamic_verifier_command_cwd, timeout=verification_pass_timeout, overwrite=False)
-				LOGGER.info("sucessfully finished dynamic data flow verification for site %s."%(website_url))
-
-
-	else: 
-		
-		testbed_filename = BASE_DIR.rstrip('/') + config["testbed"]["sitelist"].strip().strip('\n').strip()
-		from_row = int(config["testbed"]["from_row"])
-		to_row = int(config["testbed"]["to_row"])
-
-		chunksize = 10**5
-		iteration = 0
-		done = False
-		for chunk_df in pd.read_csv(testbed_filename, chunksize=chunksize, usecols=[0, 1], header=None, skip_blank_lines=True):
-			if done:
-				break
-
-			iteration = iteration + 1
-			LOGGER.info("starting to crawl chunk: %s -- %s"%((iteration-1)*chunksize, iteration*chunksize))
-			
-			reverse_chunk_df = chunk_df[::-1]
-
-			for (index, row) in reverse_chunk_df.iterrows():
-				g_index = iteration*index+1
-				if g_index >= from_row and g_index <= to_row:
-
-					website_rank = row[0]
-					website_url = 'http://' + row[1]
-					
-
-					if domain_health_check:
-						LOGGER.info('checking if domain is up with python requests ...')
-						website_up = False
-
-						try:
-							website_up = is_website_up(website_url)
-						except:
-							save_website_is_down(website_url)
-							continue
-
-						if not website_up:
-							LOGGER.warning('domain %s is not up, skipping!'%website_url)
-							save_website_is_down(website_url)
-							continue
-
-					# crawling
-					if (config['domclobbering']['enabled'] and config['domclobbering']["passes"]["crawling"]) or \
-						(config['cs_csrf']['enabled'] and config['cs_csrf']["passes"]["crawling"]) or \
-						(config['request_hijacking']['enabled'] and config['request_hijacking']["passes"]["crawling"]):
-
-						LOGGER.info("crawling site at row %s - rank %s - %s"%(g_index, website_rank, website_url)) 
-						cmd = crawling_command.replace('SEED_URL', website_url)
-						IOModule.run_os_command(cmd, cwd=crawler_command_cwd, timeout= crawling_timeout)
-						LOGGER.info("successfully crawled %s - %s"%(website_rank, website_url)) 
-
-					# dom clobbering
-					if config['domclobbering']['enabled']:
-						# static analysis
-						if  config['domclobbering']["passes"]["static"]:
-							LOGGER.info("static analysis for site at row %s - rank %s - %s"%(g_index, website_rank, website_url)) 
-							cmd = domc_static_analysis_command.replace('SEED_URL', website_url)
-							IOModule.run_os_command(cmd, print_stdout=False, cwd=domc_analyses_command_cwd, timeout= static_analysis_timeout)
-							LOGGER.info("successfully finished static analysis for site at row %s - rank %s - %s"%(g_index, website_rank, website_url)) 
-						
-						if  config['domclobbering']["passes"]["static_neo4j"]:
-							LOGGER.info("HPG construction and analysis over neo4j for site %s - %s"%(website_rank, website_url)) 
-							DOMCTraversalsModule.build_and_analyze_hpg(website_url)
-							LOGGER.info("finished HPG construction and analysis over neo4j for site %s - %s"%(website_rank, website_url)) 
-
-						# dynamic verification
-						if  config['domclobbering']["passes"]["dynamic"]:
-							LOGGER.info("Running dynamic verifier for site %s - %s"%(website_rank, website_url)) 
-							cmd = node_force_execution.replace('SEED_URL', website_url)
-							IOModule.run_os_command(cmd, cwd=force_execution_command_cwd, timeout= force_execution_timeout)
-							LOGGER.info("Dynamic verification completed for site %s - %s"%(website_rank, website_url)) 
-
-
-					# client-side csrf
-					if config['cs_csrf']['enabled']:
-						# static analysis
-						if config['cs_csrf']["passes"]["static"]:
-							LOGGER.info("static analysis for site at row %s - rank %s - %s"%(g_index, website_rank, website_url)) 
-							cmd = cs_csrf_static_analysis_command.replace('SEED_URL', website_url)
-							IOModule.run_os_command(cmd, print_stdout=False, cwd=cs_csrf_analyses_command_cwd, timeout= static_analysis_timeout)
-							LOGGER.info("successfully finished static analysis for site at row %s - rank %s - %s"%(g_index, website_rank, website_url)) 
-						
-						if config['cs_csrf']["passes"]["static_neo4j"]:
-							LOGGER.info("HPG construction and analysis over neo4j for site %s - %s"%(website_rank, website_url)) 
-							CSRFTraversalsModule.build_and_analyze_hpg(website_url)
-							LOGGER.info("finished HPG construction and analysis over neo4j for site %s - %s"%(website_rank, website_url)) 
-
-
-
-					# request hijacking
-					if config['request_hijacking']['enabled']:
-						# static analysis
-						if config['request_hijacking']["passes"]["static"]:
-							LOGGER.info("static analysis for site at row %s - rank %s - %s"%(g_index, website_rank, website_url)) 
-							sast_model_construction_api.start_model_construction(website_url, memory=static_analysis_memory, timeout=static_analysis_per_webpage_timeout, compress_hpg=static_analysis_compress_hpg, overwrite_hpg=static_analysis_overwrite_hpg)
-							LOGGER.info("successfully finished static analysis for site at row %s - rank %s - %s"%(g_index, website_rank, website_url)) 
-						
-						if config['request_hijacking']["passes"]["static_neo4j"]:
-							LOGGER.info("HPG construction and analysis over neo4j for site %s - %s"%(website_rank, website_url)) 
-							request_hijacking_neo4j_analysis_api.build_and_analyze_hpg(website_url, timeout=static_analysis_per_webpage_timeout, overwrite=static_analysis_overwrite_hpg, compress_hpg=static_analysis_compress_hpg)
-							LOGGER.info("finished HPG construction and analysis over neo4j for site %s - %s"%(website_rank, website_url)) 
-
-						# dynamic verification
-						if config['request_hijacking']['passes']['verification']:
-							LOGGER.info("dynamic data flow verification for site %s - %s"%(website_rank, website_url))
-							cmd = node_dynamic_verifier.replace("SITE_URL", website_url)
-							request_hijacking_verification_api.start_verification_for_site(cmd, website_url, cwd=dynamic_verifier_command_cwd, timeout=verification_pass_timeout, overwrite=False)
-							LOGGER.info("sucessfully finished dynamic data flow verification for site %s - %s"%(website_rank, website_url))
-
-
-				# if g_index > to_row :
-				if g_index < from_row:
-					done = True
-					LOGGER.info("successfully tested sites, terminating!") 
-					break
 
 if __name__ == "__main__":
 	main()
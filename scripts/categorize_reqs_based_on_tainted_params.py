@@ -18,16 +18,15 @@
 	------------
 	script to analyze the anatomy of request sending instructions and their parameters 
 
-	Running:
-	------------
-	$ python3 -m scripts.categorize_reqs_based_on_tainted_params --source=<SOURCE> --sink=<SINK>
+	The top frame flows of the `taintflows_relevant.json` file of each webpage are categorized into all source x sink
+	buckets in a single pass, with the webpages processed in parallel (see `utils.data_walker`), and the outputs
+	of all buckets (`<source>_<sink>_req_*.json`) and of their union (`all_req_*.json`) are written at once.
 
-	
-	Parallel Runs:
+	Running:
 	------------
-	$ python3 -m input.generate_req_categorization
+	$ python3 -m scripts.categorize_reqs_based_on_tainted_params [--source=<SOURCE> --sink=<SINK>] [--processes=<N>]
 
-	then, run the generated bash scripts
+	With `--source` and `--sink`, only the outputs of that bucket are written.
 
 """
 
@@ -38,40 +37,320 @@ import sys
 import json 
 import argparse
 import constants as constantsModule
+import utils.data_walker as walkerModule
+import utils.taintflow_index as taintflowIndexModule
 from utils.logging import logger as LOGGER
 import utils.utility as utilityModule
 from urllib.parse import urlparse
 
+
+SINK_TYPES = [
+	'websocket_url',
+	'websocket_data',
+	'eventsource_url',
+	'fetch_url',
+	'fetch_data',
+	'xmlhttprequest_url',
+	'xmlhttprequest_data',
+	'xmlhttprequest_sethdr',
+	'window.open',
+	'loc_assign',
+	'script_src'
+]
+SOURCE_TYPES = [
+	'loc_href',
+	'loc_hash',
+	'loc_search',
+	'win_name',
+	'doc_referrer',
+	'doc_baseuri',
+	'doc_uri',
+	'message_evt',
+	'pushsub_endpoint'
+]
+
+TAINTFLOWS_FILE_NAME = 'taintflows_relevant.json'
+
+# names of the output files, relative to the slug of each bucket
+OUTPUT_NAMES = [
+	'req_patterns',			# pattern_id -> count_flows
+	'req_patterns_wb',		# pattern_id -> count_webpages
+	'req_patterns_ws',		# pattern_id -> count_websites
+	'req_sink_patterns',	# sink -> pattern_id -> count_flows
+	'req_sink_patterns_wb',	# sink -> pattern_id -> count_webpages
+	'req_sink_patterns_ws'	# sink -> pattern_id -> count_websites
+]
+
+
+
+def get_request_pattern_id(sink, entry):
+
+	"""
+	@param {string} sink: sink type of the bucket
+	@param {dict} entry: taint flow with at least one taint
+	@return {string} the bit vector of the request elements that are tainted by the first taint of the flow
+	"""
+
+	taintflow_sink = entry["sink"]
+	taintflow = entry["taint"][0]
+
+	if sink == "websocket_data" or sink == "xmlhttprequest_data" or sink == "fetch_data" or taintflow_sink == "WebSocket.send" or taintflow_sink == "fetch.body" or taintflow_sink == "XMLHttpRequest.send":
+		pattern_id = ['0'] * 10 + ['1', '0']
+
+	elif sink == "xmlhttprequest_sethdr" or taintflow_sink == "XMLHttpRequest.setRequestHeader":
+		pattern_id = ['0'] * 11 + ['1']
+
+	else:
+		sink_url_string = entry["str"]
+
+		try:
+			parsed_url = urlparse(sink_url_string)
+		except:
+			parsed_url = None
+
+		if parsed_url:
+
+			url_scheme = parsed_url.scheme
+			scheme_idx = sink_url_string.find(url_scheme)
+			url_scheme_range = range(scheme_idx, scheme_idx+len(url_scheme))
+			url_scheme_range_set = set(url_scheme_range)
+
+			url_netloc = parsed_url.netloc
+			netloc_idx = sink_url_string.find(url_netloc)
+			url_netloc_range = range(netloc_idx, netloc_idx+len(url_netloc))										
+			url_netloc_range_set = set(url_netloc_range)
+
+			url_path = parsed_url.path
+			path_idx = sink_url_string.find(url_path)
+			url_path_range = range(path_idx, path_idx+len(url_path))
+			url_path_range_set = set(url_path_range)
+
+			url_query = parsed_url.query
+			query_idx = sink_url_string.find(url_query)
+			url_query_range = range(query_idx, query_idx+len(url_query))
+			url_query_range_set = set(url_query_range)
+
+			url_fragment = parsed_url.fragment
+			fragment_idx = sink_url_string.find(url_fragment)
+			url_fragment_range = range(fragment_idx, fragment_idx+len(url_fragment))
+			url_fragment_range_set = set(url_fragment_range)
+
+			scheme_flag = 0
+			scheme_flag_start = 0
+			netloc_flag = 0
+			netloc_flag_end = 0
+			path_flag = 0
+			path_flag_start = 0
+			query_flag = 0
+			query_flag_start = 0
+			fragment_flag = 0
+			fragment_flag_start = 0
+			body_flag = 0									
+			header_flag = 0
+
+
+			begin = taintflow["begin"]
+			end = taintflow["end"]
+
+			parts = len(begin)
+			for i in range(parts):
+
+				b = begin[i]
+				e = end[i]
+
+				selected_part = sink_url_string[b:e]
+				if selected_part == sink_url_string:
+					scheme_flag = 1
+					scheme_flag_start = 1
+					netloc_flag = 1
+					netloc_flag_end = 1
+					path_flag = 1
+					path_flag_start = 1
+					query_flag = 1
+					query_flag_start = 1
+					fragment_flag = 1
+					fragment_flag_start = 1
+					body_flag = 0								
+					header_flag = 0
+					break
+
+				tainted_range = range(b, e)
+
+				if scheme_idx == -1:
+					print("sink_url_string", sink_url_string)
+					print("scheme", url_scheme)
+					print("---\n")
+				else:
+					intersection = url_scheme_range_set.intersection(tainted_range)
+					if len(intersection) > 0:
+						scheme_flag = 1
+						if url_scheme_range.start == b:
+							scheme_flag_start = 1
+
+				if netloc_idx == -1:
+					print("sink_url_string", sink_url_string)
+					print("netloc", url_netloc)
+					print("---\n")
+				else:
+					intersection = url_netloc_range_set.intersection(tainted_range)
+					if len(intersection) > 0:
+						netloc_flag = 1
+						if e >= url_netloc_range.stop:
+							netloc_flag_end = 1
+
+				if path_idx == -1:
+					print("sink_url_string", sink_url_string)
+					print("path", url_path)
+					print("---\n")
+				else:
+					intersection = url_path_range_set.intersection(tainted_range)
+					if len(intersection) > 0:
+						path_flag = 1
+						if b <= url_path_range.start:
+							path_flag_start = 1
+
+				if query_idx == -1:
+					print("sink_url_string", sink_url_string)
+					print("query", url_query)
+					print("---\n")
+				else:
+					intersection = url_query_range_set.intersection(tainted_range)
+					if len(intersection) > 0:
+						query_flag = 1
+						if b <= url_query_range.start:
+							query_flag_start = 1
+
+				if fragment_idx == -1:
+					print("sink_url_string", sink_url_string)
+					print("fragment", url_fragment)
+					print("---\n")
+				else:
+					intersection = url_fragment_range_set.intersection(tainted_range)
+					if len(intersection) > 0:
+						fragment_flag = 1
+						if b <= url_fragment_range.start:
+							fragment_flag_start = 1
+
+			pattern_id = [
+				str(scheme_flag),
+				str(scheme_flag_start),
+				str(netloc_flag),
+				str(netloc_flag_end),
+				str(path_flag),
+				str(path_flag_start),
+				str(query_flag),
+				str(query_flag_start),
+				str(fragment_flag),
+				str(fragment_flag_start),
+				str(body_flag),
+				str(header_flag)
+			]
+
+		else:
+			pattern_id = ['x'] * 12
+
+	return "_".join(pattern_id)
+
+
+def get_webpage_request_patterns(webpage_path_name):
+
+	"""
+	categorizes the top frame flows of a webpage into all source x sink buckets, which is equivalent to reading the
+	`taintflows_filter_<source>_<sink>_topframe.json` files of the webpage
+	@param {string} webpage_path_name: webpage folder
+	@return {dict} (source, sink) -> pattern ids of the flows of the bucket, in the order of the flows;
+		None if the webpage has no `taintflows_relevant.json`
+	"""
+
+	taintflow_file_path_name = os.path.join(webpage_path_name, TAINTFLOWS_FILE_NAME)
+	if not os.path.exists(taintflow_file_path_name):
+		return None
+
+	with open(taintflow_file_path_name, 'r') as fd:
+		taintflow_json = json.load(fd)
+
+	buckets = {}
+	for entry in taintflow_json:
+		if entry.get("parentloc") == taintflowIndexModule.DIFFERENT_ORIGIN or len(entry["taint"]) == 0:
+			continue
+
+		sources = set(taintflowIndexModule.get_source_type(source) for source in entry.get("sources", []))
+		sinks = taintflowIndexModule.get_sink_types(entry["sink"])
+		for sink in sinks:
+			if sink not in SINK_TYPES:
+				continue
+			# the pattern only depends on the sink
+			pattern_id = get_request_pattern_id(sink, entry)
+			for source in SOURCE_TYPES:
+				if source in sources:
+					key = (source, sink)
+					if key not in buckets:
+						buckets[key] = []
+					buckets[key].append(pattern_id)
+
+	return buckets
+
+
+def _increment(d, key):
+
+	if key in d:
+		d[key] = d[key] + 1
+	else:
+		d[key] = 1
+
+
+def _get_empty_outputs():
+
+	outputs = {
+		'req_patterns': {},
+		'req_patterns_wb': {},
+		'req_patterns_ws': {},
+		'req_sink_patterns': {},
+		'req_sink_patterns_wb': {},
+		'req_sink_patterns_ws': {}
+	}
+	for s in SINK_TYPES:
+		outputs['req_sink_patterns'][s] = {}
+		outputs['req_sink_patterns_wb'][s] = {}
+		outputs['req_sink_patterns_ws'][s] = {}
+	return outputs
+
+
+def add_webpage_request_patterns(outputs, sink, pattern_ids, website_counted):
+
+	"""
+	adds the pattern ids of the flows of a webpage to the outputs of a bucket; webpages (websites) are counted
+	once, for the pattern of their first flow
+	@param {dict} outputs: see `_get_empty_outputs`
+	@param {list} pattern_ids: pattern ids of the flows of the webpage in the bucket
+	@param {bool} website_counted: whether the website was already counted for the bucket
+	"""
+
+	for pattern_id in pattern_ids:
+		_increment(outputs['req_patterns'], pattern_id)
+		_increment(outputs['req_sink_patterns'][sink], pattern_id)
+
+	if len(pattern_ids) > 0:
+		_increment(outputs['req_patterns_wb'], pattern_ids[0])
+		_increment(outputs['req_sink_patterns_wb'][sink], pattern_ids[0])
+		if not website_counted:
+			_increment(outputs['req_patterns_ws'], pattern_ids[0])
+			_increment(outputs['req_sink_patterns_ws'][sink], pattern_ids[0])
+
+
+def store_outputs(outputs, output_directory, slug):
+
+	for name in OUTPUT_NAMES:
+		with open(os.path.join(output_directory, slug + name + ".json"), 'w+') as fd:
+			json.dump(outputs[name], fd, ensure_ascii=False, indent=4)
+
+
+
 def main():
 
 	SITELIST_FILE = os.path.join(os.path.join(constantsModule.BASE_DIR, "input"), "sitelist_final.csv")
 	WEBPAGES_JSON_FILE = os.path.join(os.path.join(constantsModule.BASE_DIR, "input"), "webpages_final.json")
 
-	SINK_TYPES = [
-		'websocket_url',
-		'websocket_data',
-		'eventsource_url',
-		'fetch_url',
-		'fetch_data',
-		'xmlhttprequest_url',
-		'xmlhttprequest_data',
-		'xmlhttprequest_sethdr',
-		'window.open',
-		'loc_assign',
-		'script_src'
-	]
-	SOURCE_TYPES = [
-		'loc_href',
-		'loc_hash',
-		'loc_search',
-		'win_name',
-		'doc_referrer',
-		'doc_baseuri',
-		'doc_uri',
-		'message_evt',
-		'pushsub_endpoint'
-	]
-
 
 	p = argparse.ArgumentParser(description='This script analyzes the anatomy of request sending instructions.')
 
@@ -86,17 +365,24 @@ def main():
 		  type=str,
 		  default='ALL')
 
+	p.add_argument('--processes', "-P",
+		  default=walkerModule.DEFAULT_PROCESSES,
+		  help='number of worker processes (default: %(default)s)',
+		  type=int)
+
 
 	args= vars(p.parse_args())
 	source_name = args["source"].lower()
 	sink_name = args["sink"].lower()
+	processes = args["processes"]
 
 	process_all_sources_and_sinks = False
 	if source_name == 'all' and sink_name == 'all':
 		process_all_sources_and_sinks = True
+	elif source_name not in SOURCE_TYPES or sink_name not in SINK_TYPES:
+		print('[Single] source={0} or sink={1} is a invalid string, check your inputs!'.format(source_name, sink_name))
+		return
 
-	OUTPUT_DIR = os.path.join(constantsModule.BASE_DIR, "outputs")
-	INPUT_DIR = os.path.join(constantsModule.BASE_DIR, "input")
 	OUTPUT_TEMPT_DIR = os.path.join(constantsModule.OUTPUTS_DIR, "patterns")
 	if not os.path.exists(OUTPUT_TEMPT_DIR):
 		os.makedirs(OUTPUT_TEMPT_DIR)
@@ -106,383 +392,46 @@ def main():
 	with open(WEBPAGES_JSON_FILE, 'r') as fd:
 		WEBPAGES_FINAL = json.load(fd)
 
-
-	patterns = {} 		# pattern_id -> count_flows
-	patterns_wb = {}	# pattern_id -> count_webpages
-	patterns_ws = {}	# pattern_id -> count_websites
-
-	sink_patterns = {} 		# sink -> pattern_id -> count_flows
-	sink_patterns_wb = {}	# sink -> pattern_id -> count_webpages
-	sink_patterns_ws = {}	# sink -> pattern_id -> count_websites
-
-
-	def _process_source_sink(source, sink):
-
-		taintflow_count_file_path_name = '{0}/taintflows_count_filter_{1}_{2}_topframe.json'.format(OUTPUT_DIR.rstrip('/'), source, sink)
-
-		json_content = {}
-		with open(taintflow_count_file_path_name, 'r') as fd:
-			json_content = json.load(fd)
-
-		
-		for s in SINK_TYPES:
-			sink_patterns[s] = {}
-			sink_patterns_wb[s] = {}
-			sink_patterns_ws[s] = {}
-
-		for website in json_content:
-			if website in WEBPAGES_FINAL:
-				website_counted = False 
-				webpages =list(json_content[website].keys())
-				for webpage in webpages:
-					webpage_counted = False
-					if webpage in WEBPAGES_FINAL[website]:
-						
-						taintflow_file_path_name = os.path.join(os.path.join(website, webpage), 'taintflows_filter_{0}_{1}_topframe.json'.format(source, sink))
-						taintflow_file_path_name = os.path.join(constantsModule.DATA_DIR, taintflow_file_path_name)
-						if os.path.exists(taintflow_file_path_name):
-
-							taintflow_json = {}
-							with open(taintflow_file_path_name, 'r') as fd:
-								taintflow_json = json.load(fd)
-
-							if len(taintflow_json) > 0:
-
-								for entry in taintflow_json:
-									taintflow_sink = entry["sink"]
-									if len(entry["taint"]) > 0:
-										taintflow = entry["taint"][0]
-
-										if sink == "websocket_data" or sink == "xmlhttprequest_data" or sink == "fetch_data" or taintflow_sink == "WebSocket.send" or taintflow_sink == "fetch.body" or taintflow_sink == "XMLHttpRequest.send":
-											pattern_id = ['0'] * 10 + ['1', '0']
-											pattern_id = "_".join(pattern_id)
-
-											# global patterns
-											if pattern_id in patterns:
-												patterns[pattern_id] = patterns[pattern_id] + 1
-											else:
-												patterns[pattern_id] = 1
-
-											if not webpage_counted:
-												webpage_counted = True
-												if pattern_id in patterns_wb:
-													patterns_wb[pattern_id] = patterns_wb[pattern_id] + 1
-												else:
-													patterns_wb[pattern_id] = 1
-
-											if not website_counted:
-												website_counted = True
-												if pattern_id in patterns_ws:
-													patterns_ws[pattern_id] = patterns_ws[pattern_id] + 1
-												else:
-													patterns_ws[pattern_id] = 1														
-
-
-											# sink specific patterns
-											if pattern_id in sink_patterns[sink]:
-												sink_patterns[sink][pattern_id] = sink_patterns[sink][pattern_id] + 1
-											else:
-												sink_patterns[sink][pattern_id] = 1
-
-											if not webpage_counted:
-												webpage_counted = True
-												if pattern_id in sink_patterns_wb[sink]:
-													sink_patterns_wb[sink][pattern_id] = sink_patterns_wb[sink][pattern_id] + 1
-												else:
-													sink_patterns_wb[sink][pattern_id] = 1
-
-											if not website_counted:
-												website_counted = True
-												if pattern_id in sink_patterns_ws[sink]:
-													sink_patterns_ws[sink][pattern_id] = sink_patterns_ws[sink][pattern_id] + 1
-												else:
-													sink_patterns_ws[sink][pattern_id] = 1	
-
-
-										elif sink == "xmlhttprequest_sethdr" or taintflow_sink == "XMLHttpRequest.setRequestHeader":
-											pattern_id = ['0'] * 11 + ['1']
-											pattern_id = "_".join(pattern_id)
-
-											if pattern_id in patterns:
-												patterns[pattern_id] = patterns[pattern_id] + 1
-											else:
-												patterns[pattern_id] = 1
-
-											if not webpage_counted:
-												webpage_counted = True
-												if pattern_id in patterns_wb:
-													patterns_wb[pattern_id] = patterns_wb[pattern_id] + 1
-												else:
-													patterns_wb[pattern_id] = 1
-
-											if not website_counted:
-												website_counted = True
-												if pattern_id in patterns_ws:
-													patterns_ws[pattern_id] = patterns_ws[pattern_id] + 1
-												else:
-													patterns_ws[pattern_id] = 1		
-
-											# sink specific patterns
-											if pattern_id in sink_patterns[sink]:
-												sink_patterns[sink][pattern_id] = sink_patterns[sink][pattern_id] + 1
-											else:
-												sink_patterns[sink][pattern_id] = 1
-
-											if not webpage_counted:
-												webpage_counted = True
-												if pattern_id in sink_patterns_wb[sink]:
-													sink_patterns_wb[sink][pattern_id] = sink_patterns_wb[sink][pattern_id] + 1
-												else:
-													sink_patterns_wb[sink][pattern_id] = 1
-
-											if not website_counted:
-												website_counted = True
-												if pattern_id in sink_patterns_ws[sink]:
-													sink_patterns_ws[sink][pattern_id] = sink_patterns_ws[sink][pattern_id] + 1
-												else:
-													sink_patterns_ws[sink][pattern_id] = 1	
-
-
-										else:
-											sink_url_string = entry["str"]
-
-											try:
-												parsed_url = urlparse(sink_url_string)
-											except:
-												parsed_url = None
-
-											if parsed_url:
-
-												url_scheme = parsed_url.scheme
-												scheme_idx = sink_url_string.find(url_scheme)
-												url_scheme_range = range(scheme_idx, scheme_idx+len(url_scheme))
-												url_scheme_range_set = set(url_scheme_range)
-
-												url_netloc = parsed_url.netloc
-												netloc_idx = sink_url_string.find(url_netloc)
-												url_netloc_range = range(netloc_idx, netloc_idx+len(url_netloc))										
-												url_netloc_range_set = set(url_netloc_range)
-
-												url_path = parsed_url.path
-												path_idx = sink_url_string.find(url_path)
-												url_path_range = range(path_idx, path_idx+len(url_path))
-												url_path_range_set = set(url_path_range)
-		
-												url_query = parsed_url.query
-												query_idx = sink_url_string.find(url_query)
-												url_query_range = range(query_idx, query_idx+len(url_query))
-												url_query_range_set = set(url_query_range)
-
-												url_fragment = parsed_url.fragment
-												fragment_idx = sink_url_string.find(url_fragment)
-												url_fragment_range = range(fragment_idx, fragment_idx+len(url_fragment))
-												url_fragment_range_set = set(url_fragment_range)
-
-												scheme_flag = 0
-												scheme_flag_start = 0
-												netloc_flag = 0
-												netloc_flag_end = 0
-												path_flag = 0
-												path_flag_start = 0
-												query_flag = 0
-												query_flag_start = 0
-												fragment_flag = 0
-												fragment_flag_start = 0
-												body_flag = 0									
-												header_flag = 0
-
-
-												begin = taintflow["begin"]
-												end = taintflow["end"]
-
-												parts = len(begin)
-												for i in range(parts):
-													
-													b = begin[i]
-													e = end[i]
-
-													selected_part = sink_url_string[b:e]
-													if selected_part == sink_url_string:
-														scheme_flag = 1
-														scheme_flag_start = 1
-														netloc_flag = 1
-														netloc_flag_end = 1
-														path_flag = 1
-														path_flag_start = 1
-														query_flag = 1
-														query_flag_start = 1
-														fragment_flag = 1
-														fragment_flag_start = 1
-														body_flag = 0								
-														header_flag = 0
-														break
-
-													tainted_range = range(b, e)
-
-													if scheme_idx == -1:
-														print("sink_url_string", sink_url_string)
-														print("scheme", url_scheme)
-														print("---\n")
-													else:
-														intersection = url_scheme_range_set.intersection(tainted_range)
-														if len(intersection) > 0:
-															scheme_flag = 1
-															if url_scheme_range.start == b:
-																scheme_flag_start = 1
-
-													if netloc_idx == -1:
-														print("sink_url_string", sink_url_string)
-														print("netloc", url_netloc)
-														print("---\n")
-													else:
-														intersection = url_netloc_range_set.intersection(tainted_range)
-														if len(intersection) > 0:
-															netloc_flag = 1
-															if e >= url_netloc_range.stop:
-																netloc_flag_end = 1
-
-													if path_idx == -1:
-														print("sink_url_string", sink_url_string)
-														print("path", url_path)
-														print("---\n")
-													else:
-														intersection = url_path_range_set.intersection(tainted_range)
-														if len(intersection) > 0:
-															path_flag = 1
-															if b <= url_path_range.start:
-																path_flag_start = 1
-
-													if query_idx == -1:
-														print("sink_url_string", sink_url_string)
-														print("query", url_query)
-														print("---\n")
-													else:
-														intersection = url_query_range_set.intersection(tainted_range)
-														if len(intersection) > 0:
-															query_flag = 1
-															if b <= url_query_range.start:
-																query_flag_start = 1
-
-													if fragment_idx == -1:
-														print("sink_url_string", sink_url_string)
-														print("fragment", url_fragment)
-														print("---\n")
-													else:
-														intersection = url_fragment_range_set.intersection(tainted_range)
-														if len(intersection) > 0:
-															fragment_flag = 1
-															if b <= url_fragment_range.start:
-																fragment_flag_start = 1
-
-												pattern_id = [
-													str(scheme_flag),
-													str(scheme_flag_start),
-													str(netloc_flag),
-													str(netloc_flag_end),
-													str(path_flag),
-													str(path_flag_start),
-													str(query_flag),
-													str(query_flag_start),
-													str(fragment_flag),
-													str(fragment_flag_start),
-													str(body_flag),
-													str(header_flag)
-												]
-
-											else:
-												pattern_id = ['x'] * 12
-											
-											pattern_id = "_".join(pattern_id)
-
-											if pattern_id in patterns:
-												patterns[pattern_id] = patterns[pattern_id] + 1
-											else:
-												patterns[pattern_id] = 1
-
-											if not webpage_counted:
-												webpage_counted = True
-												if pattern_id in patterns_wb:
-													patterns_wb[pattern_id] = patterns_wb[pattern_id] + 1
-												else:
-													patterns_wb[pattern_id] = 1
-
-											if not website_counted:
-												website_counted = True
-												if pattern_id in patterns_ws:
-													patterns_ws[pattern_id] = patterns_ws[pattern_id] + 1
-												else:
-													patterns_ws[pattern_id] = 1		
-
-											# sink specific patterns
-											if pattern_id in sink_patterns[sink]:
-												sink_patterns[sink][pattern_id] = sink_patterns[sink][pattern_id] + 1
-											else:
-												sink_patterns[sink][pattern_id] = 1
-
-											if not webpage_counted:
-												webpage_counted = True
-												if pattern_id in sink_patterns_wb[sink]:
-													sink_patterns_wb[sink][pattern_id] = sink_patterns_wb[sink][pattern_id] + 1
-												else:
-													sink_patterns_wb[sink][pattern_id] = 1
-
-											if not website_counted:
-												website_counted = True
-												if pattern_id in sink_patterns_ws[sink]:
-													sink_patterns_ws[sink][pattern_id] = sink_patterns_ws[sink][pattern_id] + 1
-												else:
-													sink_patterns_ws[sink][pattern_id] = 1	
-
-						else:
-							LOGGER.warning('taintflow file does not exist: %s'%taintflow_file_path_name)
-
-
-	slug = 'all_'
-	if process_all_sources_and_sinks:
-		for sink in SINK_TYPES:
-			for source in SOURCE_TYPES:
-				print('[ALL] processing {0} - {1}'.format(source, sink))
-				_process_source_sink(source, sink)
-	else:
-		if source_name in SOURCE_TYPES and sink_name in SINK_TYPES:
-			slug = "%s_%s_"%(source_name, sink_name)
-			print('[Single] processing {0} - {1}'.format(source_name, sink_name))
-			_process_source_sink(source_name, sink_name)
-		else:
-			print('[Single] source={0} or sink={1} is a invalid string, check your inputs!'.format(source_name, sink_name))
-
-
+	sites = {}
+	for (g_index, etld_url, website) in walkerModule.get_sites(SITELIST_FILE):
+		if website in WEBPAGES_FINAL:
+			sites[website] = WEBPAGES_FINAL[website]
 
 
-	with open(os.path.join(OUTPUT_TEMPT_DIR, slug+ "req_patterns.json"), 'w+') as fd:
-		json.dump(patterns, fd, ensure_ascii=False, indent=4)
+	bucket_outputs = {} # (source, sink) -> outputs
+	for sink in SINK_TYPES:
+		for source in SOURCE_TYPES:
+			bucket_outputs[(source, sink)] = _get_empty_outputs()
+	all_outputs = _get_empty_outputs()
 
-	with open(os.path.join(OUTPUT_TEMPT_DIR, slug+ "req_patterns_wb.json"), 'w+') as fd:
-		json.dump(patterns_wb, fd, ensure_ascii=False, indent=4)
+	current_website = None
+	counted_buckets = set() # buckets in which the current website was counted
+	for (website, webpage, buckets) in walkerModule.walk_webpages(get_webpage_request_patterns, sites, processes=processes):
+		if website != current_website:
+			current_website = website
+			counted_buckets = set()
 
-	with open(os.path.join(OUTPUT_TEMPT_DIR, slug+"req_patterns_ws.json"), 'w+') as fd:
-		json.dump(patterns_ws, fd, ensure_ascii=False, indent=4)
+		if buckets is None:
+			continue
 
-	with open(os.path.join(OUTPUT_TEMPT_DIR, slug+"req_sink_patterns.json"), 'w+') as fd:
-		json.dump(sink_patterns, fd, ensure_ascii=False, indent=4)
+		for key in buckets:
+			(source, sink) = key
+			website_counted = key in counted_buckets
+			add_webpage_request_patterns(bucket_outputs[key], sink, buckets[key], website_counted)
+			add_webpage_request_patterns(all_outputs, sink, buckets[key], website_counted)
+			counted_buckets.add(key)
 
-	with open(os.path.join(OUTPUT_TEMPT_DIR, slug+"req_sink_patterns_wb.json"), 'w+') as fd:
-		json.dump(sink_patterns_wb, fd, ensure_ascii=False, indent=4)
-
-	with open(os.path.join(OUTPUT_TEMPT_DIR, slug+"req_sink_patterns_ws.json"), 'w+') as fd:
-		json.dump(sink_patterns_ws, fd, ensure_ascii=False, indent=4)
 
+	if process_all_sources_and_sinks:
+		for (source, sink) in bucket_outputs:
+			store_outputs(bucket_outputs[(source, sink)], OUTPUT_TEMPT_DIR, "%s_%s_"%(source, sink))
+		store_outputs(all_outputs, OUTPUT_TEMPT_DIR, 'all_')
+	else:
+		store_outputs(bucket_outputs[(source_name, sink_name)], OUTPUT_TEMPT_DIR, "%s_%s_"%(source_name, sink_name))
 
+	LOGGER.info('finished.')
 	
 
 if __name__ == "__main__":
 	print('started script')
 	main()
-
-
-
-
-
-
-
-			
\ No newline at end of file
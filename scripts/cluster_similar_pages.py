@@ -22,11 +22,11 @@
 	Running:
 	------------
 	$ python3 -m scripts.cluster_similar_pages --input=/path/to/sitelist_crawled.csv --outputs=webpage_clusters.json
+	$ python3 -m scripts.cluster_similar_pages --input=/path/to/sitelist_crawled.csv --mode=minhash --threshold=0.8 --weighted
 
 """
 
 import os, sys
-import json
 import argparse
 import pandas as pd
 
@@ -35,19 +35,10 @@ import constants as constantsModule
 
 from utils.logging import logger as LOGGER
 import utils.utility as utilityModule
+import utils.page_clusters as pageClustersModule
 
 
 
-def cluster(input_dict):
-	clusters = {}
-	for key, val in input_dict.items():
-		if val not in clusters:
-			clusters[val] = [key]
-		else:
-			clusters[val].append(key)
-	return clusters
-
-
 def main():
 
 	INPUT_FILE_NAME_DEFAULT = 'sitelist_crawled.csv'
@@ -66,6 +57,26 @@ def main():
 		  help='file name for the output (default: %(default)s)',
 		  type=str)
 
+	p.add_argument('--mode', "-M",
+		  default=pageClustersModule.CLUSTER_MODE_EXACT,
+		  choices=[pageClustersModule.CLUSTER_MODE_EXACT, pageClustersModule.CLUSTER_MODE_MINHASH],
+		  help='exact: identical scripts, minhash: near-identical sets of scripts (default: %(default)s)',
+		  type=str)
+
+	p.add_argument('--threshold', "-T",
+		  default=pageClustersModule.MINHASH_THRESHOLD,
+		  help='min Jaccard similarity of the scripts of webpages in the same cluster, minhash mode (default: %(default)s)',
+		  type=float)
+
+	p.add_argument('--num_perm',
+		  default=pageClustersModule.MINHASH_NUM_PERM,
+		  help='size of the minhash signatures, minhash mode (default: %(default)s)',
+		  type=int)
+
+	p.add_argument('--weighted',
+		  action='store_true',
+		  help='weight the scripts by their size, minhash mode')
+
 	args= vars(p.parse_args())
 	input_file_name = args["input"]
 	outputs_file_name = args["outputs"]
@@ -88,31 +99,8 @@ def main():
 			if os.path.exists(app_path_name) and os.path.isdir(app_path_name):
 				files = os.listdir(app_path_name)
 				if len(files) > 1:
-					website_clusters = {} #  webpage unique hash -> list of webpage folder names with that unique hash
-					webpage_hashes = {}   #  webpage folder name -> webpage unique hash based on scripts' content
-					for webpage_name in files:
-						webpage_path_name = os.path.join(app_path_name, webpage_name)
-						if os.path.exists(webpage_path_name) and os.path.isdir(webpage_path_name):
-							webpage_script_hashes = []
-							script_mapping_file = os.path.join(webpage_path_name, 'scripts_mapping.json')
-							if os.path.exists(script_mapping_file):
-								with open(script_mapping_file, 'r', encoding='utf-8') as fd:
-									script_mapping_json = json.load(fd)
-									for key in script_mapping_json:
-										script_item = script_mapping_json[key]
-										script_hash = script_item['hash']
-										webpage_script_hashes.append(script_hash)
-
-							if len(webpage_script_hashes) > 0:
-								webpage_script_hashes_as_string = '_'.join(webpage_script_hashes).strip().strip('\n').strip()
-								webpage_unique_hash = utilityModule.sha256(webpage_script_hashes_as_string)
-								webpage_hashes[webpage_name] = webpage_unique_hash
-
-					website_clusters = cluster(webpage_hashes)
-					# clusters[app_name]=website_clusters
-					
-					with open(os.path.join(app_path_name, outputs_file_name), 'w+') as fd:
-						json.dump(website_clusters, fd, ensure_ascii=False, indent=4)
+					webpages = [webpage_name for webpage_name in files if os.path.isdir(os.path.join(app_path_name, webpage_name))]
+					pageClustersModule.cluster_site_webpages(app_path_name, webpages=webpages, mode=args["mode"], threshold=args["threshold"], num_perm=args["num_perm"], weighted=args["weighted"], output_file_name=outputs_file_name)
 
 
 	LOGGER.info('finished.')
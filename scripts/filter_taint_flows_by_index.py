@@ -32,6 +32,7 @@ import json
 import hashlib
 import pandas as pd
 import constants as constantsModule
+import utils.taintflow_index as taintflowIndexModule
 from utils.logging import logger as LOGGER
 import utils.utility as utilityModule
 
@@ -46,6 +47,10 @@ def main():
 	# set this to false to also filter the taintflows in each webpage folder, and then count
 	COUNT_ONLY = True 
 
+	# read the flows from the taint flow index (see `utils.taintflow_index`) instead of
+	# the filtered taint flow files of each webpage folder; takes precedence over `COUNT_ONLY`
+	USE_TAINTFLOW_INDEX = False
+
 	SITELIST_FILE = os.path.join(os.path.join(constantsModule.BASE_DIR, "input"), "sitelist_final.csv")
 	WEBPAGES_JSON_FILE = os.path.join(os.path.join(constantsModule.BASE_DIR, "input"), "webpages_final.json")
 
@@ -99,10 +104,34 @@ def main():
 	}
 
 
+	taintflow_index = None
+	if USE_TAINTFLOW_INDEX:
+		taintflow_index = taintflowIndexModule.get_taintflow_index(update=True)
+
 	OUTPUT_DIR = os.path.join(constantsModule.BASE_DIR, "outputs")
 	for sink in SINK_TYPES:
 		for source in SOURCE_TYPES:
 
+			if taintflow_index is not None:
+				suffix = '_topframe_0' if PROCESS_TOP_LEVEL_FRAMES_ONLY else '_0'
+				topframe_taintflow_count_file_path_name = '{0}/taintflows_count_filter_{1}_{2}{3}.json'.format(OUTPUT_DIR.rstrip('/'), source, sink, suffix)
+				filtered_taintflows_count = {}
+				for website in webpages_final:
+					for webpage in webpages_final[website]:
+						filtered_taintflows = taintflow_index.get_taintflows(website, webpage, source=source, sink=sink, top_frame=PROCESS_TOP_LEVEL_FRAMES_ONLY, prefix=True)
+						if len(filtered_taintflows) > 0:
+							directory = os.path.join(os.path.join(constantsModule.DATA_DIR, website), webpage)
+							new_taintflow_file_path_name = '{0}/taintflows_filter_{1}_{2}{3}.json'.format(directory.rstrip('/'), source, sink, suffix)
+							with open(new_taintflow_file_path_name, 'w+') as fd:
+								json.dump(filtered_taintflows, fd, ensure_ascii=False, indent=4)
+							if website not in filtered_taintflows_count:
+								filtered_taintflows_count[website] = {}
+							filtered_taintflows_count[website][webpage] = len(filtered_taintflows)
+
+				with open(topframe_taintflow_count_file_path_name, 'w+') as fd:
+					json.dump(filtered_taintflows_count, fd, ensure_ascii=False, indent=4)
+				continue
+
 
 			if PROCESS_TOP_LEVEL_FRAMES_ONLY:
 				taintflow_count_file_path_name = '{0}/taintflows_count_filter_{1}_{2}_topframe.json'.format(OUTPUT_DIR.rstrip('/'), source, sink)
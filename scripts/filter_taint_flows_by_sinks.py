@@ -28,40 +28,20 @@
 import os, sys
 import json
 import argparse
-import pandas as pd
 
 import utils.io as IOModule
+import utils.taintflow_dedup as dedupModule
+import utils.data_walker as walkerModule
+import utils.taintflow_index as taintflowIndexModule
 import constants as constantsModule
 
 from utils.logging import logger as LOGGER
-import utils.utility as utilityModule
 
 
 
 def get_relevant_taint_flows(unique_taintflows):
 	
-	target_sinks = [
-		# web sockets
-		"WebSocket",
-		"WebSocket.send",
-		# server side events
-		"EventSource",
-		# async requests (including push notification requests)
-		"fetch.url",
-		"fetch.body",
-		"XMLHttpRequest.send",
-		"XMLHttpRequest.open(url)",
-		"XMLHttpRequest.setRequestHeader",
-		# top level requests
-		"Window.open",
-		"location.href",
-		"location.assign",
-		"location.replace",
-		# requests sent to fetch scripts
-		"script.src"
-	]
-
-	target_sinks = [item.lower() for item in target_sinks]
+	target_sinks = [item.lower() for item in taintflowIndexModule.RELEVANT_SINKS]
 	out_flows = []
 	for taintflow in unique_taintflows:
 		sink = taintflow["sink"].lower()
@@ -72,54 +52,9 @@ def get_relevant_taint_flows(unique_taintflows):
 
 	return out_flows
 
-def get_unique_objects(list_of_jsons):
-
-	output = []
-	tmp = []
-	for item in list_of_jsons:
-		hashed = str(item)
-		if hashed not in tmp:
-			tmp.append(hashed)
-			output.append(item)
-
-	return output
-
-def get_unique_taint_flows(json_content):
-
-	taintflows = get_unique_objects(json_content)
-
-	unique_taintflows = []
-	for taintflow_object in taintflows:
-		taints = get_unique_objects(taintflow_object["taint"])	
-
-		# merge multiple begin, end flows together
-		merged_begin_end_taints = []
-		tmp = []
-		for t in taints:
-			obj = {"flow": t["flow"]}
-			hashed = str(obj)
-			if hashed not in tmp:
-				tmp.append(hashed)
-				obj["begin"] = [t["begin"]]
-				obj["end"] = [t["end"]]
-				merged_begin_end_taints.append(obj)
-			else:
-				idx = tmp.index(hashed)
-				obj = merged_begin_end_taints[idx]
-				obj["begin"].append(t["begin"])
-				obj["end"].append(t["end"])		
-				merged_begin_end_taints[idx] = obj
-
-		copy = taintflow_object
-		copy["taint"] = merged_begin_end_taints
-		unique_taintflows.append(copy)
-
-	return unique_taintflows
-
-
 def process_taint_flows(out_taintflows_path_name, json_content):
 	
-	unique_taintflows = get_unique_taint_flows(json_content)
+	unique_taintflows = dedupModule.get_unique_taint_flows(json_content)
 	relevant_taintflows = get_relevant_taint_flows(unique_taintflows)
 
 	try:
@@ -134,6 +69,45 @@ def process_taint_flows(out_taintflows_path_name, json_content):
 
 	return [n, m, t]
 
+def process_webpage_taint_flows(webpage_path_name, outputs_file_name):
+
+	"""
+	@return {list} [n_relevant_flows, m_total_unique_flows, t_total_flows] of the webpage, or None if it has no valid `taintflows.json`
+	"""
+
+	taintflows_json_file = os.path.join(webpage_path_name, "taintflows.json")
+	if not os.path.exists(taintflows_json_file):
+		return None
+
+	try:
+		fd = open(taintflows_json_file, 'r')
+		json_content = json.load(fd)
+		fd.close()
+	except:
+		return None
+
+	taintflows_output_path_name = os.path.join(webpage_path_name, outputs_file_name)
+	return process_taint_flows(taintflows_output_path_name, json_content)
+
+def process_indexed_taint_flows(taintflow_index, app_name, app_path_name, outputs_file_name):
+
+	"""
+	stores the relevant flows of each webpage of a site from the taint flow index, without reading the `taintflows.json` files
+	@return {dict} webpage -> [n_relevant_flows, m_total_unique_flows, t_total_flows]
+	"""
+
+	site_counts = taintflow_index.get_file_counts(site=app_name).get(app_name, {})
+	for webpage_name in site_counts:
+		relevant_taintflows = taintflow_index.get_taintflows(app_name, webpage_name, relevant=True)
+		try:
+			with open(os.path.join(os.path.join(app_path_name, webpage_name), outputs_file_name), 'w+') as fd:
+				json.dump(relevant_taintflows, fd, ensure_ascii=False, indent=4)
+		except Exception as e:
+			LOGGER.warning(e) # UnicodeEncodeError
+
+	return site_counts
+
+
 def main():
 
 	INPUT_FILE_NAME_DEFAULT = 'sitelist_crawled.csv'
@@ -152,9 +126,23 @@ def main():
 		  help='file name for the output (default: %(default)s)',
 		  type=str)
 
+	p.add_argument('--index',
+		  action='store_true',
+		  help='read the flows from the taint flow index (see `utils.taintflow_index`), which is updated first')
+
+	p.add_argument('--processes', "-P",
+		  default=walkerModule.DEFAULT_PROCESSES,
+		  help='number of worker processes (default: %(default)s)',
+		  type=int)
+
 	args= vars(p.parse_args())
 	input_file_name = args["input"]
 	outputs_file_name = args["outputs"]
+	processes = args["processes"]
+
+	taintflow_index = None
+	if args["index"]:
+		taintflow_index = taintflowIndexModule.get_taintflow_index(update=True)
 
 
 	if input_file_name == INPUT_FILE_NAME_DEFAULT:
@@ -164,33 +152,18 @@ def main():
 	LOGGER.info('started processing the taint flows.')
 	
 	data = {} # app folder name -> {page1: [n_relevant_flows, m_total_unique_flows, t_total_flows], page2: [...], ...}
-	chunksize = 10**5
-	for chunk_df in pd.read_csv(input_file_name, chunksize=chunksize, usecols=[0, 1], header=None, skip_blank_lines=True):
-		for (index, row) in chunk_df.iterrows():
-			etld_url = row[1]
-			url = 'http://' + etld_url
-			app_name = utilityModule.getDirectoryNameFromURL(url)
+	sites = walkerModule.get_crawled_sites(input_file_name)
+	for app_name in sites:
+		data[app_name] = {}
+
+	if taintflow_index is not None:
+		for app_name in sites:
 			app_path_name = os.path.join(constantsModule.DATA_DIR, app_name)
-			if os.path.exists(app_path_name) and os.path.isdir(app_path_name):
-				files = os.listdir(app_path_name)
-				if len(files) > 1:
-					data[app_name]= {}
-					for webpage_name in files:
-						webpage_path_name = os.path.join(app_path_name, webpage_name)
-						if os.path.exists(webpage_path_name) and os.path.isdir(webpage_path_name):
-							taintflows_json_file = os.path.join(webpage_path_name, "taintflows.json")
-							if os.path.exists(taintflows_json_file):
-								json_content = {}
-								try:
-									fd = open(taintflows_json_file, 'r')
-									json_content = json.load(fd)
-									fd.close()
-								except:
-									continue
-
-								taintflows_output_path_name = os.path.join(webpage_path_name, OUTPUTS_FILE_NAME_DEFAULT)
-								[n, m, t] = process_taint_flows(taintflows_output_path_name, json_content)
-								data[app_name][webpage_name] = [n, m, t]
+			data[app_name] = process_indexed_taint_flows(taintflow_index, app_name, app_path_name, OUTPUTS_FILE_NAME_DEFAULT)
+	else:
+		for (app_name, webpage_name, counts) in walkerModule.walk_webpages(process_webpage_taint_flows, sites, args=(OUTPUTS_FILE_NAME_DEFAULT,), processes=processes):
+			if counts is not None:
+				data[app_name][webpage_name] = counts
 	
 	with open(os.path.join(os.path.join(constantsModule.BASE_DIR, "input"), "taintflows_count.json"), 'w+') as fd:
 		json.dump(data, fd, ensure_ascii=False, indent=4)
@@ -198,13 +171,5 @@ def main():
 	LOGGER.info('finished.')
 
 
-main()
-
-
-
-
-
-
-
-
-
+if __name__ == "__main__":
+	main()
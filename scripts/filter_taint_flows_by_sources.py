@@ -27,13 +27,13 @@
 import os, sys
 import json
 import argparse
-import pandas as pd
 
 import utils.io as IOModule
+import utils.data_walker as walkerModule
+import utils.taintflow_index as taintflowIndexModule
 import constants as constantsModule
 
 from utils.logging import logger as LOGGER
-import utils.utility as utilityModule
 
 def filter_taint_flows_by_sources(json_content):
 	
@@ -63,6 +63,34 @@ def filter_taint_flows_by_sources(json_content):
 	return output
 
 
+def process_webpage_taint_flows(webpage_path_name, taintflows_filename, outputs_file_name):
+
+	"""
+	stores the flows of the webpage that have a target source
+	@return {int} number of stored flows, or None if the webpage has no taint flow file
+	"""
+
+	taintflows_json_file = os.path.join(webpage_path_name, taintflows_filename)
+	if not os.path.exists(taintflows_json_file):
+		return None
+
+	json_content = {}
+	try:
+		fd = open(taintflows_json_file, 'r')
+		json_content = json.load(fd)
+		fd.close()
+	except:
+		LOGGER.warning('JSON parsing error for %s'%taintflows_json_file)
+
+	taintflows_output_path_name = os.path.join(webpage_path_name, outputs_file_name)
+	filtered_by_source_json = filter_taint_flows_by_sources(json_content)
+
+	with open(taintflows_output_path_name, 'w+') as fd:
+		json.dump(filtered_by_source_json, fd, ensure_ascii=False, indent=4)
+
+	return len(filtered_by_source_json)
+
+
 
 def main():
 
@@ -92,12 +120,26 @@ def main():
 		  help='file name for the output (default: %(default)s)',
 		  type=str)
 
+	p.add_argument('--index',
+		  action='store_true',
+		  help='read the flows from the taint flow index (see `utils.taintflow_index`), which is updated first')
+
+	p.add_argument('--processes', "-P",
+		  default=walkerModule.DEFAULT_PROCESSES,
+		  help='number of worker processes (default: %(default)s)',
+		  type=int)
+
 
 
 	args= vars(p.parse_args())
 	sitelist_filename = args["sitelist"]
 	taintflows_filename = args["taintfile"]
 	outputs_file_name = args["outputs"]
+	processes = args["processes"]
+
+	taintflow_index = None
+	if args["index"]:
+		taintflow_index = taintflowIndexModule.get_taintflow_index(update=True)
 
 
 	if sitelist_filename == SITELIST_FILE_NAME_DEFAULT:
@@ -106,44 +148,28 @@ def main():
 
 	LOGGER.info('started processing the taint flows.')
 	
-	chunksize = 10**5
-
 	data = {}
 
-	for chunk_df in pd.read_csv(sitelist_filename, chunksize=chunksize, usecols=[0, 1], header=None, skip_blank_lines=True):
-		for (index, row) in chunk_df.iterrows():
-			etld_url = row[1]
-			url = 'http://' + etld_url
-			app_name = utilityModule.getDirectoryNameFromURL(url)
+	sites = walkerModule.get_crawled_sites(sitelist_filename)
+	if taintflow_index is not None:
+		for app_name in sites:
 			app_path_name = os.path.join(constantsModule.DATA_DIR, app_name)
-			if os.path.exists(app_path_name) and os.path.isdir(app_path_name):
-				files = os.listdir(app_path_name)
-				if len(files) > 1:
-					for webpage_name in files:
-						webpage_path_name = os.path.join(app_path_name, webpage_name)
-						if os.path.exists(webpage_path_name) and os.path.isdir(webpage_path_name):
-							taintflows_json_file = os.path.join(webpage_path_name, taintflows_filename)
-							if os.path.exists(taintflows_json_file):
-								json_content = {}
-								try:
-									fd = open(taintflows_json_file, 'r')
-									json_content = json.load(fd)
-									fd.close()
-								except:
-									LOGGER.warning('JSON parsing error for %s'%taintflows_json_file)
-
-								taintflows_output_path_name = os.path.join(webpage_path_name, OUTPUTS_FILE_NAME_DEFAULT)
-								filtered_by_source_json = filter_taint_flows_by_sources(json_content)
-							
-								with open(taintflows_output_path_name, 'w+') as fd:
-									json.dump(filtered_by_source_json, fd, ensure_ascii=False, indent=4)
-
-
-								count_filtered_taintflows = len(filtered_by_source_json)
-								if count_filtered_taintflows > 0:
-									if app_name not in data:
-										data[app_name] = {}
-									data[app_name][webpage_name] = count_filtered_taintflows
+			for webpage_name in taintflow_index.get_webpages(app_name):
+				filtered_by_source_json = taintflow_index.get_taintflows(app_name, webpage_name, relevant=True, sources=taintflowIndexModule.RELEVANT_SOURCES)
+				with open(os.path.join(os.path.join(app_path_name, webpage_name), OUTPUTS_FILE_NAME_DEFAULT), 'w+') as fd:
+					json.dump(filtered_by_source_json, fd, ensure_ascii=False, indent=4)
+
+				if len(filtered_by_source_json) > 0:
+					if app_name not in data:
+						data[app_name] = {}
+					data[app_name][webpage_name] = len(filtered_by_source_json)
+
+	else:
+		for (app_name, webpage_name, count_filtered_taintflows) in walkerModule.walk_webpages(process_webpage_taint_flows, sites, args=(taintflows_filename, OUTPUTS_FILE_NAME_DEFAULT), processes=processes):
+			if count_filtered_taintflows is not None and count_filtered_taintflows > 0:
+				if app_name not in data:
+					data[app_name] = {}
+				data[app_name][webpage_name] = count_filtered_taintflows
 
 
 	with open(os.path.join(os.path.join(constantsModule.BASE_DIR, "input"), "taintflows_count_source_filter.json"), 'w+') as fd:
@@ -152,4 +178,5 @@ def main():
 	LOGGER.info('finished.')
 
 
-main()
\ No newline at end of file
+if __name__ == "__main__":
+	main()
@@ -58,6 +58,7 @@ import argparse
 import pandas as pd
 
 import utils.io as IOModule
+import utils.taintflow_index as taintflowIndexModule
 import constants as constantsModule
 
 from utils.logging import logger as LOGGER
@@ -107,6 +108,10 @@ def main():
 		  help='the target sink',
 		  type=str)
 
+	p.add_argument('--index',
+		  action='store_true',
+		  help='read the flows from the taint flow index (see `utils.taintflow_index`), which is updated first')
+
 	args= vars(p.parse_args())
 	input_file = args["input"]
 	source_name = args["source_name"]
@@ -159,6 +164,10 @@ def main():
 
 	taintflow_file_name = "taintflows_source_filter_%s.json"%str(source_name)
 
+	taintflow_index = None
+	if args["index"]:
+		taintflow_index = taintflowIndexModule.get_taintflow_index(update=True)
+
 	fd = open(input_file, 'r')
 	json_content = json.load(fd)
 	fd.close()
@@ -168,15 +177,18 @@ def main():
 			webpage_directory = os.path.join(os.path.join(os.path.join(constantsModule.DATA_DIR, app_name), webpage))
 			taintflow_file = os.path.join(webpage_directory, taintflow_file_name)
 
-			taintfile_json_content = {}
-			try:
-				fp = open(taintflow_file, 'r')
-				taintfile_json_content = json.load(fp)
-				fp.close()
-			except:
-				LOGGER.warning('JSON parsing error for %s'%taintflow_file)
-
-			flows = filter_taint_flows_by_specific_sinks(taintfile_json_content, target_sinks)
+			if taintflow_index is not None:
+				flows = taintflow_index.get_taintflows(app_name, webpage, source=source_name, sink=target_sink_input)
+			else:
+				taintfile_json_content = {}
+				try:
+					fp = open(taintflow_file, 'r')
+					taintfile_json_content = json.load(fp)
+					fp.close()
+				except:
+					LOGGER.warning('JSON parsing error for %s'%taintflow_file)
+
+				flows = filter_taint_flows_by_specific_sinks(taintfile_json_content, target_sinks)
 			filtered_taint_file_name = os.path.join(webpage_directory, outputs_file_name)
 
 			with open(filtered_taint_file_name, 'w+') as fd:
@@ -32,11 +32,16 @@ import json
 import hashlib
 import pandas as pd
 import constants as constantsModule
+import utils.taintflow_index as taintflowIndexModule
 from utils.logging import logger as LOGGER
 import utils.utility as utilityModule
 
 def main():
 
+	# read the flows from the taint flow index (see `utils.taintflow_index`) instead of
+	# the `taintflows_filter_<source>_<sink>.json` files of each webpage folder
+	USE_TAINTFLOW_INDEX = False
+
 	SITELIST_FILE = os.path.join(os.path.join(constantsModule.BASE_DIR, "input"), "sitelist_final.csv")
 	WEBPAGES_JSON_FILE = os.path.join(os.path.join(constantsModule.BASE_DIR, "input"), "webpages_final.json")
 
@@ -71,9 +76,32 @@ def main():
 		'pushsub_endpoint'
 	]
 
+	taintflow_index = None
+	if USE_TAINTFLOW_INDEX:
+		taintflow_index = taintflowIndexModule.get_taintflow_index(update=True)
+
 	OUTPUT_DIR = os.path.join(constantsModule.BASE_DIR, "outputs")
 	for sink in SINK_TYPES:
 		for source in SOURCE_TYPES:
+			if taintflow_index is not None:
+				topframe_taintflow_count_file_path_name = '{0}/taintflows_count_filter_{1}_{2}_topframe.json'.format(OUTPUT_DIR.rstrip('/'), source, sink)
+				filtered_taintflows_count = {}
+				for website in webpages_final:
+					for webpage in webpages_final[website]:
+						filtered_taintflows = taintflow_index.get_taintflows(website, webpage, source=source, sink=sink, top_frame=True)
+						if len(filtered_taintflows) > 0:
+							directory = os.path.join(os.path.join(constantsModule.DATA_DIR, website), webpage)
+							new_taintflow_file_path_name = '{0}/taintflows_filter_{1}_{2}_topframe.json'.format(directory.rstrip('/'), source, sink)
+							with open(new_taintflow_file_path_name, 'w+') as fd:
+								json.dump(filtered_taintflows, fd, ensure_ascii=False, indent=4)
+							if website not in filtered_taintflows_count:
+								filtered_taintflows_count[website] = {}
+							filtered_taintflows_count[website][webpage] = len(filtered_taintflows)
+
+				with open(topframe_taintflow_count_file_path_name, 'w+') as fd:
+					json.dump(filtered_taintflows_count, fd, ensure_ascii=False, indent=4)
+				continue
+
 			taintflow_count_file_path_name = '{0}/taintflows_count_filter_{1}_{2}.json'.format(OUTPUT_DIR.rstrip('/'), source, sink)
 			topframe_taintflow_count_file_path_name = '{0}/taintflows_count_filter_{1}_{2}_topframe.json'.format(OUTPUT_DIR.rstrip('/'), source, sink)
 			filtered_taintflows_count = {}
@@ -27,13 +27,12 @@
 import os, sys
 import json
 import argparse
-import pandas as pd
 
 import utils.io as IOModule
+import utils.data_walker as walkerModule
 import constants as constantsModule
 
 from utils.logging import logger as LOGGER
-import utils.utility as utilityModule
 
 
 
@@ -65,6 +64,56 @@ xss_sinks = [
 ]
 
 
+def get_markup_injection_flows(webpage_path_name):
+
+	"""
+	@return {tuple} (html insertion entry, xss entry) of the webpage, each being [n_flows, [index1, ... indexN], [[list sources1], ...]]
+		or None if the webpage has no such flows; None if the webpage has no valid `taintflows.json`
+	"""
+
+	taintflows_json_file = os.path.join(webpage_path_name, "taintflows.json")
+	if not os.path.exists(taintflows_json_file):
+		return None
+
+	try:
+		fd = open(taintflows_json_file, 'r')
+		json_content = json.load(fd)
+		fd.close()
+	except:
+		return None
+
+	html_entry = None
+	xss_entry = None
+	for taintflowindex in range(len(json_content)):
+		taintflowobject = json_content[taintflowindex]
+		taintflow_sink = taintflowobject["sink"]
+		taintflow_sources = taintflowobject["sources"]
+
+		for sink in html_insertion_sinks:
+			if sink in taintflow_sink:
+				common_sources = list(set(list(set(taintflow_sources) & set(web_attacker_sources))))
+				if len(common_sources) > 0:
+					if html_entry is not None:
+						html_entry[0] = html_entry[0] + 1
+						html_entry[1].append(taintflowindex)
+						html_entry[2].append(common_sources)
+					else:
+						html_entry = [1, [taintflowindex], [common_sources]]
+
+		for sink in xss_sinks:
+			if sink in taintflow_sink:
+				common_sources = list(set(list(set(taintflow_sources) & set(web_attacker_sources))))
+				if len(common_sources) > 0:
+					if xss_entry is not None:
+						xss_entry[0] = xss_entry[0] + 1
+						xss_entry[1].append(taintflowindex)
+						xss_entry[2].append(common_sources)
+					else:
+						xss_entry = [1, [taintflowindex], [common_sources]]
+
+	return (html_entry, xss_entry)
+
+
 def main():
 
 	INPUT_FILE_NAME_DEFAULT = 'sitelist_final.csv'
@@ -86,11 +135,17 @@ def main():
 					help='the last entry to consider (default: %(default)s)',
 					type=int)
 
+	p.add_argument('--processes', "-P",
+					default=walkerModule.DEFAULT_PROCESSES,
+					help='number of worker processes (default: %(default)s)',
+					type=int)
+
 
 	args= vars(p.parse_args())
 	input_file_name = args["input"]
 	from_row = args["from"]
 	to_row = args["to"]
+	processes = args["processes"]
 
 	if input_file_name == INPUT_FILE_NAME_DEFAULT:
 		input_file_name = os.path.join(os.path.join(constantsModule.BASE_DIR, "input"), INPUT_FILE_NAME_DEFAULT)
@@ -101,77 +156,20 @@ def main():
 	xss_data = {}
 
 
-	chunksize = 10**5
-	iteration = 0
-	done = False
-	for chunk_df in pd.read_csv(input_file_name, chunksize=chunksize, usecols=[0, 1], header=None, skip_blank_lines=True):
-		
-		if done: 
-			break
-
-		iteration = iteration + 1
-		LOGGER.info("starting to process chunk: %s -- %s"%((iteration-1)*chunksize, iteration*chunksize))
-
-		for (index, row) in chunk_df.iterrows():
-
-			g_index = iteration*index+1
-			if g_index >= from_row and g_index <= to_row:
-
-				etld_url = row[1]
-				url = 'http://' + etld_url
-				app_name = utilityModule.getDirectoryNameFromURL(url)
-				app_path_name = os.path.join(constantsModule.DATA_DIR, app_name)
-				if os.path.exists(app_path_name) and os.path.isdir(app_path_name):
-					files = os.listdir(app_path_name)
-					if len(files) > 1:
-						
-						html_data[app_name] = {}
-						xss_data[app_name] = {}
-
-						for webpage_name in files:
-							webpage_path_name = os.path.join(app_path_name, webpage_name)
-							if os.path.exists(webpage_path_name) and os.path.isdir(webpage_path_name):
-								taintflows_json_file = os.path.join(webpage_path_name, "taintflows.json")
-								if os.path.exists(taintflows_json_file):
-									json_content = {}
-									try:
-										fd = open(taintflows_json_file, 'r')
-										json_content = json.load(fd)
-										fd.close()
-									except:
-										continue
-
-								for taintflowindex in range(len(json_content)):
-									taintflowobject = json_content[taintflowindex]
-									taintflow_sink = taintflowobject["sink"]
-									taintflow_sources = taintflowobject["sources"]
-
-									for sink in html_insertion_sinks:
-										if sink in taintflow_sink:
-											common_sources = list(set(list(set(taintflow_sources) & set(web_attacker_sources))))
-											if len(common_sources) > 0:
-												if webpage_name in html_data[app_name]:
-													html_data[app_name][webpage_name][0] = html_data[app_name][webpage_name][0] + 1
-													html_data[app_name][webpage_name][1].append(taintflowindex)
-													html_data[app_name][webpage_name][2].append(common_sources)
-												else:
-													html_data[app_name][webpage_name] = [1, [taintflowindex], [common_sources]]
-
-									for sink in xss_sinks:
-										if sink in taintflow_sink:
-											common_sources = list(set(list(set(taintflow_sources) & set(web_attacker_sources))))
-											if len(common_sources) > 0:
-												if webpage_name in xss_data[app_name]:
-													xss_data[app_name][webpage_name][0] = xss_data[app_name][webpage_name][0] + 1
-													xss_data[app_name][webpage_name][1].append(taintflowindex)
-													xss_data[app_name][webpage_name][2].append(common_sources)
-												else:
-													xss_data[app_name][webpage_name] = [1, [taintflowindex], [common_sources]]
-
-			if g_index > to_row:
-				done = True
-				LOGGER.info("successfully processed sites taint flows, terminating!") 
-				break
+	sites = walkerModule.get_crawled_sites(input_file_name, from_row=from_row, to_row=to_row)
+	for app_name in sites:
+		html_data[app_name] = {}
+		xss_data[app_name] = {}
+
+	for (app_name, webpage_name, entries) in walkerModule.walk_webpages(get_markup_injection_flows, sites, processes=processes):
+		if entries is not None:
+			(html_entry, xss_entry) = entries
+			if html_entry is not None:
+				html_data[app_name][webpage_name] = html_entry
+			if xss_entry is not None:
+				xss_data[app_name][webpage_name] = xss_entry
+
+	LOGGER.info("successfully processed sites taint flows, terminating!") 
 
 
 	markup_injection_out_directory = os.path.join(constantsModule.OUTPUTS_DIR, "markup_injection")
@@ -187,4 +185,5 @@ def main():
 	LOGGER.info('finished.')
 
 
-main()
\ No newline at end of file
+if __name__ == "__main__":
+	main()
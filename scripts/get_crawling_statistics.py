@@ -29,11 +29,9 @@ import os
 import sys
 import json 
 import hashlib
-import pandas as pd
 import statistics
 import constants as constantsModule
-from utils.logging import logger as LOGGER
-import utils.utility as utilityModule
+import utils.data_walker as walkerModule
 
 def get_value_count_of_dict(d):
 	"""
@@ -401,11 +399,24 @@ def get_scripts_and_loc_stat(website_folder_name, webpages):
 	return "\t".join(output)
 
 
+def get_site_scripts_and_loc_stat(site_entry):
+
+	"""
+	@param {tuple} site_entry: (site folder name, webpage folder names)
+	"""
+
+	(website_folder_name, webpages) = site_entry
+	return get_scripts_and_loc_stat(website_folder_name, webpages)
+
+
 
 def main():
 
 	COUNT_SCRIPTS_AND_LOC = False
 
+	# number of worker processes counting the scripts and LoC of the sites
+	PROCESSES = walkerModule.DEFAULT_PROCESSES
+
 	SITELIST_FILE = os.path.join(os.path.join(constantsModule.BASE_DIR, "input"), "sitelist_final.csv")
 	WEBPAGES_JSON_FILE = os.path.join(os.path.join(constantsModule.BASE_DIR, "input"), "webpages_final.json")
 	WEBPAGES_CLUSTERS =  os.path.join(os.path.join(constantsModule.BASE_DIR, "input"), "webpage_clusters.json")
@@ -479,117 +490,115 @@ def main():
 	# loop through sites
 	# ---------------------------------- #
 
-	chunksize = 10**5
-	iteration = 0
-	for chunk_df in pd.read_csv(SITELIST_FILE, chunksize=chunksize, usecols=[0, 1], header=None, skip_blank_lines=True):
-		iteration = iteration + 1
-		LOGGER.info("[CSV] reading chunk: %s -- %s"%((iteration-1)*chunksize, iteration*chunksize))
-		
-		for (index, row) in chunk_df.iterrows():
-			website_rank = row[0]
-			website_url = 'http://' + row[1]
-			website_folder_name = utilityModule.getDirectoryNameFromURL(website_url)
-			
-			# gets the total number of webpages per site
-			site_webpage_total_count = get_value_count_of_dict(webpage_clusters_json[website_folder_name]) # gets the number of values in dictionary
-			webpage_total_count_row = '{0}\t{1}\n'.format(row[1], site_webpage_total_count)
-			list_webpages_total_count.append(webpage_total_count_row)
+	sites = list(walkerModule.get_sites(SITELIST_FILE))
 
+	# the scripts of the sites are read by the worker processes, in the order of the site list
+	if COUNT_SCRIPTS_AND_LOC:
+		site_entries = ((website_folder_name, webpages_final[website_folder_name]) for (website_rank, etld_url, website_folder_name) in sites)
+		top50_webpages_script_and_loc_stats = walkerModule.map_ordered(get_site_scripts_and_loc_stat, site_entries, processes=PROCESSES)
 
-			### count of scripts and LoC
-			# all_webpages = webpage_clusters_json[website_folder_name]
-			# all_webpages_script_and_loc_stat =  get_scripts_and_loc_stat(website_folder_name, all_webpages)
-			# list_all_webpages_script_and_loc_stat.append(all_webpages_script_and_loc_stat + '\n')
-			
-			if COUNT_SCRIPTS_AND_LOC:
-				top50_webpages = webpages_final[website_folder_name]
-				top50_webpages_script_and_loc_stat = get_scripts_and_loc_stat(website_folder_name, top50_webpages)
-				list_top50_webpages_script_and_loc_stat.append(top50_webpages_script_and_loc_stat + '\n')
-
-
-			# taint flows
-			taintflows_entry = taintflows_count_json[website_folder_name]			
-
-			if website_folder_name in taintflows_count_relevant_filter_json:
-				taintflows_entry_relevant = taintflows_count_relevant_filter_json[website_folder_name]
-
-				### taint flows -> all pages
-				taintflows_tempt = calculate_stat(taintflows_entry, 'list') + calculate_stat(taintflows_entry_relevant, 'int')
-				taintflows_tempt = [str(item) for item in taintflows_tempt]
-				taintflows_tempt = '\t'.join(taintflows_tempt)
-				taintflows_allpages_total_unique_relevant_count = row[1] + '\t' + taintflows_tempt + '\n'
-				list_taintflows_allpages_total_unique_relevant_count.append(taintflows_allpages_total_unique_relevant_count)
-
-				### taint flows -> top webpages
-				top50_pages = webpages_final[website_folder_name]
-				taintflows_tempt = calculate_stat_only_top50_pages(taintflows_entry, 'list', top50_pages) + calculate_stat_only_top50_pages(taintflows_entry_relevant, 'int', top50_pages)
-				taintflows_tempt = [str(item) for item in taintflows_tempt]
-				taintflows_tempt = '\t'.join(taintflows_tempt)
-				taintflows_top50pages_total_unique_relevant_count = row[1] + '\t' + taintflows_tempt + '\n'
-				list_taintflows_top50pages_total_unique_relevant_count.append(taintflows_top50pages_total_unique_relevant_count)
-
-
-				### count webpages with at least one taint flow of ANY kind, and at least one relevant taintflow
-				webpages_with_at_least_one_taintflow = count_webpages_with_at_least_one_taintflow(taintflows_entry)
-				webpages_with_at_least_one_relevant_taintflow = count_webpages_with_at_least_one_relevant_taintflow(taintflows_entry_relevant)
-				webpages_with_at_least_one_taintflow_in_top50 = count_webpages_with_at_least_one_taintflow_in_top50(taintflows_entry, top50_pages)
-				webpages_with_at_least_one_relevant_taintflow_in_top50 = count_webpages_with_at_least_one_relevant_taintflow_in_top50(taintflows_entry_relevant, top50_pages)
-
-
-				if webpages_with_at_least_one_relevant_taintflow > webpages_with_at_least_one_taintflow:
-					webpages_with_at_least_one_taintflow = webpages_with_at_least_one_relevant_taintflow
-
-				if webpages_with_at_least_one_relevant_taintflow_in_top50 > webpages_with_at_least_one_taintflow_in_top50:
-					webpages_with_at_least_one_taintflow_in_top50 = webpages_with_at_least_one_relevant_taintflow_in_top50
-
-
-				taintflows_webpage_count_row = '{0}\t{1}\t{2}\t{3}\t{4}\n'.format(
-					website_url,
-					webpages_with_at_least_one_taintflow,
-					webpages_with_at_least_one_relevant_taintflow,
-					webpages_with_at_least_one_taintflow_in_top50,
-					webpages_with_at_least_one_relevant_taintflow_in_top50
-				)
-				list_taintflows_webpage_count.append(taintflows_webpage_count_row)
-
-			else: 
-				### taint flows -> all pages
-				taintflows_tempt = calculate_stat(taintflows_entry, 'list') + [0, 0, 0, 0, 0] # json parsing error
-				taintflows_tempt = [str(item) for item in taintflows_tempt]
-				taintflows_tempt = '\t'.join(taintflows_tempt)
-				taintflows_allpages_total_unique_relevant_count = row[1] + '\t' + taintflows_tempt + '\n'
-				list_taintflows_allpages_total_unique_relevant_count.append(taintflows_allpages_total_unique_relevant_count)
-
-				### taint flows -> top webpages
-				top50_pages = webpages_final[website_folder_name]
-				taintflows_tempt = calculate_stat_only_top50_pages(taintflows_entry, 'list', top50_pages) + [0, 0, 0, 0, 0] # json parsing error
-				taintflows_tempt = [str(item) for item in taintflows_tempt]
-				taintflows_tempt = '\t'.join(taintflows_tempt)
-				taintflows_top50pages_total_unique_relevant_count = row[1] + '\t' + taintflows_tempt + '\n'
-				list_taintflows_top50pages_total_unique_relevant_count.append(taintflows_top50pages_total_unique_relevant_count)
-
-
-				### count webpages with at least one taint flow of ANY kind, and at least one relevant taintflow
-				webpages_with_at_least_one_taintflow = count_webpages_with_at_least_one_taintflow(taintflows_entry)
-				webpages_with_at_least_one_relevant_taintflow = 0
-				webpages_with_at_least_one_taintflow_in_top50 = count_webpages_with_at_least_one_taintflow_in_top50(taintflows_entry, top50_pages)
-				webpages_with_at_least_one_relevant_taintflow_in_top50 = 0
-
-				if webpages_with_at_least_one_relevant_taintflow > webpages_with_at_least_one_taintflow:
-					webpages_with_at_least_one_taintflow = webpages_with_at_least_one_relevant_taintflow
-
-				if webpages_with_at_least_one_relevant_taintflow_in_top50 > webpages_with_at_least_one_taintflow_in_top50:
-					webpages_with_at_least_one_taintflow_in_top50 = webpages_with_at_least_one_relevant_taintflow_in_top50
-
-
-				taintflows_webpage_count_row = '{0}\t{1}\t{2}\t{3}\t{4}\n'.format(
-					website_url,
-					webpages_with_at_least_one_taintflow,
-					webpages_with_at_least_one_relevant_taintflow,
-					webpages_with_at_least_one_taintflow_in_top50,
-					webpages_with_at_least_one_relevant_taintflow_in_top50
-				)
-				list_taintflows_webpage_count.append(taintflows_webpage_count_row)
+	for (website_rank, etld_url, website_folder_name) in sites:
+		website_url = 'http://' + etld_url
+
+		# gets the total number of webpages per site
+		site_webpage_total_count = get_value_count_of_dict(webpage_clusters_json[website_folder_name]) # gets the number of values in dictionary
+		webpage_total_count_row = '{0}\t{1}\n'.format(etld_url, site_webpage_total_count)
+		list_webpages_total_count.append(webpage_total_count_row)
+
+
+		### count of scripts and LoC
+		# all_webpages = webpage_clusters_json[website_folder_name]
+		# all_webpages_script_and_loc_stat =  get_scripts_and_loc_stat(website_folder_name, all_webpages)
+		# list_all_webpages_script_and_loc_stat.append(all_webpages_script_and_loc_stat + '\n')
+
+		if COUNT_SCRIPTS_AND_LOC:
+			(site_entry, top50_webpages_script_and_loc_stat) = next(top50_webpages_script_and_loc_stats)
+			list_top50_webpages_script_and_loc_stat.append(top50_webpages_script_and_loc_stat + '\n')
+
+
+		# taint flows
+		taintflows_entry = taintflows_count_json[website_folder_name]			
+
+		if website_folder_name in taintflows_count_relevant_filter_json:
+			taintflows_entry_relevant = taintflows_count_relevant_filter_json[website_folder_name]
+
+			### taint flows -> all pages
+			taintflows_tempt = calculate_stat(taintflows_entry, 'list') + calculate_stat(taintflows_entry_relevant, 'int')
+			taintflows_tempt = [str(item) for item in taintflows_tempt]
+			taintflows_tempt = '\t'.join(taintflows_tempt)
+			taintflows_allpages_total_unique_relevant_count = etld_url + '\t' + taintflows_tempt + '\n'
+			list_taintflows_allpages_total_unique_relevant_count.append(taintflows_allpages_total_unique_relevant_count)
+
+			### taint flows -> top webpages
+			top50_pages = webpages_final[website_folder_name]
+			taintflows_tempt = calculate_stat_only_top50_pages(taintflows_entry, 'list', top50_pages) + calculate_stat_only_top50_pages(taintflows_entry_relevant, 'int', top50_pages)
+			taintflows_tempt = [str(item) for item in taintflows_tempt]
+			taintflows_tempt = '\t'.join(taintflows_tempt)
+			taintflows_top50pages_total_unique_relevant_count = etld_url + '\t' + taintflows_tempt + '\n'
+			list_taintflows_top50pages_total_unique_relevant_count.append(taintflows_top50pages_total_unique_relevant_count)
+
+
+			### count webpages with at least one taint flow of ANY kind, and at least one relevant taintflow
+			webpages_with_at_least_one_taintflow = count_webpages_with_at_least_one_taintflow(taintflows_entry)
+			webpages_with_at_least_one_relevant_taintflow = count_webpages_with_at_least_one_relevant_taintflow(taintflows_entry_relevant)
+			webpages_with_at_least_one_taintflow_in_top50 = count_webpages_with_at_least_one_taintflow_in_top50(taintflows_entry, top50_pages)
+			webpages_with_at_least_one_relevant_taintflow_in_top50 = count_webpages_with_at_least_one_relevant_taintflow_in_top50(taintflows_entry_relevant, top50_pages)
+
+
+			if webpages_with_at_least_one_relevant_taintflow > webpages_with_at_least_one_taintflow:
+				webpages_with_at_least_one_taintflow = webpages_with_at_least_one_relevant_taintflow
+
+			if webpages_with_at_least_one_relevant_taintflow_in_top50 > webpages_with_at_least_one_taintflow_in_top50:
+				webpages_with_at_least_one_taintflow_in_top50 = webpages_with_at_least_one_relevant_taintflow_in_top50
+
+
+			taintflows_webpage_count_row = '{0}\t{1}\t{2}\t{3}\t{4}\n'.format(
+				website_url,
+				webpages_with_at_least_one_taintflow,
+				webpages_with_at_least_one_relevant_taintflow,
+				webpages_with_at_least_one_taintflow_in_top50,
+				webpages_with_at_least_one_relevant_taintflow_in_top50
+			)
+			list_taintflows_webpage_count.append(taintflows_webpage_count_row)
+
+		else: 
+			### taint flows -> all pages
+			taintflows_tempt = calculate_stat(taintflows_entry, 'list') + [0, 0, 0, 0, 0] # json parsing error
+			taintflows_tempt = [str(item) for item in taintflows_tempt]
+			taintflows_tempt = '\t'.join(taintflows_tempt)
+			taintflows_allpages_total_unique_relevant_count = etld_url + '\t' + taintflows_tempt + '\n'
+			list_taintflows_allpages_total_unique_relevant_count.append(taintflows_allpages_total_unique_relevant_count)
+
+			### taint flows -> top webpages
+			top50_pages = webpages_final[website_folder_name]
+			taintflows_tempt = calculate_stat_only_top50_pages(taintflows_entry, 'list', top50_pages) + [0, 0, 0, 0, 0] # json parsing error
+			taintflows_tempt = [str(item) for item in taintflows_tempt]
+			taintflows_tempt = '\t'.join(taintflows_tempt)
+			taintflows_top50pages_total_unique_relevant_count = etld_url + '\t' + taintflows_tempt + '\n'
+			list_taintflows_top50pages_total_unique_relevant_count.append(taintflows_top50pages_total_unique_relevant_count)
+
+
+			### count webpages with at least one taint flow of ANY kind, and at least one relevant taintflow
+			webpages_with_at_least_one_taintflow = count_webpages_with_at_least_one_taintflow(taintflows_entry)
+			webpages_with_at_least_one_relevant_taintflow = 0
+			webpages_with_at_least_one_taintflow_in_top50 = count_webpages_with_at_least_one_taintflow_in_top50(taintflows_entry, top50_pages)
+			webpages_with_at_least_one_relevant_taintflow_in_top50 = 0
+
+			if webpages_with_at_least_one_relevant_taintflow > webpages_with_at_least_one_taintflow:
+				webpages_with_at_least_one_taintflow = webpages_with_at_least_one_relevant_taintflow
+
+			if webpages_with_at_least_one_relevant_taintflow_in_top50 > webpages_with_at_least_one_taintflow_in_top50:
+				webpages_with_at_least_one_taintflow_in_top50 = webpages_with_at_least_one_relevant_taintflow_in_top50
+
+
+			taintflows_webpage_count_row = '{0}\t{1}\t{2}\t{3}\t{4}\n'.format(
+				website_url,
+				webpages_with_at_least_one_taintflow,
+				webpages_with_at_least_one_relevant_taintflow,
+				webpages_with_at_least_one_taintflow_in_top50,
+				webpages_with_at_least_one_relevant_taintflow_in_top50
+			)
+			list_taintflows_webpage_count.append(taintflows_webpage_count_row)
 
 
 
@@ -17,8 +17,9 @@
 	Description:
 	------------
 	generates two types of JSON files:
-		1. for each webapp, this JSON shows which libraries are used by each webpage
-		2. this JSON is created once per webpage, and maps each script to a potential library
+		1. for each webapp, this JSON shows which libraries are used by each webpage (`webpage_libraries.json`)
+		2. this JSON is created once per webpage, and maps each script to a potential library (`libraries.json`)
+	scripts are classified with the fingerprint index of `utils.library_index`
 
 	Running:
 	------------
@@ -36,6 +37,14 @@ import constants as constantsModule
 
 from utils.logging import logger as LOGGER
 import utils.utility as utilityModule
+import utils.library_index as libraryIndexModule
+
+
+# per webpage: script name -> library classification
+WEBPAGE_OUTPUT_FILE_NAME = 'libraries.json'
+
+# per webapp: webpage folder name -> list of libraries
+WEBAPP_OUTPUT_FILE_NAME = 'webpage_libraries.json'
 
 
 
@@ -50,15 +59,21 @@ def main():
 		  help='list of sites (default: %(default)s)',
 		  type=str)
 
+	p.add_argument('--index',
+		  metavar="FILE",
+		  default=constantsModule.LIBRARY_INDEX_FILE,
+		  help='library fingerprint index, see utils.library_index (default: %(default)s)',
+		  type=str)
+
 
 	args= vars(p.parse_args())
-	input_file_name = args["input"]
+	input_file_name = args["sitelist"]
 
 	if input_file_name == INPUT_FILE_NAME_DEFAULT:
 		input_file_name = os.path.join(os.path.join(constantsModule.BASE_DIR, "input"), INPUT_FILE_NAME_DEFAULT)
 
+	library_index = libraryIndexModule.get_library_index(args["index"])
 	
-	data = {} # app folder name -> {page1: [lib1, lib2], page2: [...], ...}
 	chunksize = 10**5
 	for chunk_df in pd.read_csv(input_file_name, chunksize=chunksize, usecols=[0, 1], header=None, skip_blank_lines=True):
 		for (index, row) in chunk_df.iterrows():
@@ -69,25 +84,17 @@ def main():
 			if os.path.exists(app_path_name) and os.path.isdir(app_path_name):
 				files = os.listdir(app_path_name)
 				if len(files) > 1:
-					data[app_name]= {}
+					webapp_libraries = {} # webpage folder name -> [lib1, lib2, ...]
 					for webpage_name in files:
 						webpage_path_name = os.path.join(app_path_name, webpage_name)
 						if os.path.exists(webpage_path_name) and os.path.isdir(webpage_path_name):
-							scripts_mapping_json_file = os.path.join(webpage_path_name, "taintflows.json")
-							if os.path.exists(scripts_mapping_json_file):
-								json_content = {}
-								try:
-									fd = open(scripts_mapping_json_file, 'r')
-									json_content = json.load(fd)
-									fd.close()
-								except:
-									continue
-
-							## TODO: 
-								# for each webpage store a json like:
-								# {script_name: lib_name}
-								# then, also create a single file like:
-								# app_folder_name -> { page1: [lib1, lib2], .... }
+							webpage_libraries = library_index.classify_webpage(webpage_path_name)
+							with open(os.path.join(webpage_path_name, WEBPAGE_OUTPUT_FILE_NAME), 'w+') as fd:
+								json.dump(webpage_libraries, fd, ensure_ascii=False, indent=4)
+							webapp_libraries[webpage_name] = sorted(set([item['library'] for item in webpage_libraries.values()]))
+
+					with open(os.path.join(app_path_name, WEBAPP_OUTPUT_FILE_NAME), 'w+') as fd:
+						json.dump(webapp_libraries, fd, ensure_ascii=False, indent=4)
 
 	
 
@@ -96,15 +103,3 @@ if __name__ == '__main__':
 	LOGGER.info('started processing...')
 	main()
 	LOGGER.info('finished.')
-
-
-
-
-
-
-
-
-
-
-
-
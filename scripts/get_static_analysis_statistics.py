@@ -28,11 +28,10 @@ import os
 import sys
 import json 
 import hashlib
-import pandas as pd
 import statistics
 import constants as constantsModule
+import utils.data_walker as walkerModule
 from utils.logging import logger as LOGGER
-import utils.utility as utilityModule
 
 def has_a_truthy_dict_value(obj):
 	for key in obj:
@@ -74,8 +73,56 @@ def get_total_count_flows_per_site(flow_stats_by_semtype, source, sink):
 def stringify(list):
 	return [str(item) for item in list]
 
+
+def load_static_analysis_outputs(site_entry, sinks_file_name, flows_file_name):
+
+	"""
+	reads the static analysis outputs of the webpages of a site, keeping only the fields needed for the statistics
+	@param {tuple} site_entry: (site folder name, webpage folder names)
+	@return {list} (webpage folder name, sinks json, flows json) of each webpage
+	"""
+
+	(website_folder_name, webpages) = site_entry
+	website_folder_path_name = os.path.join(constantsModule.DATA_DIR, website_folder_name)
+
+	outputs = []
+	for webpage_folder_name in webpages:
+		webpage_folder_path_name = os.path.join(website_folder_path_name, webpage_folder_name)
+
+		sinks_file_path_name = os.path.join(webpage_folder_path_name, sinks_file_name)
+		flows_file_path_name = os.path.join(webpage_folder_path_name, flows_file_name)
+
+		sinks_file_json_content = {}
+		flows_file_json_content = {}
+		if os.path.exists(sinks_file_path_name):
+			try:
+				with open(sinks_file_path_name, 'r') as fd:
+					sinks_file_json_content = json.load(fd)
+				if "sinks" in sinks_file_json_content:
+					sinks = sinks_file_json_content["sinks"]
+					sinks_file_json_content = {"sinks": [{key: item[key] for key in ("sink_type", "taint_possibility", "semantic_types")} for item in sinks]}
+			except:
+				LOGGER.warn('JSON file read error: {0}'.format(sinks_file_path_name))
+
+		if os.path.exists(flows_file_path_name):
+			try:
+				with open(flows_file_path_name, 'r') as fd:
+					flows_file_json_content = json.load(fd)
+				if "flows" in flows_file_json_content:
+					flows = flows_file_json_content["flows"]
+					flows_file_json_content = {"flows": [{key: item[key] for key in ("sink_type", "semantic_types")} for item in flows]}
+			except:
+				LOGGER.warn('JSON file read error: {0}'.format(flows_file_path_name))
+
+		outputs.append((webpage_folder_name, sinks_file_json_content, flows_file_json_content))
+
+	return outputs
+
 def main():
 
+	# number of worker processes reading the outputs of the sites
+	PROCESSES = walkerModule.DEFAULT_PROCESSES
+
 	SITELIST_FILE = os.path.join(os.path.join(constantsModule.BASE_DIR, "input"), "sitelist_final.csv")
 	WEBPAGES_JSON_FILE = os.path.join(os.path.join(constantsModule.BASE_DIR, "input"), "webpages_final.json")
 
@@ -170,300 +217,268 @@ def main():
 	# loop through sites
 	# ---------------------------------- #
 
-	chunksize = 10**5
-	iteration = 0
-
 	sast_dataflows = []
 
-	for chunk_df in pd.read_csv(SITELIST_FILE, chunksize=chunksize, usecols=[0, 1], header=None, skip_blank_lines=True):
-		iteration = iteration + 1
-		LOGGER.info("[CSV] reading chunk: %s -- %s"%((iteration-1)*chunksize, iteration*chunksize))
-		
-		for (index, row) in chunk_df.iterrows():
-			website_rank = row[0]
-			website_url = 'http://' + row[1]
-			website_folder_name = utilityModule.getDirectoryNameFromURL(website_url)
-			
-			website_folder_path_name = os.path.join(constantsModule.DATA_DIR, website_folder_name)
-			webpages =  webpages_final[website_folder_name]
-			for webpage_folder_name in webpages:
-				webpage_folder_path_name = os.path.join(website_folder_path_name, webpage_folder_name)
-
-				sinks_file_path_name = os.path.join(webpage_folder_path_name, STATIC_ANALYSIS_SINKS_FILE_NAME)
-				flows_file_path_name = os.path.join(webpage_folder_path_name, STATIC_ANALYSIS_FLOWS_FILE_NAME)
-
-				sinks_file_json_content = {}
-				flows_file_json_content = {}
-				if os.path.exists(sinks_file_path_name):
-					try:
-						with open(sinks_file_path_name, 'r') as fd:
-							sinks_file_json_content = json.load(fd)
-					except:
-						LOGGER.warn('JSON file read error: {0}'.format(sinks_file_path_name))
-
-				if os.path.exists(flows_file_path_name):
-					try:
-						with open(flows_file_path_name, 'r') as fd:
-							flows_file_json_content = json.load(fd)
-					except:
-						LOGGER.warn('JSON file read error: {0}'.format(flows_file_path_name))
-
-
-
-				if "sinks" in sinks_file_json_content:
-					sinks = sinks_file_json_content["sinks"]
-					if len(sinks) > 0:					
-						for sink_object in sinks:
-
-							sink_type = sink_object["sink_type"]
-							
-							if website_folder_name in sink_stats:
-								if sink_type in sink_stats[website_folder_name]:
-									sink_stats[website_folder_name][sink_type] = sink_stats[website_folder_name][sink_type] + 1
-									sink_stats_webpage[website_folder_name][sink_type].add(webpage_folder_name)
-								else:
-									sink_stats[website_folder_name][sink_type] = 1
-									sink_stats_webpage[website_folder_name][sink_type] = set()
-									sink_stats_webpage[website_folder_name][sink_type].add(webpage_folder_name)
-
+	site_entries = ((website_folder_name, webpages_final[website_folder_name]) for (g_index, etld_url, website_folder_name) in walkerModule.get_sites(SITELIST_FILE))
+	for ((website_folder_name, webpages), webpage_outputs) in walkerModule.map_ordered(load_static_analysis_outputs, site_entries, args=(STATIC_ANALYSIS_SINKS_FILE_NAME, STATIC_ANALYSIS_FLOWS_FILE_NAME), processes=PROCESSES):
+		if webpage_outputs is None:
+			webpage_outputs = []
+
+		for (webpage_folder_name, sinks_file_json_content, flows_file_json_content) in webpage_outputs:
+			if "sinks" in sinks_file_json_content:
+				sinks = sinks_file_json_content["sinks"]
+				if len(sinks) > 0:					
+					for sink_object in sinks:
+
+						sink_type = sink_object["sink_type"]
+						
+						if website_folder_name in sink_stats:
+							if sink_type in sink_stats[website_folder_name]:
+								sink_stats[website_folder_name][sink_type] = sink_stats[website_folder_name][sink_type] + 1
+								sink_stats_webpage[website_folder_name][sink_type].add(webpage_folder_name)
 							else:
-								# encountering the first sink of the website
-								sink_stats[website_folder_name] = {}
 								sink_stats[website_folder_name][sink_type] = 1
-
-								sink_stats_webpage[website_folder_name] = {}
 								sink_stats_webpage[website_folder_name][sink_type] = set()
 								sink_stats_webpage[website_folder_name][sink_type].add(webpage_folder_name)
 
-								sink_stats_website[website_folder_name] = {}
-								sink_stats_website[website_folder_name][sink_type] = 1
+						else:
+							# encountering the first sink of the website
+							sink_stats[website_folder_name] = {}
+							sink_stats[website_folder_name][sink_type] = 1
 
+							sink_stats_webpage[website_folder_name] = {}
+							sink_stats_webpage[website_folder_name][sink_type] = set()
+							sink_stats_webpage[website_folder_name][sink_type].add(webpage_folder_name)
 
-							if has_a_truthy_dict_value(sink_object["taint_possibility"]):
+							sink_stats_website[website_folder_name] = {}
+							sink_stats_website[website_folder_name][sink_type] = 1
 
-								if website_folder_name in sink_stats_taintable:
-									if sink_type in sink_stats_taintable[website_folder_name]:
-										sink_stats_taintable[website_folder_name][sink_type] = sink_stats_taintable[website_folder_name][sink_type] + 1
-										sink_stats_taintable_webpage[website_folder_name][sink_type].add(webpage_folder_name)
-									else:
-										sink_stats_taintable[website_folder_name][sink_type] = 1
-										sink_stats_taintable_webpage[website_folder_name][sink_type] = set()
-										sink_stats_taintable_webpage[website_folder_name][sink_type].add(webpage_folder_name)
 
+						if has_a_truthy_dict_value(sink_object["taint_possibility"]):
+
+							if website_folder_name in sink_stats_taintable:
+								if sink_type in sink_stats_taintable[website_folder_name]:
+									sink_stats_taintable[website_folder_name][sink_type] = sink_stats_taintable[website_folder_name][sink_type] + 1
+									sink_stats_taintable_webpage[website_folder_name][sink_type].add(webpage_folder_name)
 								else:
-									# encountering the first sink of the website
-									sink_stats_taintable[website_folder_name] = {}
 									sink_stats_taintable[website_folder_name][sink_type] = 1
-
-									sink_stats_taintable_webpage[website_folder_name] = {}
 									sink_stats_taintable_webpage[website_folder_name][sink_type] = set()
 									sink_stats_taintable_webpage[website_folder_name][sink_type].add(webpage_folder_name)
 
-									sink_stats_taintable_website[website_folder_name] = {}
-									sink_stats_taintable_website[website_folder_name][sink_type] = 1
+							else:
+								# encountering the first sink of the website
+								sink_stats_taintable[website_folder_name] = {}
+								sink_stats_taintable[website_folder_name][sink_type] = 1
 
+								sink_stats_taintable_webpage[website_folder_name] = {}
+								sink_stats_taintable_webpage[website_folder_name][sink_type] = set()
+								sink_stats_taintable_webpage[website_folder_name][sink_type].add(webpage_folder_name)
 
-							sink_semantic_types = sink_object["semantic_types"]
-							for semantic_type in sink_semantic_types:
+								sink_stats_taintable_website[website_folder_name] = {}
+								sink_stats_taintable_website[website_folder_name][sink_type] = 1
 
-								if website_folder_name in sink_stats_by_semtype:
-									if semantic_type in sink_stats_by_semtype[website_folder_name]:
-										sink_stats_by_semtype[website_folder_name][semantic_type] = sink_stats_by_semtype[website_folder_name][semantic_type] + 1
-										sink_stats_webpage_by_semtype[website_folder_name][semantic_type].add(webpage_folder_name)
-									else:
-										sink_stats_by_semtype[website_folder_name][semantic_type] = 1
-										sink_stats_webpage_by_semtype[website_folder_name][semantic_type] = set()
-										sink_stats_webpage_by_semtype[website_folder_name][semantic_type].add(webpage_folder_name)
 
+						sink_semantic_types = sink_object["semantic_types"]
+						for semantic_type in sink_semantic_types:
+
+							if website_folder_name in sink_stats_by_semtype:
+								if semantic_type in sink_stats_by_semtype[website_folder_name]:
+									sink_stats_by_semtype[website_folder_name][semantic_type] = sink_stats_by_semtype[website_folder_name][semantic_type] + 1
+									sink_stats_webpage_by_semtype[website_folder_name][semantic_type].add(webpage_folder_name)
 								else:
-									# encountering the first sink of the website
-									sink_stats_by_semtype[website_folder_name] = {}
 									sink_stats_by_semtype[website_folder_name][semantic_type] = 1
-
-									sink_stats_webpage_by_semtype[website_folder_name] = {}
 									sink_stats_webpage_by_semtype[website_folder_name][semantic_type] = set()
 									sink_stats_webpage_by_semtype[website_folder_name][semantic_type].add(webpage_folder_name)
 
-									sink_stats_website_by_semtype[website_folder_name] = {}
-									sink_stats_website_by_semtype[website_folder_name][semantic_type] = 1
+							else:
+								# encountering the first sink of the website
+								sink_stats_by_semtype[website_folder_name] = {}
+								sink_stats_by_semtype[website_folder_name][semantic_type] = 1
 
+								sink_stats_webpage_by_semtype[website_folder_name] = {}
+								sink_stats_webpage_by_semtype[website_folder_name][semantic_type] = set()
+								sink_stats_webpage_by_semtype[website_folder_name][semantic_type].add(webpage_folder_name)
 
-								if sink_object["taint_possibility"][semantic_type] == True:
+								sink_stats_website_by_semtype[website_folder_name] = {}
+								sink_stats_website_by_semtype[website_folder_name][semantic_type] = 1
 
-									if website_folder_name in sink_stats_taintable_by_semtype:
-										if semantic_type in sink_stats_taintable_by_semtype[website_folder_name]:
-											sink_stats_taintable_by_semtype[website_folder_name][semantic_type] = sink_stats_taintable_by_semtype[website_folder_name][semantic_type] + 1
-											sink_stats_taintable_webpage_by_semtype[website_folder_name][semantic_type].add(webpage_folder_name)
-										else:
-											sink_stats_taintable_by_semtype[website_folder_name][semantic_type] = 1
-											sink_stats_taintable_webpage_by_semtype[website_folder_name][semantic_type] = set()
-											sink_stats_taintable_webpage_by_semtype[website_folder_name][semantic_type].add(webpage_folder_name)
 
+							if sink_object["taint_possibility"][semantic_type] == True:
+
+								if website_folder_name in sink_stats_taintable_by_semtype:
+									if semantic_type in sink_stats_taintable_by_semtype[website_folder_name]:
+										sink_stats_taintable_by_semtype[website_folder_name][semantic_type] = sink_stats_taintable_by_semtype[website_folder_name][semantic_type] + 1
+										sink_stats_taintable_webpage_by_semtype[website_folder_name][semantic_type].add(webpage_folder_name)
 									else:
-										# encountering the first sink of the website
-										sink_stats_taintable_by_semtype[website_folder_name] = {}
 										sink_stats_taintable_by_semtype[website_folder_name][semantic_type] = 1
-
-										sink_stats_taintable_webpage_by_semtype[website_folder_name] = {}
 										sink_stats_taintable_webpage_by_semtype[website_folder_name][semantic_type] = set()
 										sink_stats_taintable_webpage_by_semtype[website_folder_name][semantic_type].add(webpage_folder_name)
 
-										sink_stats_taintable_website_by_semtype[website_folder_name] = {}
-										sink_stats_taintable_website_by_semtype[website_folder_name][semantic_type] = 1
+								else:
+									# encountering the first sink of the website
+									sink_stats_taintable_by_semtype[website_folder_name] = {}
+									sink_stats_taintable_by_semtype[website_folder_name][semantic_type] = 1
 
+									sink_stats_taintable_webpage_by_semtype[website_folder_name] = {}
+									sink_stats_taintable_webpage_by_semtype[website_folder_name][semantic_type] = set()
+									sink_stats_taintable_webpage_by_semtype[website_folder_name][semantic_type].add(webpage_folder_name)
 
-				if "flows" in flows_file_json_content:
-					flows = flows_file_json_content["flows"]
-					if len(flows) > 0:
-						for flow_object in flows:
+									sink_stats_taintable_website_by_semtype[website_folder_name] = {}
+									sink_stats_taintable_website_by_semtype[website_folder_name][semantic_type] = 1
 
-							semantic_types = flow_object["semantic_types"]
 
-							sink_type = flow_object["sink_type"]
-							semantic_types_sinks = [t for t in semantic_types if t in SINK_SEMTYPES]
-							semantic_type_sources = [t for t in semantic_types if t in SOURCE_SEMTYPES]
+			if "flows" in flows_file_json_content:
+				flows = flows_file_json_content["flows"]
+				if len(flows) > 0:
+					for flow_object in flows:
 
+						semantic_types = flow_object["semantic_types"]
 
-							for source_semantic_type in semantic_type_sources:
-								if website_folder_name in flow_stats:
-									if sink_type in flow_stats[website_folder_name]:
-										if source_semantic_type in flow_stats[website_folder_name][sink_type]:
-											flow_stats[website_folder_name][sink_type][source_semantic_type] = flow_stats[website_folder_name][sink_type][source_semantic_type] + 1
-											flow_stats_webpage[website_folder_name][sink_type][source_semantic_type].add(webpage_folder_name)
-										else:
-											flow_stats[website_folder_name][sink_type][source_semantic_type] = 1
-											flow_stats_webpage[website_folder_name][sink_type][source_semantic_type] = set()
-											flow_stats_webpage[website_folder_name][sink_type][source_semantic_type].add(webpage_folder_name)
-									else:
+						sink_type = flow_object["sink_type"]
+						semantic_types_sinks = [t for t in semantic_types if t in SINK_SEMTYPES]
+						semantic_type_sources = [t for t in semantic_types if t in SOURCE_SEMTYPES]
 
-										flow_stats[website_folder_name][sink_type] = {}
-										flow_stats[website_folder_name][sink_type][source_semantic_type] = 1
 
-										flow_stats_webpage[website_folder_name][sink_type] = {}
+						for source_semantic_type in semantic_type_sources:
+							if website_folder_name in flow_stats:
+								if sink_type in flow_stats[website_folder_name]:
+									if source_semantic_type in flow_stats[website_folder_name][sink_type]:
+										flow_stats[website_folder_name][sink_type][source_semantic_type] = flow_stats[website_folder_name][sink_type][source_semantic_type] + 1
+										flow_stats_webpage[website_folder_name][sink_type][source_semantic_type].add(webpage_folder_name)
+									else:
+										flow_stats[website_folder_name][sink_type][source_semantic_type] = 1
 										flow_stats_webpage[website_folder_name][sink_type][source_semantic_type] = set()
 										flow_stats_webpage[website_folder_name][sink_type][source_semantic_type].add(webpage_folder_name)
-
 								else:
-									flow_stats[website_folder_name] = {}
+
 									flow_stats[website_folder_name][sink_type] = {}
 									flow_stats[website_folder_name][sink_type][source_semantic_type] = 1
 
-									flow_stats_webpage[website_folder_name] = {}
 									flow_stats_webpage[website_folder_name][sink_type] = {}
 									flow_stats_webpage[website_folder_name][sink_type][source_semantic_type] = set()
 									flow_stats_webpage[website_folder_name][sink_type][source_semantic_type].add(webpage_folder_name)
 
-									flow_stats_website[website_folder_name] = {}
-									flow_stats_website[website_folder_name][sink_type] = {}				
-									flow_stats_website[website_folder_name][sink_type][source_semantic_type] = 1
-
-
-							for sink_semantic_type in semantic_types_sinks:
-								for source_semantic_type in semantic_type_sources:
-									if website_folder_name in flow_stats_by_semtype:
-										if sink_semantic_type in flow_stats_by_semtype[website_folder_name]:
-											if source_semantic_type in flow_stats_by_semtype[website_folder_name][sink_semantic_type]:
-												flow_stats_by_semtype[website_folder_name][sink_semantic_type][source_semantic_type] = flow_stats_by_semtype[website_folder_name][sink_semantic_type][source_semantic_type] + 1
-												flow_stats_webpage_by_semtype[website_folder_name][sink_semantic_type][source_semantic_type].add(webpage_folder_name)
-											else:
-												flow_stats_by_semtype[website_folder_name][sink_semantic_type][source_semantic_type] = 1
-												flow_stats_webpage_by_semtype[website_folder_name][sink_semantic_type][source_semantic_type] = set()
-												flow_stats_webpage_by_semtype[website_folder_name][sink_semantic_type][source_semantic_type].add(webpage_folder_name)
-									
-										else:
+							else:
+								flow_stats[website_folder_name] = {}
+								flow_stats[website_folder_name][sink_type] = {}
+								flow_stats[website_folder_name][sink_type][source_semantic_type] = 1
 
-											flow_stats_by_semtype[website_folder_name][sink_semantic_type] = {}
-											flow_stats_by_semtype[website_folder_name][sink_semantic_type][source_semantic_type] = 1
+								flow_stats_webpage[website_folder_name] = {}
+								flow_stats_webpage[website_folder_name][sink_type] = {}
+								flow_stats_webpage[website_folder_name][sink_type][source_semantic_type] = set()
+								flow_stats_webpage[website_folder_name][sink_type][source_semantic_type].add(webpage_folder_name)
+
+								flow_stats_website[website_folder_name] = {}
+								flow_stats_website[website_folder_name][sink_type] = {}				
+								flow_stats_website[website_folder_name][sink_type][source_semantic_type] = 1
 
-											flow_stats_webpage_by_semtype[website_folder_name][sink_semantic_type] = {}
-											flow_stats_webpage_by_semtype[website_folder_name][sink_semantic_type][source_semantic_type] = set()
-											flow_stats_webpage_by_semtype[website_folder_name][sink_semantic_type][source_semantic_type].add(webpage_folder_name)	
 
+						for sink_semantic_type in semantic_types_sinks:
+							for source_semantic_type in semantic_type_sources:
+								if website_folder_name in flow_stats_by_semtype:
+									if sink_semantic_type in flow_stats_by_semtype[website_folder_name]:
+										if source_semantic_type in flow_stats_by_semtype[website_folder_name][sink_semantic_type]:
+											flow_stats_by_semtype[website_folder_name][sink_semantic_type][source_semantic_type] = flow_stats_by_semtype[website_folder_name][sink_semantic_type][source_semantic_type] + 1
+											flow_stats_webpage_by_semtype[website_folder_name][sink_semantic_type][source_semantic_type].add(webpage_folder_name)
+										else:
+											flow_stats_by_semtype[website_folder_name][sink_semantic_type][source_semantic_type] = 1
+											flow_stats_webpage_by_semtype[website_folder_name][sink_semantic_type][source_semantic_type] = set()
+											flow_stats_webpage_by_semtype[website_folder_name][sink_semantic_type][source_semantic_type].add(webpage_folder_name)
+								
 									else:
 
-										flow_stats_by_semtype[website_folder_name] = {}
 										flow_stats_by_semtype[website_folder_name][sink_semantic_type] = {}
 										flow_stats_by_semtype[website_folder_name][sink_semantic_type][source_semantic_type] = 1
 
-										flow_stats_webpage_by_semtype[website_folder_name] = {}
 										flow_stats_webpage_by_semtype[website_folder_name][sink_semantic_type] = {}
 										flow_stats_webpage_by_semtype[website_folder_name][sink_semantic_type][source_semantic_type] = set()
 										flow_stats_webpage_by_semtype[website_folder_name][sink_semantic_type][source_semantic_type].add(webpage_folder_name)	
 
-										flow_stats_website_by_semtype[website_folder_name] = {}
-										flow_stats_website_by_semtype[website_folder_name][sink_semantic_type] = {}				
-										flow_stats_website_by_semtype[website_folder_name][sink_semantic_type][source_semantic_type] = 1
-
-
-			# export results per site here
-			row_sinks = []
-			if website_folder_name in sink_stats:
-				for sink_type in SINK_TYPES:
-					if sink_type in sink_stats[website_folder_name]:
-						count = sink_stats[website_folder_name][sink_type]
-						row_sinks.append(count)
-					else:
-						row_sinks.append(0)
-			else:
-				row_sinks = row_sinks + [0] * len(SINK_TYPES)
-
-			if website_folder_name in sink_stats_taintable:
-				for sink_type in SINK_TYPES:
-					if sink_type in sink_stats_taintable[website_folder_name]:
-						count = sink_stats_taintable[website_folder_name][sink_type]
-						row_sinks.append(count)
-					else:
-						row_sinks.append(0)
-			else:
-				row_sinks = row_sinks + [0] * len(SINK_TYPES)
-
-
-			if website_folder_name in sink_stats_webpage:
-				for sink_type in SINK_TYPES:
-					if sink_type in sink_stats_webpage[website_folder_name]:
-						count = len(sink_stats_webpage[website_folder_name][sink_type])
-						row_sinks.append(count)
-					else:
-						row_sinks.append(0)
-			else:
-				row_sinks = row_sinks + [0] * len(SINK_TYPES)
-
-			if website_folder_name in sink_stats_taintable_webpage:
-				for sink_type in SINK_TYPES:
-					if sink_type in sink_stats_taintable_webpage[website_folder_name]:
-						count = len(sink_stats_taintable_webpage[website_folder_name][sink_type])
-						row_sinks.append(count)
-					else:
-						row_sinks.append(0)
-			else:
-				row_sinks = row_sinks + [0] * len(SINK_TYPES)
-
-
-			row_flows = []
-			if website_folder_name in flow_stats:
-				for sink_type in SINK_TYPES:
-					if sink_type in flow_stats[website_folder_name]:
-						count = flow_stats[website_folder_name][sink_type]
-						row_flows.append(count)
-					else:
-						row_flows.append(0)
-			else:
-				row_flows = [0] * len(SINK_TYPES)
-
-			if website_folder_name in flow_stats_webpage:
-				for sink_type in SINK_TYPES:
-					if sink_type in flow_stats_webpage[website_folder_name]:
-						count = len(flow_stats_webpage[website_folder_name][sink_type])
-						row_flows.append(count)
-					else:
-						row_flows.append(0)
-			else:
-				row_flows = [0] * len(SINK_TYPES)
-
-
-			row_data = row_sinks + row_flows
-			row_data_string = "\t".join(stringify(row_data))
-			sast_dataflows.append(row_data_string)
+								else:
+
+									flow_stats_by_semtype[website_folder_name] = {}
+									flow_stats_by_semtype[website_folder_name][sink_semantic_type] = {}
+									flow_stats_by_semtype[website_folder_name][sink_semantic_type][source_semantic_type] = 1
+
+									flow_stats_webpage_by_semtype[website_folder_name] = {}
+									flow_stats_webpage_by_semtype[website_folder_name][sink_semantic_type] = {}
+									flow_stats_webpage_by_semtype[website_folder_name][sink_semantic_type][source_semantic_type] = set()
+									flow_stats_webpage_by_semtype[website_folder_name][sink_semantic_type][source_semantic_type].add(webpage_folder_name)	
+
+									flow_stats_website_by_semtype[website_folder_name] = {}
+									flow_stats_website_by_semtype[website_folder_name][sink_semantic_type] = {}				
+									flow_stats_website_by_semtype[website_folder_name][sink_semantic_type][source_semantic_type] = 1
+
+
+		# export results per site here
+		row_sinks = []
+		if website_folder_name in sink_stats:
+			for sink_type in SINK_TYPES:
+				if sink_type in sink_stats[website_folder_name]:
+					count = sink_stats[website_folder_name][sink_type]
+					row_sinks.append(count)
+				else:
+					row_sinks.append(0)
+		else:
+			row_sinks = row_sinks + [0] * len(SINK_TYPES)
+
+		if website_folder_name in sink_stats_taintable:
+			for sink_type in SINK_TYPES:
+				if sink_type in sink_stats_taintable[website_folder_name]:
+					count = sink_stats_taintable[website_folder_name][sink_type]
+					row_sinks.append(count)
+				else:
+					row_sinks.append(0)
+		else:
+			row_sinks = row_sinks + [0] * len(SINK_TYPES)
+
+
+		if website_folder_name in sink_stats_webpage:
+			for sink_type in SINK_TYPES:
+				if sink_type in sink_stats_webpage[website_folder_name]:
+					count = len(sink_stats_webpage[website_folder_name][sink_type])
+					row_sinks.append(count)
+				else:
+					row_sinks.append(0)
+		else:
+			row_sinks = row_sinks + [0] * len(SINK_TYPES)
+
+		if website_folder_name in sink_stats_taintable_webpage:
+			for sink_type in SINK_TYPES:
+				if sink_type in sink_stats_taintable_webpage[website_folder_name]:
+					count = len(sink_stats_taintable_webpage[website_folder_name][sink_type])
+					row_sinks.append(count)
+				else:
+					row_sinks.append(0)
+		else:
+			row_sinks = row_sinks + [0] * len(SINK_TYPES)
+
+
+		row_flows = []
+		if website_folder_name in flow_stats:
+			for sink_type in SINK_TYPES:
+				if sink_type in flow_stats[website_folder_name]:
+					count = flow_stats[website_folder_name][sink_type]
+					row_flows.append(count)
+				else:
+					row_flows.append(0)
+		else:
+			row_flows = [0] * len(SINK_TYPES)
+
+		if website_folder_name in flow_stats_webpage:
+			for sink_type in SINK_TYPES:
+				if sink_type in flow_stats_webpage[website_folder_name]:
+					count = len(flow_stats_webpage[website_folder_name][sink_type])
+					row_flows.append(count)
+				else:
+					row_flows.append(0)
+		else:
+			row_flows = [0] * len(SINK_TYPES)
+
+
+		row_data = row_sinks + row_flows
+		row_data_string = "\t".join(stringify(row_data))
+		sast_dataflows.append(row_data_string)
 
 	# export per site data flows
 	with open(os.path.join(OUTPUT_TEMPT_DIR, "sast_dataflow_sites.out"), 'w+') as fd:
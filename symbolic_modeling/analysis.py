@@ -167,36 +167,36 @@ def query_library_database_for_signatures(tx, library_name, save_directory):
 		# relation to a node of 'FunctionExpression' type and 'key'
 		# relation to an identifier as funciton name
 		query1 = """
-		MATCH (request { Type: 'Identifier', Code: '%s'})<-[:AST_parentOf*]-(function_expression { Type: 'FunctionExpression'})<-[:AST_parentOf {RelationType: 'value'}]-(property {Type: 'Property'})-[:AST_parentOf {RelationType: 'key'}]->(function_name {Type: 'Identifier'})
+		MATCH (request { Type: 'Identifier', Code: $name})<-[:AST_parentOf*]-(function_expression { Type: 'FunctionExpression'})<-[:AST_parentOf {RelationType: 'value'}]-(property {Type: 'Property'})-[:AST_parentOf {RelationType: 'key'}]->(function_name {Type: 'Identifier'})
 		OPTIONAL MATCH (function_expression)-[:AST_parentOf*]->(filter_node)-[:AST_parentOf]->(this_member_expr {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'object'}]->(this_expr {Type: 'ThisExpression'}), (this_member_expr)-[:AST_parentOf {RelationType: 'property'}]->(this_identifier {Type: 'Identifier'})
 		WHERE filter_node.Type <> 'CallExpression'
 		RETURN distinct(function_name) as function_name, function_expression, collect (distinct this_identifier) as this_list
-		"""%(function_name)
+		"""
 
 		# case 2: function declarations
 		query2 = """
-		MATCH (request { Type: 'Identifier', Code: '%s'})<-[:AST_parentOf*]-(function_declaration { Type: 'FunctionDeclaration'})-[:AST_parentOf {RelationType: 'id'}]->(function_name {Type: 'Identifier'})
+		MATCH (request { Type: 'Identifier', Code: $name})<-[:AST_parentOf*]-(function_declaration { Type: 'FunctionDeclaration'})-[:AST_parentOf {RelationType: 'id'}]->(function_name {Type: 'Identifier'})
 		OPTIONAL MATCH (function_declaration)-[:AST_parentOf*]->(filter_node)-[:AST_parentOf]->(this_member_expr {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'object'}]->(this_expr {Type: 'ThisExpression'}), (this_member_expr)-[:AST_parentOf {RelationType: 'property'}]->(this_identifier {Type: 'Identifier'})
 		WHERE filter_node.Type <> 'CallExpression'
 		RETURN function_declaration, function_name, collect (distinct this_identifier) as this_list
-		"""%(function_name)
+		"""
 
 		# case 3: var function_name = function(){}
 		query3 = """
-		MATCH (request { Type: 'Identifier', Code: '%s'})<-[:AST_parentOf*]-(function_expression { Type: 'FunctionExpression'})<-[:AST_parentOf {RelationType: 'init'}]-(var_declarator {Type: 'VariableDeclarator'})-[:AST_parentOf {RelationType: 'id'}]->(function_name {Type: 'Identifier'})
+		MATCH (request { Type: 'Identifier', Code: $name})<-[:AST_parentOf*]-(function_expression { Type: 'FunctionExpression'})<-[:AST_parentOf {RelationType: 'init'}]-(var_declarator {Type: 'VariableDeclarator'})-[:AST_parentOf {RelationType: 'id'}]->(function_name {Type: 'Identifier'})
 		OPTIONAL MATCH (function_expression)-[:AST_parentOf*]->(filter_node)-[:AST_parentOf]->(this_member_expr {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'object'}]->(this_expr {Type: 'ThisExpression'}), (this_member_expr)-[:AST_parentOf {RelationType: 'property'}]->(this_identifier {Type: 'Identifier'})
 		WHERE filter_node.Type <> 'CallExpression'
 		RETURN distinct(function_name) as function_name, function_expression, collect (distinct this_identifier) as this_list
-		"""%(function_name)
+		"""
 
 		#case 4:  obj.function_name = function(){}
 		query4 = """
 		MATCH (assignment {Type: 'AssignmentExpression'})-[:AST_parentOf {RelationType: 'left'}]->(member_expr {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'property'}]->(function_name {Type: 'Identifier'}),
-		(assignment)-[:AST_parentOf {RelationType: 'right'}]-(function_expression {Type: 'FunctionExpression'})-[:AST_parentOf*]->(request { Type: 'Identifier', Code: '%s'})
+		(assignment)-[:AST_parentOf {RelationType: 'right'}]-(function_expression {Type: 'FunctionExpression'})-[:AST_parentOf*]->(request { Type: 'Identifier', Code: $name})
 		OPTIONAL MATCH (function_expression)-[:AST_parentOf*]->(filter_node)-[:AST_parentOf]->(this_member_expr {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'object'}]->(this_expr {Type: 'ThisExpression'}), (this_member_expr)-[:AST_parentOf {RelationType: 'property'}]->(this_identifier {Type: 'Identifier'})
 		WHERE filter_node.Type <> 'CallExpression'
 		RETURN distinct(function_name) as function_name, function_expression, collect (distinct this_identifier) as this_list
-		"""%(function_name)
+		"""
 		queries = [query1, query2, query3, query4]
 		return queries
 
@@ -213,10 +213,10 @@ def query_library_database_for_signatures(tx, library_name, save_directory):
 		function_type = function_dictionary['type']
 
 		query = """
-		MATCH (function {Id :'%s'})-[:AST_parentOf*]->(node {Type: 'Identifier', Code: 'send'})
+		MATCH (function {Id :$id})-[:AST_parentOf*]->(node {Type: 'Identifier', Code: 'send'})
 		RETURN node
-		"""%(function_id)
-		results = tx.run(query)
+		"""
+		results = tx.run(query, id=function_id)
 		for record in results:
 			if record['node'] is not None and record['node'] != '':
 				return True
@@ -237,7 +237,7 @@ def query_library_database_for_signatures(tx, library_name, save_directory):
 			processed_functions.append(function_name)
 			queries = __get_functions_with_function_expressions_query(function_name)
 			for query in queries:
-				results = tx.run(query)
+				results = tx.run(query, name=function_name)
 				for record in results:
 					record_keys = record.__dict__
 					record_keys = record_keys['_Record__keys']
@@ -363,7 +363,7 @@ def query_library_database_for_signatures(tx, library_name, save_directory):
 				queries = __get_functions_with_function_expressions_query(function_name)
 
 			for query in queries:
-				results = tx.run(query)
+				results = tx.run(query, name=function_name)
 				for record in results:
 					## was checking the jquery library ... here
 					record_keys = record.__dict__
@@ -451,11 +451,11 @@ def query_library_database_for_signatures(tx, library_name, save_directory):
 
 		# look for .open(a, url, ...)
 		query = """
-		MATCH (top_function { Id: '%s'})-[:AST_parentOf*]->(call_expr {Type: 'CallExpression'})-[:AST_parentOf {RelationType: 'callee'}]->(member_expr {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'property'}]->(open_identifier {Code: 'open'}),
+		MATCH (top_function { Id: $id})-[:AST_parentOf*]->(call_expr {Type: 'CallExpression'})-[:AST_parentOf {RelationType: 'callee'}]->(member_expr {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'property'}]->(open_identifier {Code: 'open'}),
 		(call_expr)-[:AST_parentOf {RelationType: 'arguments', Arguments: '{\"arg\":1}'}]->(param {Type: 'Identifier'})
 		RETURN param
-		"""%(function_dictionary['id'])
-		results = tx.run(query)
+		"""
+		results = tx.run(query, id=function_dictionary['id'])
 		for item in results:
 			parameter = item['param']
 			return parameter['Code']
@@ -498,12 +498,12 @@ def query_library_database_for_signatures(tx, library_name, save_directory):
 		"""
 
 		query="""
-		MATCH (n {Id: '%s'})-[:AST_parentOf{RelationType: 'params'}]-(i {Type: 'Identifier'})
+		MATCH (n {Id: $id})-[:AST_parentOf{RelationType: 'params'}]-(i {Type: 'Identifier'})
 		WHERE n.Type='FunctionDeclaration'
 		OR n.Type='FunctionExpression'
 		RETURN n, collect(distinct i) as params
-		"""%(str(node_id))
-		results = tx.run(query)
+		"""
+		results = tx.run(query, id=str(node_id))
 		for node_item in results:
 			node = node_item['n']
 			params = node_item['params']
@@ -546,14 +546,14 @@ def query_library_database_for_signatures(tx, library_name, save_directory):
 		# """%(this_node['Code'])
 
 		query = """
-		MATCH (assignment_expr {Type: 'AssignmentExpression'})-[:AST_parentOf {RelationType: 'left'}]->(member_expr {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'property'}]->(this_identifier { Code: '%s'}),
+		MATCH (assignment_expr {Type: 'AssignmentExpression'})-[:AST_parentOf {RelationType: 'left'}]->(member_expr {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'property'}]->(this_identifier { Code: $code}),
 		p=shortestPath((function {Type: 'FunctionDeclaration'})-[:AST_parentOf*]->(assignment_expr)), 
 		(function)-[:AST_parentOf {RelationType: 'id'}]->(function_name {Type: 'Identifier'})
 		RETURN function, function_name
-		"""%(this_node['Code'])
+		"""
 
 		out = {}
-		results = tx.run(query)
+		results = tx.run(query, code=this_node['Code'])
 		for record in results:
 			out[record['function_name']['Code']] = record['function']
 		return out
@@ -569,12 +569,12 @@ def query_library_database_for_signatures(tx, library_name, save_directory):
 			# object expressions
 			query = """
 			MATCH (alias_top_expr {Type: 'ExpressionStatement'})-[:AST_parentOf]->(assignment {Type: 'AssignmentExpression'})-[:AST_parentOf {RelationType: 'left'}]->(member_expr {Type: 'MemberExpression'})-[:AST_parentOf {RelationType: 'property'}]->(target_property_name {Type: 'Identifier'}),
-			(assignment)-[:AST_parentOf {RelationType: 'right'}]-> (function_name { Type: 'Identifier', Code: '%s'}),
-			(alias_top_expr)<-[:AST_parentOf]-(same_parent_block)-[:AST_parentOf]->(n { Id: '%s'})
+			(assignment)-[:AST_parentOf {RelationType: 'right'}]-> (function_name { Type: 'Identifier', Code: $name}),
+			(alias_top_expr)<-[:AST_parentOf]-(same_parent_block)-[:AST_parentOf]->(n { Id: $id})
 			RETURN distinct(target_property_name.Code) as name
-			"""%(function_name, function_declaration['Id'])
+			"""
 
-			results = tx.run(query)
+			results = tx.run(query, name=function_name, id=function_declaration['Id'])
 			for record in results:
 				out[record['name']] = function_declaration # set the definition of alias to the real function
 
@@ -781,12 +781,12 @@ def get_return_statements(tx, function_node_id):
 	"""
 
 	query="""
-	MATCH (n {Id: '%s'})-[:AST_parentOf*]->(ret {Type: 'ReturnStatement'})-[:AST_parentOf]-(m)
+	MATCH (n {Id: $id})-[:AST_parentOf*]->(ret {Type: 'ReturnStatement'})-[:AST_parentOf]-(m)
 	RETURN ret
-	"""%str(function_node_id) # Note: parameter m filters out returns without arguments like return;
+	""" # Note: parameter m filters out returns without arguments like return;
 
 	out = []
-	results = tx.run(query)
+	results = tx.run(query, id=str(function_node_id))
 	for node_item in results:
 		node = node_item['ret']
 		out.append(node)
@@ -799,13 +799,13 @@ def get_control_predicates(tx, function_node_id):
 	# Check `test` relation of IfStatement, ForStatement, SwitchStatement, WhileStatement, etc,
 	# for SwitchStatement, optional match discriminant
 	query="""
-	MATCH (n {Id: '%s'})-[:AST_parentOf*]->(control)-[:AST_parentOf {RelationType: 'test'}]->(test)
+	MATCH (n {Id: $id})-[:AST_parentOf*]->(control)-[:AST_parentOf {RelationType: 'test'}]->(test)
 	OPTIONAL MATCH (control)-[:AST_parentOf {RelationType: 'discriminant'}]->(test2)
 	RETURN test, test2
-	"""%str(function_node_id)
+	"""
 
 	out = []
-	results = tx.run(query)
+	results = tx.run(query, id=str(function_node_id))
 	for node_item in results:
 		test_node_1 = node_item['test']
 		test_node_2 = node_item['test2']
@@ -831,32 +831,27 @@ def get_value_of(tx, varname, context_node, calls=[]):
 	if DEBUG:
 		print("[+] get_value_of(%s, %s)"%(varname, node_id))
 
-	query = """
-	MATCH (n_s { Id: '%s' })<-[:PDG_parentOf { Arguments: '%s' }]-(n_t) RETURN collect(distinct n_t) AS resultset
-	"""%(node_id, varname)
-	results = tx.run(query)
-	for item in results: 
-		current_nodes = item['resultset'] 
-		for iterator_node in current_nodes:
+	current_nodes = neo4jQueryUtilityModule.get_pdg_parents(tx, node_id, varname)
+	for iterator_node in current_nodes:
 
-			tree = neo4jQueryUtilityModule.getChildsOf(tx, iterator_node)
-			contextNode = tree['node']
-			if contextNode['Id'] == constantsModule.PROGRAM_NODE_INDEX: 
-				continue
-			ex = neo4jQueryUtilityModule.get_code_expression(tree)
-			#loc = iterator_node['Location']
-			[code_expr, literals, idents] = ex
-			out_values.append([code_expr, literals, idents])
-			new_varnames = utilityModule.get_unique_list(list(idents))
+		tree = neo4jQueryUtilityModule.getChildsOf(tx, iterator_node)
+		contextNode = tree['node']
+		if contextNode['Id'] == constantsModule.PROGRAM_NODE_INDEX: 
+			continue
+		ex = neo4jQueryUtilityModule.get_code_expression(tree)
+		#loc = iterator_node['Location']
+		[code_expr, literals, idents] = ex
+		out_values.append([code_expr, literals, idents])
+		new_varnames = utilityModule.get_unique_list(list(idents))
 
-			# main recursion flow
-			for new_varname in new_varnames:
-				if new_varname == varname or new_varname in constantsModule.JS_DEFINED_VARS: continue
+		# main recursion flow
+		for new_varname in new_varnames:
+			if new_varname == varname or new_varname in constantsModule.JS_DEFINED_VARS: continue
 
-				call_arg = str(new_varname) + '__' +str(contextNode['Id'])
-				calls.append(call_arg)
-				v = get_value_of(tx, new_varname, contextNode, calls)
-				out_values.extend(v)	
+			call_arg = str(new_varname) + '__' +str(contextNode['Id'])
+			calls.append(call_arg)
+			v = get_value_of(tx, new_varname, contextNode, calls)
+			out_values.extend(v)	
 
 	return out_values
 
@@ -868,21 +863,21 @@ def get_function_name(tx, function_node):
 	function_node_id = function_node['Id']
 	if t == 'FunctionDeclaration':
 		query="""
-		MATCH (n {Id: '%s'})-[:AST_parentOf {RelationType: 'id'}]->(name)
+		MATCH (n {Id: $id})-[:AST_parentOf {RelationType: 'id'}]->(name)
 		WHERE name.Type = 'Identifier'
 		OR name.Type = 'MemberExpression'
 		RETURN name
-		"""%(function_node_id)
+		"""
 	else:
 		# handle all cases in one go: object expr, assignment expr, var declarator
 		query="""
-		MATCH (n {Id: '%s'})<-[:AST_parentOf]-(parent)-[:AST_parentOf]->(name)
+		MATCH (n {Id: $id})<-[:AST_parentOf]-(parent)-[:AST_parentOf]->(name)
 		WHERE name.Type = 'Identifier'
 		OR name.Type = 'MemberExpression'
 		RETURN name
-		"""%(function_node_id)
+		"""
 
-	results = tx.run(query)
+	results = tx.run(query, id=function_node_id)
 	for item in results:
 		node = item['name']
 		if node['Type'] == 'Identifier':
@@ -0,0 +1,654 @@
+# -*- coding: utf-8 -*-
+
+"""
+	Copyright (C) 2022  Soheil Khodayari, CISPA
+	This program is free software: you can redistribute it and/or modify
+	it under the terms of the GNU Affero General Public License as published by
+	the Free Software Foundation, either version 3 of the License, or
+	(at your option) any later version.
+	This program is distributed in the hope that it will be useful,
+	but WITHOUT ANY WARRANTY; without even the implied warranty of
+	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+	GNU Affero General Public License for more details.
+	You should have received a copy of the GNU Affero General Public License
+	along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+	Description:
+	------------
+	Compiles the outputs of the Library Analyzer Module (`<library>.json` and `<library>_signature.json`
+	of each folder in `data/libraries`) into library summaries for the static analysis of webpages.
+
+	The summary of a library is a small stub script that only models the summarized functions:
+		- in-out relationships (`out <-- a, b`): the function returns its parameters a and b
+		- request-sending functions (`REQ`, and the public request APIs of `LIBRARY_REQUEST_FUNCTIONS`):
+			the function sends a request with its URL parameter, i.e., the parameter with a URL-like name,
+			preferably among the parameters of its in-out relationships
+		- functions returning the window location (`WIN.LOC`, with a `return` of the location in their body):
+			the function returns `window.location.href`
+	A request-sending function with an options parameter also accepts the options object as its first argument,
+	e.g., `jQuery.ajax({url: ...})`.
+	Only the functions that the library source defines as members of its global names are summarized,
+	i.e., `jQuery.f = function...`, or a property `f: function...` of an object literal assigned to or
+	extending a namespace (e.g., `jQuery.extend({...})`); internal functions and prototype methods are not.
+	Each function is defined under all the global names of the library (e.g., `jQuery.getJSON` and `$.getJSON`),
+	such that the call graph of the webpage connects first-party calls to the summary.
+
+	When a webpage includes a known library, i.e., a script whose SHA256 hash matches one of the library files,
+	or whose content matches a library heuristic and has one of the versions of the analyzed library files,
+	the static analysis includes the stub instead of the library.
+
+	Usage:
+	------------
+	$ python3 -m symbolic_modeling.summaries --input=$(pwd)/data/libraries --output=$(pwd)/data/libraries/summaries.json
+
+"""
+
+import os
+import re
+import json
+import bisect
+import hashlib
+import argparse
+import collections
+import constants as constantsModule
+from utils.logging import logger
+
+
+SUMMARIES_FORMAT_VERSION = 1
+
+SIGNATURE_FILE_SUFFIX = '_signature.json'
+
+LABEL_REQUEST = 'REQ'
+LABEL_WINDOW_LOCATION = 'WIN.LOC'
+
+# object properties that hold the instance methods of a library, which are not namespace members
+_PROTOTYPE_PROPERTIES = ['prototype', 'fn']
+
+# global names under which a library exposes its functions
+LIBRARY_NAMESPACES = {
+	'angularjs': ['angular'],
+	'backbone': ['Backbone'],
+	'chartjs': ['Chart'],
+	'dojo': ['dojo'],
+	'extjs': ['Ext'],
+	'hammerjs': ['Hammer'],
+	'handlebars': ['Handlebars'],
+	'jquery': ['jQuery', '$'],
+	'jquery-ui': ['jQuery', '$'],
+	'leaflet': ['L'],
+	'momentjs': ['moment'],
+	'prototype': ['Ajax'],
+	'react': ['React'],
+	'reactdom': ['ReactDOM'],
+	'vue': ['Vue'],
+	'yui': ['YUI'],
+}
+
+# public request APIs that the Library Analyzer Module does not label as `REQ`
+# (it labels the internal transport functions that they call instead)
+LIBRARY_REQUEST_FUNCTIONS = {
+	'jquery': ['jQuery.ajax', 'jQuery.getJSON', 'jQuery.getScript'],
+}
+
+# names of the content heuristics of the static analysis (`lib_content_heuristics_names` of globals.js) per library
+LIBRARY_HEURISTIC_NAMES = {
+	'react': ['reactjs'],
+}
+
+# e.g., getJSON, jQuery.ajax; computed member names (e.g., jQuery[method]) can not be summarized
+_FUNCTION_NAME_PATTERN = re.compile(r'^[A-Za-z_$][\w$]*(\.[A-Za-z_$][\w$]*)*$')
+_PARAM_NAME_PATTERN = re.compile(r'^[A-Za-z_$][\w$]*$')
+_DEPENDENCY_LABEL_PATTERN = re.compile(r'out <-- ([^\'"\]]*)')
+_RELATION_LABEL_PATTERN = re.compile(r'out ~ ([^\'"\]]*)')
+_URL_PARAM_PATTERN = re.compile(r'(url|uri|href|src|endpoint)', re.IGNORECASE)
+_OPTIONS_PARAM_PATTERN = re.compile(r'^(options|settings|config|opts)$', re.IGNORECASE)
+_LOCATION_PATTERN = re.compile(r'line:(\d+),column:(\d+)')
+
+# number of characters before a function or object literal that are matched against the patterns below
+_CONTEXT_LENGTH = 256
+
+# e.g., `jQuery v3.5.0`, `Backbone.js 1.4.0` or `VERSION = "1.0.0"` in the first characters of a library file;
+# same as `getLibraryVersion` of `library_summaries.js`
+_VERSION_PATTERN = re.compile(r'(?:^|[^\w.])v?(\d+\.\d+\.\d+)(?![\w.])')
+_VERSION_HEADER_LENGTH = 1024
+
+_PATH = r'[A-Za-z_$][\w$]*(?:\.[A-Za-z_$][\w$]*)*'
+# e.g., `jQuery._evalUrl = function`
+_MEMBER_ASSIGNMENT_PATTERN = re.compile(r'(?<![\w$.\]])(' + _PATH + r')\s*=$')
+# e.g., `getJSON: function`
+_PROPERTY_KEY_PATTERN = re.compile(r'(?:^|[{,\s])["\']?([A-Za-z_$][\w$]*)["\']?\s*:$')
+# e.g., `function bootstrap(`
+_FUNCTION_DECLARATION_PATTERN = re.compile(r'function\s+([A-Za-z_$][\w$]*)\s*\(')
+# e.g., `'bootstrap': bootstrap,` or `dojo.xhr = xhr;`
+_ALIAS_PATTERN = re.compile(r'[=:]\s*([A-Za-z_$][\w$]*)(?=\s*[;,})\n])')
+# e.g., `jQuery.extend({`
+_EXTEND_CALL_PATTERN = re.compile(r'(?<![\w$.])(' + _PATH + r')\.(?:extend|mixin)\(\s*$')
+# e.g., `extend(angular, {`
+_EXTEND_ARGUMENT_PATTERN = re.compile(r'(?<![\w$.])(?:' + _PATH + r'\.)?(?:extend|mixin)\(\s*(' + _PATH + r')\s*,$')
+# e.g., `function(a, b) {` or `(a) => {`, before the body of a function
+_FUNCTION_HEAD_PATTERN = re.compile(r'(?:function\b[^{}]*\)|=>)$')
+_RETURN_PATTERN = re.compile(r'(?<![\w$.])return\b([^;}\n]*)')
+_LOCATION_ACCESS_PATTERN = re.compile(r'(?<![\w$])location\b')
+
+
+
+def _hash_file(path):
+
+	with open(path, 'rb') as fd:
+		return hashlib.sha256(fd.read()).hexdigest()
+
+
+def get_library_version(text):
+
+	"""
+	@return {string} the version in the header of a library file, e.g., `3.5.0`, or None
+	"""
+
+	match = _VERSION_PATTERN.search(text[:_VERSION_HEADER_LENGTH])
+	return match.group(1) if match is not None else None
+
+
+def _load_json_list(path):
+
+	try:
+		with open(path, 'r', encoding='utf-8') as fd:
+			content = json.load(fd)
+	except (OSError, ValueError):
+		return []
+	return content if isinstance(content, list) else []
+
+
+def _get_params(row):
+
+	params = row.get('params', [])
+	if not isinstance(params, list):
+		return []
+	return [param for param in params if isinstance(param, str) and _PARAM_NAME_PATTERN.match(param)]
+
+
+def _get_location(row):
+
+	"""
+	@return {tuple} (line, column) of the start of the function of a row, or None
+	"""
+
+	match = _LOCATION_PATTERN.search(str(row.get('location', '')))
+	if match is None:
+		return None
+	return (int(match.group(1)), int(match.group(2)))
+
+
+def load_library_functions(library_folder):
+
+	"""
+	merges the in-out relationships and the signatures of the functions of a library
+	@param {string} library_folder: folder of a library in `data/libraries`
+	@return {OrderedDict} (file name, function id) -> {'name': string, 'source': path of the library script or None,
+		'location': (line, column), 'params': list, 'dependencies': list, 'relations': list, 'labels': list,
+		'returns_location': bool, set by `get_namespace_members`}
+	"""
+
+	functions = collections.OrderedDict()
+
+	def _get_function(base_name, row):
+		name = row.get('function')
+		if not isinstance(name, str) or not _FUNCTION_NAME_PATTERN.match(name):
+			return None
+		key = (base_name, str(row.get('id')))
+		if key not in functions:
+			source = os.path.join(library_folder, base_name + '.js')
+			functions[key] = {
+				'name': name,
+				'source': source if os.path.exists(source) else None,
+				'location': _get_location(row),
+				'params': _get_params(row),
+				'dependencies': [],
+				'relations': [],
+				'labels': [],
+				'returns_location': False
+			}
+		elif not functions[key]['params']:
+			functions[key]['params'] = _get_params(row)
+		return functions[key]
+
+	def _add_params(function, pattern, labels, field):
+		for match in pattern.finditer(labels):
+			for param in match.group(1).split(','):
+				param = param.strip()
+				if param in function['params'] and param not in function[field]:
+					function[field].append(param)
+
+	for file_name in sorted(os.listdir(library_folder)):
+		if not file_name.endswith('.json') or file_name.endswith(SIGNATURE_FILE_SUFFIX):
+			continue
+		base_name = file_name[:-len('.json')]
+		for row in _load_json_list(os.path.join(library_folder, file_name)):
+			function = _get_function(base_name, row)
+			if function is None:
+				continue
+			labels = str(row.get('labels', ''))
+			_add_params(function, _DEPENDENCY_LABEL_PATTERN, labels, 'dependencies')
+			_add_params(function, _RELATION_LABEL_PATTERN, labels, 'relations')
+
+	for file_name in sorted(os.listdir(library_folder)):
+		if not file_name.endswith(SIGNATURE_FILE_SUFFIX):
+			continue
+		base_name = file_name[:-len(SIGNATURE_FILE_SUFFIX)]
+		for row in _load_json_list(os.path.join(library_folder, file_name)):
+			label = row.get('label')
+			if label not in [LABEL_REQUEST, LABEL_WINDOW_LOCATION]:
+				continue
+			function = _get_function(base_name, row)
+			if function is not None and label not in function['labels']:
+				function['labels'].append(label)
+
+	return functions
+
+
+
+# ----------------------------------------------------------------------- #
+#		Namespace Members
+# ----------------------------------------------------------------------- #
+
+class LibrarySource:
+
+	"""
+	source of a library script, with the object literal (i.e., brace) that encloses each position
+	"""
+
+	def __init__(self, path):
+
+		with open(path, 'r', encoding='utf-8', errors='replace') as fd:
+			self.text = fd.read()
+
+		self.line_offsets = [0]
+		for line in self.text.split('\n'):
+			self.line_offsets.append(self.line_offsets[-1] + len(line) + 1)
+
+		# offset of an opening brace -> offset of the enclosing opening brace (or None)
+		self.parents = {}
+		# offset of an opening brace -> offset of its closing brace
+		self.closes = {}
+		self._scan_braces()
+		self.braces = sorted(self.parents)
+		self.aliases = None
+
+
+	def _scan_braces(self):
+
+		"""
+		matches the braces of the source, skipping the strings, comments and regular expressions
+		"""
+
+		text = self.text
+		length = len(text)
+		stack = []
+		previous = ''
+		i = 0
+		while i < length:
+			char = text[i]
+			if char in '"\'`':
+				i += 1
+				while i < length and text[i] != char:
+					i += 2 if text[i] == '\\' else 1
+			elif text.startswith('//', i):
+				i = text.find('\n', i)
+				if i < 0:
+					break
+				continue
+			elif text.startswith('/*', i):
+				i = text.find('*/', i + 2)
+				if i < 0:
+					break
+				i += 1
+			elif char == '/' and (previous == '' or previous in '(,=:[!&|?{};+-*%<>~^'):
+				# regular expression literal
+				i += 1
+				in_class = False
+				while i < length and text[i] != '\n' and (text[i] != '/' or in_class):
+					if text[i] == '\\':
+						i += 1
+					elif text[i] == '[':
+						in_class = True
+					elif text[i] == ']':
+						in_class = False
+					i += 1
+			elif char == '{':
+				self.parents[i] = stack[-1] if len(stack) else None
+				stack.append(i)
+			elif char == '}':
+				if len(stack):
+					self.closes[stack.pop()] = i
+			if not char.isspace():
+				previous = char
+			i += 1
+
+
+	def get_function_offset(self, location):
+
+		"""
+		@param {tuple} location: (line, column) of a function in the outputs of the Library Analyzer Module,
+			whose lines are usually shifted by one
+		@return {int} offset of the `function` keyword in the source, or None
+		"""
+
+		(line, column) = location
+		for shift in [1, 0, 2, -1]:
+			index = line - 1 - shift
+			if index < 0 or index >= len(self.line_offsets) - 1:
+				continue
+			offset = self.line_offsets[index] + column
+			if self.text.startswith('function', offset) or self.text.startswith('async', offset):
+				return offset
+		return None
+
+
+	def get_function_body(self, offset):
+
+		"""
+		@param {int} offset: offset of a function
+		@return {int} offset of the opening brace of the body of the function, or None
+		"""
+
+		position = bisect.bisect_left(self.braces, offset)
+		if position >= len(self.braces):
+			return None
+		brace = self.braces[position]
+		if brace not in self.closes or not _FUNCTION_HEAD_PATTERN.search(self.text[offset:brace].rstrip()):
+			return None
+		return brace
+
+
+	def _is_function_body(self, brace):
+
+		return _FUNCTION_HEAD_PATTERN.search(self._get_text_before(brace)) is not None
+
+
+	def returns_location(self, offset):
+
+		"""
+		@param {int} offset: offset of a function
+		@return {bool} whether a `return` statement of the function (not of its inner functions) returns the location
+		"""
+
+		body = self.get_function_body(offset)
+		if body is None:
+			return False
+
+		for match in _RETURN_PATTERN.finditer(self.text, body, self.closes[body]):
+			if not _LOCATION_ACCESS_PATTERN.search(match.group(1)):
+				continue
+			# the return statement belongs to the function unless one of its enclosing braces is an inner function
+			brace = self.get_enclosing_brace(match.start())
+			while brace is not None and brace != body and not self._is_function_body(brace):
+				brace = self.parents.get(brace)
+			if brace == body:
+				return True
+		return False
+
+
+	def get_enclosing_brace(self, offset):
+
+		# the innermost enclosing brace is the last brace before the offset, or one of its ancestors
+		position = bisect.bisect_left(self.braces, offset) - 1
+		brace = self.braces[position] if position >= 0 else None
+		while brace is not None and self.closes.get(brace, len(self.text)) < offset:
+			brace = self.parents.get(brace)
+		return brace
+
+
+	def _get_text_before(self, offset):
+
+		# enough for the patterns that bind a function or an object literal to a name
+		return self.text[max(0, offset - _CONTEXT_LENGTH):offset].rstrip()
+
+
+	def get_object_path(self, brace, depth=0):
+
+		"""
+		@return {string} the global path of the object literal starting at the brace, e.g., `jQuery` for
+			`jQuery.extend({` and `jQuery.ajaxSettings` for `ajaxSettings: {` in it, or None
+		"""
+
+		if brace is None or depth > 8:
+			return None
+
+		before = self._get_text_before(brace)
+		for pattern in [_EXTEND_CALL_PATTERN, _EXTEND_ARGUMENT_PATTERN, _MEMBER_ASSIGNMENT_PATTERN]:
+			match = pattern.search(before)
+			if match is not None:
+				return match.group(1)
+
+		match = _PROPERTY_KEY_PATTERN.search(before)
+		if match is not None:
+			owner = self.get_object_path(self.parents.get(brace), depth + 1)
+			if owner is not None:
+				return owner + '.' + match.group(1)
+		return None
+
+
+	def _get_binding_path(self, offset):
+
+		"""
+		@param {int} offset: offset of a value, i.e., a function expression or an identifier
+		@return {string} the global path that the value is assigned to, or None
+		"""
+
+		before = self._get_text_before(offset)
+		match = _MEMBER_ASSIGNMENT_PATTERN.search(before)
+		if match is not None and not before.endswith('=='):
+			return match.group(1)
+
+		match = _PROPERTY_KEY_PATTERN.search(before)
+		if match is not None:
+			owner = self.get_object_path(self.get_enclosing_brace(offset))
+			if owner is not None:
+				return owner + '.' + match.group(1)
+		return None
+
+
+	def get_member_paths(self, offset):
+
+		"""
+		@param {int} offset: offset of a function
+		@return {list} the global paths of the function, i.e., the one it is assigned to, or for a function declaration,
+			the ones its name is assigned to (e.g., `extend(angular, {'bootstrap': bootstrap})`)
+		"""
+
+		path = self._get_binding_path(offset)
+		if path is not None:
+			return [path]
+
+		match = _FUNCTION_DECLARATION_PATTERN.match(self.text, offset)
+		if match is None:
+			return []
+
+		if self.aliases is None:
+			# identifier -> offsets where it is assigned to a name or property, e.g., `'bootstrap': bootstrap,`
+			self.aliases = collections.defaultdict(list)
+			for alias in _ALIAS_PATTERN.finditer(self.text):
+				self.aliases[alias.group(1)].append(alias.start(1))
+
+		paths = []
+		for alias_offset in self.aliases.get(match.group(1), []):
+			path = self._get_binding_path(alias_offset)
+			if path is not None and path not in paths:
+				paths.append(path)
+		return paths
+
+
+def _get_qualified_names(member_path, namespaces):
+
+	"""
+	@param {string} member_path: the global path of a function, e.g., `jQuery.getJSON`
+	@return {list} the global names of the function, one per namespace of its library, or an empty list if the
+		function is not a namespace member
+	"""
+
+	if member_path is None:
+		return []
+	parts = member_path.split('.')
+	if len(parts) < 2 or parts[0] not in namespaces:
+		return []
+	if any([part in _PROTOTYPE_PROPERTIES for part in parts[1:]]):
+		return []
+	return ['.'.join([namespace] + parts[1:]) for namespace in namespaces]
+
+
+def get_namespace_members(functions, namespaces):
+
+	"""
+	@param {OrderedDict} functions: output of `load_library_functions`
+	@param {list} namespaces: global names of the library
+	@return {OrderedDict} global path (e.g., `jQuery.getJSON`) -> function, for the functions that the library
+		source defines as namespace members
+	"""
+
+	sources = {}
+	members = collections.OrderedDict()
+	for function in functions.values():
+		if function['source'] is None or function['location'] is None or not len(namespaces):
+			continue
+		if not len(function['labels']) and not len(function['dependencies']) and not len(function['relations']):
+			# nothing to summarize
+			continue
+		if function['source'] not in sources:
+			sources[function['source']] = LibrarySource(function['source'])
+		source = sources[function['source']]
+
+		offset = source.get_function_offset(function['location'])
+		if offset is None:
+			continue
+		for member_path in source.get_member_paths(offset):
+			qualified_names = _get_qualified_names(member_path, namespaces)
+			if len(qualified_names):
+				if qualified_names[0] not in members:
+					members[qualified_names[0]] = function
+					if LABEL_WINDOW_LOCATION in function['labels']:
+						function['returns_location'] = source.returns_location(offset)
+				break
+	return members
+
+
+def _get_url_param(function):
+
+	"""
+	@return {string} the parameter that holds the URL of a request-sending function, or None
+	"""
+
+	for candidates in [function['dependencies'] + function['relations'], function['params']]:
+		for param in candidates:
+			if _URL_PARAM_PATTERN.search(param):
+				return param
+	return None
+
+
+def build_stub(library_name, functions, namespaces):
+
+	"""
+	@return {tuple} (stub source, number of summarized functions)
+	"""
+
+	request_functions = LIBRARY_REQUEST_FUNCTIONS.get(library_name, [])
+	lines = ['/* library summary: {0} (generated by symbolic_modeling.summaries) */'.format(library_name)]
+	count = 0
+	for member_path, function in get_namespace_members(functions, namespaces).items():
+		params = function['params']
+		returned = list(function['dependencies'])
+		body = []
+		if LABEL_REQUEST in function['labels'] or member_path in request_functions:
+			url_param = _get_url_param(function)
+			if url_param is not None:
+				options_params = [param for param in params if _OPTIONS_PARAM_PATTERN.match(param)]
+				if len(options_params) and params[0] == url_param:
+					# e.g., `jQuery.ajax({url: ...})`
+					body.append("if(typeof {0} === 'object'){{ {1} = {0}; {0} = {1}.url; }}".format(url_param, options_params[0]))
+				body.append('fetch({0});'.format(url_param))
+		if function['returns_location']:
+			# only the functions that return the location are sources, not the ones that just access it
+			returned.append('window.location.href')
+		if len(returned):
+			body.append('return [{0}];'.format(', '.join(returned)))
+		if not len(body):
+			continue
+
+		for qualified_name in _get_qualified_names(member_path, namespaces):
+			lines.append('{0} = function({1}){{ {2} }};'.format(qualified_name, ', '.join(params), ' '.join(body)))
+		count += 1
+
+	return ('\n'.join(lines) + '\n', count)
+
+
+def build_library_summary(library_folder, library_name=None):
+
+	"""
+	@param {string} library_folder: folder of a library in `data/libraries`
+	@return {dict} the summary of the library, or None if the library has no summarized functions
+	"""
+
+	if library_name is None:
+		library_name = os.path.basename(os.path.normpath(library_folder))
+
+	functions = load_library_functions(library_folder)
+	(stub, count) = build_stub(library_name, functions, LIBRARY_NAMESPACES.get(library_name, []))
+	if count == 0:
+		return None
+
+	fingerprints = sorted(set([_hash_file(os.path.join(library_folder, file_name)) for file_name in os.listdir(library_folder) if '.js' in file_name and not file_name.endswith('.json')]))
+
+	# versions of the analyzed files, which the library must have to be matched by its name
+	versions = set()
+	for source in set([function['source'] for function in functions.values() if function['source'] is not None]):
+		with open(source, 'r', encoding='utf-8', errors='replace') as fd:
+			version = get_library_version(fd.read(_VERSION_HEADER_LENGTH))
+		if version is not None:
+			versions.add(version)
+
+	return {
+		'names': [library_name] + LIBRARY_HEURISTIC_NAMES.get(library_name, []),
+		'versions': sorted(versions),
+		'fingerprints': fingerprints,
+		'functions': count,
+		'stub': stub,
+	}
+
+
+def build_summaries(input_folder, output_path):
+
+	"""
+	@param {string} input_folder: e.g., `data/libraries`
+	@param {string} output_path: path of the summaries file used by the static analysis
+	@return {dict} library name -> summary
+	"""
+
+	libraries = collections.OrderedDict()
+	for library_name in sorted(os.listdir(input_folder)):
+		library_folder = os.path.join(input_folder, library_name)
+		if not os.path.isdir(library_folder):
+			continue
+		summary = build_library_summary(library_folder, library_name)
+		if summary is not None:
+			libraries[library_name] = summary
+			logger.info('summarized %s functions of %s.'%(summary['functions'], library_name))
+
+	with open(output_path + '.tmp', 'w', encoding='utf-8') as fd:
+		json.dump({'version': SUMMARIES_FORMAT_VERSION, 'libraries': libraries}, fd, ensure_ascii=False, indent=4)
+	os.replace(output_path + '.tmp', output_path)
+	return libraries
+
+
+
+def main():
+
+	p = argparse.ArgumentParser(description='Compiles the symbolic models of libraries into library summaries.')
+	p.add_argument('--input', metavar='I', help='folder of the modeled libraries (default: %(default)s)', default=os.path.join(constantsModule.DATA_DIR, 'libraries'))
+	p.add_argument('--output', metavar='O', help='path of the summaries file (default: %(default)s)', default=constantsModule.LIBRARY_SUMMARIES_FILE)
+	args = vars(p.parse_args())
+
+	libraries = build_summaries(args['input'], args['output'])
+	logger.info('stored the summaries of %s libraries at %s'%(len(libraries), args['output']))
+
+
+if __name__ == '__main__':
+	main()
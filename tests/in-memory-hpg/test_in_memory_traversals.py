@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+
+"""
+	Copyright (C) 2022  Soheil Khodayari, CISPA
+	This program is free software: you can redistribute it and/or modify
+	it under the terms of the GNU Affero General Public License as published by
+	the Free Software Foundation, either version 3 of the License, or
+	(at your option) any later version.
+	This program is distributed in the hope that it will be useful,
+	but WITHOUT ANY WARRANTY; without even the implied warranty of
+	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+	GNU Affero General Public License for more details.
+	You should have received a copy of the GNU Affero General Public License
+	along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+	Description:
+	------------
+	regression test of the in-memory HPG backend: runs the request hijacking traversals over the
+	exported HPG of `data/test_program/test.js`, whose nodes have no `Computed` column, and checks
+	that the slice of the `window.open()` sink reaches the `window.location.hash` member expression,
+	both over the csv files and over the columnar HPG.
+
+	Running:
+	------------
+	$ python3 -m unittest discover -s tests/in-memory-hpg
+
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if BASE_DIR not in sys.path:
+	sys.path.insert(0, BASE_DIR)
+
+import analyses.request_hijacking.static_analysis_py_api as staticAnalysisModule
+import hpg_neo4j.columnar_graph as columnarGraphModule
+from hpg_neo4j.in_memory_graph import InMemoryGraph
+
+
+TEST_PROGRAM_DIR = os.path.join(os.path.join(BASE_DIR, 'data'), 'test_program')
+
+# `window.open(newPageUrl);` of test.js
+SINK = {
+	"location": 27,
+	"id": "21",
+	"script": "test.js",
+	"semantic_types": ["WR_WIN_OPEN_URL"],
+	"sink_code": "window.open(newPageUrl)",
+	"sink_type": "window.open()",
+	"taint_possibility": {"WR_WIN_OPEN_URL": True},
+	"sink_identifiers": {"WR_WIN_OPEN_URL": ["newPageUrl"]},
+}
+
+
+
+class InMemoryTraversalsTest(unittest.TestCase):
+
+	def setUp(self):
+
+		self.webpage = 'test_program'
+		self.webpage_folder = os.path.join(tempfile.mkdtemp(), self.webpage)
+		os.makedirs(self.webpage_folder)
+		for name in ['nodes.csv', 'rels.csv']:
+			shutil.copy(os.path.join(TEST_PROGRAM_DIR, name), self.webpage_folder)
+		with open(os.path.join(self.webpage_folder, 'url.out'), 'w') as fd:
+			fd.write('https://example.com/')
+		with open(os.path.join(self.webpage_folder, 'sinks.out.json'), 'w') as fd:
+			json.dump({'url': 'https://example.com/', 'sinks': [SINK]}, fd)
+
+
+	def tearDown(self):
+
+		shutil.rmtree(os.path.dirname(self.webpage_folder), ignore_errors=True)
+
+
+	def _check_member_expression_slice(self):
+
+		nodes_file = os.path.join(self.webpage_folder, 'nodes.csv')
+		rels_file = os.path.join(self.webpage_folder, 'rels.csv')
+		done = staticAnalysisModule.analyze_hpg_in_memory(self.webpage_folder, self.webpage, nodes_file, rels_file)
+		self.assertTrue(done)
+
+		with open(os.path.join(self.webpage_folder, 'sinks.flows.out.json'), 'r') as fd:
+			outputs = json.load(fd)
+		self.assertEqual(len(outputs['flows']), 1)
+
+		slices = outputs['flows'][0]['program_slices']
+		codes = [item['code'] for varname in slices for item in slices[varname]['slices']]
+		self.assertTrue(any('window.location.hash' in code for code in codes), codes)
+
+
+	def test_member_expression_slice(self):
+
+		self._check_member_expression_slice()
+
+
+	def test_member_expression_slice_columnar(self):
+
+		graph = InMemoryGraph.load(os.path.join(self.webpage_folder, 'nodes.csv'), os.path.join(self.webpage_folder, 'rels.csv'))
+		graph.to_columnar(columnarGraphModule.get_columnar_folder(self.webpage_folder))
+		self.assertTrue(columnarGraphModule.has_columnar_graph(self.webpage_folder))
+		self._check_member_expression_slice()
+
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,330 @@
+# -*- coding: utf-8 -*-
+
+"""
+	Copyright (C) 2022  Soheil Khodayari, CISPA
+	This program is free software: you can redistribute it and/or modify
+	it under the terms of the GNU Affero General Public License as published by
+	the Free Software Foundation, either version 3 of the License, or
+	(at your option) any later version.
+	This program is distributed in the hope that it will be useful,
+	but WITHOUT ANY WARRANTY; without even the implied warranty of
+	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+	GNU Affero General Public License for more details.
+	You should have received a copy of the GNU Affero General Public License
+	along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+	Description:
+	------------
+	Compressed HPG csv files (nodes.csv, rels.csv, rels_dynamic.csv).
+
+	Graphs are stored either with gzip (`.gz`, the default) or with zstd (`.zst`).
+	neo4j-admin reads `.gz` files natively, so they are imported as they are; `.zst` files
+	are streamed into a temporary csv file for the duration of the import.
+	The compressed files are never modified by an import.
+
+	The zstd mode can use a dictionary trained on sample graphs, which pays off for the very
+	repetitive csv files of an HPG. The zstd mode requires the optional `zstandard` package.
+
+	Usage:
+	------------
+	train a zstd dictionary on the graphs of the data directory:
+	> python3 -m utils.compression --train --input=$(pwd)/data --output=$(pwd)/data/hpg.zstd.dict
+
+	compress the graph of a webpage:
+	> import utils.compression as compressionModule
+	> compressionModule.compress_graph(webpage_folder, method='zstd')
+
+	import a (compressed) graph:
+	> with compressionModule.import_files(IOModule.get_graph_files(webpage_folder)) as files:
+	>	DU.neoadmin_import_db_instance(ineo_db_name, neo4j_db_name, *files)
+
+"""
+
+import os
+import io
+import gzip
+import shlex
+import shutil
+import argparse
+import contextlib
+import utils.io as IOModule
+import constants as constantsModule
+from utils.logging import logger as LOGGER
+
+try:
+	import zstandard
+except ImportError:
+	zstandard = None
+
+
+COMPRESSION_GZIP = 'gzip'
+COMPRESSION_ZSTD = 'zstd'
+
+GZIP_EXTENSION = '.gz'
+ZSTD_EXTENSION = '.zst'
+
+# extension of the temporary csv files that are streamed out of .zst files for neo4j-admin
+IMPORT_EXTENSION = '.import'
+
+# max size of one training sample, and default size of a trained dictionary
+ZSTD_SAMPLE_SIZE = 64 * 1024
+ZSTD_DICTIONARY_SIZE = 112640
+
+# compressed files are read and written in chunks of this size
+_CHUNK_SIZE = 1024 * 1024
+
+# loaded zstd dictionaries: path -> ZstdCompressionDict
+_dictionaries = {}
+
+
+
+def _require_zstandard():
+
+	if zstandard is None:
+		raise RuntimeError('zstd compression of graphs requires the `zstandard` package (pip install zstandard)')
+
+
+def is_compressed(path):
+
+	return path is not None and (path.endswith(GZIP_EXTENSION) or path.endswith(ZSTD_EXTENSION))
+
+
+def load_zstd_dictionary(path=None):
+
+	"""
+	@param {string} path: path of a dictionary trained with `train_zstd_dictionary`
+	@return {ZstdCompressionDict} the dictionary, or None if it does not exist
+	"""
+
+	_require_zstandard()
+	if path is None:
+		path = constantsModule.HPG_ZSTD_DICTIONARY
+	if path in _dictionaries:
+		return _dictionaries[path]
+
+	dictionary = None
+	if os.path.exists(path):
+		with open(path, 'rb') as fd:
+			dictionary = zstandard.ZstdCompressionDict(fd.read())
+	_dictionaries[path] = dictionary
+	return dictionary
+
+
+def _get_zstd_decompressor(fd, path, dictionary_path=None):
+
+	"""
+	@return {ZstdDecompressor} a decompressor for the zstd stream of fd, with the dictionary that the stream was written with
+	"""
+
+	header = fd.read(18)
+	fd.seek(0)
+	dict_id = zstandard.get_frame_parameters(header).dict_id if len(header) else 0
+	if dict_id == 0:
+		return zstandard.ZstdDecompressor()
+
+	dictionary = load_zstd_dictionary(dictionary_path)
+	if dictionary is None or dictionary.dict_id() != dict_id:
+		raise RuntimeError('%s was compressed with the zstd dictionary %s, which is not available'%(path, dict_id))
+	return zstandard.ZstdDecompressor(dict_data=dictionary)
+
+
+def open_text(path, dictionary_path=None):
+
+	"""
+	opens a plain, .gz or .zst csv file for streaming reads
+	@param {string} path
+	@return {file} text-mode file object
+	"""
+
+	if path.endswith(GZIP_EXTENSION):
+		return gzip.open(path, 'rt', encoding='utf-8', errors='replace')
+
+	if path.endswith(ZSTD_EXTENSION):
+		_require_zstandard()
+		fd = open(path, 'rb')
+		reader = _get_zstd_decompressor(fd, path, dictionary_path).stream_reader(fd, closefd=True)
+		return io.TextIOWrapper(reader, encoding='utf-8', errors='replace')
+
+	return open(path, 'r', encoding='utf-8', errors='replace')
+
+
+def _stream_zstd_to_file(path, out_path, dictionary_path=None):
+
+	with open(path, 'rb') as ifd, open(out_path, 'wb') as ofd:
+		_get_zstd_decompressor(ifd, path, dictionary_path).copy_stream(ifd, ofd, read_size=_CHUNK_SIZE, write_size=_CHUNK_SIZE)
+
+
+@contextlib.contextmanager
+def import_files(files, dictionary_path=None):
+
+	"""
+	yields paths of the given graph files that neo4j-admin can import:
+	plain and .gz files are passed through, .zst files are streamed into temporary csv files that are removed afterwards
+	@param {list} files: paths of the nodes, rels and dynamic rels files (None entries are passed through)
+	@return {list} importable paths, in the same order
+	"""
+
+	importable = []
+	temporary = []
+	try:
+		for path in files:
+			if path is not None and path.endswith(ZSTD_EXTENSION):
+				out_path = path[:-len(ZSTD_EXTENSION)] + IMPORT_EXTENSION
+				_stream_zstd_to_file(path, out_path, dictionary_path)
+				temporary.append(out_path)
+				importable.append(out_path)
+			else:
+				importable.append(path)
+		yield importable
+	finally:
+		for path in temporary:
+			if os.path.exists(path):
+				os.remove(path)
+
+
+def compress_file(path, method=COMPRESSION_GZIP, dictionary_path=None, level=None):
+
+	"""
+	compresses a plain file and removes it; the compressed file is written atomically
+	@param {string} path
+	@param {string} method: 'gzip' or 'zstd'
+	@return {string} path of the compressed file
+	"""
+
+	if method == COMPRESSION_ZSTD:
+		_require_zstandard()
+		out_path = path + ZSTD_EXTENSION
+		dictionary = load_zstd_dictionary(dictionary_path)
+		if level is None:
+			level = constantsModule.HPG_ZSTD_LEVEL
+		if dictionary is not None:
+			compressor = zstandard.ZstdCompressor(level=level, dict_data=dictionary, write_checksum=True, threads=-1)
+		else:
+			compressor = zstandard.ZstdCompressor(level=level, write_checksum=True, threads=-1)
+		with open(path, 'rb') as ifd, open(out_path + '.tmp', 'wb') as ofd:
+			compressor.copy_stream(ifd, ofd, read_size=_CHUNK_SIZE, write_size=_CHUNK_SIZE)
+	else:
+		out_path = path + GZIP_EXTENSION
+		if shutil.which('pigz') and level is None:
+			# parallel gzip, replaces the plain file
+			ret = IOModule.bash_command('pigz -f %s'%shlex.quote(path))
+			if ret != -1 and os.path.exists(out_path) and not os.path.exists(path):
+				return out_path
+			LOGGER.warning('pigz failed to compress %s, falling back to gzip.'%path)
+		if level is None:
+			level = 6
+		with open(path, 'rb') as ifd, gzip.open(out_path + '.tmp', 'wb', compresslevel=level) as ofd:
+			shutil.copyfileobj(ifd, ofd, _CHUNK_SIZE)
+
+	os.replace(out_path + '.tmp', out_path)
+	os.remove(path)
+	return out_path
+
+
+def compress_graph(webpage_folder_path, method=None, dictionary_path=None):
+
+	"""
+	compresses the plain graph files of a webpage; already compressed files are left untouched
+	@param {string} webpage_folder_path
+	@param {string} method: 'gzip' or 'zstd' (default: constants.HPG_COMPRESSION)
+	"""
+
+	if method is None:
+		method = constantsModule.HPG_COMPRESSION
+
+	for file_name in [constantsModule.NODE_INPUT_FILE_NAME, constantsModule.RELS_INPUT_FILE_NAME, constantsModule.RELS_DYNAMIC_INPUT_FILE_NAME]:
+		path = os.path.join(webpage_folder_path, file_name)
+		if os.path.exists(path):
+			for stale_path in [path + GZIP_EXTENSION, path + ZSTD_EXTENSION]:
+				if os.path.exists(stale_path):
+					os.remove(stale_path)
+			compress_file(path, method=method, dictionary_path=dictionary_path)
+
+
+
+# ----------------------------------------------------------------------- #
+#		Dictionary Training
+# ----------------------------------------------------------------------- #
+
+def _read_samples(path, max_samples):
+
+	"""
+	splits a graph file into samples at line boundaries
+	"""
+
+	samples = []
+	with open_text(path) as fd:
+		chunk = []
+		chunk_size = 0
+		for line in fd:
+			encoded = line.encode('utf-8', errors='replace')
+			chunk.append(encoded)
+			chunk_size += len(encoded)
+			if chunk_size >= ZSTD_SAMPLE_SIZE:
+				samples.append(b''.join(chunk))
+				chunk = []
+				chunk_size = 0
+				if len(samples) >= max_samples:
+					return samples
+		if chunk:
+			samples.append(b''.join(chunk))
+	return samples
+
+
+def train_zstd_dictionary(input_folder, output_path, dict_size=ZSTD_DICTIONARY_SIZE, max_graphs=200, max_samples_per_file=64):
+
+	"""
+	trains a zstd dictionary on the graph files found in the input folder (recursively)
+	@param {string} input_folder: e.g., the data directory
+	@param {string} output_path: path of the dictionary file
+	@return {int} the id of the trained dictionary
+	"""
+
+	_require_zstandard()
+	graph_file_names = [constantsModule.NODE_INPUT_FILE_NAME, constantsModule.RELS_INPUT_FILE_NAME, constantsModule.RELS_DYNAMIC_INPUT_FILE_NAME]
+
+	samples = []
+	num_graphs = 0
+	for root, _, files in os.walk(input_folder):
+		found = False
+		for file_name in files:
+			for graph_file_name in graph_file_names:
+				if file_name in [graph_file_name, graph_file_name + GZIP_EXTENSION, graph_file_name + ZSTD_EXTENSION]:
+					samples.extend(_read_samples(os.path.join(root, file_name), max_samples_per_file))
+					found = True
+		if found:
+			num_graphs += 1
+			if num_graphs >= max_graphs:
+				break
+
+	if not samples:
+		raise RuntimeError('no graph files found in %s'%input_folder)
+
+	LOGGER.info('training a zstd dictionary on %s samples of %s graphs.'%(len(samples), num_graphs))
+	dictionary = zstandard.train_dictionary(dict_size, samples, threads=-1)
+	with open(output_path + '.tmp', 'wb') as fd:
+		fd.write(dictionary.as_bytes())
+	os.replace(output_path + '.tmp', output_path)
+	_dictionaries.pop(output_path, None)
+	return dictionary.dict_id()
+
+
+
+def main():
+
+	p = argparse.ArgumentParser(description='HPG compression utilities.')
+	p.add_argument('--train', action='store_true', help='train a zstd dictionary on the graphs of the input folder')
+	p.add_argument('--input', metavar='I', help='folder to search for graph files (default: data directory)', default=constantsModule.DATA_DIR)
+	p.add_argument('--output', metavar='O', help='path of the trained dictionary (default: constants.HPG_ZSTD_DICTIONARY)', default=constantsModule.HPG_ZSTD_DICTIONARY)
+	p.add_argument('--size', metavar='S', type=int, help='max size of the dictionary in bytes', default=ZSTD_DICTIONARY_SIZE)
+	args = vars(p.parse_args())
+
+	if args['train']:
+		dict_id = train_zstd_dictionary(args['input'], args['output'], dict_size=args['size'])
+		LOGGER.info('stored the zstd dictionary %s at %s'%(dict_id, args['output']))
+	else:
+		p.print_help()
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+
+"""
+	Copyright (C) 2022  Soheil Khodayari, CISPA
+	This program is free software: you can redistribute it and/or modify
+	it under the terms of the GNU Affero General Public License as published by
+	the Free Software Foundation, either version 3 of the License, or
+	(at your option) any later version.
+	This program is distributed in the hope that it will be useful,
+	but WITHOUT ANY WARRANTY; without even the implied warranty of
+	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+	GNU Affero General Public License for more details.
+	You should have received a copy of the GNU Affero General Public License
+	along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+	Description:
+	------------
+	Walker over the data directory for the scripts that process the output files of each webpage,
+	i.e., the sitelist -> site folder -> webpage folder loop, with the per-webpage (or per-site) work
+	fanned out to a process pool.
+
+	Results are returned in the order of the input, and only a bounded number of tasks is in flight
+	at any time, such that the memory usage does not grow with the number of sites.
+	The work function must be a module level function (i.e., picklable), and the scripts using the
+	walker must call their `main()` under `if __name__ == "__main__"`.
+
+
+	Usage:
+	------------
+	> import utils.data_walker as walkerModule
+	> sites = walkerModule.get_crawled_sites(sitelist_file) # site folder name -> webpage folder names
+	> def process_webpage(webpage_path_name, outputs_file_name):
+	>	...
+	> for (site, webpage, result) in walkerModule.walk_webpages(process_webpage, sites, args=(outputs_file_name,)):
+	>	...
+
+"""
+
+import os
+import csv
+import collections
+from concurrent.futures import ProcessPoolExecutor
+
+import constants as constantsModule
+import utils.utility as utilityModule
+from utils.logging import logger as LOGGER
+
+
+DEFAULT_PROCESSES = os.cpu_count() or 1
+
+# number of in-flight tasks per worker process
+PENDING_TASKS_PER_PROCESS = 4
+
+
+
+def get_sites(sitelist_file, from_row=-1, to_row=-1):
+
+	"""
+	@param {string} sitelist_file: csv file with `rank,etld` rows and no header
+	@param {int} from_row: first row to consider (1-based), or -1 for the first row
+	@param {int} to_row: last row to consider (1-based), or -1 for the last row
+	@return {generator} (row number, etld, site folder name) of the rows of the site list
+	"""
+
+	g_index = 0
+	with open(sitelist_file, 'r', newline='') as fd:
+		for row in csv.reader(fd):
+			if len(row) < 2 or len(row[1].strip()) == 0:
+				continue
+			g_index = g_index + 1
+			if g_index < from_row:
+				continue
+			if to_row >= 0 and g_index > to_row:
+				break
+			etld_url = row[1].strip()
+			yield (g_index, etld_url, utilityModule.getDirectoryNameFromURL('http://' + etld_url))
+
+
+def get_webpages(site_name, data_dir=None):
+
+	"""
+	@param {string} site_name: site folder name
+	@param {string} data_dir: base directory of the sites (default: `constantsModule.DATA_DIR`)
+	@return {list} sorted webpage folder names of the site, or None if the site folder is missing or was not
+		crawled, i.e., it holds less than two entries
+	"""
+
+	site_path_name = os.path.join(data_dir or constantsModule.DATA_DIR, site_name)
+	if not os.path.isdir(site_path_name):
+		return None
+
+	files = os.listdir(site_path_name)
+	if len(files) <= 1:
+		return None
+
+	return sorted(name for name in files if os.path.isdir(os.path.join(site_path_name, name)))
+
+
+def get_crawled_sites(sitelist_file, from_row=-1, to_row=-1, data_dir=None):
+
+	"""
+	@param {string} sitelist_file: csv file with `rank,etld` rows and no header
+	@return {OrderedDict} site folder name -> webpage folder names, for the crawled sites of the site list (in order)
+	"""
+
+	sites = collections.OrderedDict()
+	for (g_index, etld_url, site_name) in get_sites(sitelist_file, from_row=from_row, to_row=to_row):
+		webpages = get_webpages(site_name, data_dir=data_dir)
+		if webpages is not None:
+			sites[site_name] = webpages
+	return sites
+
+
+def _get_ordered_results(calls, processes, max_pending):
+
+	"""
+	@param {generator} calls: (tag, fn, args) of the tasks, consumed lazily
+	@return {generator} (tag, result) in the order of the calls; the result is None if the task raised an exception
+	"""
+
+	processes = max(1, int(processes or DEFAULT_PROCESSES))
+	if processes == 1:
+		for (tag, fn, args) in calls:
+			try:
+				result = fn(*args)
+			except Exception as e:
+				LOGGER.warning('[WK] task %s failed: %s'%(str(tag), e))
+				result = None
+			yield (tag, result)
+		return
+
+	max_pending = max(1, int(max_pending or processes * PENDING_TASKS_PER_PROCESS))
+	pending = collections.deque()
+	with ProcessPoolExecutor(max_workers=processes) as executor:
+		for (tag, fn, args) in calls:
+			pending.append((tag, executor.submit(fn, *args)))
+			if len(pending) >= max_pending:
+				yield _get_result(*pending.popleft())
+
+		while len(pending):
+			yield _get_result(*pending.popleft())
+
+
+def _get_result(tag, future):
+
+	try:
+		return (tag, future.result())
+	except Exception as e:
+		LOGGER.warning('[WK] task %s failed: %s'%(str(tag), e))
+		return (tag, None)
+
+
+def map_ordered(fn, items, args=(), processes=None, max_pending=None):
+
+	"""
+	@param {function} fn: module level function, called as `fn(item, *args)`
+	@param {iterable} items: the inputs, consumed lazily
+	@param {tuple} args: additional (picklable) arguments of each call
+	@param {int} processes: number of worker processes; 1 runs the calls in the current process (default: number of cores)
+	@param {int} max_pending: max number of tasks in flight (default: 4 per process)
+	@return {generator} (item, result) in the order of the items
+	"""
+
+	calls = ((item, fn, (item,) + tuple(args)) for item in items)
+	return _get_ordered_results(calls, processes, max_pending)
+
+
+def walk_webpages(fn, sites, args=(), processes=None, max_pending=None, data_dir=None):
+
+	"""
+	@param {function} fn: module level function, called as `fn(webpage_path_name, *args)`
+	@param {dict} sites: site folder name -> webpage folder names, e.g., the output of `get_crawled_sites`
+	@param {tuple} args: additional (picklable) arguments of each call
+	@param {int} processes: number of worker processes; 1 runs the calls in the current process (default: number of cores)
+	@param {int} max_pending: max number of tasks in flight (default: 4 per process)
+	@return {generator} (site, webpage, result) in the order of the sites and webpages
+	"""
+
+	base_dir = data_dir or constantsModule.DATA_DIR
+	def _get_calls():
+		for site_name in sites:
+			site_path_name = os.path.join(base_dir, site_name)
+			for webpage_name in sites[site_name]:
+				webpage_path_name = os.path.join(site_path_name, webpage_name)
+				yield ((site_name, webpage_name), fn, (webpage_path_name,) + tuple(args))
+
+	for ((site_name, webpage_name), result) in _get_ordered_results(_get_calls(), processes, max_pending):
+		yield (site_name, webpage_name, result)
+
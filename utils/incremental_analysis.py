@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+
+"""
+	Copyright (C) 2022  Soheil Khodayari, CISPA
+	This program is free software: you can redistribute it and/or modify
+	it under the terms of the GNU Affero General Public License as published by
+	the Free Software Foundation, either version 3 of the License, or
+	(at your option) any later version.
+	This program is distributed in the hope that it will be useful,
+	but WITHOUT ANY WARRANTY; without even the implied warranty of
+	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+	GNU Affero General Public License for more details.
+	You should have received a copy of the GNU Affero General Public License
+	along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+	Description:
+	------------
+	Incremental re-analysis of recrawled sites.
+
+	After each stage (HPG construction, traversals), the fingerprint of every analyzed webpage is recorded
+	in its `analysis.manifest.json`, i.e., the hashes of its scripts and of its DOM snapshot (`index.html`).
+	When the site is recrawled, only the webpages whose fingerprint changed are analyzed again: their stale
+	outputs are removed first, such that the usual "skip if the output exists" checks of the analyses rebuild them.
+	The outputs of unchanged webpages (e.g., `sinks.flows.out.json`) are carried forward as they are.
+
+	Webpages without a manifest (e.g., analyzed before the incremental mode was enabled) count as changed.
+
+	Usage:
+	------------
+	> import utils.incremental_analysis as incrementalModule
+	> unchanged = incrementalModule.prepare_stage(website_folder, webpages, incrementalModule.STAGE_TRAVERSALS)
+	> ... analyze the webpages not in unchanged ...
+	> incrementalModule.record_stage(website_folder, webpages, incrementalModule.STAGE_TRAVERSALS)
+
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import utils.page_clusters as pageClustersModule
+import hpg_neo4j.columnar_graph as columnarGraphModule
+from utils.logging import logger as LOGGER
+
+
+MANIFEST_FILE_NAME = 'analysis.manifest.json'
+DOM_SNAPSHOT_FILE_NAME = 'index.html'
+
+STAGE_STATIC = 'static'
+STAGE_TRAVERSALS = 'traversals'
+
+# outputs that must exist for the results of a stage to be carried forward
+STAGE_REQUIRED_FILES = {
+	STAGE_STATIC: ['sinks.out.json'],
+	STAGE_TRAVERSALS: ['sinks.flows.out'],
+}
+
+# stale outputs that are removed before a changed webpage is analyzed again
+STAGE_STALE_FILES = {
+	STAGE_STATIC: ['time.static_analysis.out', pageClustersModule.CLUSTER_MARKER_FILE_NAME] + pageClustersModule.STATIC_RESULT_FILES,
+	STAGE_TRAVERSALS: pageClustersModule.TRAVERSAL_RESULT_FILES,
+}
+
+
+
+def _hash_file(path):
+
+	sha = hashlib.sha256()
+	with open(path, 'rb') as fd:
+		for chunk in iter(lambda: fd.read(1024 * 1024), b''):
+			sha.update(chunk)
+	return sha.hexdigest()
+
+
+def get_webpage_fingerprint(webpage_folder):
+
+	"""
+	@param {string} webpage_folder: absolute path of the webpage directory
+	@return {dict} hashes of the scripts and of the DOM snapshot of the webpage
+	"""
+
+	scripts = pageClustersModule.get_webpage_scripts(webpage_folder)
+	if len(scripts) == 0:
+		# crawlers that do not store a `scripts_mapping.json` file
+		script_names = [item for item in os.listdir(webpage_folder) if item.endswith('.js') and item[:-len('.js')].isdigit()]
+		script_names = sorted(script_names, key=lambda item: int(item[:-len('.js')]))
+		scripts = [(item, _hash_file(os.path.join(webpage_folder, item))) for item in script_names]
+
+	dom_snapshot_file = os.path.join(webpage_folder, DOM_SNAPSHOT_FILE_NAME)
+	dom_hash = _hash_file(dom_snapshot_file) if os.path.exists(dom_snapshot_file) else None
+
+	return {
+		'scripts': [[script_name, script_hash] for (script_name, script_hash) in scripts],
+		'dom': dom_hash,
+	}
+
+
+def load_manifest(webpage_folder):
+
+	"""
+	@return {dict} stage -> fingerprint of the webpage when the stage last completed
+	"""
+
+	manifest_file = os.path.join(webpage_folder, MANIFEST_FILE_NAME)
+	if not os.path.exists(manifest_file):
+		return {}
+	try:
+		with open(manifest_file, 'r') as fd:
+			return json.load(fd)
+	except ValueError:
+		return {}
+
+
+def _store_manifest(webpage_folder, manifest):
+
+	manifest_file = os.path.join(webpage_folder, MANIFEST_FILE_NAME)
+	with open(manifest_file + '.tmp', 'w') as fd:
+		json.dump(manifest, fd, ensure_ascii=False, indent=4)
+	os.replace(manifest_file + '.tmp', manifest_file)
+
+
+def is_webpage_unchanged(webpage_folder, stage, fingerprint=None):
+
+	"""
+	@param {string} stage: `STAGE_STATIC` or `STAGE_TRAVERSALS`
+	@return {bool} whether the outputs of the stage exist and were computed for the current scripts and DOM of the webpage
+	"""
+
+	for file_name in STAGE_REQUIRED_FILES[stage]:
+		if not os.path.exists(os.path.join(webpage_folder, file_name)):
+			return False
+
+	if fingerprint is None:
+		fingerprint = get_webpage_fingerprint(webpage_folder)
+	return load_manifest(webpage_folder).get(stage) == fingerprint
+
+
+def invalidate_webpage(webpage_folder, stage):
+
+	"""
+	removes the outputs of a stage, and of the stages that depend on it
+	"""
+
+	stages = [STAGE_STATIC, STAGE_TRAVERSALS] if stage == STAGE_STATIC else [stage]
+	for each_stage in stages:
+		for file_name in STAGE_STALE_FILES[each_stage]:
+			path = os.path.join(webpage_folder, file_name)
+			if os.path.exists(path):
+				os.remove(path)
+
+	if stage == STAGE_STATIC:
+		columnar_folder = columnarGraphModule.get_columnar_folder(webpage_folder)
+		if os.path.exists(columnar_folder):
+			shutil.rmtree(columnar_folder)
+
+	manifest = load_manifest(webpage_folder)
+	if any(each_stage in manifest for each_stage in stages):
+		for each_stage in stages:
+			manifest.pop(each_stage, None)
+		_store_manifest(webpage_folder, manifest)
+
+
+def prepare_stage(website_folder, webpages, stage):
+
+	"""
+	invalidates the outputs of the webpages that changed since the stage last completed
+	@param {string} website_folder: absolute path of the site directory
+	@param {list} webpages: webpages of the site
+	@return {set} unchanged webpages, whose outputs are carried forward and need no analysis
+	"""
+
+	unchanged = set()
+	for webpage in webpages:
+		webpage_folder = os.path.join(website_folder, webpage)
+		if not os.path.isdir(webpage_folder):
+			continue
+		if is_webpage_unchanged(webpage_folder, stage):
+			unchanged.add(webpage)
+		else:
+			invalidate_webpage(webpage_folder, stage)
+
+	LOGGER.info('incremental %s stage: %s of %s webpages of %s are unchanged.'%(stage, len(unchanged), len(webpages), website_folder))
+	return unchanged
+
+
+def record_stage(website_folder, webpages, stage):
+
+	"""
+	records the fingerprint of each webpage that has the outputs of the stage
+	@return {int} number of recorded webpages
+	"""
+
+	count = 0
+	for webpage in webpages:
+		webpage_folder = os.path.join(website_folder, webpage)
+		if not os.path.isdir(webpage_folder):
+			continue
+		if not all(os.path.exists(os.path.join(webpage_folder, file_name)) for file_name in STAGE_REQUIRED_FILES[stage]):
+			continue
+
+		fingerprint = get_webpage_fingerprint(webpage_folder)
+		manifest = load_manifest(webpage_folder)
+		if manifest.get(stage) != fingerprint:
+			manifest[stage] = fingerprint
+			_store_manifest(webpage_folder, manifest)
+		count += 1
+	return count
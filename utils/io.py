@@ -171,6 +171,27 @@ def compress_graph(webpage_folder_path, node_file=constantsModule.NODE_INPUT_FIL
 	bash_command(cmd2)
 	bash_command(cmd3)
 
+
+def get_graph_files(webpage_folder_path, node_file=constantsModule.NODE_INPUT_FILE_NAME, edge_file=constantsModule.RELS_INPUT_FILE_NAME, edges_file_dynamic=constantsModule.RELS_DYNAMIC_INPUT_FILE_NAME):
+
+	"""
+	@param {string} webpage_folder_path
+	@return {list} paths of the nodes, rels and dynamic rels files, in decompressed (preferred), .gz or .zst format;
+			a path is None if the file does not exist in any format
+	"""
+
+	out = []
+	for file_name in [node_file, edge_file, edges_file_dynamic]:
+		file_path = os.path.join(webpage_folder_path, file_name)
+		for candidate in [file_path, file_path + '.gz', file_path + '.zst']:
+			if os.path.exists(candidate):
+				out.append(candidate)
+				break
+		else:
+			out.append(None)
+	return out
+
+
 def decompress_graph(webpage_folder_path, node_file=constantsModule.NODE_INPUT_FILE_NAME, edge_file=constantsModule.RELS_INPUT_FILE_NAME, edges_file_dynamic=constantsModule.RELS_DYNAMIC_INPUT_FILE_NAME):
 
 	cmd1="pigz -d %s"%(os.path.join(webpage_folder_path, node_file))
@@ -0,0 +1,418 @@
+# -*- coding: utf-8 -*-
+
+"""
+	Copyright (C) 2022  Soheil Khodayari, CISPA
+	This program is free software: you can redistribute it and/or modify
+	it under the terms of the GNU Affero General Public License as published by
+	the Free Software Foundation, either version 3 of the License, or
+	(at your option) any later version.
+	This program is distributed in the hope that it will be useful,
+	but WITHOUT ANY WARRANTY; without even the implied warranty of
+	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+	GNU Affero General Public License for more details.
+	You should have received a copy of the GNU Affero General Public License
+	along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+	Description:
+	------------
+	Fingerprint index of known library scripts (e.g., `data/libraries`, or folders of downloaded CDN versions),
+	to classify the crawled scripts of webpages without running the library detector of the crawler.
+
+	A script is matched against the index in increasing order of cost:
+		- cdn: the src of the script names a library on a public CDN (e.g., cdnjs, jsdelivr, unpkg)
+		- exact: the SHA256 hash of the script is the hash of an indexed library file
+		- normalized: the hash of the tokens of the script (i.e., without comments and whitespace) matches
+		- shingles: the script shares enough of its sampled token shingles with an indexed library;
+		  shingles only consist of the tokens that minifiers keep (i.e., string contents and long identifiers
+		  such as property names), such that minified and non-minified builds of a library match
+
+	The library of each folder of an input directory is named after the folder (e.g., `data/libraries/jquery`).
+	Classifications are cached by script hash, so scripts that recur across webpages are classified once.
+
+	Usage:
+	------------
+	build the index:
+	> python3 -m utils.library_index --build --input=$(pwd)/data/libraries --output=$(pwd)/data/libraries/fingerprints.json
+
+	classify the scripts of a webpage:
+	> python3 -m utils.library_index --classify=/path/to/webpage/folder
+
+	> import utils.library_index as libraryIndexModule
+	> libraryIndexModule.get_library_index().classify_webpage(webpage_folder)
+
+"""
+
+import os
+import re
+import json
+import zlib
+import hashlib
+import argparse
+import collections
+import constants as constantsModule
+from utils.logging import logger as LOGGER
+
+
+INDEX_FORMAT_NAME = 'jaw-library-index'
+INDEX_FORMAT_VERSION = 1
+
+MATCH_CDN = 'cdn'
+MATCH_EXACT = 'exact'
+MATCH_NORMALIZED = 'normalized'
+MATCH_SHINGLES = 'shingles'
+
+# number of tokens per shingle
+SHINGLE_SIZE = 3
+
+# a shingle is sampled if its hash is divisible by the sampling rate (i.e., one out of SHINGLE_SAMPLING_RATE shingles)
+SHINGLE_SAMPLING_RATE = 16
+
+# min share of the sampled shingles of a script (or of a library, if smaller) found in a library;
+# e.g., the minified and the plain build of bootstrap 3.3.7 share 0.53, unrelated libraries less than 0.2
+SHINGLE_THRESHOLD = 0.4
+
+# scripts with fewer sampled shingles are not classified by shingles
+MIN_SAMPLED_SHINGLES = 4
+
+# shorter identifiers are left out of shingles, as minifiers rename them
+MIN_IDENTIFIER_LENGTH = 3
+
+# keywords are left out of shingles, as minifiers rewrite the statements around them
+_KEYWORDS = set([
+	'await', 'break', 'case', 'catch', 'class', 'const', 'continue', 'debugger', 'default', 'delete', 'else', 'enum', 'export',
+	'extends', 'false', 'finally', 'for', 'function', 'import', 'instanceof', 'let', 'new', 'null', 'return', 'static', 'super',
+	'switch', 'this', 'throw', 'true', 'try', 'typeof', 'undefined', 'var', 'void', 'while', 'with', 'yield',
+])
+
+_TOKEN_PATTERN = re.compile(r'''
+	(?P<comment>/\*.*?\*/|//[^\n]*)
+	|(?P<string>"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*'|`(?:[^`\\]|\\.)*`)
+	|(?P<identifier>[A-Za-z_$][\w$]*)
+	|(?P<number>\d[\w.]*)
+	|(?P<punctuator>\S)
+''', re.VERBOSE | re.DOTALL)
+
+# library name and version in CDN urls
+_CDN_PATTERNS = [
+	re.compile(r'cdnjs\.cloudflare\.com/ajax/libs/(?P<name>[^/]+)/(?P<version>[^/]+)/'),
+	re.compile(r'ajax\.googleapis\.com/ajax/libs/(?P<name>[^/]+)/(?P<version>[^/]+)/'),
+	re.compile(r'cdn\.jsdelivr\.net/npm/(?P<name>(?:@[^/@]+/)?[^/@]+)@(?P<version>[^/]+)/'),
+	re.compile(r'unpkg\.com/(?P<name>(?:@[^/@]+/)?[^/@]+)@(?P<version>[^/]+)/'),
+	re.compile(r'code\.jquery\.com/(?P<name>jquery(?:-ui)?|ui)[-/](?P<version>\d[\w.]*)'),
+]
+
+# index loaded by `get_library_index`
+_library_index = None
+
+
+
+def tokenize(content):
+
+	"""
+	@param {string} content: JavaScript source
+	@return {list} (kind, token) of the source, without comments
+	"""
+
+	tokens = []
+	for match in _TOKEN_PATTERN.finditer(content):
+		kind = match.lastgroup
+		if kind != 'comment':
+			tokens.append((kind, match.group(kind)))
+	return tokens
+
+
+def get_normalized_hash(tokens):
+
+	return hashlib.sha256(' '.join([token for (_, token) in tokens]).encode('utf-8', errors='replace')).hexdigest()
+
+
+def get_sampled_shingles(tokens, sampling_rate=SHINGLE_SAMPLING_RATE):
+
+	"""
+	@param {list} tokens: output of `tokenize`
+	@return {set} hashes of the sampled shingles of the tokens
+	"""
+
+	kept = []
+	for (kind, token) in tokens:
+		if kind == 'string':
+			# minifiers may change the quotes
+			kept.append(token[1:-1].encode('utf-8', errors='replace'))
+		elif kind == 'identifier' and len(token) >= MIN_IDENTIFIER_LENGTH and token not in _KEYWORDS:
+			kept.append(token.encode('utf-8', errors='replace'))
+
+	shingles = set()
+	for i in range(len(kept) - SHINGLE_SIZE + 1):
+		shingle_hash = zlib.crc32(b'\x00'.join(kept[i: i + SHINGLE_SIZE]))
+		if shingle_hash % sampling_rate == 0:
+			shingles.add(shingle_hash)
+	return shingles
+
+
+def get_cdn_library(src):
+
+	"""
+	@param {string} src: src of a script
+	@return {tuple} (library name, version) if the src points to a library on a public CDN, otherwise None
+	"""
+
+	if not src:
+		return None
+	for pattern in _CDN_PATTERNS:
+		match = pattern.search(src)
+		if match:
+			return (match.group('name').lower(), match.group('version'))
+	return None
+
+
+
+class LibraryIndex:
+
+	"""
+	in-memory fingerprint index of library scripts
+	"""
+
+	def __init__(self, exact=None, normalized=None, shingles=None, shingle_counts=None, sampling_rate=SHINGLE_SAMPLING_RATE):
+
+		self.exact = exact or {} # sha256 -> library
+		self.normalized = normalized or {} # normalized hash -> library
+		self.shingles = shingles or {} # sampled shingle -> list of library files (library/file name)
+		self.shingle_counts = shingle_counts or {} # library file -> number of sampled shingles
+		self.sampling_rate = sampling_rate
+		self._cache = {} # script sha256 -> classification
+
+
+	# ----------------------------------------------------------------------- #
+	#		Building
+	# ----------------------------------------------------------------------- #
+
+	def add_library_file(self, library, path):
+
+		"""
+		@param {string} library: name of the library
+		@param {string} path: path of a file of the library
+		"""
+
+		with open(path, 'rb') as fd:
+			content = fd.read()
+		self.exact[hashlib.sha256(content).hexdigest()] = library
+
+		tokens = tokenize(content.decode('utf-8', errors='replace'))
+		self.normalized[get_normalized_hash(tokens)] = library
+
+		shingles = get_sampled_shingles(tokens, self.sampling_rate)
+		if len(shingles) < MIN_SAMPLED_SHINGLES:
+			return
+		file_key = '{0}/{1}'.format(library, os.path.basename(path))
+		self.shingle_counts[file_key] = len(shingles)
+		for shingle in shingles:
+			entries = self.shingles.setdefault(shingle, [])
+			if file_key not in entries:
+				entries.append(file_key)
+
+
+	def add_library_folder(self, input_folder):
+
+		"""
+		indexes the .js files of each library folder of the input folder (e.g., `data/libraries`)
+		@return {int} number of indexed files
+		"""
+
+		count = 0
+		for library in sorted(os.listdir(input_folder)):
+			library_folder = os.path.join(input_folder, library)
+			if not os.path.isdir(library_folder):
+				continue
+			for file_name in sorted(os.listdir(library_folder)):
+				path = os.path.join(library_folder, file_name)
+				if '.js' in file_name and not file_name.endswith('.json') and os.path.isfile(path):
+					self.add_library_file(library, path)
+					count += 1
+		return count
+
+
+	def save(self, path):
+
+		content = {
+			'format': INDEX_FORMAT_NAME,
+			'version': INDEX_FORMAT_VERSION,
+			'sampling_rate': self.sampling_rate,
+			'exact': self.exact,
+			'normalized': self.normalized,
+			'shingle_counts': self.shingle_counts,
+			'shingles': {str(shingle): files for shingle, files in self.shingles.items()},
+		}
+		with open(path + '.tmp', 'w') as fd:
+			json.dump(content, fd)
+		os.replace(path + '.tmp', path)
+
+
+	@classmethod
+	def load(cls, path):
+
+		"""
+		@param {string} path: index built with `save`
+		@return {LibraryIndex}
+		"""
+
+		with open(path, 'r') as fd:
+			content = json.load(fd)
+		if content.get('format') != INDEX_FORMAT_NAME or content.get('version') != INDEX_FORMAT_VERSION:
+			raise ValueError('unsupported library index format in %s'%path)
+
+		return cls(
+			exact=content['exact'],
+			normalized=content['normalized'],
+			shingles={int(shingle): files for shingle, files in content['shingles'].items()},
+			shingle_counts=content['shingle_counts'],
+			sampling_rate=content['sampling_rate'],
+		)
+
+
+	# ----------------------------------------------------------------------- #
+	#		Lookup
+	# ----------------------------------------------------------------------- #
+
+	def classify_script(self, content, src=None):
+
+		"""
+		@param {string|bytes} content: source of the script
+		@param {string} src: src of the script, if external
+		@return {dict} {'library', 'match', 'score'} if the script is a known library, otherwise None
+		"""
+
+		cdn_library = get_cdn_library(src)
+		if cdn_library is not None:
+			return {'library': cdn_library[0], 'version': cdn_library[1], 'match': MATCH_CDN, 'score': 1.0}
+
+		if isinstance(content, str):
+			content = content.encode('utf-8', errors='replace')
+		script_hash = hashlib.sha256(content).hexdigest()
+		if script_hash in self._cache:
+			return self._cache[script_hash]
+
+		classification = None
+		if script_hash in self.exact:
+			classification = {'library': self.exact[script_hash], 'match': MATCH_EXACT, 'score': 1.0}
+		else:
+			tokens = tokenize(content.decode('utf-8', errors='replace'))
+			normalized_hash = get_normalized_hash(tokens)
+			if normalized_hash in self.normalized:
+				classification = {'library': self.normalized[normalized_hash], 'match': MATCH_NORMALIZED, 'score': 1.0}
+			else:
+				classification = self._classify_by_shingles(get_sampled_shingles(tokens, self.sampling_rate))
+
+		self._cache[script_hash] = classification
+		return classification
+
+
+	def _classify_by_shingles(self, shingles):
+
+		if len(shingles) < MIN_SAMPLED_SHINGLES:
+			return None
+
+		hits = collections.Counter()
+		for shingle in shingles:
+			for file_key in self.shingles.get(shingle, []):
+				hits[file_key] += 1
+
+		best = None
+		for file_key, count in hits.items():
+			# resemblance, or containment of the smaller one, e.g., a library bundled with first-party code
+			score = count / float(min(len(shingles), self.shingle_counts[file_key]))
+			if score >= SHINGLE_THRESHOLD and (best is None or score > best[1]):
+				best = (file_key, score)
+
+		if best is None:
+			return None
+		return {'library': best[0].split('/')[0], 'match': MATCH_SHINGLES, 'score': round(best[1], 3)}
+
+
+	def classify_webpage(self, webpage_folder):
+
+		"""
+		@param {string} webpage_folder: absolute path of the webpage directory
+		@return {dict} script name (e.g., 0.js) -> classification (see `classify_script`) of each library script of the webpage
+		"""
+
+		scripts_mapping = {}
+		scripts_mapping_file = os.path.join(webpage_folder, 'scripts_mapping.json')
+		if os.path.exists(scripts_mapping_file):
+			try:
+				with open(scripts_mapping_file, 'r', encoding='utf-8') as fd:
+					scripts_mapping = json.load(fd)
+			except ValueError:
+				pass
+
+		libraries = collections.OrderedDict()
+		script_names = [item for item in os.listdir(webpage_folder) if item.endswith('.js') and item[:-len('.js')].isdigit()]
+		for script_name in sorted(script_names, key=lambda item: int(item[:-len('.js')])):
+			script_item = scripts_mapping.get(script_name, {})
+			src = script_item.get('src') if script_item.get('type') == 'external' else None
+			with open(os.path.join(webpage_folder, script_name), 'rb') as fd:
+				classification = self.classify_script(fd.read(), src=src)
+			if classification is not None:
+				libraries[script_name] = classification
+		return libraries
+
+
+
+def build_library_index(input_folders, output_path):
+
+	"""
+	@param {list} input_folders: folders with one sub-folder per library
+	@param {string} output_path: path of the index
+	@return {LibraryIndex}
+	"""
+
+	index = LibraryIndex()
+	for input_folder in input_folders:
+		count = index.add_library_folder(input_folder)
+		LOGGER.info('indexed %s library files of %s.'%(count, input_folder))
+	index.save(output_path)
+	return index
+
+
+def get_library_index(path=None):
+
+	"""
+	@param {string} path: path of the index (default: constants.LIBRARY_INDEX_FILE)
+	@return {LibraryIndex} the index, loaded once per process; built from `data/libraries` if it does not exist
+	"""
+
+	global _library_index
+	if path is None:
+		path = constantsModule.LIBRARY_INDEX_FILE
+	if _library_index is None or _library_index[0] != path:
+		if os.path.exists(path):
+			index = LibraryIndex.load(path)
+		else:
+			LOGGER.info('library index %s does not exist, building it.'%path)
+			index = build_library_index([os.path.join(constantsModule.DATA_DIR, 'libraries')], path)
+		_library_index = (path, index)
+	return _library_index[1]
+
+
+
+def main():
+
+	p = argparse.ArgumentParser(description='Fingerprint index of library scripts.')
+	p.add_argument('--build', action='store_true', help='build the index from the input folders')
+	p.add_argument('--input', metavar='I', action='append', help='folder with one sub-folder per library, can be repeated (default: data/libraries)')
+	p.add_argument('--output', metavar='O', help='path of the index (default: constants.LIBRARY_INDEX_FILE)', default=constantsModule.LIBRARY_INDEX_FILE)
+	p.add_argument('--classify', metavar='W', help='webpage folder whose scripts to classify')
+	args = vars(p.parse_args())
+
+	if args['build']:
+		input_folders = args['input'] or [os.path.join(constantsModule.DATA_DIR, 'libraries')]
+		build_library_index(input_folders, args['output'])
+		LOGGER.info('stored the library index at %s'%args['output'])
+	elif args['classify']:
+		libraries = get_library_index(args['output']).classify_webpage(args['classify'])
+		print(json.dumps(libraries, indent=4))
+	else:
+		p.print_help()
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,428 @@
+# -*- coding: utf-8 -*-
+
+"""
+	Copyright (C) 2022  Soheil Khodayari, CISPA
+	This program is free software: you can redistribute it and/or modify
+	it under the terms of the GNU Affero General Public License as published by
+	the Free Software Foundation, either version 3 of the License, or
+	(at your option) any later version.
+	This program is distributed in the hope that it will be useful,
+	but WITHOUT ANY WARRANTY; without even the implied warranty of
+	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+	GNU Affero General Public License for more details.
+	You should have received a copy of the GNU Affero General Public License
+	along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+	Description:
+	------------
+	Clusters the webpages of a site by their set of scripts (i.e., near-duplicate detection, as in
+	`scripts/cluster_similar_pages.py`), such that the pipeline analyzes one representative webpage
+	per cluster and attaches its results to the other members of the cluster.
+
+	Clustering modes:
+		- exact: webpages with identical lists of script hashes
+		- minhash: webpages whose sets of script hashes have an (estimated) Jaccard similarity of at least a threshold
+			with the one of the representative of their cluster, using MinHash signatures and LSH banding;
+			scripts can optionally be weighted by their size, such that a differing analytics snippet matters
+			less than a differing bundle
+
+	The clusters of a site are stored in `webpage_clusters.json` of the site directory
+	(cluster hash -> list of webpage folder names). The first webpage of each cluster is its representative.
+	Each member webpage that received the results of a representative gets a `cluster.out` file.
+
+	Note: the HPG of a member webpage is not constructed; its dynamic taint flows are only
+	reflected through those of the representative.
+	In the minhash mode, the scripts that a member does not share with its representative are not analyzed.
+
+	Usage:
+	------------
+	> import utils.page_clusters as pageClustersModule
+	> clusters = pageClustersModule.cluster_site_webpages(website_folder)
+	> skip = pageClustersModule.get_redundant_webpages(clusters)
+	> ... analyze the webpages not in skip ...
+	> pageClustersModule.attach_cluster_results(website_folder, clusters, pageClustersModule.TRAVERSAL_RESULT_FILES)
+
+"""
+
+import os
+import math
+import json
+import random
+import shutil
+import collections
+import utils.utility as utilityModule
+from utils.logging import logger as LOGGER
+
+
+CLUSTERS_FILE_NAME = 'webpage_clusters.json'
+CLUSTER_MARKER_FILE_NAME = 'cluster.out'
+
+CLUSTER_MODE_EXACT = 'exact'
+CLUSTER_MODE_MINHASH = 'minhash'
+
+# defaults of the minhash mode
+MINHASH_THRESHOLD = 0.8
+MINHASH_NUM_PERM = 64
+MINHASH_SEED = 1
+
+# universal hashing of the signature permutations: (a * x + b) mod p, truncated to 32 bits
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# outputs of the static pass (i.e., HPG construction) per webpage
+STATIC_RESULT_FILES = ['sinks.out.json', 'library_scripts.json', 'library_summaries.json']
+
+# outputs of the traversals per webpage
+TRAVERSAL_RESULT_FILES = ['sinks.flows.out', 'sinks.flows.out.json', 'triage.out']
+
+
+
+def _read_webpage_url(webpage_folder):
+
+	url_file = os.path.join(webpage_folder, 'url.out')
+	if not os.path.exists(url_file):
+		return None
+	with open(url_file, 'r') as fd:
+		return fd.read().strip()
+
+
+def get_webpage_scripts(webpage_folder):
+
+	"""
+	@param {string} webpage_folder: absolute path of the webpage directory
+	@return {list} (script name, script hash) of the scripts of the webpage, in the order of `scripts_mapping.json`
+	"""
+
+	script_mapping_file = os.path.join(webpage_folder, 'scripts_mapping.json')
+	if not os.path.exists(script_mapping_file):
+		return []
+
+	try:
+		with open(script_mapping_file, 'r', encoding='utf-8') as fd:
+			script_mapping_json = json.load(fd)
+	except ValueError:
+		return []
+
+	return [(key, script_mapping_json[key]['hash']) for key in script_mapping_json if 'hash' in script_mapping_json[key]]
+
+
+def get_webpage_cluster_hash(webpage_folder, scripts=None):
+
+	"""
+	@param {string} webpage_folder: absolute path of the webpage directory
+	@param {list} scripts: output of `get_webpage_scripts` (read from the webpage directory if not given)
+	@return {string} hash of the scripts of the webpage, or None if the webpage has no (known) scripts
+	"""
+
+	if scripts is None:
+		scripts = get_webpage_scripts(webpage_folder)
+
+	webpage_script_hashes = [script_hash for (_, script_hash) in scripts]
+	if len(webpage_script_hashes) == 0:
+		return None
+
+	webpage_script_hashes_as_string = '_'.join(webpage_script_hashes).strip().strip('\n').strip()
+	return utilityModule.sha256(webpage_script_hashes_as_string)
+
+
+
+# ----------------------------------------------------------------------- #
+#		MinHash / LSH
+# ----------------------------------------------------------------------- #
+
+def get_minhash_permutations(num_perm=MINHASH_NUM_PERM, seed=MINHASH_SEED):
+
+	"""
+	@return {list} (a, b) parameters of the hash functions of a signature; the same seed yields comparable signatures
+	"""
+
+	rng = random.Random(seed)
+	return [(rng.randint(1, _MERSENNE_PRIME - 1), rng.randint(0, _MERSENNE_PRIME - 1)) for _ in range(num_perm)]
+
+
+def get_script_weight(script_size):
+
+	"""
+	@param {int} script_size: size of a script in bytes
+	@return {int} number of tokens of a script in a weighted signature, i.e., logarithmic in the size of the script
+	"""
+
+	return 1 + int(math.log2(1 + script_size / 1024.0))
+
+
+def get_webpage_tokens(webpage_folder, scripts=None, weighted=False):
+
+	"""
+	@param {string} webpage_folder: absolute path of the webpage directory
+	@param {bool} weighted: repeat the token of each script according to `get_script_weight`
+	@return {set} integer tokens of the scripts of the webpage
+	"""
+
+	if scripts is None:
+		scripts = get_webpage_scripts(webpage_folder)
+
+	tokens = set()
+	for (script_name, script_hash) in scripts:
+		try:
+			base = int(script_hash[:15], 16)
+		except (TypeError, ValueError):
+			base = int(utilityModule.sha256(str(script_hash))[:15], 16)
+
+		weight = 1
+		if weighted:
+			script_file = os.path.join(webpage_folder, script_name)
+			if os.path.exists(script_file):
+				weight = get_script_weight(os.path.getsize(script_file))
+
+		for i in range(weight):
+			tokens.add((base + i * 0x9E3779B97F4A7C15) % _MERSENNE_PRIME)
+	return tokens
+
+
+def get_minhash_signature(tokens, permutations):
+
+	"""
+	@param {set} tokens: output of `get_webpage_tokens`
+	@param {list} permutations: output of `get_minhash_permutations`
+	@return {tuple} the minhash signature of the tokens
+	"""
+
+	return tuple([min([((a * x + b) % _MERSENNE_PRIME) & _MAX_HASH for x in tokens]) for (a, b) in permutations])
+
+
+def estimate_jaccard_similarity(signature_1, signature_2):
+
+	equal = 0
+	for (v1, v2) in zip(signature_1, signature_2):
+		if v1 == v2:
+			equal += 1
+	return equal / float(len(signature_1))
+
+
+def get_lsh_parameters(threshold, num_perm):
+
+	"""
+	@return {tuple} (bands, rows) with bands * rows <= num_perm, such that the similarity at which two signatures
+		become candidates with probability 1/2, i.e., about (1 / bands) ^ (1 / rows), is closest to the threshold
+	"""
+
+	best = None
+	for rows in range(1, num_perm + 1):
+		bands = num_perm // rows
+		approx_threshold = (1.0 / bands) ** (1.0 / rows)
+		error = abs(approx_threshold - threshold)
+		if best is None or error < best[0]:
+			best = (error, bands, rows)
+	return (best[1], best[2])
+
+
+def cluster_by_minhash(signatures, threshold=MINHASH_THRESHOLD, num_perm=MINHASH_NUM_PERM):
+
+	"""
+	leader clustering of the LSH candidates: the webpages are visited in order, and each webpage joins the
+	cluster of the most similar leader among the leaders of its LSH buckets, if their estimated Jaccard similarity
+	is at least the threshold; otherwise, it becomes the leader of a new cluster.
+	unlike single-linkage, every member is similar to the leader of its cluster, and not just to another member.
+	@param {OrderedDict} signatures: webpage -> minhash signature, in order of preference as leaders
+	@return {list} clusters, i.e., lists of webpages with the leader first
+	"""
+
+	(bands, rows) = get_lsh_parameters(threshold, num_perm)
+
+	clusters = collections.OrderedDict()
+	# LSH bucket -> leaders in the bucket
+	buckets = {}
+	for webpage, signature in signatures.items():
+		keys = [(band, signature[band * rows: (band + 1) * rows]) for band in range(bands)]
+
+		best_leader = None
+		best_similarity = 0
+		seen = set()
+		for key in keys:
+			for leader in buckets.get(key, []):
+				if leader in seen:
+					continue
+				seen.add(leader)
+				similarity = estimate_jaccard_similarity(signatures[leader], signature)
+				if similarity >= threshold and (best_leader is None or similarity > best_similarity):
+					best_leader = leader
+					best_similarity = similarity
+
+		if best_leader is not None:
+			clusters[best_leader].append(webpage)
+			continue
+
+		clusters[webpage] = [webpage]
+		for key in keys:
+			buckets.setdefault(key, []).append(webpage)
+
+	return list(clusters.values())
+
+
+def get_site_webpages(website_folder):
+
+	"""
+	@return {list} the webpages of the site to analyze, i.e., `webpages.json` if it exists, otherwise all webpage folders
+	"""
+
+	webpages_json_file = os.path.join(website_folder, 'webpages.json')
+	if os.path.exists(webpages_json_file):
+		with open(webpages_json_file, 'r') as fd:
+			return json.load(fd)
+
+	# the name of each webpage folder is a hex digest of a SHA256 hash (as stored by the crawler)
+	return [item for item in os.listdir(website_folder) if len(item) == 64 and os.path.isdir(os.path.join(website_folder, item))]
+
+
+def cluster_site_webpages(website_folder, webpages=None, mode=CLUSTER_MODE_EXACT, threshold=MINHASH_THRESHOLD, num_perm=MINHASH_NUM_PERM, weighted=False, output_file_name=CLUSTERS_FILE_NAME):
+
+	"""
+	clusters the webpages of a site and stores the clusters in the site directory
+	@param {string} website_folder: absolute path of the site directory
+	@param {list} webpages: webpages to cluster (default: `get_site_webpages`)
+	@param {string} mode: `exact` or `minhash`
+	@param {float} threshold: min Jaccard similarity of the script set of a webpage with the one of the representative of its cluster (minhash mode)
+	@param {int} num_perm: size of the minhash signatures (minhash mode)
+	@param {bool} weighted: weight the scripts by their size (minhash mode)
+	@return {dict} cluster hash -> list of webpages, representative first
+	"""
+
+	if webpages is None:
+		webpages = get_site_webpages(website_folder)
+
+	webpage_scripts = collections.OrderedDict()
+	for webpage in sorted(webpages):
+		webpage_folder = os.path.join(website_folder, webpage)
+		if not os.path.isdir(webpage_folder):
+			continue
+		scripts = get_webpage_scripts(webpage_folder)
+		if len(scripts) > 0:
+			webpage_scripts[webpage] = scripts
+
+	clusters = {}
+	if mode == CLUSTER_MODE_MINHASH:
+		permutations = get_minhash_permutations(num_perm)
+		# the webpages with the most scripts, i.e., the ones covering most of the code, are preferred as leaders
+		signatures = collections.OrderedDict()
+		for webpage in sorted(webpage_scripts, key=lambda webpage: (-len(webpage_scripts[webpage]), webpage)):
+			tokens = get_webpage_tokens(os.path.join(website_folder, webpage), scripts=webpage_scripts[webpage], weighted=weighted)
+			signatures[webpage] = get_minhash_signature(tokens, permutations)
+
+		for members in cluster_by_minhash(signatures, threshold=threshold, num_perm=num_perm):
+			# the leader is the representative of the cluster
+			representative = members[0]
+			members = [representative] + sorted(members[1:])
+			clusters[get_webpage_cluster_hash(os.path.join(website_folder, representative), scripts=webpage_scripts[representative])] = members
+	else:
+		for webpage, scripts in webpage_scripts.items():
+			cluster_hash = get_webpage_cluster_hash(os.path.join(website_folder, webpage), scripts=scripts)
+			if cluster_hash not in clusters:
+				clusters[cluster_hash] = [webpage]
+			else:
+				clusters[cluster_hash].append(webpage)
+
+	clusters = collections.OrderedDict(sorted(clusters.items(), key=lambda item: item[1][0]))
+	with open(os.path.join(website_folder, output_file_name), 'w+') as fd:
+		json.dump(clusters, fd, ensure_ascii=False, indent=4)
+
+	count_webpages = sum([len(members) for members in clusters.values()])
+	LOGGER.info('clustered %s webpages of %s into %s clusters.'%(count_webpages, website_folder, len(clusters)))
+	return clusters
+
+
+def load_site_clusters(website_folder):
+
+	"""
+	@return {dict} the stored clusters of the site, or None if the site was not clustered
+	"""
+
+	clusters_file = os.path.join(website_folder, CLUSTERS_FILE_NAME)
+	if not os.path.exists(clusters_file):
+		return None
+	with open(clusters_file, 'r') as fd:
+		return json.load(fd, object_pairs_hook=collections.OrderedDict)
+
+
+def get_redundant_webpages(clusters):
+
+	"""
+	@param {dict} clusters: output of `cluster_site_webpages`
+	@return {set} webpages that need no analysis of their own, i.e., all but the representative of each cluster
+	"""
+
+	if not clusters:
+		return set()
+	redundant = set()
+	for members in clusters.values():
+		redundant.update(members[1:])
+	return redundant
+
+
+def _copy_result_file(source_file, target_file, source_url, target_url):
+
+	if source_url is None or target_url is None or source_url == target_url:
+		shutil.copyfile(source_file, target_file)
+		return
+
+	# the results mention the url of the webpage that they were computed for
+	if source_file.endswith('.json'):
+		with open(source_file, 'r', encoding='utf-8') as fd:
+			content = json.load(fd)
+		if isinstance(content, dict) and content.get('url') == source_url:
+			content['url'] = target_url
+		with open(target_file, 'w+', encoding='utf-8') as fd:
+			json.dump(content, fd, ensure_ascii=False, indent=4)
+	else:
+		with open(source_file, 'r', encoding='utf-8') as fd:
+			content = fd.read()
+		content = content.replace('[*] webpage URL: %s\n'%source_url, '[*] webpage URL: %s\n'%target_url, 1)
+		with open(target_file, 'w+', encoding='utf-8') as fd:
+			fd.write(content)
+
+
+def attach_cluster_results(website_folder, clusters, file_names, overwrite=False):
+
+	"""
+	copies the given result files of the representative of each cluster to the other members
+	@param {string} website_folder: absolute path of the site directory
+	@param {dict} clusters: output of `cluster_site_webpages`
+	@param {list} file_names: result files to copy, e.g., `STATIC_RESULT_FILES`
+	@param {bool} overwrite: replace results that a member already has
+	@return {int} number of copied files
+	"""
+
+	if not clusters:
+		return 0
+
+	count = 0
+	for cluster_hash, members in clusters.items():
+		representative = members[0]
+		representative_folder = os.path.join(website_folder, representative)
+		representative_url = _read_webpage_url(representative_folder)
+
+		for member in members[1:]:
+			member_folder = os.path.join(website_folder, member)
+			if not os.path.isdir(member_folder):
+				continue
+			member_url = _read_webpage_url(member_folder)
+
+			attached = False
+			for file_name in file_names:
+				source_file = os.path.join(representative_folder, file_name)
+				target_file = os.path.join(member_folder, file_name)
+				if not os.path.exists(source_file):
+					continue
+				if os.path.exists(target_file) and str(overwrite).lower() != 'true':
+					continue
+				try:
+					_copy_result_file(source_file, target_file, representative_url, member_url)
+					attached = True
+					count += 1
+				except Exception as e:
+					LOGGER.error('could not attach %s of %s to %s: %s'%(file_name, representative, member, str(e)))
+
+			if attached:
+				with open(os.path.join(member_folder, CLUSTER_MARKER_FILE_NAME), 'w+') as fd:
+					json.dump({'cluster': cluster_hash, 'representative': representative}, fd, ensure_ascii=False, indent=4)
+
+	return count
@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+
+"""
+	Copyright (C) 2022  Soheil Khodayari, CISPA
+	This program is free software: you can redistribute it and/or modify
+	it under the terms of the GNU Affero General Public License as published by
+	the Free Software Foundation, either version 3 of the License, or
+	(at your option) any later version.
+	This program is distributed in the hope that it will be useful,
+	but WITHOUT ANY WARRANTY; without even the implied warranty of
+	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+	GNU Affero General Public License for more details.
+	You should have received a copy of the GNU Affero General Public License
+	along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+	Description:
+	------------
+	Concurrent scheduler for running the pipeline passes of multiple sites at the same time.
+	Each stage (e.g., crawling, static, static_neo4j, verification) has its own concurrency limit,
+	and every running stage holds a numbered slot that can be used to partition shared resources
+	(e.g., the ports of a neo4j instance).
+
+	Two execution modes are supported:
+		- StageScheduler: a pool of workers, each running all the stages of one site
+		- StagePipeline: one queue per stage, such that e.g., a site is crawled while another one is analyzed
+
+
+	Usage:
+	------------
+	> from utils.scheduler import StageScheduler
+	> scheduler = StageScheduler(workers=8, stage_limits={'crawling': 4, 'static_neo4j': 2})
+	> def run_site(site):
+	>	with scheduler.stage('crawling') as slot:
+	>		...
+	> scheduler.run(run_site, sites)
+
+	> from utils.scheduler import StagePipeline
+	> pipeline = StagePipeline([('crawling', crawl_site, 4), ('static', analyze_site, 2)])
+	> pipeline.run(sites)
+
+"""
+
+import threading
+import queue
+import contextlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from utils.logging import logger
+
+
+
+def get_stage_limit(requested_limit, memory_budget=None, process_memory=None):
+
+	"""
+	@param {int} requested_limit: max number of concurrent processes requested for a stage
+	@param {int} memory_budget: total amount of memory (in MB) available to the stage
+	@param {int} process_memory: amount of memory (in MB) allocated to each process of the stage
+	@return {int} the concurrency limit of the stage, such that the processes fit in the memory budget
+	"""
+
+	limit = max(1, int(requested_limit))
+	if memory_budget is not None and process_memory is not None and int(process_memory) > 0:
+		limit = min(limit, max(1, int(memory_budget) // int(process_memory)))
+	return limit
+
+
+def split_memory_budget(memory_budget, stages):
+
+	"""
+	splits one memory budget across stages, such that their processes fit in it together
+	@param {int} memory_budget: total amount of memory (in MB) available to the stages, or None
+	@param {list} stages: (requested_limit, process_memory) of each stage, in the order they get their share
+	@return {list} the concurrency limit of each stage; the memory of one process of each later stage is
+		held back from the share of the earlier stages
+	"""
+
+	if memory_budget is None:
+		return [get_stage_limit(requested_limit, None, process_memory) for (requested_limit, process_memory) in stages]
+
+	def _process_memory(process_memory):
+		return int(process_memory) if process_memory is not None and int(process_memory) > 0 else 0
+
+	remaining = int(memory_budget)
+	limits = []
+	for (index, (requested_limit, process_memory)) in enumerate(stages):
+		reserved = sum([_process_memory(later_memory) for (_, later_memory) in stages[index+1:]])
+		limit = get_stage_limit(requested_limit, remaining - reserved, process_memory)
+		remaining = remaining - limit * _process_memory(process_memory)
+		limits.append(limit)
+
+	if remaining < 0:
+		logger.warning('the memory budget of %s MB is too small for one process per stage.'%memory_budget)
+	return limits
+
+
+class StageScheduler:
+
+	"""
+	Runs a per-site function for many sites over a thread pool, while
+	bounding the number of sites that are inside each stage at the same time.
+	"""
+
+	def __init__(self, workers, stage_limits):
+
+		"""
+		@param {int} workers: number of sites processed concurrently
+		@param {dict} stage_limits: stage name -> max number of concurrent executions of that stage
+		"""
+
+		self.workers = max(1, int(workers))
+		self.stage_limits = {}
+		self._slots = {}
+		for stage_name, limit in stage_limits.items():
+			limit = max(1, int(limit))
+			self.stage_limits[stage_name] = limit
+			slots = queue.Queue()
+			for slot in range(limit):
+				slots.put(slot)
+			self._slots[stage_name] = slots
+
+
+	@contextlib.contextmanager
+	def stage(self, stage_name):
+
+		"""
+		blocks until a slot of the given stage is free, and holds it for the duration of the context
+		@param {string} stage_name
+		@return {int} the slot index in [0, limit) or None if the stage is not bounded
+		"""
+
+		if stage_name not in self._slots:
+			yield None
+			return
+
+		slots = self._slots[stage_name]
+		slot = slots.get()
+		try:
+			yield slot
+		finally:
+			slots.put(slot)
+
+
+	def run(self, fn, items):
+
+		"""
+		executes fn(item) for all items over the worker pool
+		@param {function} fn: per-item function
+		@param {iterable} items
+		@return {int} number of items for which fn raised an exception
+		"""
+
+		failures = 0
+		with ThreadPoolExecutor(max_workers=self.workers) as executor:
+
+			futures = {}
+			for item in items:
+				future = executor.submit(fn, item)
+				futures[future] = item
+
+			for future in as_completed(futures):
+				item = futures[future]
+				try:
+					future.result()
+				except Exception as e:
+					failures += 1
+					logger.error('[scheduler] failed to process %s: %s'%(str(item), str(e)))
+
+		return failures
+
+
+
+class StagePipeline:
+
+	"""
+	Producer/consumer pipeline over a sequence of stages.
+	Every stage has its own queue and worker threads; an item that a stage accepts
+	(i.e., its function returns True) is put on the queue of the next stage, so that
+	different items can be in different stages at the same time.
+	"""
+
+	_DONE = object()
+
+	def __init__(self, stages):
+
+		"""
+		@param {list} stages: ordered list of (stage name, function, number of workers) tuples
+		"""
+
+		self.stages = [(name, fn, max(1, int(workers))) for (name, fn, workers) in stages]
+
+
+	def _worker(self, stage_index, in_queue, out_queue, failures, lock):
+
+		(stage_name, fn, _) = self.stages[stage_index]
+		while True:
+			item = in_queue.get()
+			if item is StagePipeline._DONE:
+				break
+
+			forward = False
+			try:
+				forward = fn(item)
+			except Exception as e:
+				with lock:
+					failures[0] += 1
+				logger.error('[pipeline] stage %s failed for %s: %s'%(stage_name, str(item), str(e)))
+
+			if forward and out_queue is not None:
+				out_queue.put(item)
+
+
+	def run(self, items):
+
+		"""
+		feeds the items to the first stage, and waits until all stages are drained
+		@param {iterable} items
+		@return {int} number of stage executions that raised an exception
+		"""
+
+		queues = [queue.Queue() for _ in self.stages]
+		failures = [0]
+		lock = threading.Lock()
+
+		threads = []
+		for i, (stage_name, fn, workers) in enumerate(self.stages):
+			out_queue = queues[i+1] if i+1 < len(queues) else None
+			stage_threads = []
+			for _ in range(workers):
+				t = threading.Thread(target=self._worker, args=(i, queues[i], out_queue, failures, lock), daemon=True)
+				t.start()
+				stage_threads.append(t)
+			threads.append(stage_threads)
+
+		for item in items:
+			queues[0].put(item)
+
+		# shut the stages down in order: once all workers of a stage have exited,
+		# every item it accepted is already on the queue of the next stage
+		for i, stage_threads in enumerate(threads):
+			for _ in stage_threads:
+				queues[i].put(StagePipeline._DONE)
+			for t in stage_threads:
+				t.join()
+
+		return failures[0]
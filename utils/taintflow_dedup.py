@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+"""
+	Copyright (C) 2022  Soheil Khodayari, CISPA
+	This program is free software: you can redistribute it and/or modify
+	it under the terms of the GNU Affero General Public License as published by
+	the Free Software Foundation, either version 3 of the License, or
+	(at your option) any later version.
+	This program is distributed in the hope that it will be useful,
+	but WITHOUT ANY WARRANTY; without even the implied warranty of
+	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+	GNU Affero General Public License for more details.
+	You should have received a copy of the GNU Affero General Public License
+	along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+	Description:
+	------------
+	Deduplication of the Foxhound taint flows (`taintflows.json`) of a webpage.
+
+	Objects are compared by a digest of their canonical JSON form (sorted keys), and kept in
+	hash sets / dicts, such that removing the duplicates of n flows, and merging the begin/end
+	offsets of the taints of a flow, takes linear time.
+
+
+	Usage:
+	------------
+	> import utils.taintflow_dedup as dedupModule
+	> unique_taintflows = dedupModule.get_unique_taint_flows(json_content)
+
+"""
+
+import json
+import hashlib
+import collections
+
+
+
+def get_object_hash(item):
+
+	"""
+	@param {object} item: a JSON-serializable object, e.g., a taint flow
+	@return {bytes} digest of the canonical JSON form of the object; equal objects have equal digests
+		regardless of the order of their keys
+	"""
+
+	canonical = json.dumps(item, sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=str)
+	return hashlib.blake2b(canonical.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+
+def get_unique_objects(list_of_jsons):
+
+	"""
+	@param {list} list_of_jsons: JSON-serializable objects
+	@return {list} the objects without duplicates, in the order of their first occurrence
+	"""
+
+	output = []
+	seen = set()
+	for item in list_of_jsons:
+		hashed = get_object_hash(item)
+		if hashed not in seen:
+			seen.add(hashed)
+			output.append(item)
+
+	return output
+
+
+def merge_taints(taints):
+
+	"""
+	merges the begin/end offsets of the (unique) taints that have the same flow
+	@param {list} taints: the `taint` list of a taint flow, with `flow`, `begin` and `end` fields
+	@return {list} one {flow, begin: [...], end: [...]} object per flow, in the order of their first occurrence
+	"""
+
+	merged_begin_end_taints = collections.OrderedDict()
+	for t in get_unique_objects(taints):
+		hashed = get_object_hash(t["flow"])
+		if hashed not in merged_begin_end_taints:
+			merged_begin_end_taints[hashed] = {"flow": t["flow"], "begin": [], "end": []}
+		obj = merged_begin_end_taints[hashed]
+		obj["begin"].append(t["begin"])
+		obj["end"].append(t["end"])
+
+	return list(merged_begin_end_taints.values())
+
+
+def get_unique_taint_flows(json_content):
+
+	"""
+	removes duplicate flows, and merges the begin/end offsets of the duplicate taints of each flow
+	@param {list} json_content: content of a `taintflows.json` file; the flow objects are not modified
+	@return {list} unique flows, in the order of their first occurrence
+	"""
+
+	unique_taintflows = []
+	for taintflow_object in get_unique_objects(json_content):
+		copy = dict(taintflow_object)
+		copy["taint"] = merge_taints(taintflow_object.get("taint", []))
+		unique_taintflows.append(copy)
+
+	return unique_taintflows
+
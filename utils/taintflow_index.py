@@ -0,0 +1,523 @@
+# -*- coding: utf-8 -*-
+
+"""
+	Copyright (C) 2022  Soheil Khodayari, CISPA
+	This program is free software: you can redistribute it and/or modify
+	it under the terms of the GNU Affero General Public License as published by
+	the Free Software Foundation, either version 3 of the License, or
+	(at your option) any later version.
+	This program is distributed in the hope that it will be useful,
+	but WITHOUT ANY WARRANTY; without even the implied warranty of
+	MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+	GNU Affero General Public License for more details.
+	You should have received a copy of the GNU Affero General Public License
+	along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+	Description:
+	------------
+	SQLite index of the dynamic taint flows of all crawled webpages (i.e., the `taintflows.json` files of Foxhound),
+	such that the filter, matrix, pattern and export scripts query one store instead of re-reading every file.
+
+	The unique flows of each file (i.e., with merged begin/end offsets, as `filter_taint_flows_by_sinks` computes them)
+	are stored with their sink types and their sources in normalized tables:
+		- files: one row per `taintflows.json` file, with its mtime and size
+		- flows: one row per unique flow, with its sink and whether it is a request hijacking (i.e., relevant) sink
+		- flow_sinks: the sink types of each relevant flow (e.g., `fetch_url`)
+		- flow_sources: the sources of each flow, their source types (e.g., `loc_href`), and whether the attacker
+		  controls the beginning of the sink string from the source (i.e., the `_0` filter of `filter_taint_flows_by_index`)
+
+	The index is updated incrementally: files whose mtime and size did not change are not read again,
+	and the flows of files that were changed or removed are replaced.
+
+	The query filters map to the files of the chain of filter scripts, e.g.:
+		- `taintflows_relevant.json`: relevant=True
+		- `taintflows_source_filter_<source>.json`: relevant=True, source=<source>
+		- `taintflows_filter_<source>_<sink>_topframe.json`: source=<source>, sink=<sink>, top_frame=True
+
+	Usage:
+	------------
+	index the taint flows of all sites of the data directory:
+	> python3 -m utils.taintflow_index --update
+
+	> import utils.taintflow_index as taintflowIndexModule
+	> index = taintflowIndexModule.TaintFlowIndex()
+	> counts = index.count_taintflows(source='loc_href', sink='fetch_url', top_frame=True) # {site: {webpage: count}}
+	> flows = index.get_taintflows(site, webpage, source='loc_href', sink='fetch_url', top_frame=True)
+
+"""
+
+import os
+import json
+import sqlite3
+import argparse
+import collections
+import constants as constantsModule
+import utils.taintflow_dedup as dedupModule
+from utils.logging import logger as LOGGER
+
+
+TAINTFLOW_FILE_NAME = 'taintflows.json'
+URL_FILE_NAME = 'url.out'
+
+# frames of a different origin than the webpage
+DIFFERENT_ORIGIN = 'different origin'
+
+# request hijacking sinks (case-insensitive substrings), see `filter_taint_flows_by_sinks`
+RELEVANT_SINKS = [
+	# web sockets
+	"WebSocket",
+	"WebSocket.send",
+	# server side events
+	"EventSource",
+	# async requests (including push notification requests)
+	"fetch.url",
+	"fetch.body",
+	"XMLHttpRequest.send",
+	"XMLHttpRequest.open(url)",
+	"XMLHttpRequest.setRequestHeader",
+	# top level requests
+	"Window.open",
+	"location.href",
+	"location.assign",
+	"location.replace",
+	# requests sent to fetch scripts
+	"script.src",
+]
+
+# sources of the request hijacking flows (exact names), see `filter_taint_flows_by_sources`
+RELEVANT_SOURCES = [
+	"PushMessageData",
+	"PushSubscription.endpoint",
+	"document.baseURI",
+	"document.documentURI",
+	"document.referrer",
+	"location.hash",
+	"location.href",
+	"location.search",
+	"MessageEvent",
+	"window.MessageEvent",
+	"window.name",
+]
+
+# sink types (case-insensitive substrings), see `filter_taint_flows_by_specific_sink`
+SINK_TYPES = collections.OrderedDict([
+	('websocket_url', ["WebSocket"]),
+	('websocket_data', ["WebSocket.send"]),
+	('eventsource_url', ["EventSource"]),
+	('fetch_url', ["fetch.url"]),
+	('fetch_data', ["fetch.body"]),
+	('xmlhttprequest_url', ["XMLHttpRequest.open", "XMLHttpRequest.open(url)"]),
+	('xmlhttprequest_data', ["XMLHttpRequest.send"]),
+	('xmlhttprequest_sethdr', ["XMLHttpRequest.setRequestHeader"]),
+	('window.open', ["window.open"]),
+	('loc_assign', ["location.href", "location.assign", "location.replace"]),
+	('script_src', ["script.src"]),
+])
+
+# source types (exact names, the first one is the full name of the source), see `filter_taint_flows_by_specific_source`
+SOURCE_TYPES = collections.OrderedDict([
+	('loc_hash', ["location.hash"]),
+	('win_name', ["window.name"]),
+	('loc_href', ["location.href"]),
+	('loc_search', ["location.search"]),
+	('doc_referrer', ["document.referrer"]),
+	('doc_baseuri', ["document.baseURI"]),
+	('doc_uri', ["document.documentURI"]),
+	('pushsub_endpoint', ["PushSubscription.endpoint"]),
+	('message_evt', ["MessageEvent", "window.MessageEvent"]),
+	('push_message', ["PushMessageData"]),
+])
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+	id INTEGER PRIMARY KEY,
+	path TEXT NOT NULL UNIQUE,
+	site TEXT NOT NULL,
+	webpage TEXT NOT NULL,
+	url TEXT,
+	mtime INTEGER NOT NULL,
+	size INTEGER NOT NULL,
+	num_flows INTEGER NOT NULL,
+	error TEXT
+);
+CREATE TABLE IF NOT EXISTS flows (
+	id INTEGER PRIMARY KEY,
+	file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+	site TEXT NOT NULL,
+	webpage TEXT NOT NULL,
+	position INTEGER NOT NULL,
+	sink TEXT,
+	relevant INTEGER NOT NULL,
+	top_frame INTEGER NOT NULL,
+	content TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS flow_sinks (
+	flow_id INTEGER NOT NULL REFERENCES flows(id) ON DELETE CASCADE,
+	sink_type TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS flow_sources (
+	flow_id INTEGER NOT NULL REFERENCES flows(id) ON DELETE CASCADE,
+	source TEXT NOT NULL,
+	source_type TEXT,
+	prefix INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_site_webpage ON files(site, webpage);
+CREATE INDEX IF NOT EXISTS flows_file ON flows(file_id);
+CREATE INDEX IF NOT EXISTS flows_site_webpage ON flows(site, webpage);
+CREATE INDEX IF NOT EXISTS flows_relevant ON flows(relevant);
+CREATE INDEX IF NOT EXISTS flow_sinks_type ON flow_sinks(sink_type, flow_id);
+CREATE INDEX IF NOT EXISTS flow_sinks_flow ON flow_sinks(flow_id);
+CREATE INDEX IF NOT EXISTS flow_sources_type ON flow_sources(source_type, flow_id);
+CREATE INDEX IF NOT EXISTS flow_sources_source ON flow_sources(source, flow_id);
+CREATE INDEX IF NOT EXISTS flow_sources_flow ON flow_sources(flow_id);
+"""
+
+
+
+def is_relevant_sink(sink):
+
+	sink = str(sink).lower()
+	return any(target.lower() in sink for target in RELEVANT_SINKS)
+
+
+def get_sink_types(sink):
+
+	"""
+	@return {list} the sink types whose patterns occur in the sink name; a sink may have several, e.g., `WebSocket.send`
+	"""
+
+	sink = str(sink).lower()
+	return [sink_type for sink_type, patterns in SINK_TYPES.items() if any(pattern.lower() in sink for pattern in patterns)]
+
+
+def get_source_type(source):
+
+	for source_type, names in SOURCE_TYPES.items():
+		if source in names:
+			return source_type
+	return None
+
+
+def is_prefix_controlled(taintflow_object, source):
+
+	"""
+	@return {bool} whether the taint of the given source starts at the beginning of the sink string
+	"""
+
+	sources = taintflow_object.get("sources", [])
+	taints = taintflow_object.get("taint", [])
+	if source not in sources or not len(taints):
+		return False
+	index = sources.index(source)
+	if index >= len(taints):
+		index = -1 # pick the last element
+	return 0 in taints[index]["begin"]
+
+
+def _read_url(webpage_folder):
+
+	url_file = os.path.join(webpage_folder, URL_FILE_NAME)
+	if not os.path.exists(url_file):
+		return None
+	with open(url_file, 'r') as fd:
+		return fd.read().strip()
+
+
+
+class TaintFlowIndex:
+
+	"""
+	SQLite store of the unique taint flows of the crawled webpages
+	"""
+
+	def __init__(self, index_file=None):
+
+		"""
+		@param {string} index_file: path of the SQLite file (default: `constants.TAINTFLOW_INDEX_FILE`)
+		"""
+
+		if index_file is None:
+			index_file = constantsModule.TAINTFLOW_INDEX_FILE
+		self.index_file = index_file
+
+		index_folder = os.path.dirname(os.path.abspath(index_file))
+		if not os.path.exists(index_folder):
+			os.makedirs(index_folder)
+
+		self.conn = sqlite3.connect(index_file)
+		self.conn.execute('PRAGMA journal_mode=WAL')
+		self.conn.execute('PRAGMA synchronous=NORMAL')
+		self.conn.execute('PRAGMA foreign_keys=ON')
+		self.conn.executescript(_SCHEMA)
+		self.conn.commit()
+
+
+	def close(self):
+
+		self.conn.close()
+
+
+	# ------------------------------------------------------------------------ #
+	#	Ingestion
+	# ------------------------------------------------------------------------ #
+
+	def update(self, data_dir=None, sites=None, file_name=TAINTFLOW_FILE_NAME):
+
+		"""
+		indexes the taint flow files that are new or changed since the last update, and drops the removed ones
+		@param {string} data_dir: directory with one folder per site (default: `constants.DATA_DIR`)
+		@param {list} sites: site folders to index (default: all folders of data_dir)
+		@param {string} file_name: name of the taint flow file in each webpage folder
+		@return {dict} number of added, updated, unchanged and removed files
+		"""
+
+		if data_dir is None:
+			data_dir = constantsModule.DATA_DIR
+		if sites is None:
+			sites = [item for item in os.listdir(data_dir) if os.path.isdir(os.path.join(data_dir, item))]
+
+		stats = {'added': 0, 'updated': 0, 'unchanged': 0, 'removed': 0}
+		for site in sites:
+			site_folder = os.path.join(data_dir, site)
+
+			known_files = {}
+			for (file_id, path, mtime, size) in self.conn.execute('SELECT id, path, mtime, size FROM files WHERE site = ?', (site,)):
+				known_files[path] = (file_id, mtime, size)
+
+			webpages = os.listdir(site_folder) if os.path.isdir(site_folder) else []
+			for webpage in webpages:
+				path = os.path.join(os.path.join(site_folder, webpage), file_name)
+				if not os.path.isfile(path):
+					continue
+
+				stat = os.stat(path)
+				known = known_files.pop(path, None)
+				if known is not None and known[1] == stat.st_mtime_ns and known[2] == stat.st_size:
+					stats['unchanged'] += 1
+					continue
+
+				if known is not None:
+					self.conn.execute('DELETE FROM files WHERE id = ?', (known[0],))
+					stats['updated'] += 1
+				else:
+					stats['added'] += 1
+				self._add_file(path, site, webpage, stat)
+
+			# files that no longer exist
+			for path, known in known_files.items():
+				self.conn.execute('DELETE FROM files WHERE id = ?', (known[0],))
+				stats['removed'] += 1
+
+			self.conn.commit()
+
+		LOGGER.info('updated the taint flow index %s: %s'%(self.index_file, stats))
+		return stats
+
+
+	def _add_file(self, path, site, webpage, stat):
+
+		error = None
+		try:
+			with open(path, 'r') as fd:
+				json_content = json.load(fd)
+			if not isinstance(json_content, list):
+				raise ValueError('expected a list of taint flows')
+		except Exception as e:
+			LOGGER.warning('JSON parsing error for %s'%path)
+			json_content = []
+			error = str(e)
+
+		cursor = self.conn.execute('INSERT INTO files (path, site, webpage, url, mtime, size, num_flows, error) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+			(path, site, webpage, _read_url(os.path.dirname(path)), stat.st_mtime_ns, stat.st_size, len(json_content), error))
+		file_id = cursor.lastrowid
+
+		flow_sinks = []
+		flow_sources = []
+		for position, taintflow_object in enumerate(dedupModule.get_unique_taint_flows(json_content)):
+			sink = taintflow_object.get("sink")
+			relevant = is_relevant_sink(sink) if sink is not None else False
+			top_frame = taintflow_object.get("parentloc") != DIFFERENT_ORIGIN
+			cursor = self.conn.execute('INSERT INTO flows (file_id, site, webpage, position, sink, relevant, top_frame, content) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+				(file_id, site, webpage, position, sink, int(relevant), int(top_frame), json.dumps(taintflow_object, ensure_ascii=False)))
+			flow_id = cursor.lastrowid
+
+			if relevant:
+				# sink types are only assigned to relevant flows, as the filter scripts match them among the relevant flows
+				flow_sinks.extend([(flow_id, sink_type) for sink_type in get_sink_types(sink)])
+
+			sources = taintflow_object.get("sources", [])
+			for source in collections.OrderedDict.fromkeys(sources):
+				flow_sources.append((flow_id, source, get_source_type(source), int(is_prefix_controlled(taintflow_object, source))))
+
+		self.conn.executemany('INSERT INTO flow_sinks (flow_id, sink_type) VALUES (?, ?)', flow_sinks)
+		self.conn.executemany('INSERT INTO flow_sources (flow_id, source, source_type, prefix) VALUES (?, ?, ?, ?)', flow_sources)
+
+
+	# ------------------------------------------------------------------------ #
+	#	Queries
+	# ------------------------------------------------------------------------ #
+
+	def _get_conditions(self, site=None, webpage=None, source=None, sink=None, sources=None, relevant=None, top_frame=False, prefix=False):
+
+		"""
+		@param {string} source: source type, e.g., `loc_href`
+		@param {string} sink: sink type, e.g., `fetch_url`
+		@param {list} sources: full source names, of which a flow must have at least one
+		@param {bool} relevant: whether the flows must (True) or must not (False) have a request hijacking sink
+		@param {bool} top_frame: only flows of frames with the same origin as the webpage
+		@param {bool} prefix: only flows where the source controls the beginning of the sink string (requires source)
+		@return {tuple} (where clause, parameters)
+		"""
+
+		conditions = []
+		params = []
+		if site is not None:
+			conditions.append('f.site = ?')
+			params.append(site)
+		if webpage is not None:
+			conditions.append('f.webpage = ?')
+			params.append(webpage)
+		if relevant is not None:
+			conditions.append('f.relevant = ?')
+			params.append(int(relevant))
+		if top_frame:
+			conditions.append('f.top_frame = 1')
+		if sink is not None:
+			conditions.append('EXISTS (SELECT 1 FROM flow_sinks k WHERE k.flow_id = f.id AND k.sink_type = ?)')
+			params.append(sink)
+		if source is not None:
+			conditions.append('EXISTS (SELECT 1 FROM flow_sources s WHERE s.flow_id = f.id AND s.source_type = ?)')
+			params.append(source)
+			if prefix:
+				conditions.append('EXISTS (SELECT 1 FROM flow_sources s WHERE s.flow_id = f.id AND s.source = ? AND s.prefix = 1)')
+				params.append(SOURCE_TYPES[source][0])
+		if sources is not None:
+			sources = list(sources)
+			conditions.append('EXISTS (SELECT 1 FROM flow_sources s WHERE s.flow_id = f.id AND s.source IN (%s))'%', '.join(['?'] * len(sources)))
+			params.extend(sources)
+
+		where = ('WHERE ' + ' AND '.join(conditions)) if len(conditions) else ''
+		return (where, params)
+
+
+	def get_webpages(self, site):
+
+		"""
+		@return {list} the webpages of the site with a valid taint flow file
+		"""
+
+		return [row[0] for row in self.conn.execute('SELECT webpage FROM files WHERE site = ? AND error IS NULL ORDER BY webpage', (site,))]
+
+
+	def get_taintflows(self, site, webpage, **filters):
+
+		"""
+		@param {string} site: site folder name
+		@param {string} webpage: webpage folder name
+		@param filters: see `_get_conditions`
+		@return {list} the unique flows of the webpage that match the filters
+		"""
+
+		(where, params) = self._get_conditions(site=site, webpage=webpage, **filters)
+		query = 'SELECT f.content FROM flows f %s ORDER BY f.position'%where
+		return [json.loads(row[0]) for row in self.conn.execute(query, params)]
+
+
+	def iter_taintflows(self, **filters):
+
+		"""
+		@param filters: see `_get_conditions`
+		@return {generator} (site, webpage, webpage url, flow) of all flows that match the filters
+		"""
+
+		(where, params) = self._get_conditions(**filters)
+		query = 'SELECT f.site, f.webpage, u.url, f.content FROM flows f JOIN files u ON u.id = f.file_id %s ORDER BY f.site, f.webpage, f.position'%where
+		for (site, webpage, url, content) in self.conn.execute(query, params):
+			yield (site, webpage, url, json.loads(content))
+
+
+	def count_taintflows(self, **filters):
+
+		"""
+		@param filters: see `_get_conditions`
+		@return {dict} site -> webpage -> number of flows that match the filters (webpages without flows are left out),
+			i.e., the content of the `taintflows_count_*.json` files of the filter scripts
+		"""
+
+		(where, params) = self._get_conditions(**filters)
+		query = 'SELECT f.site, f.webpage, COUNT(*) FROM flows f %s GROUP BY f.site, f.webpage'%where
+		out = {}
+		for (site, webpage, count) in self.conn.execute(query, params):
+			if site not in out:
+				out[site] = {}
+			out[site][webpage] = count
+		return out
+
+
+	def get_file_counts(self, site=None):
+
+		"""
+		@return {dict} site -> webpage -> [number of relevant unique flows, number of unique flows, number of flows],
+			i.e., the content of the `taintflows_count.json` file of `filter_taint_flows_by_sinks`
+		"""
+
+		query = """
+		SELECT u.site, u.webpage, u.num_flows, COUNT(f.id), COALESCE(SUM(f.relevant), 0)
+		FROM files u LEFT JOIN flows f ON f.file_id = u.id
+		WHERE u.error IS NULL %s
+		GROUP BY u.id
+		"""%('AND u.site = ?' if site is not None else '')
+		out = {}
+		for (site_name, webpage, num_flows, num_unique, num_relevant) in self.conn.execute(query, [site] if site is not None else []):
+			if site_name not in out:
+				out[site_name] = {}
+			out[site_name][webpage] = [num_relevant, num_unique, num_flows]
+		return out
+
+
+	def get_stats(self):
+
+		"""
+		@return {dict} number of indexed sites, files and flows
+		"""
+
+		(sites, files) = self.conn.execute('SELECT COUNT(DISTINCT site), COUNT(*) FROM files').fetchone()
+		(flows, relevant) = self.conn.execute('SELECT COUNT(*), COALESCE(SUM(relevant), 0) FROM flows').fetchone()
+		return {'sites': sites, 'files': files, 'flows': flows, 'relevant_flows': relevant}
+
+
+
+def get_taintflow_index(index_file=None, update=False, sites=None):
+
+	"""
+	@param {string} index_file: path of the SQLite file (default: `constants.TAINTFLOW_INDEX_FILE`)
+	@param {bool} update: whether to index the new and changed taint flow files first
+	@param {list} sites: site folders to update (default: all)
+	@return {TaintFlowIndex}
+	"""
+
+	index = TaintFlowIndex(index_file)
+	if update:
+		index.update(sites=sites)
+	return index
+
+
+
+def main():
+
+	p = argparse.ArgumentParser(description='SQLite index of the dynamic taint flows of the crawled webpages.')
+	p.add_argument('--update', action='store_true', help='index the new and changed taint flow files')
+	p.add_argument('--site', metavar='S', action='append', help='site folder to update, can be repeated (default: all sites of the data directory)')
+	p.add_argument('--data', metavar='D', help='data directory (default: %(default)s)', default=constantsModule.DATA_DIR)
+	p.add_argument('--index', metavar='F', help='path of the index (default: %(default)s)', default=constantsModule.TAINTFLOW_INDEX_FILE)
+	args = vars(p.parse_args())
+
+	index = TaintFlowIndex(args['index'])
+	if args['update']:
+		index.update(data_dir=args['data'], sites=args['site'])
+	print(json.dumps(index.get_stats(), indent=4))
+	index.close()
+
+
+if __name__ == '__main__':
+	main()